@@ -0,0 +1,524 @@
+"""
+Core orchestration engine for Medusa library.
+
+This module provides the MedusaCore class which ties together:
+- Configuration loading and platform configuration mapping
+- Task creation and tracking through TaskStore and TaskStateManager
+- An asyncio-based executor with a bounded pool of workers
+- Global and per-platform concurrency limits
+- Sequential platform execution with result passing (upload -> publish)
+- Fail-fast error handling with spec-compliant task status reporting
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Union, Tuple
+
+from .models import TaskResult, TaskStatus, PublishRequest, PlatformConfig, MediaMetadata
+from .exceptions import MedusaError, TaskError, ConfigError
+from .uploaders.base import BaseUploader, UploadResult
+from .publishers.base import PublishResult
+from .utils.config import ConfigLoader, MedusaConfig
+from .utils.registry import PlatformRegistry, get_registry
+from .utils.states import TaskStateManager, TaskState
+from .utils.task_id import TaskIDGenerator
+from .utils.task_status import TaskStatusManager
+from .utils.task_store import TaskStore
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class MedusaCore:
+    """
+    Main interface for task management and coordination.
+
+    Requests submitted through publish_async are stored as pending tasks and
+    queued for a fixed pool of asyncio workers. The number of workers bounds
+    how many requests run at once; optional per-platform limits additionally
+    bound how many operations hit a single platform at the same time.
+    """
+
+    DEFAULT_MAX_WORKERS = 4
+    TASK_TYPE = "publish"
+
+    def __init__(self,
+                 config_file: Optional[Union[str, Path]] = None,
+                 config: Optional[MedusaConfig] = None,
+                 platform_configs: Optional[Dict[str, PlatformConfig]] = None,
+                 registry: Optional[PlatformRegistry] = None,
+                 task_store: Optional[TaskStore] = None,
+                 state_manager: Optional[TaskStateManager] = None,
+                 max_workers: int = DEFAULT_MAX_WORKERS,
+                 platform_concurrency: Optional[Dict[str, int]] = None,
+                 max_queue_size: int = 0):
+        """
+        Initialize MedusaCore.
+
+        Args:
+            config_file: Optional path to JSON configuration file
+            config: Optional pre-loaded MedusaConfig (takes precedence over config_file)
+            platform_configs: Optional platform configurations keyed by platform name
+                              (takes precedence over config and config_file)
+            registry: Optional PlatformRegistry (uses global registry if None)
+            task_store: Optional TaskStore instance (creates new if None)
+            state_manager: Optional TaskStateManager instance (creates new if None)
+            max_workers: Number of workers, i.e. global limit of concurrently running tasks
+            platform_concurrency: Optional per-platform limits of concurrent operations
+            max_queue_size: Maximum number of queued tasks (0 means unbounded)
+
+        Raises:
+            ConfigError: If concurrency settings are invalid or config cannot be loaded
+        """
+        if max_workers < 1:
+            raise ConfigError("max_workers must be at least 1", invalid_fields=["max_workers"])
+
+        if max_queue_size < 0:
+            raise ConfigError("max_queue_size must be non-negative", invalid_fields=["max_queue_size"])
+
+        platform_concurrency = dict(platform_concurrency or {})
+        invalid_limits = [name for name, limit in platform_concurrency.items() if limit < 1]
+        if invalid_limits:
+            raise ConfigError(
+                f"Platform concurrency limits must be at least 1: {invalid_limits}",
+                invalid_fields=invalid_limits
+            )
+
+        # Platform configuration
+        if platform_configs is not None:
+            self.platform_configs = dict(platform_configs)
+        else:
+            if config is None and config_file is not None:
+                config = ConfigLoader(config_file).load()
+            self.platform_configs = self._build_platform_configs(config)
+
+        # Collaborators
+        self.registry = registry or get_registry()
+        self.task_store = task_store or TaskStore()
+        self.state_manager = state_manager or TaskStateManager()
+        self.status_manager = TaskStatusManager(self.task_store, self.state_manager)
+        self.task_id_generator = TaskIDGenerator()
+
+        # Executor configuration
+        self.max_workers = max_workers
+        self.platform_concurrency = platform_concurrency
+        self.max_queue_size = max_queue_size
+
+        # Executor state (created on start() so it binds to the running loop)
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._workers: List[asyncio.Task] = []
+        self._platform_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._pending: List[Tuple[int, int, str, PublishRequest]] = []
+        self._sequence = itertools.count()
+        self._active_platforms: Dict[str, int] = {}
+        self._running = False
+
+        logger.debug(f"MedusaCore initialized with max_workers={max_workers}, "
+                     f"platform_concurrency={platform_concurrency}")
+
+    @staticmethod
+    def _build_platform_configs(config: Optional[MedusaConfig]) -> Dict[str, PlatformConfig]:
+        """
+        Convert loaded file configuration into per-platform PlatformConfig objects.
+
+        Args:
+            config: Loaded MedusaConfig or None
+
+        Returns:
+            Dictionary mapping platform names to PlatformConfig
+        """
+        platform_configs: Dict[str, PlatformConfig] = {}
+        if config is None:
+            return platform_configs
+
+        for platform in config.get_configured_platforms():
+            file_config = config.get_platform_config(platform)
+            credentials = {
+                key: value for key, value in asdict(file_config).items() if value is not None
+            }
+            platform_configs[platform] = PlatformConfig(
+                platform_name=platform,
+                credentials=credentials
+            )
+
+        return platform_configs
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the worker pool is running."""
+        return self._running
+
+    async def start(self) -> None:
+        """
+        Start the worker pool.
+
+        Requests submitted before start() are queued and processed once the
+        workers are running.
+        """
+        if self._running:
+            return
+
+        # Listen again if a previous stop() detached the status manager
+        self.status_manager.listen()
+
+        self._queue = asyncio.PriorityQueue(maxsize=self.max_queue_size)
+        self._platform_semaphores = {
+            platform: asyncio.Semaphore(limit)
+            for platform, limit in self.platform_concurrency.items()
+        }
+
+        # Move requests submitted before start into the queue
+        for item in self._pending:
+            self._queue.put_nowait(item)
+        self._pending.clear()
+
+        self._workers = [
+            asyncio.create_task(self._worker(index))
+            for index in range(self.max_workers)
+        ]
+        self._running = True
+
+        logger.info(f"MedusaCore started with {self.max_workers} workers")
+
+    async def join(self) -> None:
+        """Wait until every queued task has been processed."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def stop(self, wait: bool = True) -> None:
+        """
+        Stop the worker pool.
+
+        The status manager stops listening to the state manager, which may be
+        shared and outlive this core; start() attaches it again.
+
+        Args:
+            wait: If True, process all queued tasks before stopping
+        """
+        if not self._running:
+            return
+
+        if wait:
+            await self.join()
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+
+        self._workers = []
+        self._running = False
+
+        # Keep unprocessed requests so a later start() picks them up
+        while not self._queue.empty():
+            self._pending.append(self._queue.get_nowait())
+            self._queue.task_done()
+        self._queue = None
+
+        self.status_manager.close()
+
+        logger.info("MedusaCore stopped")
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.stop(wait=exc_type is None)
+        return False  # Don't suppress exceptions
+
+    def publish_async(self,
+                      media_file: str,
+                      platforms: List[str],
+                      metadata: Optional[Dict[str, Dict[str, Any]]] = None,
+                      priority: int = 1) -> str:
+        """
+        Create a publishing task and queue it for execution.
+
+        Args:
+            media_file: Path to the media file
+            platforms: Platforms to process, in order
+            metadata: Platform-specific metadata keyed by platform name
+            priority: Task priority (higher values run first)
+
+        Returns:
+            Task ID for status tracking
+
+        Raises:
+            MedusaError: If the request is invalid
+            TaskError: If the queue is full
+        """
+        request = PublishRequest(
+            media_file_path=str(media_file),
+            platforms=list(platforms),
+            metadata=metadata or {},
+            priority=priority
+        )
+        return self.submit_request(request)
+
+    def submit_request(self, request: PublishRequest) -> str:
+        """
+        Queue a PublishRequest for execution.
+
+        Args:
+            request: Publish request to execute
+
+        Returns:
+            Task ID for status tracking
+
+        Raises:
+            MedusaError: If the request is invalid
+            TaskError: If the queue is full
+        """
+        request.validate()
+
+        unknown_platforms = [
+            platform for platform in request.platforms
+            if not self.registry.is_platform_registered(platform)
+        ]
+        if unknown_platforms:
+            raise MedusaError(f"Platforms not registered: {unknown_platforms}")
+
+        queued_count = self._queue.qsize() if self._queue is not None else len(self._pending)
+        if self.max_queue_size and queued_count >= self.max_queue_size:
+            raise TaskError(f"Task queue is full ({self.max_queue_size} tasks)")
+
+        task_id = self.task_id_generator.generate_task_id(self.TASK_TYPE)
+
+        self.task_store.store_task(TaskResult(
+            task_id=task_id,
+            status=TaskStatus.PENDING,
+            message="Task queued"
+        ))
+        self.state_manager.initialize_task(task_id, TaskState.PENDING)
+
+        item = (-request.priority, next(self._sequence), task_id, request)
+        if self._queue is not None:
+            self._queue.put_nowait(item)
+        else:
+            self._pending.append(item)
+
+        logger.info(f"Queued task {task_id} for platforms {request.platforms}")
+        return task_id
+
+    def get_task_status(self, task_id: str) -> Dict[str, Any]:
+        """
+        Get spec-formatted status for a task.
+
+        Args:
+            task_id: Task ID to query
+
+        Returns:
+            Status dictionary following the API specification
+
+        Raises:
+            TaskStatusError: If task not found
+        """
+        return self.status_manager.get_task_status(task_id).to_dict()
+
+    def get_executor_stats(self) -> Dict[str, Any]:
+        """
+        Get executor statistics.
+
+        Returns:
+            Dictionary with worker, queue and per-platform activity information
+        """
+        queued = self._queue.qsize() if self._queue is not None else len(self._pending)
+        return {
+            "running": self._running,
+            "max_workers": self.max_workers,
+            "queued_tasks": queued,
+            "max_queue_size": self.max_queue_size,
+            "platform_concurrency": dict(self.platform_concurrency),
+            "active_platform_operations": dict(self._active_platforms)
+        }
+
+    async def _worker(self, index: int) -> None:
+        """
+        Worker loop pulling requests from the queue.
+
+        Args:
+            index: Worker index (for logging)
+        """
+        while True:
+            _, _, task_id, request = await self._queue.get()
+            try:
+                await self._execute_task(task_id, request)
+            except Exception as e:
+                logger.error(f"Worker {index} failed to execute task {task_id}: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _execute_task(self, task_id: str, request: PublishRequest) -> None:
+        """
+        Execute a publish request platform by platform (fail-fast).
+
+        Uploaders run before publishers so that publishers can reference
+        upload results (e.g. {youtube_url}) in their templates.
+
+        Args:
+            task_id: Task ID
+            request: Publish request to execute
+        """
+        self._update_task(task_id, TaskStatus.IN_PROGRESS, "Task started")
+
+        results: Dict[str, Any] = {}
+        for platform in self._order_platforms(request.platforms):
+            self._update_task(task_id, TaskStatus.IN_PROGRESS, f"Processing {platform}...")
+            try:
+                platform_results = await self._run_platform(platform, task_id, request, results)
+            except Exception as e:
+                logger.error(f"Task {task_id} failed on {platform}: {e}")
+                self._update_task(
+                    task_id, TaskStatus.FAILED, f"Failed on {platform}",
+                    error=str(e), failed_platform=platform
+                )
+                return
+            results.update(platform_results)
+
+        self._update_task(task_id, TaskStatus.COMPLETED, "Task completed", results=results)
+
+    def _order_platforms(self, platforms: List[str]) -> List[str]:
+        """
+        Order platforms so uploaders run before publishers.
+
+        Args:
+            platforms: Requested platforms
+
+        Returns:
+            Platforms ordered for execution (stable within each group)
+        """
+        def sort_key(platform: str) -> int:
+            info = self.registry.get_platform_info(platform)
+            return 0 if info is not None and info.platform_type == "uploader" else 1
+
+        return sorted(platforms, key=sort_key)
+
+    async def _run_platform(self,
+                            platform: str,
+                            task_id: str,
+                            request: PublishRequest,
+                            results: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run a single platform operation under its concurrency limit.
+
+        Args:
+            platform: Platform name
+            task_id: Task ID
+            request: Publish request
+            results: Results gathered from previous platforms
+
+        Returns:
+            Results produced by this platform
+        """
+        config = self.platform_configs.get(platform) or PlatformConfig(platform_name=platform)
+        platform_metadata = request.get_platform_metadata(platform)
+        semaphore = self._platform_semaphores.get(platform)
+
+        if semaphore is not None:
+            await semaphore.acquire()
+        self._active_platforms[platform] = self._active_platforms.get(platform, 0) + 1
+        try:
+            instance = self.registry.create_platform_instance(platform, config)
+            async with instance:
+                is_upload = isinstance(instance, BaseUploader)
+                status = TaskStatus.FAILED
+                started = time.monotonic()
+                try:
+                    if is_upload:
+                        upload_result = await instance.upload_media(
+                            request.media_file_path,
+                            MediaMetadata.from_dict(platform_metadata),
+                            task_id=task_id
+                        )
+                        platform_results = self._collect_upload_results(platform, upload_result)
+                    else:
+                        content = platform_metadata.get("message", "")
+                        publish_metadata = {
+                            key: value for key, value in platform_metadata.items()
+                            if key != "message"
+                        }
+                        publish_metadata.update(results)
+                        publish_result = await instance.publish_post(content, publish_metadata)
+                        platform_results = self._collect_publish_results(platform, publish_result)
+                    status = TaskStatus.COMPLETED
+                    return platform_results
+                finally:
+                    self.status_manager.record_platform_duration(
+                        platform, "upload" if is_upload else "publish",
+                        time.monotonic() - started, status
+                    )
+        finally:
+            self._active_platforms[platform] -= 1
+            if semaphore is not None:
+                semaphore.release()
+
+    @staticmethod
+    def _collect_upload_results(platform: str, result: UploadResult) -> Dict[str, Any]:
+        """Convert an UploadResult into task result entries."""
+        return {
+            f"{platform}_id": result.upload_id,
+            f"{platform}_url": result.media_url
+        }
+
+    @staticmethod
+    def _collect_publish_results(platform: str, result: PublishResult) -> Dict[str, Any]:
+        """Convert a PublishResult into task result entries."""
+        return {
+            f"{platform}_post_id": result.post_id,
+            f"{platform}_post_url": result.post_url
+        }
+
+    def _update_task(self,
+                     task_id: str,
+                     status: TaskStatus,
+                     message: Optional[str] = None,
+                     error: Optional[str] = None,
+                     failed_platform: Optional[str] = None,
+                     results: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Update stored task result and state history.
+
+        Args:
+            task_id: Task ID
+            status: New status
+            message: Optional status message
+            error: Optional error description (for failures)
+            failed_platform: Optional name of the failing platform
+            results: Optional results to merge into the task
+
+        Raises:
+            TaskError: If the task does not exist
+            StateTransitionError: If the task cannot move to the new status
+        """
+        task = self.task_store.get_task(task_id)
+        if task is None:
+            raise TaskError("Task not found", task_id=task_id)
+
+        # Reject invalid transitions before the stored task is touched
+        status_changed = task.status != status
+        if status_changed:
+            self.state_manager.check_transition(task_id, TaskState(status.value))
+            task.update_status(status, message)
+        else:
+            task.message = message
+            task.updated_at = datetime.now(timezone.utc)
+
+        if error is not None:
+            task.error = error
+        if failed_platform is not None:
+            task.failed_platform = failed_platform
+        if results:
+            task.results.update(results)
+
+        self.task_store.update_task(task)
+
+        # Transition last so state listeners (and watchers) see the final task
+        if status_changed:
+            self.state_manager.transition_state(task_id, TaskState(status.value), message)
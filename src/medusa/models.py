@@ -6,7 +6,7 @@ import re
 from enum import Enum
 from typing import Dict, Any, Optional, List, Union
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
 
 from .exceptions import MedusaError
 
@@ -64,17 +64,108 @@ class TaskTransition:
             )
 
 
-@dataclass
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def datetime_to_epoch_us(value: datetime) -> int:
+    """
+    Convert a datetime to integer microseconds since the Unix epoch.
+    
+    Naive datetimes are taken to be UTC.
+    
+    Args:
+        value: Datetime to convert
+        
+    Returns:
+        Microseconds since 1970-01-01T00:00:00Z
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def epoch_us_to_datetime(value: int) -> datetime:
+    """
+    Convert integer microseconds since the Unix epoch to a UTC datetime.
+    
+    Args:
+        value: Microseconds since 1970-01-01T00:00:00Z
+        
+    Returns:
+        Timezone-aware UTC datetime
+    """
+    return _EPOCH + timedelta(microseconds=value)
+
+
 class TaskResult:
-    """Represents the result of a task with comprehensive tracking."""
-    task_id: str
-    status: TaskStatus
-    message: Optional[str] = None
-    error: Optional[str] = None
-    failed_platform: Optional[str] = None
-    results: Dict[str, Any] = field(default_factory=dict)
-    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    """
+    Represents the result of a task with comprehensive tracking.
+    
+    Instances use __slots__ and keep created_at/updated_at as integer epoch
+    microseconds; the datetime properties convert on access. Assigned
+    datetimes are normalized to UTC.
+    """
+    
+    __slots__ = ("task_id", "status", "message", "error", "failed_platform", "results",
+                 "created_at_us", "updated_at_us")
+    
+    def __init__(self,
+                 task_id: str,
+                 status: TaskStatus,
+                 message: Optional[str] = None,
+                 error: Optional[str] = None,
+                 failed_platform: Optional[str] = None,
+                 results: Optional[Dict[str, Any]] = None,
+                 created_at: Optional[datetime] = None,
+                 updated_at: Optional[datetime] = None):
+        self.task_id = task_id
+        self.status = status
+        self.message = message
+        self.error = error
+        self.failed_platform = failed_platform
+        self.results = results if results is not None else {}
+        
+        now_us = None
+        if created_at is None or updated_at is None:
+            now_us = datetime_to_epoch_us(datetime.now(timezone.utc))
+        self.created_at_us = now_us if created_at is None else datetime_to_epoch_us(created_at)
+        self.updated_at_us = now_us if updated_at is None else datetime_to_epoch_us(updated_at)
+    
+    @property
+    def created_at(self) -> datetime:
+        """Creation time as a UTC datetime."""
+        return epoch_us_to_datetime(self.created_at_us)
+    
+    @created_at.setter
+    def created_at(self, value: datetime) -> None:
+        self.created_at_us = datetime_to_epoch_us(value)
+    
+    @property
+    def updated_at(self) -> datetime:
+        """Last update time as a UTC datetime."""
+        return epoch_us_to_datetime(self.updated_at_us)
+    
+    @updated_at.setter
+    def updated_at(self, value: datetime) -> None:
+        self.updated_at_us = datetime_to_epoch_us(value)
+    
+    def _astuple(self) -> tuple:
+        return (self.task_id, self.status, self.message, self.error, self.failed_platform,
+                self.results, self.created_at_us, self.updated_at_us)
+    
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._astuple() == other._astuple()
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return (f"{self.__class__.__qualname__}(task_id={self.task_id!r}, status={self.status!r}, "
+                f"message={self.message!r}, error={self.error!r}, "
+                f"failed_platform={self.failed_platform!r}, results={self.results!r}, "
+                f"created_at={self.created_at!r}, updated_at={self.updated_at!r})")
     
     def validate(self) -> None:
         """
@@ -107,7 +198,7 @@ class TaskResult:
         
         self.status = new_status
         self.message = message
-        self.updated_at = datetime.now(timezone.utc)
+        self.updated_at_us = datetime_to_epoch_us(datetime.now(timezone.utc))
     
     def add_platform_result(self, platform: str, result: Dict[str, Any]) -> None:
         """
@@ -118,7 +209,7 @@ class TaskResult:
             result: Platform result data
         """
         self.results[platform] = result
-        self.updated_at = datetime.now(timezone.utc)
+        self.updated_at_us = datetime_to_epoch_us(datetime.now(timezone.utc))
     
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -307,6 +398,8 @@ class PlatformConfig:
     rate_limit: Optional[int] = None  # Requests per minute
     retry_attempts: int = 3
     timeout: Optional[int] = None  # Timeout in seconds
+    chunk_size: Optional[int] = None  # Upload chunk size in bytes (None uses uploader default)
+    adaptive_chunk_size: bool = False  # Tune chunk size to measured throughput
     
     # Supported platforms
     SUPPORTED_PLATFORMS = {"youtube", "facebook", "vimeo", "twitter"}
@@ -326,6 +419,9 @@ class PlatformConfig:
         
         if self.timeout is not None and self.timeout <= 0:
             raise MedusaError("Timeout must be positive")
+        
+        if self.chunk_size is not None and self.chunk_size <= 0:
+            raise MedusaError("Chunk size must be positive")
     
     def is_configured(self) -> bool:
         """
@@ -350,7 +446,9 @@ class PlatformConfig:
             "metadata": self.metadata,
             "rate_limit": self.rate_limit,
             "retry_attempts": self.retry_attempts,
-            "timeout": self.timeout
+            "timeout": self.timeout,
+            "chunk_size": self.chunk_size,
+            "adaptive_chunk_size": self.adaptive_chunk_size
         }
     
     @classmethod
@@ -371,7 +469,9 @@ class PlatformConfig:
             metadata=data.get("metadata", {}),
             rate_limit=data.get("rate_limit"),
             retry_attempts=data.get("retry_attempts", 3),
-            timeout=data.get("timeout")
+            timeout=data.get("timeout"),
+            chunk_size=data.get("chunk_size"),
+            adaptive_chunk_size=data.get("adaptive_chunk_size", False)
         )
 
 
@@ -4,12 +4,13 @@ Contains base classes and implementations for social media publishing.
 """
 
 from .base import BasePublisher, PublishProgress, PublishResult, TemplateSubstitution
-from .facebook import FacebookPublisher
+from .facebook import FacebookPublisher, FacebookBatchPost
 
 __all__ = [
     'BasePublisher',
     'PublishProgress', 
     'PublishResult',
     'TemplateSubstitution',
-    'FacebookPublisher'
+    'FacebookPublisher',
+    'FacebookBatchPost'
 ] 
\ No newline at end of file
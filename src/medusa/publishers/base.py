@@ -8,6 +8,7 @@ import logging
 import re
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Dict, Any, Optional, Callable, List
 from datetime import datetime, timezone
 
@@ -73,6 +74,98 @@ class PublishResult:
             raise ValidationError("Failed publishes must have error information")
 
 
+# Opcodes of compiled template instructions
+_OP_TEXT = 0
+_OP_VAR = 1
+_OP_FALLBACK = 2
+_OP_CONDITIONAL = 3
+
+_CONDITIONAL_RE = re.compile(r'\?(\w+):\s*(.*)', re.DOTALL)
+_FALLBACK_RE = re.compile(r'(\w+)\|(\w+)')
+_VARIABLE_RE = re.compile(r'\w+')
+
+# Number of compiled templates kept by TemplateSubstitution.compile
+TEMPLATE_CACHE_SIZE = 256
+
+
+class CompiledTemplate:
+    """
+    Template parsed once into a flat list of render instructions.
+    
+    Instructions are tuples of (opcode, ...):
+    - (_OP_TEXT, text)
+    - (_OP_VAR, name)
+    - (_OP_FALLBACK, primary, fallback)
+    - (_OP_CONDITIONAL, condition, instructions)
+    
+    Rendering walks the list once, so no regex runs and no intermediate
+    string is rebuilt per variable.
+    """
+    
+    __slots__ = ("template", "instructions")
+    
+    def __init__(self, template: str, instructions: List[tuple]):
+        self.template = template
+        self.instructions = instructions
+    
+    def render(self, variables: Dict[str, Any]) -> str:
+        """
+        Render the template with the given variables.
+        
+        Args:
+            variables: Dictionary of variable values
+            
+        Returns:
+            Rendered string
+            
+        Raises:
+            TemplateError: If a required variable is missing
+        """
+        parts: List[str] = []
+        self._render(self.instructions, variables, parts)
+        return "".join(parts).strip()
+    
+    def _render(self, instructions: List[tuple], variables: Dict[str, Any], parts: List[str]) -> None:
+        """Append the rendered output of instructions to parts."""
+        for instruction in instructions:
+            op = instruction[0]
+            
+            if op == _OP_TEXT:
+                parts.append(instruction[1])
+            
+            elif op == _OP_VAR:
+                name = instruction[1]
+                if name not in variables:
+                    raise TemplateError(
+                        f"Missing template variable: {name}",
+                        variable_name=name
+                    )
+                parts.append(str(variables[name]))
+            
+            elif op == _OP_FALLBACK:
+                primary, fallback = instruction[1], instruction[2]
+                if variables.get(primary):
+                    parts.append(str(variables[primary]))
+                elif variables.get(fallback):
+                    parts.append(str(variables[fallback]))
+                else:
+                    raise TemplateError(
+                        f"Neither primary variable '{primary}' nor fallback '{fallback}' found",
+                        template=self.template,
+                        variable_name=primary
+                    )
+            
+            elif variables.get(instruction[1]):
+                # Conditional block whose condition is met
+                block: List[str] = []
+                self._render(instruction[2], variables, block)
+                content = "".join(block)
+                # Add space if conditional content doesn't start with space
+                if content and not content.startswith(' '):
+                    content = ' ' + content
+                parts.append(content)
+
+
 class TemplateSubstitution:
     """Utility class for template variable substitution."""
     
@@ -96,83 +189,111 @@ class TemplateSubstitution:
         Raises:
             TemplateError: If template processing fails
         """
+        compiled = TemplateSubstitution.compile(template)
+        
+        try:
+            return compiled.render(variables)
+        except TemplateError:
+            raise
+        except Exception as e:
+            raise TemplateError(f"Template processing failed: {e}", template=template)
+    
+    @staticmethod
+    @lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+    def compile(template: str) -> CompiledTemplate:
+        """
+        Parse a template into a CompiledTemplate.
+        
+        Results are kept in an LRU cache keyed by the template text, so a
+        template rendered many times is only parsed once.
+        
+        Args:
+            template: Template string
+            
+        Returns:
+            CompiledTemplate ready for rendering
+            
+        Raises:
+            TemplateError: If the template syntax is invalid
+        """
         if not TemplateSubstitution.validate_template(template):
             raise TemplateError(f"Invalid template syntax", template=template)
         
-        try:
-            result = template
+        return CompiledTemplate(template, TemplateSubstitution._parse(template))
+    
+    @staticmethod
+    def _parse(text: str) -> List[tuple]:
+        """
+        Parse balanced template text into render instructions.
+        
+        Brace groups that are not variables, fallbacks or conditionals are kept
+        as literal text, with any variables inside them still substituted.
+        """
+        instructions: List[tuple] = []
+        literal: List[str] = []
+        position = 0
+        length = len(text)
+        
+        while position < length:
+            open_index = text.find('{', position)
+            if open_index == -1:
+                literal.append(text[position:])
+                break
+            literal.append(text[position:open_index])
             
-            # Process conditional blocks first: {?var: content}
-            # This pattern matches {?variable: content} where content can contain nested braces
-            conditional_pattern = r'\{\?(\w+):\s*([^{}]*(?:\{[^}]*\}[^{}]*)*)\}'
+            # Find the matching closing brace
+            depth = 0
+            close_index = open_index
+            for close_index in range(open_index, length):
+                char = text[close_index]
+                if char == '{':
+                    depth += 1
+                elif char == '}':
+                    depth -= 1
+                    if depth == 0:
+                        break
             
-            # Process all conditional blocks (may need multiple passes for nested conditions)
-            while True:
-                matches = list(re.finditer(conditional_pattern, result))
-                if not matches:
-                    break
-                    
-                for match in matches:
-                    condition_var = match.group(1)
-                    conditional_content = match.group(2)
-                    
-                    if condition_var in variables and variables[condition_var]:
-                        # Condition met, process the conditional content
-                        processed_content = TemplateSubstitution._substitute_simple(
-                            conditional_content, variables
-                        )
-                        # Add space if conditional content doesn't start with space
-                        if processed_content and not processed_content.startswith(' '):
-                            processed_content = ' ' + processed_content
-                        result = result.replace(match.group(0), processed_content)
-                    else:
-                        # Condition not met, remove the conditional block
-                        result = result.replace(match.group(0), "")
+            inner = text[open_index + 1:close_index]
+            position = close_index + 1
             
-            # Process fallback variables: {var1|var2}
-            fallback_pattern = r'\{(\w+)\|(\w+)\}'
-            for match in re.finditer(fallback_pattern, result):
-                primary_var = match.group(1)
-                fallback_var = match.group(2)
-                
-                if primary_var in variables and variables[primary_var]:
-                    value = str(variables[primary_var])
-                elif fallback_var in variables and variables[fallback_var]:
-                    value = str(variables[fallback_var])
+            if _VARIABLE_RE.fullmatch(inner):
+                instruction = (_OP_VAR, inner)
+            else:
+                match = _FALLBACK_RE.fullmatch(inner)
+                if match:
+                    instruction = (_OP_FALLBACK, match.group(1), match.group(2))
                 else:
-                    raise TemplateError(
-                        f"Neither primary variable '{primary_var}' nor fallback '{fallback_var}' found",
-                        template=template,
-                        variable_name=primary_var
-                    )
-                
-                result = result.replace(match.group(0), value)
-            
-            # Process simple variables: {variable}
-            result = TemplateSubstitution._substitute_simple(result, variables)
+                    match = _CONDITIONAL_RE.fullmatch(inner)
+                    if match:
+                        instruction = (
+                            _OP_CONDITIONAL,
+                            match.group(1),
+                            TemplateSubstitution._parse(match.group(2))
+                        )
+                    else:
+                        instruction = None
             
-            return result.strip()
+            if instruction is None:
+                literal.append('{')
+                for nested in TemplateSubstitution._parse(inner):
+                    if nested[0] == _OP_TEXT:
+                        literal.append(nested[1])
+                    else:
+                        instructions.append((_OP_TEXT, "".join(literal)))
+                        literal = []
+                        instructions.append(nested)
+                literal.append('}')
+                continue
             
-        except Exception as e:
-            if isinstance(e, TemplateError):
-                raise
-            raise TemplateError(f"Template processing failed: {e}", template=template)
-    
-    @staticmethod
-    def _substitute_simple(text: str, variables: Dict[str, Any]) -> str:
-        """Substitute simple {variable} patterns."""
-        simple_pattern = r'\{(\w+)\}'
+            if literal:
+                instructions.append((_OP_TEXT, "".join(literal)))
+                literal = []
+            instructions.append(instruction)
         
-        def replace_var(match):
-            var_name = match.group(1)
-            if var_name not in variables:
-                raise TemplateError(
-                    f"Missing template variable: {var_name}",
-                    variable_name=var_name
-                )
-            return str(variables[var_name])
+        if literal:
+            instructions.append((_OP_TEXT, "".join(literal)))
         
-        return re.sub(simple_pattern, replace_var, text)
+        return [i for i in instructions if i[0] != _OP_TEXT or i[1]]
     
     @staticmethod
     def validate_template(template: str) -> bool:
@@ -6,11 +6,13 @@ and link posts to Facebook pages using the Facebook Graph API.
 """
 
 import asyncio
+import json
 import logging
 import re
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional, Callable
-from urllib.parse import urlparse
+from typing import Dict, Any, Optional, Callable, List
+from urllib.parse import urlparse, urlencode
 
 from .base import BasePublisher, PublishResult, PublishProgress
 from .facebook_auth import FacebookAuth
@@ -26,6 +28,16 @@ from ..exceptions import (
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class FacebookBatchPost:
+    """A single post submitted through FacebookPublisher.publish_batch."""
+    content: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    page_id: Optional[str] = None
+    access_token: Optional[str] = None
+    task_id: Optional[str] = None
+
+
 class FacebookPublisher(BasePublisher):
     """
     Facebook post publisher for publishing text and link posts to Facebook pages.
@@ -38,6 +50,9 @@ class FacebookPublisher(BasePublisher):
     # Facebook post content limits
     MAX_POST_LENGTH = 63206  # Facebook's maximum post length
     
+    # Maximum number of operations in one Graph API batch request
+    MAX_BATCH_SIZE = 50
+    
     def __init__(self, config: Optional[PlatformConfig] = None):
         """
         Initialize FacebookPublisher with configuration.
@@ -236,7 +251,7 @@ class FacebookPublisher(BasePublisher):
             page_id = self.config.credentials["page_id"]
             endpoint = f"/{page_id}/feed"
             
-            response = self._auth._make_api_request(
+            response = await self._auth._make_api_request_async(
                 method="POST",
                 endpoint=endpoint,
                 data=post_data
@@ -283,6 +298,175 @@ class FacebookPublisher(BasePublisher):
                 platform="facebook"
             ) from e
     
+    async def publish_batch(
+        self,
+        posts: List[FacebookBatchPost],
+        progress_callback: Optional[Callable[[PublishProgress], None]] = None
+    ) -> List[PublishResult]:
+        """
+        Publish many posts using Graph API batch requests.
+        
+        Posts are grouped into batch requests of up to MAX_BATCH_SIZE operations
+        and may target different pages; a post for another page must carry that
+        page's access token. Each post gets its own PublishResult, in input order,
+        so a failure of one post never fails the others.
+        
+        Args:
+            posts: Posts to publish
+            progress_callback: Optional progress callback, called once per batch request
+            
+        Returns:
+            List of PublishResult objects aligned with posts. Failed posts have
+            success=False and the error message; metadata carries the task_id.
+            
+        Raises:
+            AuthenticationError: If not authenticated
+        """
+        if self._auth is None:
+            raise AuthenticationError(
+                "Not authenticated with Facebook API",
+                platform="facebook"
+            )
+        
+        results: List[Optional[PublishResult]] = [None] * len(posts)
+        operations = []
+        
+        # Prepare operations; posts failing locally never reach the API
+        for index, post in enumerate(posts):
+            try:
+                processed_content = self._process_template(post.content, post.metadata)
+                self._validate_content(processed_content, post.metadata)
+                operations.append((index, self._build_batch_operation(post, processed_content)))
+            except Exception as e:
+                results[index] = self._batch_failure(post, e)
+        
+        chunks = [
+            operations[start:start + self.MAX_BATCH_SIZE]
+            for start in range(0, len(operations), self.MAX_BATCH_SIZE)
+        ]
+        completed_chunks = 0
+        
+        async def send_chunk(chunk):
+            nonlocal completed_chunks
+            try:
+                responses = await self._auth._make_api_request_async(
+                    method="POST",
+                    endpoint="/",
+                    data={"batch": json.dumps([operation for _, operation in chunk])}
+                )
+                if not isinstance(responses, list) or len(responses) != len(chunk):
+                    raise PublishError(
+                        "Invalid batch response: expected one result per operation",
+                        platform="facebook"
+                    )
+                for (index, _), response in zip(chunk, responses):
+                    results[index] = self._parse_batch_response(posts[index], response)
+            except Exception as e:
+                logger.error(f"Facebook batch request failed: {e}")
+                for index, _ in chunk:
+                    results[index] = self._batch_failure(posts[index], e)
+            
+            completed_chunks += 1
+            if progress_callback:
+                progress_callback(PublishProgress(
+                    step="Publishing batch to Facebook",
+                    current_step=completed_chunks,
+                    total_steps=len(chunks),
+                    message=f"Batch {completed_chunks}/{len(chunks)} sent ({len(chunk)} posts)",
+                    status="completed" if completed_chunks == len(chunks) else "in_progress"
+                ))
+        
+        await asyncio.gather(*(send_chunk(chunk) for chunk in chunks))
+        
+        succeeded = sum(1 for result in results if result.success)
+        logger.info(f"Facebook batch publish finished: {succeeded}/{len(posts)} posts published "
+                    f"in {len(chunks)} requests")
+        return results
+    
+    def _build_batch_operation(self, post: FacebookBatchPost, content: str) -> Dict[str, Any]:
+        """
+        Build a Graph API batch operation for a post.
+        
+        Args:
+            post: Post to publish
+            content: Post content with template variables substituted
+            
+        Returns:
+            Batch operation dictionary
+        """
+        page_id = post.page_id or self.config.credentials["page_id"]
+        body = self._format_post_data(content, post.metadata)
+        if post.access_token:
+            body["access_token"] = post.access_token
+        
+        return {
+            "method": "POST",
+            "relative_url": f"{page_id}/feed",
+            "body": urlencode(body)
+        }
+    
+    def _parse_batch_response(self, post: FacebookBatchPost,
+                              response: Optional[Dict[str, Any]]) -> PublishResult:
+        """
+        Convert one batch operation response into a PublishResult.
+        
+        Args:
+            post: Post the operation belongs to
+            response: Batch response entry; None if the operation did not run
+            
+        Returns:
+            PublishResult for the post
+        """
+        if response is None:
+            return self._batch_failure(post, NetworkError(
+                "Batch operation did not complete",
+                platform="facebook"
+            ))
+        
+        try:
+            body = json.loads(response.get("body") or "{}")
+        except (TypeError, ValueError):
+            body = {}
+        
+        status_code = response.get("code", 0)
+        if status_code >= 400:
+            error_info = body.get("error", {}) if isinstance(body, dict) else {}
+            return self._batch_failure(post, NetworkError(
+                f"API error: {error_info.get('message', 'Unknown API error')} "
+                f"({error_info.get('type', 'Unknown')})",
+                platform="facebook",
+                status_code=status_code
+            ))
+        
+        try:
+            post_id = self._extract_post_id(body)
+        except PublishError as e:
+            return self._batch_failure(post, e)
+        
+        result_metadata = dict(post.metadata)
+        result_metadata["task_id"] = post.task_id
+        
+        return PublishResult(
+            platform="facebook",
+            post_id=post_id,
+            success=True,
+            post_url=self._build_post_url(post_id, post.page_id),
+            metadata=result_metadata
+        )
+    
+    def _batch_failure(self, post: FacebookBatchPost, error: Exception) -> PublishResult:
+        """Build a failed PublishResult for a batched post."""
+        result_metadata = dict(post.metadata)
+        result_metadata["task_id"] = post.task_id
+        
+        return PublishResult(
+            platform="facebook",
+            post_id="",
+            success=False,
+            metadata=result_metadata,
+            error=str(error)
+        )
+    
     def _format_post_data(self, content: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
         """
         Format post data for Facebook API.
@@ -345,22 +529,24 @@ class FacebookPublisher(BasePublisher):
             platform="facebook"
         )
     
-    def _build_post_url(self, post_id: str) -> str:
+    def _build_post_url(self, post_id: str, page_id: Optional[str] = None) -> str:
         """
         Build Facebook post URL.
         
         Args:
             post_id: Post ID
+            page_id: Page the post belongs to (defaults to the configured page)
             
         Returns:
             Complete post URL
         """
-        page_id = self.config.credentials["page_id"]
+        page_id = page_id or self.config.credentials["page_id"]
         return f"https://facebook.com/{page_id}/posts/{post_id}"
     
     async def cleanup(self) -> None:
         """Clean up resources."""
-        # No specific cleanup needed for Facebook publisher
+        if self._auth is not None:
+            await self._auth.close()
         logger.debug("FacebookPublisher cleanup completed")
     
     def health_check(self) -> bool:
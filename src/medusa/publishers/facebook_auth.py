@@ -6,8 +6,11 @@ for Facebook Graph API, including token validation, permission
 verification, and page access management.
 """
 
+import asyncio
 import json
 import logging
+import threading
+import aiohttp
 import requests
 from datetime import datetime
 from typing import Dict, List, Optional, Any
@@ -19,6 +22,7 @@ from medusa.exceptions import (
     NetworkError,
     ValidationError
 )
+from medusa.utils.http_client import PooledHTTPClient
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +41,15 @@ class FacebookAuth:
     # Optional permissions that enhance functionality
     OPTIONAL_PERMISSIONS = ["pages_read_engagement", "publish_pages"]
     
+    # Request timeout in seconds for Graph API calls
+    REQUEST_TIMEOUT = 30
+    
+    # Keep-alive connections to graph.facebook.com shared by all instances
+    MAX_CONNECTIONS_PER_HOST = 10
+    
+    _shared_http_client: Optional[PooledHTTPClient] = None
+    _shared_http_client_lock = threading.Lock()
+    
     def __init__(self, config: Dict[str, Any]) -> None:
         """
         Initialize FacebookAuth with configuration.
@@ -44,7 +57,7 @@ class FacebookAuth:
         Args:
             config: Dictionary containing Facebook API configuration
                    Required keys: page_id, access_token, app_id, app_secret
-                   Optional keys: api_version
+                   Optional keys: api_version, max_connections_per_host
         
         Raises:
             ConfigurationError: If required configuration is missing
@@ -58,6 +71,15 @@ class FacebookAuth:
         self.app_secret = config["app_secret"]
         self.api_version = config.get("api_version", "v19.0")
         
+        # Instances with a custom pool size get their own client
+        if "max_connections_per_host" in config:
+            self._http_client: Optional[PooledHTTPClient] = PooledHTTPClient(
+                limit_per_host=config["max_connections_per_host"],
+                timeout=self.REQUEST_TIMEOUT
+            )
+        else:
+            self._http_client = None
+        
         # Base URL for Facebook Graph API
         self.base_url = f"https://graph.facebook.com/{self.api_version}"
         
@@ -94,6 +116,14 @@ class FacebookAuth:
                 )
         
         # Validate optional fields
+        if "max_connections_per_host" in config:
+            limit = config["max_connections_per_host"]
+            if not isinstance(limit, int) or isinstance(limit, bool) or limit <= 0:
+                raise ValidationError(
+                    f"Invalid max_connections_per_host: {limit}. Expected positive integer",
+                    platform="facebook"
+                )
+        
         if "api_version" in config:
             api_version = config["api_version"]
             if not isinstance(api_version, str) or not api_version.startswith("v"):
@@ -150,9 +180,9 @@ class FacebookAuth:
         
         try:
             if method.upper() == "GET":
-                response = requests.get(url, timeout=30)
+                response = requests.get(url, timeout=self.REQUEST_TIMEOUT)
             elif method.upper() == "POST":
-                response = requests.post(url, json=data, timeout=30)
+                response = requests.post(url, json=data, timeout=self.REQUEST_TIMEOUT)
             else:
                 raise NetworkError(
                     f"Unsupported HTTP method: {method}",
@@ -178,17 +208,7 @@ class FacebookAuth:
                 )
             
             # Check for API errors
-            if response.status_code >= 400:
-                error_info = response_data.get("error", {})
-                error_message = error_info.get("message", "Unknown API error")
-                error_type = error_info.get("type", "Unknown")
-                
-                raise NetworkError(
-                    f"API error during {method} {endpoint}: {error_message} ({error_type})",
-                    platform="facebook",
-                    status_code=response.status_code,
-                    endpoint=endpoint
-                )
+            self._check_api_error(method, endpoint, response.status_code, response_data)
             
             return response_data
             
@@ -198,6 +218,127 @@ class FacebookAuth:
                 platform="facebook"
             )
     
+    @classmethod
+    def _get_shared_http_client(cls) -> PooledHTTPClient:
+        """Get the pooled HTTP client shared by all FacebookAuth instances."""
+        with cls._shared_http_client_lock:
+            if cls._shared_http_client is None:
+                cls._shared_http_client = PooledHTTPClient(
+                    limit_per_host=cls.MAX_CONNECTIONS_PER_HOST,
+                    timeout=cls.REQUEST_TIMEOUT
+                )
+            return cls._shared_http_client
+    
+    @property
+    def http_client(self) -> PooledHTTPClient:
+        """Pooled HTTP client used for async Graph API requests."""
+        return self._http_client or self._get_shared_http_client()
+    
+    def _check_api_error(self, method: str, endpoint: str,
+                         status_code: int, response_data: Any) -> None:
+        """
+        Raise NetworkError for an error response from the Graph API.
+        
+        Args:
+            method: HTTP method of the request
+            endpoint: API endpoint of the request
+            status_code: HTTP status code of the response
+            response_data: Decoded JSON response body
+            
+        Raises:
+            NetworkError: If the response is an error
+        """
+        if status_code < 400:
+            return
+        
+        error_info = response_data.get("error", {}) if isinstance(response_data, dict) else {}
+        error_message = error_info.get("message", "Unknown API error")
+        
+        if status_code == 429:
+            raise NetworkError(
+                f"Rate limit exceeded: {error_message}",
+                platform="facebook",
+                status_code=429
+            )
+        
+        error_type = error_info.get("type", "Unknown")
+        raise NetworkError(
+            f"API error during {method} {endpoint}: {error_message} ({error_type})",
+            platform="facebook",
+            status_code=status_code,
+            endpoint=endpoint
+        )
+    
+    async def _make_api_request_async(self, method: str, endpoint: str,
+                                      params: Optional[Dict[str, Any]] = None,
+                                      data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Make authenticated request to Facebook Graph API without blocking the event loop.
+        
+        Requests go through a pooled keep-alive connection, so consecutive
+        calls reuse the TCP and TLS session to graph.facebook.com.
+        
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            endpoint: API endpoint
+            params: Query parameters
+            data: Request body data
+            
+        Returns:
+            API response as dictionary
+            
+        Raises:
+            NetworkError: If API request fails
+        """
+        if method.upper() not in ("GET", "POST"):
+            raise NetworkError(
+                f"Unsupported HTTP method: {method}",
+                platform="facebook"
+            )
+        
+        url = self._build_api_url(endpoint, params)
+        
+        try:
+            status_code, response_data = await self.http_client.request_json(
+                method.upper(),
+                url,
+                json_data=data if method.upper() == "POST" else None
+            )
+        except ValueError as e:
+            raise NetworkError(
+                f"Invalid JSON response from Facebook API: {e}",
+                platform="facebook"
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise NetworkError(
+                f"Network error during API request: {e}",
+                platform="facebook"
+            )
+        
+        self._check_api_error(method, endpoint, status_code, response_data)
+        return response_data
+    
+    async def close(self) -> None:
+        """Close the connection pool owned by this instance; the shared pool stays open."""
+        if self._http_client is not None:
+            await self._http_client.close()
+    
+    @classmethod
+    async def close_shared_http_client(cls) -> None:
+        """
+        Close the connection pool shared by all FacebookAuth instances.
+        
+        The pool is process-wide, so this is an application shutdown hook:
+        call it once no publisher or core uses Facebook any more. Sessions of
+        every event loop are closed; a later request opens a new shared pool.
+        """
+        with cls._shared_http_client_lock:
+            client = cls._shared_http_client
+            cls._shared_http_client = None
+        
+        if client is not None:
+            await client.close_all()
+    
     def validate_token(self) -> bool:
         """
         Validate the access token using Facebook's debug_token endpoint.
@@ -5,10 +5,13 @@ Contains base classes and platform-specific uploader implementations.
 
 from .base import BaseUploader, UploadProgress, UploadResult
 from .youtube import YouTubeUploader
+from .youtube_pool import YouTubeAccount, YouTubeCredentialPool
 
 __all__ = [
     'BaseUploader',
     'UploadProgress', 
     'UploadResult',
-    'YouTubeUploader'
+    'YouTubeUploader',
+    'YouTubeAccount',
+    'YouTubeCredentialPool'
 ] 
\ No newline at end of file
@@ -100,6 +100,9 @@ class BaseUploader(ABC):
         self.is_authenticated = False
         self.logger = logging.getLogger(f"medusa.uploader.{self.platform_name}")
         
+        # Task the current upload belongs to (used to key persisted upload state)
+        self.current_task_id: Optional[str] = None
+        
         # Configuration from config or defaults
         self.retry_attempts = getattr(self.config, 'retry_attempts', 3)
         self.timeout = getattr(self.config, 'timeout', None) or 30
@@ -157,7 +160,8 @@ class BaseUploader(ABC):
         self,
         file_path: str,
         metadata: MediaMetadata,
-        progress_callback: Optional[Callable[[UploadProgress], None]] = None
+        progress_callback: Optional[Callable[[UploadProgress], None]] = None,
+        task_id: Optional[str] = None
     ) -> UploadResult:
         """
         Upload media file with retry logic and error handling.
@@ -166,6 +170,7 @@ class BaseUploader(ABC):
             file_path: Path to the media file
             metadata: Media metadata
             progress_callback: Optional callback for progress updates
+            task_id: Optional ID of the task this upload belongs to
             
         Returns:
             UploadResult with upload information
@@ -185,6 +190,8 @@ class BaseUploader(ABC):
         # Validate metadata
         self._validate_metadata(metadata)
         
+        self.current_task_id = task_id
+        
         # Attempt upload with retry logic
         last_error = None
         for attempt in range(self.retry_attempts + 1):
@@ -3,22 +3,39 @@ YouTube video uploader implementation.
 Handles video uploads to YouTube with progress tracking and error handling.
 """
 
+import copy
 import os
 import logging
 import asyncio
 import random
 import time
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
 from typing import Optional, Callable, Dict, Any
 from datetime import datetime, timezone
 
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from googleapiclient.http import MediaFileUpload
+from googleapiclient.http import MediaFileUpload, build_http
+import google_auth_httplib2
 import socket
 
 from .base import BaseUploader, UploadProgress, UploadResult
-from .youtube_auth import YouTubeAuth
+from .youtube_auth import TokenRefresher, YouTubeAuth
 from ..models import MediaMetadata, PlatformConfig
+from ..utils.quota import (
+    QuotaLedger,
+    QuotaReservation,
+    YOUTUBE_DAILY_QUOTA,
+    get_quota_ledger,
+    next_quota_reset
+)
+from ..utils.upload_sessions import (
+    UploadSession,
+    UploadSessionStore,
+    UploadSessionStoreError,
+    compute_file_fingerprint
+)
 from ..exceptions import (
     UploadError,
     AuthenticationError,
@@ -37,6 +54,7 @@ class YouTubeUploader(BaseUploader):
     - OAuth authentication via YouTubeAuth
     - Progress tracking for large uploads
     - Resumable upload support
+    - Daily API quota accounting and admission
     - Comprehensive error handling
     - Metadata validation and conversion
     """
@@ -76,24 +94,301 @@ class YouTubeUploader(BaseUploader):
     # Maximum retry attempts for resumable uploads
     MAX_RESUMABLE_RETRIES = 10
     
-    def __init__(self, platform_name: str = "youtube", config: Optional[PlatformConfig] = None):
+    # Status codes returned for expired or unknown resumable upload sessions
+    SESSION_EXPIRED_STATUS_CODES = [404, 410]
+    
+    # Resumable upload chunk sizing (YouTube requires multiples of 256KB)
+    CHUNK_SIZE_MULTIPLE = 256 * 1024
+    DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024  # 8MB
+    MIN_CHUNK_SIZE = CHUNK_SIZE_MULTIPLE
+    MAX_CHUNK_SIZE = 256 * 1024 * 1024  # 256MB
+    
+    # Adaptive chunk sizing aims for chunks taking this long to transfer
+    TARGET_CHUNK_SECONDS = 10.0
+    
+    # Size of the thread pool shared by all uploaders for blocking chunk transfers
+    CHUNK_THREAD_POOL_SIZE = 8
+    
+    _shared_executor: Optional[ThreadPoolExecutor] = None
+    _shared_executor_lock = threading.Lock()
+    
+    def __init__(
+        self,
+        platform_name: str = "youtube",
+        config: Optional[PlatformConfig] = None,
+        executor: Optional[Executor] = None,
+        run_in_thread: bool = True,
+        session_store: Optional[UploadSessionStore] = None,
+        quota_ledger: Optional[QuotaLedger] = None,
+        quota_wait_timeout: Optional[float] = None,
+        token_refresher: Optional[TokenRefresher] = None
+    ):
         """
         Initialize YouTube uploader.
         
         Args:
             platform_name: Platform name (default: "youtube")
             config: Platform configuration
+            executor: Optional executor for blocking API calls
+                      (uses a shared thread pool if None)
+            run_in_thread: If True, blocking API calls (chunk transfers, thumbnail
+                           uploads) run in the executor instead of on the event loop
+            session_store: Optional store persisting resumable sessions for crash
+                           recovery (defaults to one in the "upload_sessions_dir"
+                           credentials entry, if configured)
+            quota_ledger: Optional ledger admitting uploads against the daily API
+                          quota (defaults to the shared ledger persisted in the
+                          "quota_ledger_file" credentials entry, if configured)
+            quota_wait_timeout: Maximum seconds an upload waits for quota before
+                                failing with RateLimitError (None waits until the
+                                quota resets)
+            token_refresher: Optional refresher renewing OAuth tokens in the
+                             background (uses the process-wide refresher if None)
         """
         super().__init__(platform_name, config)
         
         # Initialize YouTube authentication manager
-        self.auth_manager = YouTubeAuth(config)
+        self.auth_manager = YouTubeAuth(config, token_refresher=token_refresher)
         
         # YouTube API service instance
         self.service = None
         
+        # Execution mode for blocking API calls
+        self.executor = executor
+        self.run_in_thread = run_in_thread
+        
+        # Chunk sizing for resumable uploads
+        self.chunk_size = self._normalize_chunk_size(
+            getattr(self.config, 'chunk_size', None) or self.DEFAULT_CHUNK_SIZE
+        )
+        self.adaptive_chunk_size = getattr(self.config, 'adaptive_chunk_size', False)
+        
+        # Durable resumable session storage
+        sessions_dir = (self.config.credentials or {}).get("upload_sessions_dir")
+        if session_store is None and sessions_dir:
+            session_store = UploadSessionStore(sessions_dir)
+        self.session_store = session_store
+        
+        # Daily API quota accounting, shared by uploaders using the same ledger file
+        ledger_file = (self.config.credentials or {}).get("quota_ledger_file")
+        if quota_ledger is None and ledger_file:
+            daily_quota = (self.config.credentials or {}).get("daily_quota") or YOUTUBE_DAILY_QUOTA
+            quota_ledger = get_quota_ledger(ledger_file, daily_limit=daily_quota)
+        self.quota_ledger = quota_ledger
+        self.quota_wait_timeout = quota_wait_timeout
+        
         self.logger = logging.getLogger(f"medusa.uploader.{self.platform_name}")
     
+    @classmethod
+    def _get_shared_executor(cls) -> ThreadPoolExecutor:
+        """
+        Get the thread pool shared by all YouTube uploaders.
+        
+        Returns:
+            Shared ThreadPoolExecutor (created on first use)
+        """
+        with cls._shared_executor_lock:
+            if YouTubeUploader._shared_executor is None:
+                YouTubeUploader._shared_executor = ThreadPoolExecutor(
+                    max_workers=cls.CHUNK_THREAD_POOL_SIZE,
+                    thread_name_prefix="medusa-youtube-upload"
+                )
+            return YouTubeUploader._shared_executor
+    
+    async def _run_blocking(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a blocking API call according to the configured execution mode.
+        
+        Args:
+            func: Blocking callable
+            *args: Positional arguments for the callable
+            
+        Returns:
+            Result of the callable
+        """
+        if not self.run_in_thread:
+            return func(*args)
+        
+        executor = self.executor or self._get_shared_executor()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, func, *args)
+    
+    def clone(self) -> "YouTubeUploader":
+        """
+        Create an uploader sharing this one's authentication and resources.
+        
+        The clone shares the auth manager, API service, executor, session store
+        and quota ledger but tracks its own current task, so several uploads
+        for the same account can run concurrently.
+        
+        Returns:
+            New YouTubeUploader instance
+        """
+        uploader = copy.copy(self)
+        uploader.current_task_id = None
+        return uploader
+    
+    def _normalize_chunk_size(self, chunk_size: float) -> int:
+        """
+        Round a chunk size down to a valid resumable upload chunk size.
+        
+        Args:
+            chunk_size: Requested chunk size in bytes
+            
+        Returns:
+            Chunk size that is a multiple of CHUNK_SIZE_MULTIPLE within the allowed range
+        """
+        chunk_size = int(chunk_size) // self.CHUNK_SIZE_MULTIPLE * self.CHUNK_SIZE_MULTIPLE
+        return max(self.MIN_CHUNK_SIZE, min(self.MAX_CHUNK_SIZE, chunk_size))
+    
+    def _adapt_chunk_size(self, current_size: int, bytes_sent: int, elapsed: float) -> int:
+        """
+        Compute the next chunk size from the throughput of the last chunk.
+        
+        The size moves towards TARGET_CHUNK_SECONDS worth of data, but at most
+        halves or doubles per chunk to avoid oscillating on noisy links.
+        
+        Args:
+            current_size: Current chunk size in bytes
+            bytes_sent: Bytes confirmed by the last chunk
+            elapsed: Seconds the last chunk took
+            
+        Returns:
+            Next chunk size in bytes
+        """
+        if bytes_sent <= 0 or elapsed <= 0:
+            return current_size
+        
+        target_size = (bytes_sent / elapsed) * self.TARGET_CHUNK_SECONDS
+        target_size = max(current_size / 2, min(current_size * 2, target_size))
+        return self._normalize_chunk_size(target_size)
+    
+    async def _prepare_upload_session(
+        self,
+        insert_request,
+        file_path: str,
+        file_size: int
+    ) -> Optional[UploadSession]:
+        """
+        Load or create the persisted session for an upload.
+        
+        If a session for the same task and file content exists, the insert
+        request is pointed at its session URI and put in the error state, so
+        the first next_chunk() queries YouTube for the confirmed offset and
+        continues from there instead of from byte zero. Hashing the file and
+        reading the session store run like the other blocking calls.
+        
+        Args:
+            insert_request: YouTube API insert request
+            file_path: Path to the video file
+            file_size: Total file size in bytes
+            
+        Returns:
+            UploadSession to checkpoint, or None if persistence is disabled
+            or the upload does not belong to a task
+        """
+        # Sessions are keyed by task; without one, unrelated uploads of the
+        # same file would resume each other's session
+        if self.session_store is None or not self.current_task_id:
+            return None
+        
+        try:
+            fingerprint = await self._run_blocking(compute_file_fingerprint, file_path)
+        except UploadSessionStoreError as e:
+            self.logger.warning(f"Upload session persistence disabled for this upload: {e}")
+            return None
+        
+        task_id = self.current_task_id
+        session = await self._run_blocking(self.session_store.get_session, task_id, fingerprint)
+        
+        # googleapiclient has no public API for resuming a session URI from an
+        # earlier process. Its HttpRequest sends the "bytes */size" status
+        # query that reports the confirmed offset only while _in_error_state is
+        # set (the state it enters after a failed chunk), so resuming relies on
+        # that attribute and starts over if a future release drops it.
+        can_resume = hasattr(insert_request, "_in_error_state")
+        if not can_resume:
+            self.logger.warning(
+                "Installed googleapiclient does not support resuming persisted sessions"
+            )
+        
+        if (can_resume and session is not None and session.session_uri
+                and session.total_bytes == file_size):
+            insert_request.resumable_uri = session.session_uri
+            insert_request.resumable_progress = session.confirmed_bytes
+            insert_request._in_error_state = True
+            self.logger.info(
+                f"Resuming YouTube upload from {session.confirmed_bytes}/{file_size} bytes"
+            )
+            return session
+        
+        return UploadSession(
+            task_id=task_id,
+            fingerprint=fingerprint,
+            file_path=file_path,
+            session_uri="",
+            total_bytes=file_size,
+            platform=self.platform_name
+        )
+    
+    async def _checkpoint_upload_session(
+        self,
+        insert_request,
+        session: Optional[UploadSession],
+        confirmed_bytes: int
+    ) -> None:
+        """
+        Persist the session URI and confirmed offset after a chunk.
+        
+        Args:
+            insert_request: YouTube API insert request
+            session: Session to update (no-op if None)
+            confirmed_bytes: Byte offset confirmed by YouTube
+        """
+        if session is None or self.session_store is None:
+            return
+        
+        session_uri = getattr(insert_request, "resumable_uri", None)
+        if not isinstance(session_uri, str) or not session_uri:
+            return
+        
+        session.session_uri = session_uri
+        session.confirmed_bytes = confirmed_bytes
+        try:
+            await self._run_blocking(self.session_store.save_session, session)
+        except UploadSessionStoreError as e:
+            self.logger.warning(f"Failed to checkpoint upload session: {e}")
+    
+    async def _discard_upload_session(self, session: Optional[UploadSession]) -> None:
+        """
+        Remove a persisted session once it can no longer be resumed.
+        
+        Args:
+            session: Session to remove (no-op if None)
+        """
+        if session is None or self.session_store is None:
+            return
+        
+        await self._run_blocking(self.session_store.delete_session, session.task_id, session.fingerprint)
+        session.session_uri = ""
+        session.confirmed_bytes = 0
+    
+    def _build_upload_http(self):
+        """
+        Build a dedicated authorized HTTP object for a single upload.
+        
+        httplib2 connections are not thread-safe, so each upload running in
+        the thread pool gets its own connection instead of sharing the
+        service-level one. _upload_media closes it when the upload ends.
+        
+        Returns:
+            AuthorizedHttp instance, or None if no credentials are available
+        """
+        credentials = self.auth_manager.credentials
+        if credentials is None:
+            return None
+        return google_auth_httplib2.AuthorizedHttp(credentials, http=build_http())
+    
     async def authenticate(self) -> bool:
         """
         Authenticate with YouTube API.
@@ -330,13 +625,21 @@ class YouTubeUploader(BaseUploader):
         """
         return f"https://www.youtube.com/watch?v={video_id}"
     
-    async def upload_thumbnail(self, video_id: str, thumbnail_path: str) -> bool:
+    async def upload_thumbnail(
+        self,
+        video_id: str,
+        thumbnail_path: str,
+        reservation: Optional[QuotaReservation] = None
+    ) -> bool:
         """
         Upload custom thumbnail for a YouTube video.
         
         Args:
             video_id: YouTube video ID
             thumbnail_path: Path to thumbnail image file
+            reservation: Optional quota reservation already covering the call;
+                         the caller keeps ownership and releases it. Without
+                         one, the call reserves and releases its own units.
             
         Returns:
             True if thumbnail upload succeeded
@@ -344,10 +647,14 @@ class YouTubeUploader(BaseUploader):
         Raises:
             ValidationError: If thumbnail file is invalid
             UploadError: If thumbnail upload fails
+            RateLimitError: If the daily quota does not allow the call
         """
         # Validate thumbnail file
         self._validate_thumbnail_file(thumbnail_path)
         
+        owns_reservation = reservation is None
+        if owns_reservation:
+            reservation = await self._reserve_quota("thumbnails.set")
         try:
             # Create media upload for thumbnail
             media = MediaFileUpload(
@@ -356,10 +663,14 @@ class YouTubeUploader(BaseUploader):
             )
             
             # Upload thumbnail
-            self.service.thumbnails().set(
+            thumbnail_request = self.service.thumbnails().set(
                 videoId=video_id,
                 media_body=media
-            ).execute()
+            )
+            try:
+                await self._run_blocking(thumbnail_request.execute)
+            finally:
+                await self._record_quota("thumbnails.set", reservation)
             
             self.logger.info(f"Thumbnail uploaded successfully for video: {video_id}")
             return True
@@ -375,6 +686,71 @@ class YouTubeUploader(BaseUploader):
                 platform=self.platform_name,
                 original_error=e
             )
+        
+        finally:
+            if owns_reservation:
+                self._release_quota(reservation)
+    
+    async def _reserve_quota(self, *methods: str) -> Optional[QuotaReservation]:
+        """
+        Wait until the daily quota admits a set of API calls and reserve their cost.
+        
+        Args:
+            methods: API methods the operation will call
+            
+        Returns:
+            QuotaReservation, or None if quota accounting is disabled
+            
+        Raises:
+            RateLimitError: If the quota did not allow the calls within
+                            quota_wait_timeout
+        """
+        if self.quota_ledger is None:
+            return None
+        
+        units = sum(self.quota_ledger.cost_of(method) for method in methods)
+        return await self.quota_ledger.reserve(units, timeout=self.quota_wait_timeout)
+    
+    async def _record_quota(self, method: str, reservation: Optional[QuotaReservation]) -> None:
+        """
+        Charge an API call to the daily quota.
+        
+        The ledger writes its file with an fsync, so the charge runs like the
+        other blocking calls.
+        
+        Args:
+            method: API method that was called
+            reservation: Optional reservation the call was admitted under
+        """
+        if self.quota_ledger is not None:
+            await self._run_blocking(self.quota_ledger.record, method, reservation)
+    
+    def _release_quota(self, reservation: Optional[QuotaReservation]) -> None:
+        """
+        Return the unused part of a quota reservation.
+        
+        Args:
+            reservation: Reservation to release (no-op if None)
+        """
+        if self.quota_ledger is not None and reservation is not None:
+            self.quota_ledger.release(reservation)
+    
+    def get_quota_status(self) -> Dict[str, Any]:
+        """
+        Get daily API quota accounting information.
+        
+        Returns:
+            Dictionary with quota tracking status, and when enabled the quota
+            day, limit, used, reserved and remaining units, reset time and
+            per-method call counts
+        """
+        status: Dict[str, Any] = {
+            "platform": self.platform_name,
+            "enabled": self.quota_ledger is not None
+        }
+        if self.quota_ledger is not None:
+            status.update(self.quota_ledger.get_status())
+        return status
     
     def _validate_thumbnail_file(self, thumbnail_path: str) -> None:
         """
@@ -536,12 +912,19 @@ class YouTubeUploader(BaseUploader):
         # Convert metadata to YouTube format
         youtube_metadata = self._convert_metadata_to_youtube_format(metadata)
         
+        # Admit the upload only while the daily quota covers its API calls
+        quota_methods = ["videos.insert"]
+        if metadata.thumbnail_path:
+            quota_methods.append("thumbnails.set")
+        reservation = await self._reserve_quota(*quota_methods)
+        upload_http = None
+        
         try:
             # Create media upload object
             file_size = os.path.getsize(file_path)
             media = MediaFileUpload(
                 file_path,
-                chunksize=-1,  # Upload entire file at once for better performance
+                chunksize=self.chunk_size,
                 resumable=True
             )
             
@@ -552,14 +935,32 @@ class YouTubeUploader(BaseUploader):
                 media_body=media
             )
             
+            # Give the upload its own connection when chunks run in worker threads
+            if self.run_in_thread:
+                upload_http = self._build_upload_http()
+                if upload_http is not None:
+                    insert_request.http = upload_http
+            
+            # Resume a persisted session for this task and file, if any
+            session = await self._prepare_upload_session(insert_request, file_path, file_size)
+            
             self.logger.info(f"Starting YouTube upload for file: {file_path}")
             
+            # A resumed session was already charged when it was created
+            resumed = session is not None and bool(session.session_uri)
+            
             # Perform resumable upload
-            response = await self._perform_resumable_upload(
-                insert_request,
-                progress_callback,
-                file_size
-            )
+            try:
+                response = await self._perform_resumable_upload(
+                    insert_request,
+                    progress_callback,
+                    file_size,
+                    media=media,
+                    session=session
+                )
+            finally:
+                if not resumed:
+                    await self._record_quota("videos.insert", reservation)
             
             # Extract video information from response
             video_id = response["id"]
@@ -567,11 +968,13 @@ class YouTubeUploader(BaseUploader):
             
             self.logger.info(f"YouTube upload successful. Video ID: {video_id}")
             
-            # Upload thumbnail if provided
+            # Upload thumbnail if provided, under the units reserved with the upload
             thumbnail_uploaded = False
             if metadata.thumbnail_path:
                 try:
-                    thumbnail_uploaded = await self.upload_thumbnail(video_id, metadata.thumbnail_path)
+                    thumbnail_uploaded = await self.upload_thumbnail(
+                        video_id, metadata.thumbnail_path, reservation=reservation
+                    )
                     self.logger.info(f"Thumbnail uploaded for video: {video_id}")
                 except Exception as e:
                     self.logger.warning(f"Thumbnail upload failed (continuing with video upload): {e}")
@@ -615,20 +1018,33 @@ class YouTubeUploader(BaseUploader):
                 platform=self.platform_name,
                 original_error=e
             )
+        
+        finally:
+            self._release_quota(reservation)
+            # The dedicated connection is not reused once the upload ends
+            if upload_http is not None:
+                upload_http.close()
     
     async def _perform_resumable_upload(
         self,
         insert_request,
         progress_callback: Optional[Callable[[UploadProgress], None]],
-        file_size: int
+        file_size: int,
+        media: Optional[MediaFileUpload] = None,
+        session: Optional[UploadSession] = None
     ) -> Dict[str, Any]:
         """
         Perform resumable upload with retry logic.
         
+        Progress is reported after every chunk with the byte offset confirmed
+        by YouTube, so a retry resumes from the last confirmed chunk.
+        
         Args:
             insert_request: YouTube API insert request
             progress_callback: Optional progress callback
             file_size: Total file size in bytes
+            media: Optional media upload to resize when adaptive chunking is enabled
+            session: Optional persisted session checkpointed after every chunk
             
         Returns:
             YouTube API response
@@ -639,24 +1055,41 @@ class YouTubeUploader(BaseUploader):
         response = None
         error = None
         retry = 0
+        confirmed_bytes = 0
         
         while response is None:
             try:
                 self.logger.debug("Uploading chunk...")
-                status, response = insert_request.next_chunk()
+                chunk_started = time.monotonic()
+                status, response = await self._run_blocking(insert_request.next_chunk)
                 
-                # Report progress if callback provided
-                if progress_callback and status:
-                    progress = UploadProgress(
-                        bytes_uploaded=int(status.resumable_progress * file_size),
-                        total_bytes=file_size,
-                        status="uploading"
-                    )
-                    progress_callback(progress)
+                if status:
+                    # resumable_progress is the byte offset confirmed by YouTube
+                    bytes_uploaded = min(int(status.resumable_progress), file_size)
+                    
+                    if self.adaptive_chunk_size and media is not None:
+                        # MediaFileUpload has no public setter; next_chunk reads _chunksize
+                        media._chunksize = self._adapt_chunk_size(
+                            media._chunksize,
+                            bytes_uploaded - confirmed_bytes,
+                            time.monotonic() - chunk_started
+                        )
+                    confirmed_bytes = bytes_uploaded
+                    await self._checkpoint_upload_session(insert_request, session, bytes_uploaded)
+                    
+                    # Report progress if callback provided
+                    if progress_callback:
+                        progress = UploadProgress(
+                            bytes_uploaded=bytes_uploaded,
+                            total_bytes=file_size,
+                            status="uploading"
+                        )
+                        progress_callback(progress)
                 
                 if response is not None:
                     if 'id' in response:
                         self.logger.info(f"Video upload completed. ID: {response['id']}")
+                        await self._discard_upload_session(session)
                         
                         # Final progress update
                         if progress_callback:
@@ -675,15 +1108,28 @@ class YouTubeUploader(BaseUploader):
                         )
                         
             except HttpError as e:
-                if e.resp.status in self.RETRYABLE_STATUS_CODES:
+                if (e.resp.status in self.SESSION_EXPIRED_STATUS_CODES
+                        and session is not None and session.session_uri):
+                    # Session expired on YouTube's side - restart from byte zero
+                    self.logger.warning(f"Resumable session expired ({e.resp.status}), restarting upload")
+                    await self._discard_upload_session(session)
+                    insert_request.resumable_uri = None
+                    insert_request.resumable_progress = 0
+                    insert_request._in_error_state = False
+                    confirmed_bytes = 0
+                    continue
+                elif e.resp.status in self.RETRYABLE_STATUS_CODES:
                     error = f"Retriable HTTP error {e.resp.status}: {e.content}"
                 else:
+                    # The upload failed for good; its session cannot be resumed
+                    await self._discard_upload_session(session)
                     raise self._handle_http_error(e)
                     
             except Exception as e:
                 if self._is_retryable_error(e):
                     error = f"Retriable error: {e}"
                 else:
+                    await self._discard_upload_session(session)
                     raise UploadError(
                         f"YouTube upload failed: {e}",
                         platform=self.platform_name,
@@ -693,6 +1139,7 @@ class YouTubeUploader(BaseUploader):
             if error is not None:
                 retry += 1
                 if retry > self.MAX_RESUMABLE_RETRIES:
+                    await self._discard_upload_session(session)
                     raise UploadError(
                         f"YouTube upload failed after {self.MAX_RESUMABLE_RETRIES} retries: {error}",
                         platform=self.platform_name
@@ -738,9 +1185,17 @@ class YouTubeUploader(BaseUploader):
         # Handle specific error types
         if status_code == 403:
             if "quota" in error_message.lower():
+                if self.quota_ledger is not None:
+                    self.quota_ledger.mark_exhausted()
+                    retry_after = self.quota_ledger.seconds_until_reset()
+                else:
+                    now = datetime.now(timezone.utc)
+                    retry_after = (next_quota_reset(now) - now).total_seconds()
                 raise RateLimitError(
                     f"YouTube API quota exceeded: {error_message}",
                     platform=self.platform_name,
+                    retry_after=int(retry_after) + 1,
+                    quota_exceeded=True,
                     original_error=error
                 )
             else:
@@ -5,8 +5,12 @@ Handles OAuth flow, token refresh, and credential validation for YouTube API.
 
 import json
 import logging
+import threading
+import weakref
+from concurrent.futures import Executor, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Hashable
 
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
@@ -14,6 +18,7 @@ from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 
 from ..models import PlatformConfig
+from ..utils.expiry import ExpiryJob, get_expiry_scheduler
 from ..exceptions import (
     AuthenticationError,
     ConfigError,
@@ -39,12 +44,19 @@ class YouTubeAuth:
         'https://www.googleapis.com/auth/youtube'
     ]
     
-    def __init__(self, config: Optional[PlatformConfig] = None):
+    def __init__(
+        self,
+        config: Optional[PlatformConfig] = None,
+        token_refresher: Optional["TokenRefresher"] = None
+    ):
         """
         Initialize YouTube authentication manager.
         
         Args:
             config: Platform configuration with credential file paths
+            token_refresher: Optional refresher sharing credentials and renewing
+                             tokens in the background (uses the process-wide
+                             refresher if None)
         """
         self.platform_name = "youtube"
         self.config = config or PlatformConfig(platform_name=self.platform_name)
@@ -58,6 +70,9 @@ class YouTubeAuth:
         # Authentication state
         self.credentials: Optional[Credentials] = None
         self.is_authenticated = False
+        
+        # Credentials shared with other instances and refreshed ahead of expiry
+        self.token_refresher = token_refresher or get_token_refresher()
     
     def validate_files(self) -> None:
         """
@@ -316,28 +331,32 @@ class YouTubeAuth:
             ConfigError: If configuration is invalid
         """
         try:
+            # Reuse credentials another instance already authenticated and keeps fresh
+            shared_credentials = self.token_refresher.get_credentials(self.credentials_file)
+            if shared_credentials is not None:
+                self.credentials = shared_credentials
+                self._authenticated("Authentication successful with shared credentials")
+                return True
+            
             # Try to load existing credentials
             if self.load_existing_credentials():
                 # Validate existing credentials
                 if self.validate_credentials():
-                    self.is_authenticated = True
-                    self.logger.info("Authentication successful with existing credentials")
+                    self._authenticated("Authentication successful with existing credentials")
                     return True
                 
                 # Try to refresh expired credentials
                 if self.refresh_token():
                     if self.validate_credentials():
                         self.save_credentials()
-                        self.is_authenticated = True
-                        self.logger.info("Authentication successful after token refresh")
+                        self._authenticated("Authentication successful after token refresh")
                         return True
             
             # If existing credentials don't work, start OAuth flow
             if self.start_oauth_flow():
                 if self.validate_credentials():
                     self.save_credentials()
-                    self.is_authenticated = True
-                    self.logger.info("Authentication successful with new OAuth flow")
+                    self._authenticated("Authentication successful with new OAuth flow")
                     return True
             
             # If we get here, authentication failed
@@ -355,6 +374,17 @@ class YouTubeAuth:
                     original_error=e
                 )
     
+    def _authenticated(self, message: str) -> None:
+        """
+        Mark authentication successful and hand the credentials to the refresher.
+        
+        Args:
+            message: Log message describing how authentication succeeded
+        """
+        self.is_authenticated = True
+        self.token_refresher.register(self)
+        self.logger.info(message)
+    
     def get_required_scopes(self) -> List[str]:
         """
         Get list of required OAuth scopes.
@@ -388,7 +418,8 @@ class YouTubeAuth:
             "has_credentials": self.credentials is not None,
             "token_expired": self.is_token_expired(),
             "platform": self.platform_name,
-            "scopes": self.SCOPES
+            "scopes": self.SCOPES,
+            "refresh_due": self.token_refresher.is_due(self.credentials)
         }
     
     async def cleanup(self) -> None:
@@ -398,4 +429,234 @@ class YouTubeAuth:
         Note: This doesn't reset authentication state to allow reuse.
         """
         self.logger.debug("YouTube auth cleanup completed")
-        # Don't reset authentication state - credentials can be reused 
\ No newline at end of file
+        # Don't reset authentication state - credentials can be reused
+
+
+class _SharedCredentials:
+    """Credentials shared by the YouTubeAuth instances of one credentials file."""
+    
+    __slots__ = ("credentials", "auths", "refreshing")
+    
+    def __init__(self, credentials: Credentials):
+        self.credentials = credentials
+        self.auths: "weakref.WeakSet[YouTubeAuth]" = weakref.WeakSet()
+        self.refreshing = False
+
+
+class TokenRefresher:
+    """
+    Background refresher for YouTube OAuth access tokens.
+    
+    YouTubeAuth instances register after authenticating. Instances using the
+    same credentials file share one Credentials object, and refreshes update
+    it in place, so every uploader built on it sees the new token on its next
+    request. A job on the shared expiry scheduler checks expiry every
+    interval. Tokens within the margin are refreshed and saved in a small
+    thread pool, so neither the event loop nor in-flight uploads wait for
+    the refresh round trip or the credentials file write.
+    
+    Instances are only weakly referenced: credentials whose YouTubeAuth
+    instances have all been garbage collected are dropped, and the job stops
+    once nothing is registered.
+    """
+    
+    # Refresh tokens this long before they expire
+    DEFAULT_MARGIN_SECONDS = 300
+    
+    # How often token expiry is checked
+    DEFAULT_INTERVAL_SECONDS = 60
+    
+    def __init__(
+        self,
+        margin_seconds: float = DEFAULT_MARGIN_SECONDS,
+        interval_seconds: float = DEFAULT_INTERVAL_SECONDS,
+        executor: Optional[Executor] = None
+    ):
+        """
+        Initialize token refresher.
+        
+        Args:
+            margin_seconds: Refresh tokens this many seconds before expiry
+            interval_seconds: Seconds between expiry checks
+            executor: Optional executor running refreshes (a two-thread pool
+                      is created on first use if None)
+            
+        Raises:
+            ValidationError: If margin_seconds is negative or interval_seconds
+                             is not positive
+        """
+        if margin_seconds < 0:
+            raise ValidationError("margin_seconds must be non-negative", field_name="margin_seconds")
+        if interval_seconds <= 0:
+            raise ValidationError("interval_seconds must be positive", field_name="interval_seconds")
+        
+        self.margin = timedelta(seconds=margin_seconds)
+        self.interval_seconds = interval_seconds
+        self.executor = executor
+        self.logger = logging.getLogger("medusa.auth.token_refresh")
+        
+        self._entries: Dict[Hashable, _SharedCredentials] = {}
+        self._lock = threading.Lock()
+        self._job: Optional[ExpiryJob] = None
+    
+    @staticmethod
+    def _key(credentials_file: Optional[str], auth: "YouTubeAuth") -> Hashable:
+        """Get the sharing key: the resolved credentials file, else the instance."""
+        if credentials_file:
+            return Path(credentials_file).resolve()
+        return ("instance", id(auth))
+    
+    def get_credentials(self, credentials_file: Optional[str]) -> Optional[Credentials]:
+        """
+        Get the shared credentials of a credentials file, if still valid.
+        
+        Args:
+            credentials_file: Credentials file path
+            
+        Returns:
+            Shared Credentials, or None if none are registered or they expired
+        """
+        if not credentials_file:
+            return None
+        
+        with self._lock:
+            entry = self._entries.get(Path(credentials_file).resolve())
+            if entry is None or not entry.auths or not entry.credentials.valid:
+                return None
+            return entry.credentials
+    
+    def register(self, auth: "YouTubeAuth") -> None:
+        """
+        Share an authenticated instance's credentials and keep them fresh.
+        
+        Credentials differing from the shared ones, e.g. from a new OAuth
+        flow, replace them for every registered instance.
+        
+        Args:
+            auth: Authenticated YouTubeAuth
+        """
+        if auth.credentials is None:
+            return
+        
+        key = self._key(auth.credentials_file, auth)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _SharedCredentials(auth.credentials)
+            elif entry.credentials is not auth.credentials:
+                entry.credentials = auth.credentials
+                for other in entry.auths:
+                    other.credentials = auth.credentials
+            entry.auths.add(auth)
+            
+            if self._job is None:
+                self._job = get_expiry_scheduler().schedule(
+                    self.interval_seconds,
+                    self.refresh_due,
+                    name="youtube-token-refresh"
+                )
+    
+    def unregister(self, auth: "YouTubeAuth") -> None:
+        """
+        Stop refreshing an instance's credentials.
+        
+        Args:
+            auth: Previously registered YouTubeAuth
+        """
+        with self._lock:
+            entry = self._entries.get(self._key(auth.credentials_file, auth))
+            if entry is not None:
+                entry.auths.discard(auth)
+    
+    def is_due(self, credentials: Optional[Credentials]) -> bool:
+        """
+        Check whether credentials should be refreshed now.
+        
+        Args:
+            credentials: Credentials to check
+            
+        Returns:
+            True if they can be refreshed and expire within the margin
+        """
+        expiry = getattr(credentials, "expiry", None)
+        if not isinstance(expiry, datetime) or not getattr(credentials, "refresh_token", None):
+            return False
+        
+        # google-auth stores expiry as naive UTC
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return expiry - self.margin <= now
+    
+    def refresh_due(self) -> Optional[bool]:
+        """
+        Hand credentials close to expiry to the executor for refreshing.
+        
+        Runs on the expiry scheduler thread.
+        
+        Returns:
+            False once nothing is registered, which stops the job
+        """
+        due = []
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if not entry.auths:
+                    del self._entries[key]
+                    continue
+                if not entry.refreshing and self.is_due(entry.credentials):
+                    entry.refreshing = True
+                    due.append(entry)
+            
+            if not self._entries:
+                self._job = None
+                return False
+            
+            if due and self.executor is None:
+                self.executor = ThreadPoolExecutor(
+                    max_workers=2,
+                    thread_name_prefix="medusa-token-refresh"
+                )
+        
+        for entry in due:
+            self.executor.submit(self._refresh, entry)
+        return None
+    
+    def _refresh(self, entry: _SharedCredentials) -> bool:
+        """
+        Refresh and save one set of shared credentials.
+        
+        Args:
+            entry: Shared credentials to refresh
+            
+        Returns:
+            True if the token was refreshed, False otherwise
+        """
+        try:
+            auth = next(iter(entry.auths), None)
+            if auth is None or not auth.refresh_token():
+                return False
+            if auth.credentials_file:
+                auth.save_credentials()
+            self.logger.debug(f"Refreshed access token ahead of expiry for {auth.credentials_file or 'in-memory credentials'}")
+            return True
+        except MedusaError as e:
+            self.logger.warning(f"Background token refresh failed: {e}")
+            return False
+        finally:
+            entry.refreshing = False
+
+
+_default_refresher: Optional[TokenRefresher] = None
+_default_refresher_lock = threading.Lock()
+
+
+def get_token_refresher() -> TokenRefresher:
+    """
+    Get the process-wide token refresher.
+    
+    Returns:
+        Shared TokenRefresher instance
+    """
+    global _default_refresher
+    with _default_refresher_lock:
+        if _default_refresher is None:
+            _default_refresher = TokenRefresher()
+        return _default_refresher
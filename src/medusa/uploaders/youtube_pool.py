@@ -0,0 +1,423 @@
+"""
+YouTube multi-account uploader implementation.
+Routes uploads across a pool of YouTube credentials and keeps their tokens fresh.
+"""
+
+import asyncio
+import hashlib
+import threading
+from concurrent.futures import Executor
+from dataclasses import replace
+from datetime import timezone
+from pathlib import Path
+from typing import Optional, Callable, Dict, Any, List, Sequence, Set
+
+from .base import BaseUploader, UploadProgress, UploadResult
+from .youtube import YouTubeUploader
+from .youtube_auth import TokenRefresher, get_token_refresher
+from ..models import MediaMetadata, PlatformConfig
+from ..utils.quota import QuotaLedger, YOUTUBE_DAILY_QUOTA, get_quota_ledger
+from ..exceptions import (
+    AuthenticationError,
+    ConfigError,
+    RateLimitError
+)
+
+
+class YouTubeAccount:
+    """
+    One YouTube identity in a YouTubeCredentialPool.
+    
+    Wraps the account's YouTubeUploader, which owns its YouTubeAuth, API
+    service and quota ledger, and counts the uploads routed to it.
+    """
+    
+    def __init__(self, name: str, uploader: YouTubeUploader):
+        """
+        Initialize YouTube account.
+        
+        Args:
+            name: Account name used in logs, results and status reports
+            uploader: Uploader authenticated as this account
+        """
+        self.name = name
+        self.uploader = uploader
+        self.active_uploads = 0
+    
+    @property
+    def quota_ledger(self) -> QuotaLedger:
+        """Ledger of the Cloud project this account uploads through."""
+        return self.uploader.quota_ledger
+    
+    @property
+    def is_authenticated(self) -> bool:
+        """Whether the account can accept uploads."""
+        return self.uploader.is_authenticated
+    
+    def quota_cost(self, methods: Sequence[str]) -> int:
+        """
+        Get the quota units a set of API calls would charge.
+        
+        Args:
+            methods: API methods, e.g. ["videos.insert", "thumbnails.set"]
+        
+        Returns:
+            Total units
+        """
+        return sum(self.quota_ledger.cost_of(method) for method in methods)
+    
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Get account status information.
+        
+        Returns:
+            Dictionary with authentication, load, token expiry and quota details
+        """
+        credentials = self.uploader.auth_manager.credentials
+        expiry = getattr(credentials, "expiry", None)
+        return {
+            "name": self.name,
+            "authenticated": self.is_authenticated,
+            "active_uploads": self.active_uploads,
+            "token_expiry": expiry.replace(tzinfo=timezone.utc).isoformat() if expiry else None,
+            "quota_remaining": self.quota_ledger.remaining
+        }
+
+
+class YouTubeCredentialPool(BaseUploader):
+    """
+    YouTube uploader spreading uploads across several OAuth identities.
+    
+    Each account is configured like a single YouTubeUploader; entries of the
+    "accounts" credentials list override the shared settings (typically
+    credentials_file, and client_secrets_file or quota_ledger_file when the
+    accounts belong to different Cloud projects). API quota is charged per
+    Cloud project, so accounts share one ledger per client_secrets_file. The
+    ledger is persisted in the quota_ledger_file when only one project uses
+    it, and otherwise in a per-project file derived from quota_ledger_file or
+    upload_sessions_dir; without either setting it is kept in memory.
+    
+    Every upload is routed to the authenticated account with the fewest
+    uploads in flight among those whose quota covers it, so a channel network
+    uploads in parallel until every project's daily quota is spent. Account
+    tokens are kept fresh by a TokenRefresher, so uploads do not pay for the
+    refresh.
+    
+    The pool is a drop-in BaseUploader and can be registered for "youtube"
+    in place of YouTubeUploader.
+    """
+    
+    def __init__(
+        self,
+        platform_name: str = "youtube",
+        config: Optional[PlatformConfig] = None,
+        accounts: Optional[List[PlatformConfig]] = None,
+        executor: Optional[Executor] = None,
+        run_in_thread: bool = True,
+        token_refresher: Optional[TokenRefresher] = None
+    ):
+        """
+        Initialize YouTube credential pool.
+        
+        Args:
+            platform_name: Platform name (default: "youtube")
+            config: Platform configuration; its "accounts" credentials entry
+                    lists per-account overrides of the other credentials
+            accounts: Optional explicit per-account configurations (takes
+                      precedence over the "accounts" credentials entry)
+            executor: Optional executor for blocking API calls
+                      (uses the shared YouTube thread pool if None)
+            run_in_thread: If True, blocking API calls run in the executor
+            token_refresher: Optional refresher renewing account tokens in the
+                             background (uses the process-wide refresher if None)
+        
+        Raises:
+            ConfigError: If no accounts are configured
+        """
+        super().__init__(platform_name, config)
+        
+        if accounts is None:
+            accounts = self._account_configs(self.config)
+        if not accounts:
+            raise ConfigError(
+                "No YouTube accounts configured for credential pool",
+                missing_fields=["accounts"]
+            )
+        
+        self.token_refresher = token_refresher or get_token_refresher()
+        
+        # Projects writing to each configured ledger file
+        file_projects: Dict[str, Set[Any]] = {}
+        for account_config in accounts:
+            credentials = account_config.credentials or {}
+            if credentials.get("quota_ledger_file"):
+                file_projects.setdefault(credentials["quota_ledger_file"], set()).add(
+                    credentials.get("client_secrets_file")
+                )
+        
+        # Accounts of the same Cloud project draw from the same quota
+        project_ledgers: Dict[Any, QuotaLedger] = {}
+        self.accounts: List[YouTubeAccount] = []
+        for index, account_config in enumerate(accounts):
+            credentials = account_config.credentials or {}
+            project = credentials.get("client_secrets_file")
+            daily_quota = credentials.get("daily_quota") or YOUTUBE_DAILY_QUOTA
+            ledger_path = self._ledger_path(credentials, file_projects)
+            if ledger_path is not None:
+                quota_ledger = get_quota_ledger(ledger_path, daily_limit=daily_quota)
+            else:
+                quota_ledger = project_ledgers.get(project)
+                if quota_ledger is None:
+                    quota_ledger = project_ledgers[project] = QuotaLedger(
+                        daily_limit=daily_quota,
+                        platform=self.platform_name
+                    )
+            
+            # Fail fast on a short budget; the pool reroutes to another account
+            uploader = YouTubeUploader(
+                self.platform_name,
+                account_config,
+                executor=executor,
+                run_in_thread=run_in_thread,
+                quota_ledger=quota_ledger,
+                quota_wait_timeout=0,
+                token_refresher=self.token_refresher
+            )
+            name = credentials.get("name") or f"account{index + 1}"
+            self.accounts.append(YouTubeAccount(name, uploader))
+        
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _ledger_path(credentials: Dict[str, Any], file_projects: Dict[str, Set[Any]]) -> Optional[Path]:
+        """
+        Get the file persisting the quota ledger of an account's Cloud project.
+        
+        Args:
+            credentials: Account credentials
+            file_projects: Client secrets files of the accounts using each
+                           configured quota_ledger_file
+        
+        Returns:
+            Ledger file path, or None to keep the ledger in memory
+        """
+        project = credentials.get("client_secrets_file")
+        project_tag = hashlib.sha1(str(Path(project).resolve() if project else "").encode()).hexdigest()[:12]
+        
+        ledger_file = credentials.get("quota_ledger_file")
+        if ledger_file:
+            if len(file_projects.get(ledger_file, ())) <= 1:
+                return Path(ledger_file)
+            # Several projects configured with one file; keep one file per project
+            path = Path(ledger_file)
+            return path.with_name(f"{path.stem}.{project_tag}{path.suffix}")
+        
+        sessions_dir = credentials.get("upload_sessions_dir")
+        if sessions_dir:
+            return Path(sessions_dir) / f"quota.{project_tag}.json"
+        
+        return None
+    
+    @staticmethod
+    def _account_configs(config: PlatformConfig) -> List[PlatformConfig]:
+        """
+        Build per-account configurations from the "accounts" credentials entry.
+        
+        Args:
+            config: Pool configuration
+        
+        Returns:
+            List of account configurations with the shared credentials merged in
+        """
+        shared = dict(config.credentials or {})
+        overrides = shared.pop("accounts", None) or []
+        return [replace(config, credentials={**shared, **account}) for account in overrides]
+    
+    def get_account(self, name: str) -> Optional[YouTubeAccount]:
+        """
+        Get an account by name.
+        
+        Args:
+            name: Account name
+        
+        Returns:
+            YouTubeAccount if found, None otherwise
+        """
+        for account in self.accounts:
+            if account.name == name:
+                return account
+        return None
+    
+    async def authenticate(self) -> bool:
+        """
+        Authenticate every account.
+        
+        Accounts that fail to authenticate are logged and left out of routing.
+        
+        Returns:
+            True if at least one account authenticated, False otherwise
+        
+        Raises:
+            AuthenticationError: If every account failed with an error
+        """
+        results = await asyncio.gather(
+            *(account.uploader.authenticate() for account in self.accounts),
+            return_exceptions=True
+        )
+        
+        errors = []
+        for account, result in zip(self.accounts, results):
+            if isinstance(result, BaseException):
+                errors.append(result)
+                self.logger.warning(f"YouTube account {account.name} failed to authenticate: {result}")
+            elif not result:
+                self.logger.warning(f"YouTube account {account.name} failed to authenticate")
+        
+        authenticated = sum(1 for account in self.accounts if account.is_authenticated)
+        self.is_authenticated = authenticated > 0
+        
+        if not self.is_authenticated:
+            if len(errors) == len(self.accounts):
+                raise AuthenticationError(
+                    f"No YouTube account could be authenticated: {errors[0]}",
+                    platform=self.platform_name,
+                    original_error=errors[0]
+                )
+            return False
+        
+        self.logger.info(f"YouTube credential pool authenticated {authenticated}/{len(self.accounts)} accounts")
+        return True
+    
+    def _validate_metadata(self, metadata: MediaMetadata) -> None:
+        """
+        Validate metadata for YouTube-specific requirements.
+        
+        Args:
+            metadata: Media metadata to validate
+        
+        Raises:
+            ValidationError: If metadata is invalid
+        """
+        self.accounts[0].uploader._validate_metadata(metadata)
+    
+    def _acquire_account(self, methods: Sequence[str], excluded: Sequence[str] = ()) -> YouTubeAccount:
+        """
+        Pick the least-loaded account whose quota covers a set of API calls.
+        
+        Args:
+            methods: API methods the upload will call
+            excluded: Names of accounts not to route to
+        
+        Returns:
+            Account with its active upload count incremented
+        
+        Raises:
+            RateLimitError: If no authenticated account has enough quota left
+        """
+        with self._lock:
+            candidates = []
+            for account in self.accounts:
+                if not account.is_authenticated or account.name in excluded:
+                    continue
+                remaining = account.quota_ledger.remaining
+                if remaining >= account.quota_cost(methods):
+                    candidates.append((account.active_uploads, -remaining, len(candidates), account))
+            
+            if not candidates:
+                retry_after = min(account.quota_ledger.seconds_until_reset() for account in self.accounts)
+                raise RateLimitError(
+                    "No YouTube account has quota left for this upload",
+                    platform=self.platform_name,
+                    retry_after=int(retry_after) + 1,
+                    quota_exceeded=True
+                )
+            
+            account = min(candidates)[3]
+            account.active_uploads += 1
+            return account
+    
+    def _release_account(self, account: YouTubeAccount) -> None:
+        """
+        Mark an upload routed to an account as finished.
+        
+        Args:
+            account: Account returned by _acquire_account()
+        """
+        with self._lock:
+            account.active_uploads -= 1
+    
+    async def _upload_media(
+        self,
+        file_path: str,
+        metadata: MediaMetadata,
+        progress_callback: Optional[Callable[[UploadProgress], None]] = None
+    ) -> UploadResult:
+        """
+        Upload video through the least-loaded account with quota left.
+        
+        An account whose quota turns out to be exhausted, by the ledger or by
+        the API, is skipped and the upload is routed to the next one.
+        
+        Args:
+            file_path: Path to the video file
+            metadata: Video metadata
+            progress_callback: Optional progress callback
+        
+        Returns:
+            UploadResult with the account name in its metadata
+        
+        Raises:
+            RateLimitError: If no account has quota left
+            UploadError: If upload fails
+        """
+        methods = ["videos.insert"]
+        if metadata.thumbnail_path:
+            methods.append("thumbnails.set")
+        
+        task_id = self.current_task_id
+        excluded: List[str] = []
+        while True:
+            account = self._acquire_account(methods, excluded)
+            worker = account.uploader.clone()
+            worker.current_task_id = task_id
+            
+            self.logger.info(f"Routing YouTube upload of {file_path} to account {account.name}")
+            try:
+                result = await worker._upload_media(file_path, metadata, progress_callback)
+            except RateLimitError as e:
+                if not e.quota_exceeded:
+                    raise
+                self.logger.warning(f"YouTube account {account.name} is out of quota, rerouting upload")
+                excluded.append(account.name)
+                continue
+            finally:
+                self._release_account(account)
+            
+            result.metadata["account"] = account.name
+            return result
+    
+    def get_pool_status(self) -> Dict[str, Any]:
+        """
+        Get credential pool status information.
+        
+        Returns:
+            Dictionary with per-account authentication, load, token expiry
+            and quota details
+        """
+        with self._lock:
+            accounts = [account.get_status() for account in self.accounts]
+        return {
+            "platform": self.platform_name,
+            "authenticated_accounts": sum(1 for account in accounts if account["authenticated"]),
+            "active_uploads": sum(account["active_uploads"] for account in accounts),
+            "accounts": accounts
+        }
+    
+    async def cleanup(self) -> None:
+        """
+        Clean up every account.
+        """
+        for account in self.accounts:
+            await account.uploader.cleanup()
+        
+        await super().cleanup()
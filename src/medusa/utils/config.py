@@ -10,7 +10,7 @@ import json
 import os
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, List, Union
 
 from ..exceptions import ConfigurationError
 
@@ -36,6 +36,10 @@ class PlatformConfig:
     
     # Platform-specific fields
     page_id: Optional[str] = None  # Facebook page ID
+    upload_sessions_dir: Optional[str] = None  # Directory for resumable upload sessions
+    quota_ledger_file: Optional[str] = None  # File persisting daily API quota usage
+    daily_quota: Optional[int] = None  # Daily API quota units (YouTube default: 10000)
+    accounts: Optional[List[Dict[str, Any]]] = None  # Per-account overrides for credential pools
     
     def __post_init__(self):
         """Post-initialization validation."""
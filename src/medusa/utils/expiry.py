@@ -0,0 +1,156 @@
+"""
+Shared expiry scheduler for Medusa library.
+
+This module provides a single background thread that drives periodic
+expiry work for every task store and state manager in the process:
+- Heap of due jobs ordered by monotonic deadline
+- Repeating jobs with O(log n) scheduling and lazy cancellation
+- One daemon thread, started on first use, instead of a Timer per instance
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class ExpiryJob:
+    """Handle for a repeating job registered with an ExpiryScheduler."""
+
+    __slots__ = ("interval", "callback", "name", "cancelled")
+
+    def __init__(self, interval: float, callback: Callable[[], None], name: str):
+        self.interval = interval
+        self.callback = callback
+        self.name = name
+        self.cancelled = False
+
+
+class ExpiryScheduler:
+    """
+    Heap-based scheduler running repeating jobs on one daemon thread.
+
+    Jobs run sequentially on the scheduler thread, so callbacks should only
+    evict what has expired and return quickly. Cancelled jobs stay in the
+    heap until their deadline comes up and are then dropped.
+    """
+
+    def __init__(self, name: str = "medusa-expiry"):
+        """
+        Initialize ExpiryScheduler.
+
+        Args:
+            name: Name of the scheduler thread
+        """
+        self.name = name
+        self._heap: List[Tuple[float, int, ExpiryJob]] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def schedule(self, interval: float, callback: Callable[[], None],
+                 name: Optional[str] = None) -> ExpiryJob:
+        """
+        Run a callback every interval seconds, first after one interval.
+
+        The job is cancelled when the callback returns False.
+
+        Args:
+            interval: Seconds between runs
+            callback: Function to call
+            name: Optional job name used in log messages
+
+        Returns:
+            ExpiryJob handle that can be passed to cancel()
+
+        Raises:
+            ValueError: If interval is not positive
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+
+        job = ExpiryJob(interval, callback, name or getattr(callback, "__qualname__", "job"))
+        with self._condition:
+            self._push(job)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+        logger.debug(f"Scheduled expiry job {job.name} every {interval}s")
+        return job
+
+    def cancel(self, job: ExpiryJob) -> None:
+        """
+        Cancel a scheduled job.
+
+        Args:
+            job: Handle returned by schedule()
+        """
+        with self._condition:
+            job.cancelled = True
+            self._condition.notify()
+
+    def pending_jobs(self) -> int:
+        """
+        Get the number of active jobs.
+
+        Returns:
+            Number of jobs that have not been cancelled
+        """
+        with self._condition:
+            return sum(1 for _, _, job in self._heap if not job.cancelled)
+
+    def _push(self, job: ExpiryJob) -> None:
+        """Queue the next run of a job. Caller must hold the condition."""
+        heapq.heappush(self._heap, (time.monotonic() + job.interval, next(self._sequence), job))
+
+    def _run(self) -> None:
+        """Run due jobs until none are left."""
+        while True:
+            with self._condition:
+                while self._heap and self._heap[0][2].cancelled:
+                    heapq.heappop(self._heap)
+                if not self._heap:
+                    self._thread = None
+                    return
+
+                due, _, job = self._heap[0]
+                delay = due - time.monotonic()
+                if delay > 0:
+                    self._condition.wait(delay)
+                    continue
+                heapq.heappop(self._heap)
+
+            try:
+                if job.callback() is False:
+                    job.cancelled = True
+            except Exception as e:
+                logger.error(f"Error in expiry job {job.name}: {e}")
+
+            with self._condition:
+                if not job.cancelled:
+                    self._push(job)
+
+
+_default_scheduler: Optional[ExpiryScheduler] = None
+_default_scheduler_lock = threading.Lock()
+
+
+def get_expiry_scheduler() -> ExpiryScheduler:
+    """
+    Get the process-wide expiry scheduler.
+
+    Returns:
+        Shared ExpiryScheduler instance
+    """
+    global _default_scheduler
+    with _default_scheduler_lock:
+        if _default_scheduler is None:
+            _default_scheduler = ExpiryScheduler()
+        return _default_scheduler
@@ -0,0 +1,170 @@
+"""
+Pooled async HTTP client for Medusa library.
+
+This module provides a shared aiohttp-based transport for platform API calls:
+- Keep-alive connection reuse across requests
+- Total and per-host connection limits
+- One client session per event loop, created lazily
+- JSON request/response helpers
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from typing import Dict, Any, Optional, Tuple
+
+import aiohttp
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Default connection pool settings
+DEFAULT_CONNECTION_LIMIT = 100
+DEFAULT_LIMIT_PER_HOST = 10
+DEFAULT_KEEPALIVE_TIMEOUT = 30.0
+DEFAULT_REQUEST_TIMEOUT = 30.0
+
+
+class PooledHTTPClient:
+    """
+    Keep-alive HTTP client backed by a bounded aiohttp connection pool.
+
+    aiohttp sessions are bound to the event loop that created them, so the
+    client keeps one session per running loop. Within a loop every request
+    reuses the same connector, so repeated calls to the same host skip the
+    TCP and TLS handshakes.
+    """
+
+    def __init__(self,
+                 limit: int = DEFAULT_CONNECTION_LIMIT,
+                 limit_per_host: int = DEFAULT_LIMIT_PER_HOST,
+                 keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+                 timeout: float = DEFAULT_REQUEST_TIMEOUT):
+        """
+        Initialize PooledHTTPClient.
+
+        Args:
+            limit: Maximum number of open connections in total
+            limit_per_host: Maximum number of open connections per host
+            keepalive_timeout: Seconds an idle connection is kept open
+            timeout: Default total timeout for a request in seconds
+
+        Raises:
+            ValueError: If any limit or timeout is not positive
+        """
+        if limit <= 0 or limit_per_host <= 0:
+            raise ValueError("Connection limits must be positive")
+        if keepalive_timeout <= 0 or timeout <= 0:
+            raise ValueError("Timeouts must be positive")
+
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+
+        self._sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+        self._lock = threading.Lock()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the client session for the running event loop, creating it if needed."""
+        loop = asyncio.get_running_loop()
+
+        with self._lock:
+            # Forget sessions whose loops are gone; they cannot be reused
+            for stale_loop in [l for l in self._sessions if l.is_closed()]:
+                del self._sessions[stale_loop]
+
+            session = self._sessions.get(loop)
+            if session is None or session.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                    keepalive_timeout=self.keepalive_timeout
+                )
+                session = aiohttp.ClientSession(
+                    connector=connector,
+                    timeout=aiohttp.ClientTimeout(total=self.timeout)
+                )
+                self._sessions[loop] = session
+                logger.debug(f"Created pooled HTTP session (limit_per_host={self.limit_per_host})")
+
+            return session
+
+    async def request_json(self, method: str, url: str,
+                           json_data: Optional[Dict[str, Any]] = None,
+                           timeout: Optional[float] = None) -> Tuple[int, Any]:
+        """
+        Send a request and decode the JSON response body.
+
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            url: Request URL
+            json_data: Optional JSON request body
+            timeout: Optional total timeout overriding the client default
+
+        Returns:
+            Tuple of (HTTP status code, decoded JSON body)
+
+        Raises:
+            aiohttp.ClientError: If the request fails
+            asyncio.TimeoutError: If the request times out
+            ValueError: If the response body is not valid JSON
+        """
+        session = self._get_session()
+        kwargs: Dict[str, Any] = {"json": json_data}
+        if timeout is not None:
+            kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout)
+
+        async with session.request(method, url, **kwargs) as response:
+            body = await response.read()
+            return response.status, json.loads(body.decode('utf-8'))
+
+    async def close(self) -> None:
+        """Close the session bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._sessions.pop(loop, None)
+
+        if session is not None and not session.closed:
+            await session.close()
+
+    async def close_all(self) -> None:
+        """
+        Close the sessions of every event loop.
+
+        The session of the running loop is closed directly; sessions of loops
+        running in other threads are closed on their own loop. Sessions of
+        loops that are no longer running cannot be closed and are dropped.
+        """
+        current_loop = asyncio.get_running_loop()
+        with self._lock:
+            sessions, self._sessions = self._sessions, {}
+
+        for loop, session in sessions.items():
+            if session.closed:
+                continue
+            if loop is current_loop:
+                await session.close()
+            elif loop.is_running():
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(session.close(), loop))
+            else:
+                logger.warning("Dropping pooled HTTP session of an event loop that is not running")
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """
+        Get connection pool configuration and usage.
+
+        Returns:
+            Dictionary with pool limits and number of live sessions
+        """
+        with self._lock:
+            open_sessions = sum(1 for s in self._sessions.values() if not s.closed)
+
+        return {
+            "limit": self.limit,
+            "limit_per_host": self.limit_per_host,
+            "keepalive_timeout": self.keepalive_timeout,
+            "open_sessions": open_sessions
+        }
+
@@ -0,0 +1,539 @@
+"""
+Append-only task journal for Medusa library.
+
+This module provides durable, low-cost persistence of task state including:
+- Append-only JSON-lines journal of TaskResult changes and StateTransition events
+- Field-level patches so an update only writes what changed
+- Group commit: records are buffered and fsynced together
+- Periodic snapshot compaction so replay cost is bounded by snapshot size
+- Replay at startup that tolerates a torn final record
+"""
+
+import copy
+import json
+import logging
+import os
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Union
+
+from ..models import TaskResult, datetime_to_epoch_us
+from ..exceptions import MedusaError
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FILE = "snapshot.json"
+JOURNAL_FILE = "journal.log"
+SNAPSHOT_VERSION = 1
+
+
+def _timestamp_us(transition: Dict[str, Any]) -> int:
+    """Get the epoch microseconds of a serialized StateTransition."""
+    return datetime_to_epoch_us(datetime.fromisoformat(transition["timestamp"].replace('Z', '+00:00')))
+
+
+class TaskJournalError(MedusaError):
+    """Exception raised for task journal operations."""
+    pass
+
+
+class TaskJournal:
+    """
+    Append-only journal of task and state changes with snapshot compaction.
+
+    The journal keeps a materialized view of every journaled task and state
+    history. Each change appends one small record carrying a sequence number:
+    a full task on insert, only the changed fields on update, and single
+    transitions for state changes. Records are buffered and written with one
+    write and one fsync every sync_interval seconds by a background thread.
+    With sync_interval 0 every record is written and fsynced by the thread
+    recording it, while TaskStore or TaskStateManager still holds its lock,
+    so writers wait on the disk; that mode trades throughput for durability.
+
+    With max_transitions_per_task set, only the most recent transitions of
+    each task are kept in the view and in snapshots, matching a
+    TaskStateManager that caps its histories. The time spent in each state
+    and the states reached by evicted transitions are folded into per-task
+    statistics that are snapshotted with the histories, so restored histories
+    report the same durations as ones that were never restarted.
+
+    Once compact_threshold records have accumulated, the view is written to a
+    snapshot and the journal is truncated. Snapshots remember the last
+    sequence number they contain, so a crash between writing the snapshot and
+    truncating the journal never applies a record twice.
+    """
+
+    def __init__(self,
+                 directory: Union[str, Path],
+                 sync_interval: float = 0.05,
+                 compact_threshold: int = 10000,
+                 max_transitions_per_task: Optional[int] = None):
+        """
+        Initialize TaskJournal and replay persisted state.
+
+        Args:
+            directory: Directory holding the snapshot and journal files
+            sync_interval: Seconds between group commits (0 writes and fsyncs
+                every record in the recording thread, under the caller's lock)
+            compact_threshold: Journal records that trigger snapshot compaction
+            max_transitions_per_task: Optional number of most recent transitions
+                kept per task (None keeps every transition)
+
+        Raises:
+            TaskJournalError: If parameters are invalid or files cannot be read
+        """
+        if sync_interval < 0:
+            raise TaskJournalError("sync_interval cannot be negative")
+        if compact_threshold <= 0:
+            raise TaskJournalError("compact_threshold must be positive")
+        if max_transitions_per_task is not None and max_transitions_per_task <= 0:
+            raise TaskJournalError("max_transitions_per_task must be positive")
+
+        self.directory = Path(directory)
+        self.sync_interval = sync_interval
+        self.compact_threshold = compact_threshold
+        self.max_transitions_per_task = max_transitions_per_task
+
+        self._snapshot_path = self.directory / SNAPSHOT_FILE
+        self._journal_path = self.directory / JOURNAL_FILE
+
+        # Materialized view: task_id -> TaskResult dict, task_id -> transition dicts
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+        self._histories: Dict[str, List[Dict[str, Any]]] = {}
+        # task_id -> {"durations_us": {state: us}, "reached": [state]} of evicted transitions
+        self._evicted: Dict[str, Dict[str, Any]] = {}
+        self._sequence = 0
+        self._records_since_snapshot = 0
+
+        self._buffer: List[str] = []
+        self._lock = threading.Lock()      # view, sequence and buffer
+        self._io_lock = threading.Lock()   # journal and snapshot files
+        self._closed = False
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._replay()
+            self._file = open(self._journal_path, 'a', encoding='utf-8')
+        except OSError as e:
+            raise TaskJournalError(f"Cannot open task journal in {self.directory}: {e}",
+                                   original_error=e)
+
+        self._sync_event = threading.Event()
+        self._sync_thread: Optional[threading.Thread] = None
+        if self.sync_interval > 0:
+            self._sync_thread = threading.Thread(
+                target=self._sync_loop, name="medusa-task-journal", daemon=True
+            )
+            self._sync_thread.start()
+
+        logger.debug(f"TaskJournal opened in {self.directory} with {len(self._tasks)} tasks "
+                     f"and {len(self._histories)} state histories")
+
+    # ------------------------------------------------------------------
+    # Replay
+    # ------------------------------------------------------------------
+
+    def _replay(self) -> None:
+        """Load the snapshot and apply journal records written after it."""
+        snapshot_sequence = 0
+        if self._snapshot_path.exists():
+            try:
+                with open(self._snapshot_path, 'r', encoding='utf-8') as f:
+                    snapshot = json.load(f)
+                self._tasks = snapshot["tasks"]
+                self._histories = snapshot["histories"]
+                self._evicted = snapshot.get("evicted", {})
+                snapshot_sequence = snapshot["sequence"]
+            except (ValueError, KeyError) as e:
+                raise TaskJournalError(f"Corrupt journal snapshot {self._snapshot_path}: {e}",
+                                       original_error=e)
+            self._trim_histories()
+        self._sequence = snapshot_sequence
+
+        if not self._journal_path.exists():
+            return
+
+        applied = 0
+        valid_length = 0
+        with open(self._journal_path, 'rb') as f:
+            for raw_line in f:
+                try:
+                    record = json.loads(raw_line)
+                except ValueError:
+                    # Torn write from a crash; everything after it is discarded
+                    logger.warning(f"Discarding torn record at offset {valid_length} "
+                                   f"of {self._journal_path}")
+                    break
+                valid_length += len(raw_line)
+
+                if record["seq"] <= snapshot_sequence:
+                    continue
+                self._apply(record)
+                self._sequence = record["seq"]
+                applied += 1
+
+        if valid_length < self._journal_path.stat().st_size:
+            with open(self._journal_path, 'r+b') as f:
+                f.truncate(valid_length)
+
+        self._records_since_snapshot = applied
+        if applied:
+            logger.info(f"Replayed {applied} journal records from {self._journal_path}")
+
+    def _apply(self, record: Dict[str, Any]) -> None:
+        """Apply a journal record to the materialized view."""
+        op = record["op"]
+        if op == "put":
+            self._tasks[record["id"]] = record["task"]
+        elif op == "patch":
+            self._tasks[record["id"]].update(record["fields"])
+        elif op == "del":
+            self._tasks.pop(record["id"], None)
+        elif op == "clear":
+            self._tasks.clear()
+        elif op == "tr":
+            history = self._histories.setdefault(record["id"], [])
+            history.append(record["tr"])
+            self._trim_history(record["id"], history)
+        elif op == "forget":
+            self._histories.pop(record["id"], None)
+            self._evicted.pop(record["id"], None)
+
+    def _trim_history(self, task_id: str, history: List[Dict[str, Any]]) -> None:
+        """
+        Drop transitions beyond the per-task limit, keeping their statistics.
+
+        Caller must hold _lock or be replaying.
+        """
+        limit = self.max_transitions_per_task
+        if limit is None or len(history) <= limit:
+            return
+
+        evicted_count = len(history) - limit
+        stats = self._evicted.setdefault(task_id, {"durations_us": {}, "reached": []})
+        durations = stats["durations_us"]
+        for previous, following in zip(history[:evicted_count], history[1:evicted_count + 1]):
+            state = previous["to_state"]
+            durations[state] = (durations.get(state, 0)
+                                + _timestamp_us(following) - _timestamp_us(previous))
+            if state not in stats["reached"]:
+                stats["reached"].append(state)
+        del history[:evicted_count]
+
+    def _trim_histories(self) -> None:
+        """Drop transitions beyond the per-task limit. Caller must hold _lock or be replaying."""
+        for task_id, history in self._histories.items():
+            self._trim_history(task_id, history)
+
+    def set_history_limit(self, max_transitions_per_task: Optional[int]) -> None:
+        """
+        Change how many transitions are kept per task.
+
+        Histories already in the view are trimmed at once; the next snapshot
+        drops the trimmed transitions from disk.
+
+        Args:
+            max_transitions_per_task: Number of most recent transitions to keep
+                (None keeps every transition)
+
+        Raises:
+            TaskJournalError: If the limit is not positive
+        """
+        if max_transitions_per_task is not None and max_transitions_per_task <= 0:
+            raise TaskJournalError("max_transitions_per_task must be positive")
+
+        with self._lock:
+            self.max_transitions_per_task = max_transitions_per_task
+            self._trim_histories()
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        """Assign a sequence number, apply and buffer a record. Caller must hold _lock."""
+        if self._closed:
+            raise TaskJournalError("Task journal is closed")
+
+        self._sequence += 1
+        record["seq"] = self._sequence
+        self._apply(record)
+        self._buffer.append(json.dumps(record, separators=(',', ':'), default=str))
+        self._records_since_snapshot += 1
+
+    def _after_append(self) -> None:
+        """Sync immediately when group commit is disabled."""
+        if self.sync_interval == 0:
+            self.sync()
+
+    def record_task(self, task: TaskResult) -> None:
+        """
+        Record the current state of a task.
+
+        New tasks are written in full; known tasks only write changed fields.
+
+        Args:
+            task: TaskResult that was stored or updated
+        """
+        data = task.to_dict()
+
+        with self._lock:
+            previous = self._tasks.get(task.task_id)
+            if previous is None:
+                fields = data
+            else:
+                fields = {key: value for key, value in data.items() if previous.get(key) != value}
+                if not fields:
+                    return
+
+            # results is the only mutable field; copy it so later in-place
+            # changes to the task are detected against the view
+            if "results" in fields:
+                fields["results"] = copy.deepcopy(fields["results"])
+
+            if previous is None:
+                self._append({"op": "put", "id": task.task_id, "task": fields})
+            else:
+                self._append({"op": "patch", "id": task.task_id, "fields": fields})
+
+        self._after_append()
+
+    def record_task_deleted(self, task_id: str) -> None:
+        """
+        Record that a task was deleted.
+
+        Args:
+            task_id: ID of the deleted task
+        """
+        with self._lock:
+            if task_id not in self._tasks:
+                return
+            self._append({"op": "del", "id": task_id})
+        self._after_append()
+
+    def record_tasks_cleared(self) -> None:
+        """Record that all tasks were cleared."""
+        with self._lock:
+            self._append({"op": "clear"})
+        self._after_append()
+
+    def record_transition(self, task_id: str, transition: Any) -> None:
+        """
+        Record a state transition.
+
+        Args:
+            task_id: Task the transition belongs to
+            transition: StateTransition that was added to the task history
+        """
+        with self._lock:
+            self._append({"op": "tr", "id": task_id, "tr": transition.to_dict()})
+        self._after_append()
+
+    def record_history_removed(self, task_id: str) -> None:
+        """
+        Record that a task's state history was removed.
+
+        Args:
+            task_id: Task whose history was removed
+        """
+        with self._lock:
+            if task_id not in self._histories:
+                return
+            self._append({"op": "forget", "id": task_id})
+        self._after_append()
+
+    # ------------------------------------------------------------------
+    # Replayed state
+    # ------------------------------------------------------------------
+
+    def get_tasks(self) -> List[TaskResult]:
+        """
+        Get all journaled tasks.
+
+        Returns:
+            List of TaskResult objects ordered by creation time
+        """
+        with self._lock:
+            tasks = [TaskResult.from_dict(dict(data)) for data in self._tasks.values()]
+        tasks.sort(key=lambda task: task.created_at_us)
+        return tasks
+
+    def get_histories(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get all journaled state histories.
+
+        Returns:
+            Dictionary mapping task IDs to lists of StateTransition dictionaries
+        """
+        with self._lock:
+            return {task_id: list(history) for task_id, history in self._histories.items()}
+
+    def get_evicted_statistics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the statistics of transitions dropped by max_transitions_per_task.
+
+        Returns:
+            Dictionary mapping task IDs to {"durations_us": {state value:
+            microseconds}, "reached": [state values]} for evicted transitions
+        """
+        with self._lock:
+            return {
+                task_id: {"durations_us": dict(stats["durations_us"]), "reached": list(stats["reached"])}
+                for task_id, stats in self._evicted.items()
+            }
+
+    # ------------------------------------------------------------------
+    # Durability and compaction
+    # ------------------------------------------------------------------
+
+    def sync(self) -> int:
+        """
+        Write buffered records and fsync the journal.
+
+        Compacts the journal afterwards if compact_threshold was reached.
+
+        Returns:
+            Number of records written
+
+        Raises:
+            TaskJournalError: If writing fails
+        """
+        with self._io_lock:
+            with self._lock:
+                lines = self._buffer
+                self._buffer = []
+                should_compact = self._records_since_snapshot >= self.compact_threshold
+
+            if lines and not self._file.closed:
+                self._write_lines(lines)
+
+            if should_compact:
+                self._compact_locked()
+
+        return len(lines)
+
+    def _write_lines(self, lines: List[str]) -> None:
+        """Append lines to the journal with a single write and fsync. Caller must hold _io_lock."""
+        try:
+            self._file.write("\n".join(lines) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        except OSError as e:
+            raise TaskJournalError(f"Failed to write task journal: {e}", original_error=e)
+
+    def compact(self) -> None:
+        """
+        Write a snapshot of the current state and truncate the journal.
+
+        Raises:
+            TaskJournalError: If the snapshot cannot be written
+        """
+        with self._io_lock:
+            self._compact_locked()
+
+    def _compact_locked(self) -> None:
+        """Snapshot the view and truncate the journal. Caller must hold _io_lock."""
+        # Copy the view under the lock and serialize it outside, so recording
+        # threads only wait for the copy. Patches update task dicts and
+        # transitions are appended to history lists in place, so those are
+        # copied one level deep; their values are never mutated.
+        with self._lock:
+            lines = self._buffer
+            self._buffer = []
+            sequence = self._sequence
+            tasks = {task_id: dict(data) for task_id, data in self._tasks.items()}
+            histories = {task_id: list(history) for task_id, history in self._histories.items()}
+            evicted = {
+                task_id: {"durations_us": dict(stats["durations_us"]), "reached": list(stats["reached"])}
+                for task_id, stats in self._evicted.items()
+            }
+            self._records_since_snapshot = 0
+
+        snapshot = json.dumps({
+            "version": SNAPSHOT_VERSION,
+            "sequence": sequence,
+            "tasks": tasks,
+            "histories": histories,
+            "evicted": evicted
+        }, separators=(',', ':'), default=str)
+
+        # Records up to the snapshot sequence must be durable before truncating
+        if lines:
+            self._write_lines(lines)
+
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(snapshot)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self._snapshot_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+
+            self._file.truncate(0)
+            self._file.seek(0)
+            os.fsync(self._file.fileno())
+        except OSError as e:
+            raise TaskJournalError(f"Failed to compact task journal: {e}", original_error=e)
+
+        logger.debug(f"Compacted task journal into {self._snapshot_path}")
+
+    def _sync_loop(self) -> None:
+        """Group-commit buffered records every sync_interval seconds until closed."""
+        while not self._sync_event.wait(self.sync_interval):
+            try:
+                self.sync()
+            except Exception as e:
+                logger.error(f"Error during task journal sync: {e}")
+
+    def get_journal_stats(self) -> Dict[str, Any]:
+        """
+        Get journal statistics.
+
+        Returns:
+            Dictionary with journal statistics
+        """
+        with self._lock:
+            return {
+                "directory": str(self.directory),
+                "sequence": self._sequence,
+                "pending_records": len(self._buffer),
+                "records_since_snapshot": self._records_since_snapshot,
+                "tasks": len(self._tasks),
+                "histories": len(self._histories),
+                "sync_interval": self.sync_interval,
+                "compact_threshold": self.compact_threshold,
+                "max_transitions_per_task": self.max_transitions_per_task
+            }
+
+    def close(self) -> None:
+        """Sync buffered records, stop the sync thread and close the journal file."""
+        if self._closed:
+            return
+
+        self._sync_event.set()
+        if self._sync_thread is not None:
+            self._sync_thread.join()
+
+        self.sync()
+        with self._io_lock:
+            with self._lock:
+                self._closed = True
+            self._file.close()
+
+        logger.debug(f"TaskJournal closed in {self.directory}")
+
+    def __enter__(self) -> 'TaskJournal':
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Context manager exit."""
+        self.close()
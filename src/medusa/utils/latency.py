@@ -0,0 +1,171 @@
+"""
+Streaming latency sketches for Medusa library.
+
+This module provides LatencySketch, a log-bucketed histogram that tracks
+duration percentiles without keeping the individual samples:
+- O(1) recording into exponentially sized buckets
+- Percentiles with a bounded relative error
+- Mergeable sketches and compact summaries for metrics endpoints
+"""
+
+import math
+from typing import Dict, Iterable, Any
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+DEFAULT_PERCENTILES = (50, 95, 99)
+
+
+class LatencySketch:
+    """
+    Histogram of durations with logarithmically spaced buckets.
+
+    Bucket i covers (gamma^(i-1), gamma^i] with gamma = (1 + a) / (1 - a),
+    so every reported percentile is within relative_accuracy a of a
+    recorded value. Memory grows with the logarithm of the value range,
+    not with the number of samples: one second to one day at 1% accuracy
+    needs under 600 buckets.
+
+    Sketches are not thread-safe; callers serialize access.
+    """
+
+    def __init__(self,
+                 relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+                 min_value: float = 1e-6):
+        """
+        Initialize LatencySketch.
+
+        Args:
+            relative_accuracy: Maximum relative error of reported percentiles
+            min_value: Values at or below this are counted as zero
+
+        Raises:
+            ValueError: If relative_accuracy is not between 0 and 1 or
+                min_value is not positive
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        if min_value <= 0:
+            raise ValueError("min_value must be positive")
+
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._buckets: Dict[int, int] = {}
+        self._zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def record(self, value: float) -> None:
+        """
+        Record one duration.
+
+        Args:
+            value: Duration to record (seconds by convention)
+
+        Raises:
+            ValueError: If value is negative
+        """
+        if value < 0:
+            raise ValueError("value must be non-negative")
+
+        if value <= self.min_value:
+            self._zero_count += 1
+        else:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self._buckets[index] = self._buckets.get(index, 0) + 1
+
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "LatencySketch") -> None:
+        """
+        Add the samples of another sketch to this one.
+
+        Args:
+            other: Sketch with the same relative accuracy
+
+        Raises:
+            ValueError: If the sketches use different bucket layouts
+        """
+        if other._gamma != self._gamma or other.min_value != self.min_value:
+            raise ValueError("Cannot merge sketches with different accuracy")
+
+        for index, count in other._buckets.items():
+            self._buckets[index] = self._buckets.get(index, 0) + count
+        self._zero_count += other._zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """
+        Get the value at a quantile.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Estimated value, or 0.0 if nothing has been recorded
+
+        Raises:
+            ValueError: If q is outside [0, 1]
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        if self.count == 0:
+            return 0.0
+
+        rank = q * (self.count - 1)
+        seen = self._zero_count
+        if rank < seen:
+            return 0.0
+
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if rank < seen:
+                # Midpoint of the bucket in relative terms, clamped to what was seen
+                value = 2 * self._gamma ** index / (self._gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def percentile(self, p: float) -> float:
+        """
+        Get the value at a percentile.
+
+        Args:
+            p: Percentile between 0 and 100
+
+        Returns:
+            Estimated value, or 0.0 if nothing has been recorded
+        """
+        return self.quantile(p / 100)
+
+    @property
+    def mean(self) -> float:
+        """Mean of the recorded values, or 0.0 if nothing has been recorded."""
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self, percentiles: Iterable[float] = DEFAULT_PERCENTILES) -> Dict[str, Any]:
+        """
+        Summarize the sketch.
+
+        Args:
+            percentiles: Percentiles to report
+
+        Returns:
+            Dictionary with count, mean, max and one "p<N>" entry per percentile
+        """
+        result: Dict[str, Any] = {
+            "count": self.count,
+            "mean": self.mean,
+            "max": self.max if self.count else 0.0
+        }
+        for p in percentiles:
+            result[f"p{p:g}"] = self.percentile(p)
+        return result
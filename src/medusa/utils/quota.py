@@ -0,0 +1,451 @@
+"""
+API quota accounting for Medusa library.
+
+This module tracks daily API quota units, as charged by the YouTube Data API:
+- Per-method call costs (videos.insert, thumbnails.set, ...)
+- A ledger persisted across restarts that resets at midnight Pacific time
+- Reservations that admit an operation only while budget remains, deferring
+  the rest until units are released or the quota resets
+"""
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import threading
+from datetime import date, datetime, time, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, Any, Optional, Set, Tuple, Union
+
+from ..exceptions import MedusaError, RateLimitError
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Default daily quota of a Google Cloud project for the YouTube Data API
+YOUTUBE_DAILY_QUOTA = 10000
+
+# Quota units charged per YouTube Data API call
+YOUTUBE_QUOTA_COSTS = {
+    "videos.insert": 1600,
+    "videos.update": 50,
+    "videos.delete": 50,
+    "videos.list": 1,
+    "thumbnails.set": 50,
+    "channels.list": 1,
+}
+
+# Cost of calls missing from the cost table (read operations cost one unit)
+DEFAULT_CALL_COST = 1
+
+# US Pacific time offsets; daylight time runs from the second Sunday in March
+# until the first Sunday in November, switching at 02:00 local time
+_PACIFIC_STANDARD_OFFSET = timedelta(hours=-8)
+_PACIFIC_DAYLIGHT_OFFSET = timedelta(hours=-7)
+
+
+def _nth_sunday(year: int, month: int, n: int) -> date:
+    """Get the nth Sunday of a month."""
+    first = date(year, month, 1)
+    return first + timedelta(days=(6 - first.weekday()) % 7 + 7 * (n - 1))
+
+
+def _pacific_offset(moment: datetime) -> timedelta:
+    """Get the UTC offset of US Pacific time at an aware UTC moment."""
+    dst_start = datetime.combine(_nth_sunday(moment.year, 3, 2), time(10), tzinfo=timezone.utc)
+    dst_end = datetime.combine(_nth_sunday(moment.year, 11, 1), time(9), tzinfo=timezone.utc)
+    if dst_start <= moment < dst_end:
+        return _PACIFIC_DAYLIGHT_OFFSET
+    return _PACIFIC_STANDARD_OFFSET
+
+
+def _to_utc(moment: datetime) -> datetime:
+    """Convert a datetime to aware UTC, treating naive values as UTC."""
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+
+def quota_day(moment: datetime) -> date:
+    """
+    Get the quota day a moment falls in.
+
+    Args:
+        moment: Datetime (naive values are treated as UTC)
+
+    Returns:
+        Calendar date in US Pacific time
+    """
+    moment = _to_utc(moment)
+    return (moment + _pacific_offset(moment)).date()
+
+
+def next_quota_reset(moment: datetime) -> datetime:
+    """
+    Get when the quota day containing a moment ends.
+
+    Args:
+        moment: Datetime (naive values are treated as UTC)
+
+    Returns:
+        Aware UTC datetime of the next midnight in US Pacific time
+    """
+    moment = _to_utc(moment)
+    midnight = datetime.combine(quota_day(moment) + timedelta(days=1), time(),
+                                tzinfo=timezone.utc)
+    # DST switches at 02:00, so the offset a few hours before midnight applies
+    return midnight - _pacific_offset(midnight - _PACIFIC_STANDARD_OFFSET - timedelta(hours=3))
+
+
+class QuotaLedgerError(MedusaError):
+    """Exception raised for quota ledger operations."""
+    pass
+
+
+class QuotaReservation:
+    """Units set aside for an operation admitted by a QuotaLedger."""
+
+    __slots__ = ("units",)
+
+    def __init__(self, units: int):
+        self.units = units
+
+
+class QuotaLedger:
+    """
+    Thread-safe daily quota ledger.
+
+    Units are charged with record() as API calls are made. Operations first
+    reserve their expected cost: a reservation is only granted while the
+    units used plus the units reserved by operations in flight stay within
+    the daily limit, so concurrent uploads cannot overrun the quota between
+    them. Used units and per-method call counts are written to a JSON file
+    (temp file, fsync, rename) after every charge, so they survive restarts;
+    the write happens outside the ledger lock, so reservations and status
+    reads never wait on the disk. Everything resets when the quota day rolls
+    over at midnight Pacific time.
+    """
+
+    def __init__(self,
+                 path: Optional[Union[str, Path]] = None,
+                 daily_limit: int = YOUTUBE_DAILY_QUOTA,
+                 costs: Optional[Dict[str, int]] = None,
+                 clock: Optional[Callable[[], datetime]] = None,
+                 platform: str = "youtube"):
+        """
+        Initialize QuotaLedger.
+
+        Args:
+            path: Optional JSON file persisting the ledger (in memory if None)
+            daily_limit: Units available per quota day
+            costs: Cost per API method (defaults to YOUTUBE_QUOTA_COSTS)
+            clock: Optional function returning the current aware datetime
+            platform: Platform named in rate limit errors
+
+        Raises:
+            QuotaLedgerError: If daily_limit is not positive or the ledger
+                file cannot be read
+        """
+        if daily_limit <= 0:
+            raise QuotaLedgerError("daily_limit must be positive")
+
+        self.path = Path(path) if path is not None else None
+        self.daily_limit = daily_limit
+        self.costs = dict(YOUTUBE_QUOTA_COSTS if costs is None else costs)
+        self.platform = platform
+        self._clock = clock or (lambda: datetime.now(timezone.utc))
+        self._lock = threading.Lock()
+        # Serializes file writes so a newer snapshot is never replaced by an older one
+        self._save_lock = threading.Lock()
+        self._waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+
+        self._day = quota_day(self._clock())
+        self._used = 0
+        self._reserved = 0
+        self._calls: Dict[str, Dict[str, int]] = {}
+        self._load()
+
+        logger.debug(f"QuotaLedger initialized with {self.remaining}/{daily_limit} units remaining")
+
+    def cost_of(self, method: str) -> int:
+        """
+        Get the quota cost of an API method.
+
+        Args:
+            method: API method name, e.g. "videos.insert"
+
+        Returns:
+            Units charged per call
+        """
+        return self.costs.get(method, DEFAULT_CALL_COST)
+
+    @property
+    def used(self) -> int:
+        """Units charged in the current quota day."""
+        with self._lock:
+            self._roll_over()
+            return self._used
+
+    @property
+    def remaining(self) -> int:
+        """Units neither charged nor reserved in the current quota day."""
+        with self._lock:
+            self._roll_over()
+            return max(self.daily_limit - self._used - self._reserved, 0)
+
+    def seconds_until_reset(self) -> float:
+        """
+        Get the time left in the current quota day.
+
+        Returns:
+            Seconds until the next midnight Pacific time
+        """
+        now = self._clock()
+        return max((next_quota_reset(now) - _to_utc(now)).total_seconds(), 0.0)
+
+    def try_reserve(self, units: int) -> Optional[QuotaReservation]:
+        """
+        Reserve units if the budget allows it, without waiting.
+
+        Args:
+            units: Units the operation is expected to charge
+
+        Returns:
+            QuotaReservation, or None if too few units remain
+
+        Raises:
+            QuotaLedgerError: If units is negative or exceeds the daily limit
+        """
+        if units < 0 or units > self.daily_limit:
+            raise QuotaLedgerError(f"Cannot reserve {units} of {self.daily_limit} daily units")
+
+        with self._lock:
+            self._roll_over()
+            if self._used + self._reserved + units > self.daily_limit:
+                return None
+            self._reserved += units
+            return QuotaReservation(units)
+
+    async def reserve(self, units: int, timeout: Optional[float] = None) -> QuotaReservation:
+        """
+        Reserve units, waiting until enough are released or the quota resets.
+
+        Args:
+            units: Units the operation is expected to charge
+            timeout: Maximum seconds to wait (None waits indefinitely, 0 fails
+                immediately when the budget is short)
+
+        Returns:
+            QuotaReservation to pass to record() and release()
+
+        Raises:
+            QuotaLedgerError: If units is negative or exceeds the daily limit
+            RateLimitError: If the units could not be reserved within timeout
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+
+        while True:
+            waiter = (loop, asyncio.Event())
+            with self._lock:
+                self._waiters.add(waiter)
+            try:
+                reservation = self.try_reserve(units)
+                if reservation is not None:
+                    return reservation
+
+                # Budget frees up when reservations are released or the day ends
+                wait = self.seconds_until_reset() + 0.001
+                if deadline is not None:
+                    if deadline - loop.time() <= 0:
+                        raise RateLimitError(
+                            f"Daily quota exhausted: {units} units needed, "
+                            f"{self.remaining} of {self.daily_limit} remaining",
+                            platform=self.platform,
+                            retry_after=int(self.seconds_until_reset()) + 1,
+                            quota_exceeded=True
+                        )
+                    wait = min(wait, deadline - loop.time())
+
+                logger.debug(f"Deferring operation needing {units} quota units for up to {wait:.0f}s")
+                try:
+                    await asyncio.wait_for(waiter[1].wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+            finally:
+                with self._lock:
+                    self._waiters.discard(waiter)
+
+    def record(self, method: str, reservation: Optional[QuotaReservation] = None) -> int:
+        """
+        Charge the cost of an API call.
+
+        Args:
+            method: API method name, e.g. "videos.insert"
+            reservation: Optional reservation the call was admitted under;
+                its reserved units are consumed first
+
+        Returns:
+            Units charged
+        """
+        units = self.cost_of(method)
+        with self._lock:
+            self._roll_over()
+            if reservation is not None:
+                consumed = min(units, reservation.units)
+                reservation.units -= consumed
+                self._reserved -= consumed
+            self._used += units
+            call_stats = self._calls.setdefault(method, {"count": 0, "units": 0})
+            call_stats["count"] += 1
+            call_stats["units"] += units
+
+        self._save()
+        return units
+
+    def release(self, reservation: QuotaReservation) -> None:
+        """
+        Return the unused units of a reservation to the budget.
+
+        Args:
+            reservation: Reservation from try_reserve() or reserve()
+        """
+        with self._lock:
+            self._reserved = max(self._reserved - reservation.units, 0)
+            reservation.units = 0
+            waiters = list(self._waiters)
+
+        for loop, event in waiters:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(event.set)
+
+    def mark_exhausted(self) -> None:
+        """
+        Treat the rest of the quota day as used.
+
+        Called when the API reports the quota exceeded even though the ledger
+        had units left, e.g. because another client shares the project.
+        """
+        with self._lock:
+            self._roll_over()
+            self._used = max(self._used, self.daily_limit - self._reserved)
+
+        self._save()
+
+        logger.warning("API reported quota exceeded; deferring until the quota resets")
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Get quota accounting information.
+
+        Returns:
+            Dictionary with the quota day, limit, used, reserved and remaining
+            units, the reset time and per-method call counts and units
+        """
+        now = self._clock()
+        with self._lock:
+            self._roll_over()
+            return {
+                "quota_day": self._day.isoformat(),
+                "daily_limit": self.daily_limit,
+                "used": self._used,
+                "reserved": self._reserved,
+                "remaining": max(self.daily_limit - self._used - self._reserved, 0),
+                "resets_at": next_quota_reset(now).isoformat(),
+                "calls": {method: dict(stats) for method, stats in self._calls.items()}
+            }
+
+    def _roll_over(self) -> None:
+        """Start a new quota day if the current one has ended. Caller must hold the lock."""
+        today = quota_day(self._clock())
+        if today == self._day:
+            return
+
+        # Not saved: a file from an earlier quota day is ignored on load
+        self._day = today
+        self._used = 0
+        self._calls = {}
+        logger.info(f"Quota day rolled over to {today.isoformat()}")
+
+        waiters = list(self._waiters)
+        for loop, event in waiters:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(event.set)
+
+    def _load(self) -> None:
+        """Load the persisted ledger for the current quota day, if any."""
+        if self.path is None or not self.path.exists():
+            return
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise QuotaLedgerError(f"Failed to read quota ledger {self.path}: {e}", original_error=e)
+
+        if data.get("quota_day") == self._day.isoformat():
+            self._used = int(data.get("used", 0))
+            self._calls = {
+                method: {"count": int(stats["count"]), "units": int(stats["units"])}
+                for method, stats in data.get("calls", {}).items()
+            }
+
+    def _save(self) -> None:
+        """Persist the ledger atomically. Caller must not hold the lock."""
+        if self.path is None:
+            return
+
+        with self._save_lock:
+            # Snapshot under the ledger lock, write outside it
+            with self._lock:
+                data = {
+                    "quota_day": self._day.isoformat(),
+                    "used": self._used,
+                    "calls": {method: dict(stats) for method, stats in self._calls.items()}
+                }
+            self._write(data)
+
+    def _write(self, data: Dict[str, Any]) -> None:
+        """Write a ledger snapshot via temp file, fsync and rename. Caller must hold _save_lock."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(data, f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.error(f"Failed to persist quota ledger {self.path}: {e}")
+
+
+_shared_ledgers: Dict[Path, QuotaLedger] = {}
+_shared_ledgers_lock = threading.Lock()
+
+
+def get_quota_ledger(path: Union[str, Path], daily_limit: int = YOUTUBE_DAILY_QUOTA) -> QuotaLedger:
+    """
+    Get the process-wide ledger persisted in a file.
+
+    Uploader instances pointing at the same file share one ledger, so their
+    reservations are admitted against the same budget.
+
+    Args:
+        path: JSON file persisting the ledger
+        daily_limit: Units available per quota day (used on first access)
+
+    Returns:
+        Shared QuotaLedger instance
+    """
+    key = Path(path).resolve()
+    with _shared_ledgers_lock:
+        ledger = _shared_ledgers.get(key)
+        if ledger is None:
+            ledger = _shared_ledgers[key] = QuotaLedger(key, daily_limit=daily_limit)
+        return ledger
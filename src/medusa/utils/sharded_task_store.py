@@ -0,0 +1,332 @@
+"""
+Sharded in-memory task storage for Medusa library.
+
+This module provides ShardedTaskStore, a drop-in replacement for TaskStore
+for workloads with many concurrent writers:
+- Tasks partitioned by task ID hash across independently locked shards
+- Lock-free get_task and task_exists
+- Queries aggregated across shards in the same order as TaskStore
+"""
+
+import contextlib
+import heapq
+import itertools
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple, Union, Any
+
+from ..models import TaskResult, TaskStatus, datetime_to_epoch_us
+from .journal import TaskJournal
+from .task_store import TaskStore, TaskStoreError
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_SHARD_COUNT = 16
+
+
+class ShardedTaskStore(TaskStore):
+    """
+    TaskStore that stripes tasks across independently locked shards.
+
+    Each shard is a plain TaskStore holding the tasks whose ID hashes to it,
+    so writers touching different tasks rarely contend for the same lock.
+    Every shard indexes its tasks by the unique (created_at, task_id) key, so
+    cross-shard queries merge the per-shard created_at indexes into exactly
+    the order a single TaskStore would return.
+
+    get_task and task_exists read the shard dictionary without locking: a
+    dictionary lookup is atomic in CPython and writers only ever replace whole
+    entries, so readers see either the previous or the new TaskResult.
+    """
+
+    def __init__(self,
+                 shard_count: int = DEFAULT_SHARD_COUNT,
+                 cleanup_enabled: bool = True,
+                 max_task_age_hours: int = 24,
+                 cleanup_interval_minutes: int = 60,
+                 journal: Optional[TaskJournal] = None):
+        """
+        Initialize ShardedTaskStore.
+
+        Args:
+            shard_count: Number of independently locked shards
+            cleanup_enabled: Whether to enable automatic cleanup
+            max_task_age_hours: Maximum age of tasks before cleanup (hours)
+            cleanup_interval_minutes: Interval between cleanup runs (minutes)
+            journal: Optional TaskJournal that records every change and
+                supplies the tasks restored at startup
+
+        Raises:
+            TaskStoreError: If shard_count is not positive
+        """
+        super().__init__(cleanup_enabled=cleanup_enabled,
+                         max_task_age_hours=max_task_age_hours,
+                         cleanup_interval_minutes=cleanup_interval_minutes)
+
+        if shard_count <= 0:
+            self.stop_cleanup()
+            raise TaskStoreError("shard_count must be positive")
+
+        self.shard_count = shard_count
+        self._shards: List[TaskStore] = [
+            TaskStore(cleanup_enabled=False) for _ in range(shard_count)
+        ]
+
+        # Restore journaled tasks before the shards start recording changes
+        self._journal = journal
+        if self._journal is not None:
+            for task in self._journal.get_tasks():
+                self._shard_for(task.task_id).store_task(task)
+            for shard in self._shards:
+                shard._journal = self._journal
+
+        logger.debug(f"ShardedTaskStore initialized with {shard_count} shards")
+
+    def _shard_for(self, task_id: str) -> TaskStore:
+        """Get the shard responsible for a task ID."""
+        return self._shards[hash(task_id) % self.shard_count]
+
+    def store_task(self, task: TaskResult) -> bool:
+        """
+        Store a task in the task store.
+
+        Args:
+            task: TaskResult to store
+
+        Returns:
+            True if task was stored successfully
+
+        Raises:
+            TaskStoreError: If task is invalid or already exists
+        """
+        if task is None:
+            raise TaskStoreError("Task cannot be None")
+        return self._shard_for(task.task_id).store_task(task)
+
+    def get_task(self, task_id: str) -> Optional[TaskResult]:
+        """
+        Retrieve a task by ID without taking a lock.
+
+        Args:
+            task_id: Task ID to retrieve
+
+        Returns:
+            TaskResult if found, None otherwise
+        """
+        if not task_id:
+            return None
+        return self._shard_for(task_id)._tasks.get(task_id)
+
+    def get_tasks(self, task_ids: Iterable[str]) -> Dict[str, Optional[TaskResult]]:
+        """
+        Retrieve several tasks without taking a lock.
+
+        Args:
+            task_ids: Task IDs to retrieve
+
+        Returns:
+            Dictionary mapping every requested ID, in request order, to its
+            TaskResult or None if not found
+        """
+        return {task_id: self._shard_for(task_id)._tasks.get(task_id) if task_id else None
+                for task_id in task_ids}
+
+    def update_task(self, task: TaskResult) -> bool:
+        """
+        Update an existing task.
+
+        Args:
+            task: Updated TaskResult
+
+        Returns:
+            True if task was updated successfully
+
+        Raises:
+            TaskStoreError: If task doesn't exist
+        """
+        if task is None:
+            raise TaskStoreError("Task cannot be None")
+        return self._shard_for(task.task_id).update_task(task)
+
+    def delete_task(self, task_id: str) -> bool:
+        """
+        Delete a task by ID.
+
+        Args:
+            task_id: Task ID to delete
+
+        Returns:
+            True if task was deleted, False if not found
+        """
+        if not task_id:
+            return False
+        return self._shard_for(task_id).delete_task(task_id)
+
+    def task_exists(self, task_id: str) -> bool:
+        """
+        Check if a task exists without taking a lock.
+
+        Args:
+            task_id: Task ID to check
+
+        Returns:
+            True if task exists, False otherwise
+        """
+        if not task_id:
+            return False
+        return task_id in self._shard_for(task_id)._tasks
+
+    def get_all_tasks(self) -> List[TaskResult]:
+        """
+        Get all tasks in the store.
+
+        Returns:
+            List of all TaskResult objects in creation order
+        """
+        return self.get_tasks_by_created_range(newest_first=False)
+
+    def get_tasks_by_status(self, status: Union[TaskStatus, List[TaskStatus]]) -> List[TaskResult]:
+        """
+        Get tasks filtered by status.
+
+        Args:
+            status: TaskStatus or list of TaskStatus to filter by
+
+        Returns:
+            List of TaskResult objects with matching status
+        """
+        tasks = []
+        for shard in self._shards:
+            tasks.extend(shard.get_tasks_by_status(status))
+        return tasks
+
+    def get_tasks_created_after(self, cutoff_time: datetime) -> List[TaskResult]:
+        """
+        Get tasks created after a specific time.
+
+        Args:
+            cutoff_time: Datetime cutoff for filtering
+
+        Returns:
+            List of TaskResult objects created after cutoff_time
+        """
+        cutoff_us = datetime_to_epoch_us(cutoff_time)
+        return [task for task in self.get_tasks_by_created_range(created_after=cutoff_time,
+                                                                 newest_first=False)
+                if task.created_at_us > cutoff_us]
+
+    def get_tasks_by_created_range(self,
+                                   created_after: Optional[datetime] = None,
+                                   created_before: Optional[datetime] = None,
+                                   status_filter: Optional[List[TaskStatus]] = None,
+                                   offset: int = 0,
+                                   limit: Optional[int] = None,
+                                   newest_first: bool = True,
+                                   cursor: Optional[Tuple[int, str]] = None) -> List[TaskResult]:
+        """
+        Get a page of tasks ordered by creation time.
+
+        Each shard contributes at most offset + limit matches from its own
+        created_at index; the sorted runs are then merged.
+
+        Args:
+            created_after: Optional inclusive lower bound on created_at
+            created_before: Optional inclusive upper bound on created_at
+            status_filter: Optional list of statuses to include
+            offset: Number of matching tasks to skip
+            limit: Maximum number of tasks to return (None for all)
+            newest_first: Whether to return newest tasks first
+            cursor: Optional (created_at_us, task_id) key from cursor_for();
+                only tasks strictly after it in the requested order are returned
+
+        Returns:
+            List of TaskResult objects in creation order
+        """
+        count = None if limit is None else offset + limit
+        runs = []
+        for shard in self._shards:
+            with shard._lock:
+                runs.append(shard._created_range(created_after, created_before,
+                                                 status_filter, count, newest_first,
+                                                 cursor))
+
+        merged = heapq.merge(*runs, key=lambda match: match[0], reverse=newest_first)
+        stop = None if limit is None else offset + limit
+        return [task for _, task in itertools.islice(merged, offset, stop)]
+
+    def get_task_count(self, status: Optional[TaskStatus] = None) -> int:
+        """
+        Get count of tasks, optionally filtered by status.
+
+        Args:
+            status: Optional TaskStatus to filter by
+
+        Returns:
+            Number of tasks matching criteria
+        """
+        return sum(shard.get_task_count(status) for shard in self._shards)
+
+    def clear_all_tasks(self) -> int:
+        """
+        Clear all tasks from the store.
+
+        All shard locks are taken in shard order, so the store is emptied in
+        one step and the journal records a single clear.
+
+        Returns:
+            Number of tasks that were cleared
+        """
+        with contextlib.ExitStack() as stack:
+            for shard in self._shards:
+                stack.enter_context(shard._lock)
+            count = sum(shard._clear_tasks() for shard in self._shards)
+            if self._journal is not None:
+                self._journal.record_tasks_cleared()
+        logger.debug(f"Cleared all {count} tasks from store")
+        return count
+
+    def _remove_expired_tasks(self,
+                              cutoff_time: datetime,
+                              status_filter: Optional[List[TaskStatus]] = None) -> List[str]:
+        """Remove expired tasks shard by shard, holding one shard lock at a time."""
+        removed = []
+        for shard in self._shards:
+            with shard._lock:
+                removed.extend(shard._remove_expired_tasks(cutoff_time, status_filter))
+        return removed
+
+    def get_storage_stats(self) -> Dict[str, Any]:
+        """
+        Get storage statistics aggregated across shards.
+
+        Returns:
+            Dictionary with storage statistics including shard sizes
+        """
+        now = datetime.now(timezone.utc)
+        status_counts: Dict[str, int] = {}
+        shard_sizes = []
+        ages = []
+
+        for shard in self._shards:
+            with shard._lock:
+                shard_sizes.append(len(shard._tasks))
+                for task_status, tasks in shard._status_index.items():
+                    if tasks:
+                        status_counts[task_status.value] = (
+                            status_counts.get(task_status.value, 0) + len(tasks)
+                        )
+                ages.extend((now - task.created_at).total_seconds() / 3600
+                            for task in shard._tasks.values())
+
+        return {
+            "total_tasks": sum(shard_sizes),
+            "status_counts": status_counts,
+            "oldest_task_hours": max(ages) if ages else 0,
+            "newest_task_hours": min(ages) if ages else 0,
+            "average_age_hours": sum(ages) / len(ages) if ages else 0,
+            "cleanup_enabled": self.cleanup_enabled,
+            "max_task_age_hours": self.max_task_age_hours,
+            "shard_count": self.shard_count,
+            "shard_sizes": shard_sizes
+        }
@@ -0,0 +1,339 @@
+"""
+SQLite-backed persistent task storage for Medusa library.
+
+This module provides SQLiteTaskStore, a drop-in replacement for TaskStore that
+keeps tasks across restarts:
+- SQLite database in WAL mode on the local host, no server required
+- Indexed status and created_at columns
+- Batched, coalesced write-behind with a configurable flush interval
+- Reads served from the in-memory TaskStore indexes loaded at startup
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union, Any, Tuple
+
+from ..models import TaskResult, TaskStatus
+from .task_store import TaskStore, TaskStoreError
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS tasks (
+        task_id TEXT PRIMARY KEY,
+        status TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        data TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status)",
+    "CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON tasks (created_at)",
+)
+
+# Statements are constant strings so sqlite3's statement cache keeps them prepared
+_UPSERT_SQL = (
+    "INSERT INTO tasks (task_id, status, created_at, data) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT(task_id) DO UPDATE SET "
+    "status = excluded.status, created_at = excluded.created_at, data = excluded.data"
+)
+_DELETE_SQL = "DELETE FROM tasks WHERE task_id = ?"
+_LOAD_SQL = "SELECT data FROM tasks ORDER BY created_at"
+
+# Marker for a pending delete in the write buffer
+_DELETED = None
+
+
+class SQLiteTaskStore(TaskStore):
+    """
+    Persistent TaskStore backed by a SQLite database in WAL mode.
+
+    The store keeps the full in-memory TaskStore (and its status and
+    created_at indexes) as the read path, loading it from the database at
+    startup. Writes are buffered per task ID, so repeated updates of the same
+    task collapse into one row write, and flushed in a single transaction
+    when batch_size changes are pending, every flush_interval seconds, on
+    flush() and on close().
+
+    Changes made within the last flush_interval may be lost on a crash; use
+    batch_size=1 for write-through durability.
+    """
+
+    def __init__(self,
+                 db_path: Union[str, Path],
+                 batch_size: int = 100,
+                 flush_interval: float = 1.0,
+                 cleanup_enabled: bool = True,
+                 max_task_age_hours: int = 24,
+                 cleanup_interval_minutes: int = 60):
+        """
+        Initialize SQLiteTaskStore and load persisted tasks.
+
+        Args:
+            db_path: Path to the SQLite database file (created if missing)
+            batch_size: Number of pending changes that triggers a flush
+            flush_interval: Maximum seconds a change stays buffered (0 disables the timer)
+            cleanup_enabled: Whether to enable automatic cleanup
+            max_task_age_hours: Maximum age of tasks before cleanup (hours)
+            cleanup_interval_minutes: Interval between cleanup runs (minutes)
+
+        Raises:
+            TaskStoreError: If parameters are invalid or the database cannot be opened
+        """
+        super().__init__(cleanup_enabled=cleanup_enabled,
+                         max_task_age_hours=max_task_age_hours,
+                         cleanup_interval_minutes=cleanup_interval_minutes)
+
+        if batch_size <= 0 or flush_interval < 0:
+            self.stop_cleanup()
+            raise TaskStoreError("batch_size must be positive and flush_interval non-negative")
+
+        self.db_path = Path(db_path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        # task_id -> row tuple to upsert, or _DELETED
+        self._pending: Dict[str, Optional[Tuple[str, str, float, str]]] = {}
+        self._db_lock = threading.Lock()
+        self._closed = False
+
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            with self._conn:
+                for statement in _SCHEMA:
+                    self._conn.execute(statement)
+        except (OSError, sqlite3.Error) as e:
+            self.stop_cleanup()
+            raise TaskStoreError(f"Cannot open task database {self.db_path}: {e}",
+                                 original_error=e)
+
+        self._load_tasks()
+
+        # Background flusher
+        self._flush_event = threading.Event()
+        self._flush_thread: Optional[threading.Thread] = None
+        if self.flush_interval > 0:
+            self._flush_thread = threading.Thread(
+                target=self._flush_loop, name="medusa-task-store-flush", daemon=True
+            )
+            self._flush_thread.start()
+
+        logger.debug(f"SQLiteTaskStore opened {self.db_path} with {len(self._tasks)} tasks")
+
+    def _load_tasks(self) -> None:
+        """Load all persisted tasks into the in-memory indexes."""
+        loaded = 0
+        with self._db_lock:
+            rows = self._conn.execute(_LOAD_SQL).fetchall()
+
+        with self._lock:
+            for (data,) in rows:
+                try:
+                    task = TaskResult.from_dict(json.loads(data))
+                except (ValueError, KeyError) as e:
+                    logger.warning(f"Skipping unreadable task row: {e}")
+                    continue
+                TaskStore.store_task(self, task)
+                loaded += 1
+
+        if loaded:
+            logger.info(f"Loaded {loaded} tasks from {self.db_path}")
+
+    @staticmethod
+    def _task_row(task: TaskResult) -> Tuple[str, str, float, str]:
+        """Serialize a task into a database row."""
+        return (
+            task.task_id,
+            task.status.value,
+            task.created_at.timestamp(),
+            json.dumps(task.to_dict(), default=str)
+        )
+
+    def _enqueue(self, task_id: str, row: Optional[Tuple[str, str, float, str]]) -> None:
+        """Buffer a row change, replacing any earlier change of the same task."""
+        with self._db_lock:
+            self._check_open()
+            self._pending[task_id] = row
+
+    def _flush_if_full(self) -> None:
+        """Flush once batch_size changes are pending."""
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def _check_open(self) -> None:
+        """Raise if the store was closed."""
+        if self._closed:
+            raise TaskStoreError("Task store is closed")
+
+    def store_task(self, task: TaskResult) -> bool:
+        """
+        Store a task in the task store.
+
+        Args:
+            task: TaskResult to store
+
+        Returns:
+            True if task was stored successfully
+
+        Raises:
+            TaskStoreError: If task is invalid or already exists
+        """
+        with self._lock:
+            self._check_open()
+            super().store_task(task)
+            self._enqueue(task.task_id, self._task_row(task))
+        self._flush_if_full()
+        return True
+
+    def update_task(self, task: TaskResult) -> bool:
+        """
+        Update an existing task.
+
+        Args:
+            task: Updated TaskResult
+
+        Returns:
+            True if task was updated successfully
+
+        Raises:
+            TaskStoreError: If task doesn't exist
+        """
+        with self._lock:
+            self._check_open()
+            super().update_task(task)
+            self._enqueue(task.task_id, self._task_row(task))
+        self._flush_if_full()
+        return True
+
+    def delete_task(self, task_id: str) -> bool:
+        """
+        Delete a task by ID.
+
+        Args:
+            task_id: Task ID to delete
+
+        Returns:
+            True if task was deleted, False if not found
+        """
+        with self._lock:
+            self._check_open()
+            deleted = super().delete_task(task_id)
+            if deleted:
+                self._enqueue(task_id, _DELETED)
+        self._flush_if_full()
+        return deleted
+
+    def clear_all_tasks(self) -> int:
+        """
+        Clear all tasks from the store and the database.
+
+        Returns:
+            Number of tasks that were cleared
+        """
+        with self._lock:
+            count = super().clear_all_tasks()
+            with self._db_lock:
+                self._check_open()
+                self._pending.clear()
+                with self._conn:
+                    self._conn.execute("DELETE FROM tasks")
+        return count
+
+    def _remove_expired_tasks(self,
+                              cutoff_time: datetime,
+                              status_filter: Optional[List[TaskStatus]] = None) -> List[str]:
+        """Remove expired tasks from memory and buffer their deletion."""
+        removed = super()._remove_expired_tasks(cutoff_time, status_filter)
+        for task_id in removed:
+            self._enqueue(task_id, _DELETED)
+        self._flush_if_full()
+        return removed
+
+    def flush(self) -> int:
+        """
+        Write all buffered changes to the database in one transaction.
+
+        Returns:
+            Number of row changes written
+
+        Raises:
+            TaskStoreError: If the write fails
+        """
+        with self._db_lock:
+            if self._closed or not self._pending:
+                return 0
+
+            pending = self._pending
+            self._pending = {}
+            upserts = [row for row in pending.values() if row is not _DELETED]
+            deletes = [(task_id,) for task_id, row in pending.items() if row is _DELETED]
+
+            try:
+                with self._conn:
+                    if upserts:
+                        self._conn.executemany(_UPSERT_SQL, upserts)
+                    if deletes:
+                        self._conn.executemany(_DELETE_SQL, deletes)
+            except sqlite3.Error as e:
+                # Keep the changes so the next flush retries them
+                pending.update(self._pending)
+                self._pending = pending
+                raise TaskStoreError(f"Failed to write tasks to {self.db_path}: {e}",
+                                     original_error=e)
+
+        logger.debug(f"Flushed {len(pending)} task changes to {self.db_path}")
+        return len(pending)
+
+    def _flush_loop(self) -> None:
+        """Flush buffered changes every flush_interval seconds until closed."""
+        while not self._flush_event.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error during task store flush: {e}")
+
+    def get_storage_stats(self) -> Dict[str, Any]:
+        """
+        Get storage statistics.
+
+        Returns:
+            Dictionary with storage statistics including database details
+        """
+        stats = super().get_storage_stats()
+        with self._db_lock:
+            stats["database_path"] = str(self.db_path)
+            stats["pending_writes"] = len(self._pending)
+        return stats
+
+    def close(self) -> None:
+        """Flush buffered changes, stop background threads and close the database."""
+        if self._closed:
+            return
+
+        self.stop_cleanup()
+        self._flush_event.set()
+        if self._flush_thread is not None:
+            self._flush_thread.join()
+
+        self.flush()
+        with self._db_lock:
+            self._closed = True
+            self._conn.close()
+
+        logger.debug(f"SQLiteTaskStore closed {self.db_path}")
+
+    def __enter__(self) -> 'SQLiteTaskStore':
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Context manager exit."""
+        self.close()
@@ -9,14 +9,23 @@ This module provides comprehensive state management functionality including:
 - Support for state rollback scenarios
 """
 
+import asyncio
+import heapq
+import itertools
 import logging
+import threading
+import weakref
 from enum import Enum
-from typing import Dict, List, Optional, Callable, Any
+from typing import Dict, List, Optional, Callable, Any, Set, Iterable
 from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
-from collections import defaultdict
+from collections import defaultdict, deque, OrderedDict
+from concurrent.futures import Executor
 
 from ..exceptions import MedusaError
+from ..models import datetime_to_epoch_us, epoch_us_to_datetime
+from .journal import TaskJournal
+from .expiry import ExpiryJob, get_expiry_scheduler
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -70,14 +79,53 @@ class TaskState(Enum):
         return target_state in valid_transitions.get(self, set())
 
 
-@dataclass
 class StateTransition:
-    """Represents a task state transition with validation and metadata."""
-    from_state: Optional[TaskState]
-    to_state: TaskState
-    timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
-    message: Optional[str] = None
-    is_rollback: bool = False
+    """
+    Represents a task state transition with validation and metadata.
+    
+    Instances use __slots__ and keep the timestamp as integer epoch
+    microseconds; the timestamp property converts on access.
+    """
+    
+    __slots__ = ("from_state", "to_state", "timestamp_us", "message", "is_rollback")
+    
+    def __init__(self,
+                 from_state: Optional[TaskState],
+                 to_state: TaskState,
+                 timestamp: Optional[datetime] = None,
+                 message: Optional[str] = None,
+                 is_rollback: bool = False):
+        self.from_state = from_state
+        self.to_state = to_state
+        self.timestamp_us = datetime_to_epoch_us(
+            timestamp if timestamp is not None else datetime.now(timezone.utc)
+        )
+        self.message = message
+        self.is_rollback = is_rollback
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Transition time as a UTC datetime."""
+        return epoch_us_to_datetime(self.timestamp_us)
+    
+    @timestamp.setter
+    def timestamp(self, value: datetime) -> None:
+        self.timestamp_us = datetime_to_epoch_us(value)
+    
+    def _astuple(self) -> tuple:
+        return (self.from_state, self.to_state, self.timestamp_us, self.message, self.is_rollback)
+    
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._astuple() == other._astuple()
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return (f"{self.__class__.__qualname__}(from_state={self.from_state!r}, "
+                f"to_state={self.to_state!r}, timestamp={self.timestamp!r}, "
+                f"message={self.message!r}, is_rollback={self.is_rollback!r})")
     
     def validate(self) -> None:
         """
@@ -140,9 +188,35 @@ class StateTransition:
 
 @dataclass
 class StateHistory:
-    """Manages the complete history of state transitions for a task."""
+    """
+    Manages the history of state transitions for a task.
+    
+    With max_transitions set, only the most recent transitions are kept in a
+    ring buffer, capping memory per task. Per-state durations and the set of
+    states reached are maintained incrementally by add_transition, so they
+    still cover evicted transitions and get_state_durations is O(states).
+    """
     task_id: str
     transitions: List[StateTransition] = field(default_factory=list)
+    max_transitions: Optional[int] = None
+    _durations_us: Dict[TaskState, int] = field(default_factory=dict, init=False,
+                                                repr=False, compare=False)
+    _reached_states: Set[TaskState] = field(default_factory=set, init=False,
+                                            repr=False, compare=False)
+    
+    def __post_init__(self):
+        """Build the ring buffer and incremental statistics from initial transitions."""
+        if self.max_transitions is not None:
+            if self.max_transitions <= 0:
+                raise InvalidStateError("max_transitions must be positive")
+            transitions = self.transitions
+            self.transitions = deque(maxlen=self.max_transitions)
+        else:
+            transitions = self.transitions
+            self.transitions = []
+        
+        for transition in transitions:
+            self._append(transition)
     
     @property
     def current_state(self) -> Optional[TaskState]:
@@ -178,10 +252,39 @@ class StateHistory:
         transition.validate()
         
         # Add to history
-        self.transitions.append(transition)
+        self._append(transition)
         
         logger.debug(f"Task {self.task_id}: State transition {transition.from_state} -> {transition.to_state}")
     
+    def _append(self, transition: StateTransition) -> None:
+        """Append a transition and close the interval spent in the previous state."""
+        if self.transitions:
+            previous = self.transitions[-1]
+            self._durations_us[previous.to_state] = (
+                self._durations_us.get(previous.to_state, 0)
+                + transition.timestamp_us - previous.timestamp_us
+            )
+        
+        self.transitions.append(transition)
+        self._reached_states.add(transition.to_state)
+    
+    def merge_evicted_statistics(self,
+                                 durations_us: Dict[TaskState, int],
+                                 reached_states: Set[TaskState]) -> None:
+        """
+        Account for transitions evicted before this history was built.
+        
+        Used when restoring a capped history from a journal, which keeps
+        the statistics of transitions it dropped.
+        
+        Args:
+            durations_us: Microseconds spent in each state by evicted transitions
+            reached_states: States reached by evicted transitions
+        """
+        for state, us in durations_us.items():
+            self._durations_us[state] = self._durations_us.get(state, 0) + us
+        self._reached_states.update(reached_states)
+    
     def get_state_durations(self) -> Dict[TaskState, timedelta]:
         """
         Calculate how long the task spent in each state.
@@ -189,27 +292,17 @@ class StateHistory:
         Returns:
             Dictionary mapping states to their durations
         """
-        durations = defaultdict(timedelta)
-        
-        if not self.transitions:
-            return dict(durations)
-        
-        current_time = datetime.now(timezone.utc)
+        durations = dict(self._durations_us)
         
-        for i, transition in enumerate(self.transitions):
-            state = transition.to_state
-            start_time = transition.timestamp
-            
-            # Calculate end time (next transition or current time)
-            if i + 1 < len(self.transitions):
-                end_time = self.transitions[i + 1].timestamp
-            else:
-                end_time = current_time
-            
-            duration = end_time - start_time
-            durations[state] += duration
+        if self.transitions:
+            # The current state runs until now
+            current = self.transitions[-1]
+            now_us = datetime_to_epoch_us(datetime.now(timezone.utc))
+            durations[current.to_state] = (
+                durations.get(current.to_state, 0) + now_us - current.timestamp_us
+            )
         
-        return dict(durations)
+        return {state: timedelta(microseconds=us) for state, us in durations.items()}
     
     def rollback_to_state(self, target_state: TaskState, message: Optional[str] = None) -> StateTransition:
         """
@@ -225,9 +318,8 @@ class StateHistory:
         Raises:
             InvalidStateError: If target state is not in history
         """
-        # Check if target state exists in history
-        target_exists = any(t.to_state == target_state for t in self.transitions)
-        if not target_exists:
+        # Check if target state was ever reached, including evicted transitions
+        if target_state not in self._reached_states:
             raise InvalidStateError(f"Cannot rollback to state {target_state.value} - not in history")
         
         # Create rollback transition
@@ -242,23 +334,249 @@ class StateHistory:
         return rollback_transition
 
 
+DEFAULT_LISTENER_QUEUE_SIZE = 1000
+
+
+class OverflowPolicy(Enum):
+    """What an async listener queue does when it is full."""
+    DROP_OLDEST = "drop_oldest"
+    BLOCK = "block"
+
+
+class _QueuedListener:
+    """
+    Bounded event queue feeding one async listener on an event loop.
+    
+    Events may be put from any thread. A worker task on the loop delivers
+    them in order, awaiting coroutine listeners directly and running plain
+    callables in an executor. Pending events for the same task in a
+    coalesced state are replaced by the newest one, keeping their position.
+    """
+    
+    def __init__(self,
+                 callback: Callable,
+                 loop: asyncio.AbstractEventLoop,
+                 max_queue_size: int,
+                 overflow_policy: OverflowPolicy,
+                 executor: Optional[Executor],
+                 coalesce: bool):
+        self.callback = callback
+        self.max_queue_size = max_queue_size
+        self.overflow_policy = overflow_policy
+        self.dropped = 0
+        self.coalesced = 0
+        self.delivered = 0
+        self.failed = 0
+        
+        self._loop = loop
+        self._executor = executor
+        self._coalesce = coalesce
+        self._is_coroutine = asyncio.iscoroutinefunction(callback)
+        self._pending: "OrderedDict[Any, tuple]" = OrderedDict()
+        self._keys = itertools.count()
+        self._condition = threading.Condition()
+        # Created on the loop by _start(); asyncio primitives bind to the
+        # running loop, and registration may happen on another thread
+        self._wakeup: Optional[asyncio.Event] = None
+        self._in_flight = False
+        self._closed = False
+        self._loop_thread: Optional[int] = None
+        self._drain_waiters: List[asyncio.Future] = []
+        self._task: Optional[asyncio.Task] = None
+        
+        loop.call_soon_threadsafe(self._start)
+    
+    def _start(self) -> None:
+        """Start the delivery worker. Runs on the loop."""
+        self._loop_thread = threading.get_ident()
+        self._wakeup = asyncio.Event()
+        if not self._closed:
+            self._task = self._loop.create_task(self._run())
+    
+    def put(self, task_id: str, transition: StateTransition) -> None:
+        """Queue an event, applying coalescing and the overflow policy."""
+        with self._condition:
+            if self._closed:
+                return
+            
+            key = task_id if self._coalesce else next(self._keys)
+            if key in self._pending:
+                self._pending[key] = (task_id, transition)
+                self.coalesced += 1
+                return
+            
+            while len(self._pending) >= self.max_queue_size and not self._closed:
+                if self.overflow_policy is OverflowPolicy.DROP_OLDEST:
+                    self._pending.popitem(last=False)
+                    self.dropped += 1
+                elif threading.get_ident() == self._loop_thread:
+                    # Waiting here would stop the worker that frees space
+                    logger.warning(f"Listener queue for {self.callback!r} is full; "
+                                   f"cannot block on the event loop thread")
+                    break
+                else:
+                    self._condition.wait()
+            
+            self._pending[key] = (task_id, transition)
+        
+        self._loop.call_soon_threadsafe(self._notify)
+    
+    def _notify(self) -> None:
+        """Wake the delivery worker. Runs on the loop."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+    
+    async def _run(self) -> None:
+        """Deliver queued events until cancelled."""
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            
+            while True:
+                with self._condition:
+                    if not self._pending:
+                        break
+                    _, (task_id, transition) = self._pending.popitem(last=False)
+                    self._in_flight = True
+                    self._condition.notify_all()
+                
+                try:
+                    if self._is_coroutine:
+                        await self.callback(task_id, transition)
+                    else:
+                        await self._loop.run_in_executor(self._executor, self.callback,
+                                                         task_id, transition)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.failed += 1
+                    logger.error(f"Error in async state change listener for "
+                                 f"{transition.to_state.value}: {e}")
+                else:
+                    self.delivered += 1
+                finally:
+                    self._in_flight = False
+            
+            self._release_drain_waiters()
+    
+    def _release_drain_waiters(self) -> None:
+        """Wake drain() callers. Runs on the loop."""
+        waiters, self._drain_waiters = self._drain_waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+    
+    async def drain(self) -> None:
+        """Wait until every queued event was delivered. Must run on the loop."""
+        while True:
+            with self._condition:
+                if self._closed or (not self._pending and not self._in_flight):
+                    return
+            waiter = self._loop.create_future()
+            self._drain_waiters.append(waiter)
+            self._notify()
+            await waiter
+    
+    def close(self) -> None:
+        """Discard pending events and stop the worker."""
+        with self._condition:
+            self._closed = True
+            self._pending.clear()
+            self._condition.notify_all()
+        
+        def stop():
+            if self._task is not None:
+                self._task.cancel()
+            self._release_drain_waiters()
+        
+        if not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(stop)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue counters."""
+        with self._condition:
+            return {
+                "pending": len(self._pending),
+                "max_queue_size": self.max_queue_size,
+                "overflow_policy": self.overflow_policy.value,
+                "delivered": self.delivered,
+                "failed": self.failed,
+                "dropped": self.dropped,
+                "coalesced": self.coalesced
+            }
+
+
 class StateEventSystem:
-    """Event system for notifying listeners about state changes."""
+    """
+    Event system for notifying listeners about state changes.
+    
+    Listeners are called synchronously inside emit_state_change by default.
+    Listeners registered with async_dispatch=True get a bounded queue drained
+    on an event loop instead, so slow listeners never hold up a transition.
+    """
     
-    def __init__(self):
-        """Initialize the event system."""
+    def __init__(self, coalesce_states: Optional[Set[TaskState]] = None):
+        """
+        Initialize the event system.
+        
+        Args:
+            coalesce_states: States whose queued events for the same task are
+                coalesced in async listener queues (defaults to IN_PROGRESS,
+                which is re-entered on every retry)
+        """
         self._listeners: Dict[TaskState, List[Callable]] = defaultdict(list)
+        self._queued_listeners: Dict[TaskState, List[_QueuedListener]] = defaultdict(list)
+        self.coalesce_states = (set(coalesce_states) if coalesce_states is not None
+                                else {TaskState.IN_PROGRESS})
     
-    def register_listener(self, state: TaskState, callback: Callable[[str, StateTransition], None]) -> None:
+    def register_listener(self,
+                          state: TaskState,
+                          callback: Callable[[str, StateTransition], Any],
+                          async_dispatch: bool = False,
+                          max_queue_size: int = DEFAULT_LISTENER_QUEUE_SIZE,
+                          overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+                          executor: Optional[Executor] = None,
+                          loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
         """
         Register a listener for state changes.
         
         Args:
             state: TaskState to listen for
-            callback: Function to call when state is reached
+            callback: Function or coroutine function to call when state is reached
+            async_dispatch: Whether to deliver events through a bounded queue
+                on an event loop instead of calling the listener inline
+            max_queue_size: Maximum number of queued events (async dispatch only)
+            overflow_policy: What to do when the queue is full (async dispatch only)
+            executor: Executor for plain callables (async dispatch only; None
+                uses the loop's default executor)
+            loop: Event loop to deliver on (defaults to the running loop)
+            
+        Raises:
+            InvalidStateError: If async dispatch is requested without an event
+                loop or with a non-positive queue size
         """
-        self._listeners[state].append(callback)
-        logger.debug(f"Registered listener for state {state.value}")
+        if not async_dispatch:
+            self._listeners[state].append(callback)
+            logger.debug(f"Registered listener for state {state.value}")
+            return
+        
+        if max_queue_size <= 0:
+            raise InvalidStateError("max_queue_size must be positive")
+        
+        if loop is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError as e:
+                raise InvalidStateError(
+                    "Async listeners need a running event loop or an explicit loop",
+                    original_error=e
+                )
+        
+        self._queued_listeners[state].append(_QueuedListener(
+            callback, loop, max_queue_size, overflow_policy, executor,
+            coalesce=state in self.coalesce_states
+        ))
+        logger.debug(f"Registered async listener for state {state.value}")
     
     def unregister_listener(self, state: TaskState, callback: Callable[[str, StateTransition], None]) -> None:
         """
@@ -271,6 +589,12 @@ class StateEventSystem:
         if callback in self._listeners[state]:
             self._listeners[state].remove(callback)
             logger.debug(f"Unregistered listener for state {state.value}")
+        
+        for queued in list(self._queued_listeners.get(state, ())):
+            if queued.callback == callback:
+                queued.close()
+                self._queued_listeners[state].remove(queued)
+                logger.debug(f"Unregistered async listener for state {state.value}")
     
     def emit_state_change(self, task_id: str, transition: StateTransition) -> None:
         """
@@ -289,15 +613,118 @@ class StateEventSystem:
             except Exception as e:
                 logger.error(f"Error in state change listener for {state.value}: {e}")
                 # Don't re-raise to prevent one failing listener from affecting others
+        
+        for queued in self._queued_listeners.get(state, ()):
+            queued.put(task_id, transition)
+    
+    async def drain(self) -> None:
+        """Wait until all async listeners have processed their queued events."""
+        for queued_listeners in list(self._queued_listeners.values()):
+            for queued in list(queued_listeners):
+                await queued.drain()
+    
+    def close(self) -> None:
+        """Stop all async listeners, discarding undelivered events."""
+        for queued_listeners in self._queued_listeners.values():
+            for queued in queued_listeners:
+                queued.close()
+        self._queued_listeners.clear()
+    
+    def get_listener_stats(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get queue statistics for async listeners.
+        
+        Returns:
+            Dictionary mapping state values to per-listener queue statistics
+        """
+        return {
+            state.value: [queued.get_stats() for queued in queued_listeners]
+            for state, queued_listeners in self._queued_listeners.items()
+            if queued_listeners
+        }
 
 
 class TaskStateManager:
     """Centralized manager for task state operations and history tracking."""
     
-    def __init__(self):
-        """Initialize the task state manager."""
+    def __init__(self,
+                 journal: Optional[TaskJournal] = None,
+                 cleanup_interval_minutes: Optional[int] = None,
+                 max_history_age_hours: int = 24,
+                 max_transitions_per_task: Optional[int] = None):
+        """
+        Initialize the task state manager.
+        
+        Args:
+            journal: Optional TaskJournal that records every transition and
+                supplies the histories restored at startup
+            cleanup_interval_minutes: Optional interval for automatic cleanup of
+                old histories on the shared expiry scheduler (None disables it)
+            max_history_age_hours: Maximum history age used by automatic cleanup
+            max_transitions_per_task: Optional number of most recent transitions
+                kept per task (None keeps the full history). State durations and
+                reached states still cover evicted transitions, including after
+                a restart from the journal
+        """
         self._task_histories: Dict[str, StateHistory] = {}
         self._event_system = StateEventSystem()
+        self._lock = threading.RLock()
+        self.max_transitions_per_task = max_transitions_per_task
+        
+        # Expiry heap of (last transition epoch microseconds, sequence, history). Entries
+        # are not moved when a task transitions; cleanup re-checks the popped
+        # history and pushes it back with its real last transition time.
+        self._expiry_heap: List[tuple] = []
+        self._expiry_sequence = itertools.count()
+        
+        # Restore journaled histories; they were validated when first recorded
+        self._journal = journal
+        if self._journal is not None:
+            if max_transitions_per_task is not None:
+                self._journal.set_history_limit(max_transitions_per_task)
+            evicted = self._journal.get_evicted_statistics()
+            for task_id, transitions in self._journal.get_histories().items():
+                history = StateHistory(
+                    task_id,
+                    [StateTransition.from_dict(data) for data in transitions],
+                    max_transitions=max_transitions_per_task
+                )
+                if task_id in evicted:
+                    history.merge_evicted_statistics(
+                        {TaskState(state): us for state, us in evicted[task_id]["durations_us"].items()},
+                        {TaskState(state) for state in evicted[task_id]["reached"]}
+                    )
+                self._task_histories[task_id] = history
+                self._push_expiry(history)
+        
+        self.max_history_age_hours = max_history_age_hours
+        self._cleanup_job: Optional[ExpiryJob] = None
+        if cleanup_interval_minutes is not None:
+            cleanup = weakref.WeakMethod(self.cleanup_old_tasks)
+            
+            def cleanup_task():
+                method = cleanup()
+                if method is None:
+                    return False
+                method(max_history_age_hours)
+            
+            self._cleanup_job = get_expiry_scheduler().schedule(
+                cleanup_interval_minutes * 60,
+                cleanup_task,
+                name="TaskStateManager.cleanup_old_tasks"
+            )
+    
+    def _push_expiry(self, history: StateHistory) -> None:
+        """Track a history in the expiry heap. Caller must hold the lock."""
+        if history.transitions:
+            heapq.heappush(self._expiry_heap, (history.transitions[-1].timestamp_us,
+                                               next(self._expiry_sequence), history))
+    
+    def stop_cleanup(self) -> None:
+        """Stop automatic cleanup if running."""
+        if self._cleanup_job:
+            get_expiry_scheduler().cancel(self._cleanup_job)
+            self._cleanup_job = None
     
     def initialize_task(self, task_id: str, initial_state: TaskState) -> None:
         """
@@ -310,24 +737,47 @@ class TaskStateManager:
         Raises:
             InvalidStateError: If task already exists
         """
-        if task_id in self._task_histories:
-            raise InvalidStateError(f"Task {task_id} already exists")
-        
-        # Create history and initial transition
-        history = StateHistory(task_id)
-        initial_transition = StateTransition(
-            from_state=None,
-            to_state=initial_state
-        )
-        
-        history.add_transition(initial_transition)
-        self._task_histories[task_id] = history
+        with self._lock:
+            if task_id in self._task_histories:
+                raise InvalidStateError(f"Task {task_id} already exists")
+            
+            # Create history and initial transition
+            history = StateHistory(task_id, max_transitions=self.max_transitions_per_task)
+            initial_transition = StateTransition(
+                from_state=None,
+                to_state=initial_state
+            )
+            
+            history.add_transition(initial_transition)
+            self._task_histories[task_id] = history
+            self._push_expiry(history)
+            if self._journal is not None:
+                self._journal.record_transition(task_id, initial_transition)
         
         # Emit state change event
         self._event_system.emit_state_change(task_id, initial_transition)
         
         logger.info(f"Initialized task {task_id} with state {initial_state.value}")
     
+    def check_transition(self, task_id: str, new_state: TaskState) -> None:
+        """
+        Check that a task could transition to a new state, without recording it.
+        
+        Args:
+            task_id: Task identifier
+            new_state: Target state
+            
+        Raises:
+            InvalidStateError: If task doesn't exist
+            StateTransitionError: If transition is invalid
+        """
+        with self._lock:
+            if task_id not in self._task_histories:
+                raise InvalidStateError(f"Task {task_id} not found")
+            
+            current_state = self._task_histories[task_id].current_state
+            StateTransition(from_state=current_state, to_state=new_state).validate()
+    
     def transition_state(self, task_id: str, new_state: TaskState, message: Optional[str] = None) -> StateTransition:
         """
         Transition a task to a new state.
@@ -344,21 +794,24 @@ class TaskStateManager:
             InvalidStateError: If task doesn't exist
             StateTransitionError: If transition is invalid
         """
-        if task_id not in self._task_histories:
-            raise InvalidStateError(f"Task {task_id} not found")
-        
-        history = self._task_histories[task_id]
-        current_state = history.current_state
-        
-        # Create and validate transition
-        transition = StateTransition(
-            from_state=current_state,
-            to_state=new_state,
-            message=message
-        )
-        
-        # Add to history (validates transition)
-        history.add_transition(transition)
+        with self._lock:
+            if task_id not in self._task_histories:
+                raise InvalidStateError(f"Task {task_id} not found")
+            
+            history = self._task_histories[task_id]
+            current_state = history.current_state
+            
+            # Create and validate transition
+            transition = StateTransition(
+                from_state=current_state,
+                to_state=new_state,
+                message=message
+            )
+            
+            # Add to history (validates transition)
+            history.add_transition(transition)
+            if self._journal is not None:
+                self._journal.record_transition(task_id, transition)
         
         # Emit state change event
         self._event_system.emit_state_change(task_id, transition)
@@ -406,6 +859,24 @@ class TaskStateManager:
         
         return self._task_histories[task_id]
     
+    def get_task_transitions(self, task_ids: Iterable[str]) -> Dict[str, List[StateTransition]]:
+        """
+        Snapshot the transitions of several tasks under one lock acquisition.
+        
+        Args:
+            task_ids: Task identifiers
+            
+        Returns:
+            Dictionary mapping each known task ID to a copy of its transitions;
+            unknown task IDs are left out
+        """
+        with self._lock:
+            histories = self._task_histories
+            return {
+                task_id: list(histories[task_id].transitions)
+                for task_id in task_ids if task_id in histories
+            }
+    
     def rollback_task(self, task_id: str, target_state: TaskState, message: Optional[str] = None) -> StateTransition:
         """
         Rollback a task to a previous state.
@@ -421,11 +892,14 @@ class TaskStateManager:
         Raises:
             InvalidStateError: If task doesn't exist or invalid rollback
         """
-        if task_id not in self._task_histories:
-            raise InvalidStateError(f"Task {task_id} not found")
-        
-        history = self._task_histories[task_id]
-        rollback_transition = history.rollback_to_state(target_state, message)
+        with self._lock:
+            if task_id not in self._task_histories:
+                raise InvalidStateError(f"Task {task_id} not found")
+            
+            history = self._task_histories[task_id]
+            rollback_transition = history.rollback_to_state(target_state, message)
+            if self._journal is not None:
+                self._journal.record_transition(task_id, rollback_transition)
         
         # Emit state change event
         self._event_system.emit_state_change(task_id, rollback_transition)
@@ -433,15 +907,23 @@ class TaskStateManager:
         logger.info(f"Task {task_id}: Rolled back to {target_state.value}")
         return rollback_transition
     
-    def register_state_listener(self, state: TaskState, callback: Callable[[str, StateTransition], None]) -> None:
+    def register_state_listener(self, state: TaskState, callback: Callable[[str, StateTransition], Any],
+                                **dispatch_options: Any) -> None:
         """
         Register a listener for state changes.
         
         Args:
             state: TaskState to listen for
-            callback: Function to call when state is reached
+            callback: Function or coroutine function to call when state is reached
+            **dispatch_options: Async dispatch options passed to
+                StateEventSystem.register_listener (async_dispatch,
+                max_queue_size, overflow_policy, executor, loop)
         """
-        self._event_system.register_listener(state, callback)
+        self._event_system.register_listener(state, callback, **dispatch_options)
+    
+    async def drain_state_events(self) -> None:
+        """Wait until async state listeners have processed all queued events."""
+        await self._event_system.drain()
     
     def unregister_state_listener(self, state: TaskState, callback: Callable[[str, StateTransition], None]) -> None:
         """
@@ -457,6 +939,10 @@ class TaskStateManager:
         """
         Clean up old task histories to prevent memory leaks.
         
+        Only histories whose expiry heap entry is older than the cutoff are
+        examined, so a run costs O(expired log n) amortized rather than a scan
+        of every history.
+        
         Args:
             max_age_hours: Maximum age in hours for keeping task histories
             
@@ -464,19 +950,30 @@ class TaskStateManager:
             Number of tasks cleaned up
         """
         cutoff_time = datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
-        tasks_to_remove = []
-        
-        for task_id, history in self._task_histories.items():
-            if history.transitions:
-                last_transition_time = history.transitions[-1].timestamp
-                if last_transition_time < cutoff_time:
-                    tasks_to_remove.append(task_id)
-        
-        for task_id in tasks_to_remove:
-            del self._task_histories[task_id]
-            logger.debug(f"Cleaned up old task history: {task_id}")
-        
-        return len(tasks_to_remove)
+        cutoff_us = datetime_to_epoch_us(cutoff_time)
+        removed = 0
+        
+        with self._lock:
+            while self._expiry_heap and self._expiry_heap[0][0] < cutoff_us:
+                _, _, history = heapq.heappop(self._expiry_heap)
+                task_id = history.task_id
+                
+                # Drop entries for histories that were already removed or replaced
+                if self._task_histories.get(task_id) is not history:
+                    continue
+                
+                if history.transitions[-1].timestamp_us >= cutoff_us:
+                    # The task transitioned since it was queued; look again later
+                    self._push_expiry(history)
+                    continue
+                
+                del self._task_histories[task_id]
+                if self._journal is not None:
+                    self._journal.record_history_removed(task_id)
+                removed += 1
+                logger.debug(f"Cleaned up old task history: {task_id}")
+        
+        return removed
     
     def get_state_statistics(self) -> Dict[TaskState, int]:
         """
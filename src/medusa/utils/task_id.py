@@ -3,19 +3,88 @@ Secure task ID generation system for Medusa library.
 
 This module provides task ID generation with:
 - UUID4-based cryptographically secure IDs
+- Optional compact, monotonic, time-sortable IDs (ULID)
 - Prefix-based categorization
 - Task type classification
 - Timestamp tracking
 - Full validation and parsing utilities
+- Single-pass matching, cached parsing and bulk validation
 """
 
-import uuid
+import os
 import re
-from datetime import datetime
-from typing import Optional, Dict, Any, Union
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, Union, Iterable, List
 
 from medusa.exceptions import ValidationError
 
+# Crockford base32, as used by ULID: excludes I, L, O and U
+ULID_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+ULID_LENGTH = 26
+ULID_TIMESTAMP_LENGTH = 10
+ULID_RANDOM_BITS = 80
+_ULID_DECODE = {char: value for value, char in enumerate(ULID_ALPHABET)}
+_ULID_MAX_RANDOM = (1 << ULID_RANDOM_BITS) - 1
+
+# Number of parsed task IDs each generator caches by default
+DEFAULT_PARSE_CACHE_SIZE = 10000
+
+# Whole-ID patterns, formatted with the escaped prefix of a generator
+UUID_ID_PATTERN = (
+    r'{prefix}(?:_(?P<task_type>[a-zA-Z][a-zA-Z0-9_]*))?_(?P<timestamp>\d{{14}})'
+    r'_(?P<uuid>[0-9a-f]{{8}}-[0-9a-f]{{4}}-4[0-9a-f]{{3}}-[89ab][0-9a-f]{{3}}-[0-9a-f]{{12}})\Z'
+)
+ULID_ID_PATTERN = (
+    r'{prefix}(?:_(?P<task_type>[a-zA-Z][a-zA-Z0-9_]*))?_(?P<ulid>[0-7][0-9A-HJKMNP-TV-Z]{{25}})\Z'
+)
+
+
+def encode_ulid(timestamp_ms: int, randomness: int) -> str:
+    """
+    Encode a millisecond timestamp and 80 random bits as a ULID string.
+    
+    Args:
+        timestamp_ms: Milliseconds since the Unix epoch (48 bits)
+        randomness: Random component (80 bits)
+        
+    Returns:
+        26-character Crockford base32 string that sorts by timestamp
+    """
+    value = (timestamp_ms << ULID_RANDOM_BITS) | randomness
+    chars = []
+    for _ in range(ULID_LENGTH):
+        chars.append(ULID_ALPHABET[value & 0x1F])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+def decode_ulid_timestamp(ulid: str) -> int:
+    """
+    Decode the millisecond timestamp of a ULID string.
+    
+    Only the first ten characters are read, so this is constant time.
+    
+    Args:
+        ulid: ULID string
+        
+    Returns:
+        Milliseconds since the Unix epoch
+        
+    Raises:
+        ValueError: If the timestamp characters are not Crockford base32
+    """
+    timestamp_ms = 0
+    for char in ulid[:ULID_TIMESTAMP_LENGTH]:
+        digit = _ULID_DECODE.get(char)
+        if digit is None:
+            raise ValueError(f"Invalid ULID character: {char!r}")
+        timestamp_ms = (timestamp_ms << 5) | digit
+    return timestamp_ms
+
 
 class InvalidTaskIDError(Exception):
     """Exception raised for invalid task ID operations."""
@@ -43,8 +112,14 @@ class TaskIDGenerator:
     Where:
     - prefix: Configurable prefix (default: "medusa_task")
     - task_type: Optional categorization (e.g., "upload", "publish")
-    - timestamp: UTC timestamp in YYYYMMDDHHMMSS format
+    - timestamp: Local timestamp in YYYYMMDDHHMMSS format
     - uuid4: Cryptographically secure UUID4
+    
+    With sortable=True, IDs are {prefix}[_{task_type}]_{ulid} instead: a
+    26-character ULID holding a 48-bit millisecond timestamp and 80 random
+    bits. IDs from one generator are strictly increasing, even within a
+    millisecond, so IDs with the same prefix and task type sort by creation
+    time as plain strings.
     """
     
     DEFAULT_PREFIX = "medusa_task"
@@ -56,16 +131,21 @@ class TaskIDGenerator:
     UUID4_PATTERN = re.compile(
         r'^[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$'
     )
+    ULID_PATTERN = re.compile(r'^[0-7][0-9A-HJKMNP-TV-Z]{25}$')
     
-    def __init__(self, prefix: str = DEFAULT_PREFIX):
+    def __init__(self, prefix: str = DEFAULT_PREFIX, sortable: bool = False,
+                 parse_cache_size: int = DEFAULT_PARSE_CACHE_SIZE):
         """
         Initialize TaskIDGenerator with optional custom prefix.
         
         Args:
             prefix: Custom prefix for task IDs (default: "medusa_task")
+            sortable: Whether to generate time-sortable ULID-based IDs
+            parse_cache_size: Number of parsed IDs to keep in the LRU cache
+                (0 disables caching)
             
         Raises:
-            MedusaValidationError: If prefix format is invalid
+            MedusaValidationError: If prefix format or parse_cache_size is invalid
         """
         if not self._validate_prefix(prefix):
             raise ValidationError(
@@ -73,6 +153,24 @@ class TaskIDGenerator:
                 f"Prefix must start with letter and contain only letters, numbers, and underscores."
             )
         self.prefix = prefix
+        self.sortable = sortable
+        if parse_cache_size < 0:
+            raise ValidationError("parse_cache_size must be non-negative")
+        
+        # Whole-ID matcher compiled once per generator, so valid IDs are
+        # checked in one regex pass instead of component by component
+        id_pattern = ULID_ID_PATTERN if sortable else UUID_ID_PATTERN
+        self._id_matcher = re.compile(id_pattern.format(prefix=re.escape(prefix)))
+        
+        # LRU cache of parsed IDs: task_id -> parsed components
+        self.parse_cache_size = parse_cache_size
+        self._parse_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
+        # Last ULID components, for monotonic generation within a millisecond
+        self._ulid_lock = threading.Lock()
+        self._last_timestamp_ms = -1
+        self._last_randomness = 0
     
     def generate_task_id(self, task_type: Optional[str] = None) -> str:
         """
@@ -93,6 +191,13 @@ class TaskIDGenerator:
                 f"Task type must start with letter and contain only letters, numbers, and underscores."
             )
         
+        if self.sortable:
+            parts = [self.prefix]
+            if task_type:
+                parts.append(task_type)
+            parts.append(self._next_ulid())
+            return "_".join(parts)
+        
         # Generate components
         timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
         unique_id = str(uuid.uuid4())
@@ -105,6 +210,31 @@ class TaskIDGenerator:
         
         return "_".join(parts)
     
+    def _next_ulid(self) -> str:
+        """
+        Generate the next ULID, strictly greater than the previous one.
+        
+        Within one millisecond, or if the clock steps backwards, the random
+        component of the previous ULID is incremented instead of redrawn.
+        
+        Returns:
+            ULID string
+        """
+        timestamp_ms = time.time_ns() // 1_000_000
+        with self._ulid_lock:
+            if timestamp_ms > self._last_timestamp_ms:
+                randomness = int.from_bytes(os.urandom(10), "big")
+            else:
+                timestamp_ms = self._last_timestamp_ms
+                randomness = self._last_randomness + 1
+                if randomness > _ULID_MAX_RANDOM:
+                    timestamp_ms += 1
+                    randomness = int.from_bytes(os.urandom(10), "big")
+            self._last_timestamp_ms = timestamp_ms
+            self._last_randomness = randomness
+        
+        return encode_ulid(timestamp_ms, randomness)
+    
     def validate_task_id(self, task_id: Any) -> bool:
         """
         Validate if a string is a valid task ID.
@@ -119,11 +249,23 @@ class TaskIDGenerator:
             return False
             
         try:
-            self.parse_task_id(task_id)
+            self._parse_cached(task_id)
             return True
         except (InvalidTaskIDError, ValueError, AttributeError):
             return False
     
+    def validate_many(self, task_ids: Iterable[Any]) -> List[bool]:
+        """
+        Validate a batch of task IDs.
+        
+        Args:
+            task_ids: Task IDs to validate
+            
+        Returns:
+            One validity flag per task ID, in input order
+        """
+        return [self.validate_task_id(task_id) for task_id in task_ids]
+    
     def parse_task_id(self, task_id: str) -> Dict[str, Any]:
         """
         Parse task ID into its components.
@@ -144,6 +286,112 @@ class TaskIDGenerator:
         if not isinstance(task_id, str):
             raise InvalidTaskIDError(f"Task ID must be string, got {type(task_id)}", task_id)
         
+        return dict(self._parse_cached(task_id))
+    
+    def parse_many(self, task_ids: Iterable[Any]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Parse a batch of task IDs.
+        
+        Args:
+            task_ids: Task IDs to parse
+            
+        Returns:
+            Parsed components (as returned by parse_task_id) per task ID, in
+            input order, with None for invalid IDs
+        """
+        results: List[Optional[Dict[str, Any]]] = []
+        for task_id in task_ids:
+            try:
+                results.append(self.parse_task_id(task_id))
+            except (InvalidTaskIDError, ValueError, AttributeError):
+                results.append(None)
+        return results
+    
+    def _parse_cached(self, task_id: str) -> Dict[str, Any]:
+        """
+        Parse a task ID through the LRU cache of parsed IDs.
+        
+        The returned dictionary is shared with the cache and must not be
+        modified.
+        
+        Args:
+            task_id: Task ID to parse
+            
+        Returns:
+            Parsed components
+            
+        Raises:
+            InvalidTaskIDError: If task ID format is invalid
+        """
+        if self.parse_cache_size:
+            with self._cache_lock:
+                parsed = self._parse_cache.get(task_id)
+                if parsed is not None:
+                    self._parse_cache.move_to_end(task_id)
+                    return parsed
+        
+        if self.sortable:
+            parsed = self._parse_sortable_task_id(task_id)
+        else:
+            parsed = self._parse_uuid_task_id(task_id)
+        
+        if self.parse_cache_size:
+            with self._cache_lock:
+                self._parse_cache[task_id] = parsed
+                if len(self._parse_cache) > self.parse_cache_size:
+                    self._parse_cache.popitem(last=False)
+        return parsed
+    
+    def _parse_uuid_task_id(self, task_id: str) -> Dict[str, Any]:
+        """
+        Parse a timestamp and UUID4-based task ID into its components.
+        
+        Args:
+            task_id: Task ID to parse
+            
+        Returns:
+            Parsed components
+            
+        Raises:
+            InvalidTaskIDError: If task ID format is invalid
+        """
+        match = self._id_matcher.match(task_id)
+        if match is None:
+            self._raise_uuid_task_id_error(task_id)
+        
+        task_type, timestamp_str, uuid_str = match.group("task_type", "timestamp", "uuid")
+        
+        try:
+            timestamp = datetime.strptime(timestamp_str, "%Y%m%d%H%M%S")
+        except ValueError as e:
+            raise InvalidTaskIDError(f"Invalid timestamp value in task ID: {timestamp_str}", task_id) from e
+        
+        try:
+            uuid_obj = uuid.UUID(uuid_str)
+            if uuid_obj.version != 4:
+                raise InvalidTaskIDError(f"Task ID must use UUID4, got UUID{uuid_obj.version}", task_id)
+        except ValueError as e:
+            raise InvalidTaskIDError(f"Invalid UUID in task ID: {uuid_str}", task_id) from e
+        
+        return {
+            "prefix": self.prefix,
+            "task_type": task_type,
+            "timestamp": timestamp,
+            "uuid": uuid_obj
+        }
+    
+    def _raise_uuid_task_id_error(self, task_id: str) -> None:
+        """
+        Explain why a task ID does not match the full-ID pattern.
+        
+        Walks the components one at a time; only invalid IDs take this path.
+        
+        Args:
+            task_id: Task ID that failed to match
+            
+        Raises:
+            InvalidTaskIDError: Always, describing the first invalid component
+        """
         # Use regex to parse task ID components more accurately
         # Pattern: prefix_[tasktype_]timestamp_uuid
         # UUID is always at the end, timestamp before it
@@ -151,7 +399,6 @@ class TaskIDGenerator:
         if not uuid_match:
             raise InvalidTaskIDError(f"No valid UUID4 found in task ID: {task_id}", task_id)
         
-        uuid_str = uuid_match.group(1)
         uuid_start = uuid_match.start()
         
         # Everything before UUID should end with _timestamp_
@@ -162,7 +409,6 @@ class TaskIDGenerator:
         if not timestamp_match:
             raise InvalidTaskIDError(f"No valid timestamp found in task ID: {task_id}", task_id)
         
-        timestamp_str = timestamp_match.group(1)
         timestamp_start = timestamp_match.start()
         
         # Everything before timestamp
@@ -172,8 +418,7 @@ class TaskIDGenerator:
         if not before_timestamp.startswith(self.prefix):
             raise InvalidTaskIDError(f"Task ID prefix mismatch: expected '{self.prefix}', got prefix from '{task_id}'", task_id)
         
-        # Determine task type (if any)
-        task_type = None
+        # Check the task type (if any)
         after_prefix = before_timestamp[len(self.prefix):]
         
         if after_prefix:
@@ -185,31 +430,42 @@ class TaskIDGenerator:
             if not self._validate_task_type(task_type):
                 raise InvalidTaskIDError(f"Invalid task type in task ID: {task_type}", task_id)
         
-        # Validate timestamp format
-        if not self._validate_timestamp(timestamp_str):
-            raise InvalidTaskIDError(f"Invalid timestamp format in task ID: {timestamp_str}", task_id)
-        
-        try:
-            timestamp = datetime.strptime(timestamp_str, "%Y%m%d%H%M%S")
-        except ValueError as e:
-            raise InvalidTaskIDError(f"Invalid timestamp value in task ID: {timestamp_str}", task_id) from e
+        raise InvalidTaskIDError(f"Invalid task ID format: {task_id}", task_id)
+    
+    def _parse_sortable_task_id(self, task_id: str) -> Dict[str, Any]:
+        """
+        Parse a ULID-based task ID into its components.
         
-        # Validate and parse UUID
-        if not self.UUID4_PATTERN.match(uuid_str):
-            raise InvalidTaskIDError(f"Invalid UUID format in task ID: {uuid_str}", task_id)
+        Args:
+            task_id: Task ID to parse
+            
+        Returns:
+            Dictionary with prefix, task_type, timestamp (UTC datetime) and
+            uuid (the ULID's 128 bits as a UUID object)
+            
+        Raises:
+            InvalidTaskIDError: If task ID format is invalid
+        """
+        match = self._id_matcher.match(task_id)
+        if match is None:
+            ulid = task_id[-ULID_LENGTH:]
+            if len(task_id) <= ULID_LENGTH or not self.ULID_PATTERN.match(ulid):
+                raise InvalidTaskIDError(f"No valid ULID found in task ID: {task_id}", task_id)
+            if task_id.startswith(f"{self.prefix}_"):
+                raise InvalidTaskIDError(f"Invalid task type in task ID: {task_id}", task_id)
+            raise InvalidTaskIDError(f"Task ID prefix mismatch: expected '{self.prefix}', got prefix from '{task_id}'", task_id)
         
-        try:
-            uuid_obj = uuid.UUID(uuid_str)
-            if uuid_obj.version != 4:
-                raise InvalidTaskIDError(f"Task ID must use UUID4, got UUID{uuid_obj.version}", task_id)
-        except ValueError as e:
-            raise InvalidTaskIDError(f"Invalid UUID in task ID: {uuid_str}", task_id) from e
+        task_type, ulid = match.group("task_type", "ulid")
+        timestamp_ms = decode_ulid_timestamp(ulid)
+        value = 0
+        for char in ulid:
+            value = (value << 5) | _ULID_DECODE[char]
         
         return {
             "prefix": self.prefix,
             "task_type": task_type,
-            "timestamp": timestamp,
-            "uuid": uuid_obj
+            "timestamp": datetime.fromtimestamp(timestamp_ms / 1000, tz=timezone.utc),
+            "uuid": uuid.UUID(int=value)
         }
     
     def is_task_id(self, task_id: Any) -> bool:
@@ -237,8 +493,7 @@ class TaskIDGenerator:
         Raises:
             InvalidTaskIDError: If task ID is invalid
         """
-        parsed = self.parse_task_id(task_id)
-        return parsed["uuid"]
+        return self.parse_task_id(task_id)["uuid"]
     
     def extract_timestamp(self, task_id: str) -> datetime:
         """
@@ -253,8 +508,7 @@ class TaskIDGenerator:
         Raises:
             InvalidTaskIDError: If task ID is invalid
         """
-        parsed = self.parse_task_id(task_id)
-        return parsed["timestamp"]
+        return self.parse_task_id(task_id)["timestamp"]
     
     def extract_task_type(self, task_id: str) -> Optional[str]:
         """
@@ -269,8 +523,7 @@ class TaskIDGenerator:
         Raises:
             InvalidTaskIDError: If task ID is invalid
         """
-        parsed = self.parse_task_id(task_id)
-        return parsed["task_type"]
+        return self.parse_task_id(task_id)["task_type"]
     
     def get_task_id_summary(self, task_id: str) -> Dict[str, Any]:
         """
@@ -340,31 +593,35 @@ class TaskIDGenerator:
         return bool(self.TIMESTAMP_PATTERN.match(timestamp))
     
     @classmethod
-    def quick_generate(cls, prefix: str = DEFAULT_PREFIX, task_type: Optional[str] = None) -> str:
+    def quick_generate(cls, prefix: str = DEFAULT_PREFIX, task_type: Optional[str] = None,
+                       sortable: bool = False) -> str:
         """
         Quick task ID generation without creating generator instance.
         
         Args:
             prefix: Task prefix (default: "medusa_task")
             task_type: Optional task type
+            sortable: Whether to generate a time-sortable ULID-based ID
             
         Returns:
             Generated task ID
         """
-        generator = cls(prefix=prefix)
+        generator = cls(prefix=prefix, sortable=sortable)
         return generator.generate_task_id(task_type=task_type)
     
     @classmethod
-    def quick_validate(cls, task_id: str, prefix: str = DEFAULT_PREFIX) -> bool:
+    def quick_validate(cls, task_id: str, prefix: str = DEFAULT_PREFIX,
+                       sortable: bool = False) -> bool:
         """
         Quick task ID validation without creating generator instance.
         
         Args:
             task_id: Task ID to validate
             prefix: Expected prefix (default: "medusa_task")
+            sortable: Whether to expect a ULID-based ID
             
         Returns:
             True if valid, False otherwise
         """
-        generator = cls(prefix=prefix)
+        generator = cls(prefix=prefix, sortable=sortable)
         return generator.validate_task_id(task_id) 
\ No newline at end of file
@@ -5,17 +5,22 @@ This module provides comprehensive task status management functionality includin
 - TaskStatusManager for status operations and formatted responses
 - Task status querying with filtering and pagination
 - Performance metrics collection and tracking
+- Streaming duration percentiles per status and per platform
 - Status history management with progress indicators
 - Spec-compliant response formatting
 """
 
+import asyncio
 import logging
 import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Union, Iterable, AsyncIterator, Tuple, Set, Callable
 from dataclasses import dataclass, field
 
 from ..models import TaskResult, TaskStatus
+from ..utils.latency import LatencySketch
 from ..utils.task_store import TaskStore
 from ..utils.states import TaskStateManager, TaskState, StateTransition
 from ..exceptions import MedusaError
@@ -23,6 +28,48 @@ from ..exceptions import MedusaError
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Number of per-task change versions remembered for watch()
+WATCH_HISTORY_SIZE = 100000
+
+# States that end a task; reaching one records the task's total duration
+TERMINAL_STATES = frozenset({TaskState.COMPLETED, TaskState.FAILED, TaskState.CANCELLED})
+
+
+def encode_cursor(created_at_us: int, task_id: str) -> str:
+    """
+    Encode a created_at index key as an opaque pagination cursor.
+    
+    Args:
+        created_at_us: Task creation time in epoch microseconds
+        task_id: Task ID
+        
+    Returns:
+        Cursor string
+    """
+    return f"{created_at_us}:{task_id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[int, str]:
+    """
+    Decode a pagination cursor produced by encode_cursor.
+    
+    Args:
+        cursor: Cursor string
+        
+    Returns:
+        (created_at epoch microseconds, task_id) key
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    created_at_us, separator, task_id = cursor.partition(":")
+    if not separator or not task_id:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    try:
+        return int(created_at_us), task_id
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from None
+
 
 class TaskStatusError(MedusaError):
     """Exception raised for task status operations."""
@@ -49,6 +96,7 @@ class TaskStatusQuery:
     created_before: Optional[datetime] = None
     limit: Optional[int] = None
     offset: int = 0
+    cursor: Optional[str] = None
     
     def __post_init__(self):
         """Validate query parameters."""
@@ -58,6 +106,9 @@ class TaskStatusQuery:
         if self.offset < 0:
             raise ValueError("Offset must be non-negative")
         
+        if self.cursor is not None:
+            decode_cursor(self.cursor)
+        
         if (self.created_after is not None and 
             self.created_before is not None and 
             self.created_after >= self.created_before):
@@ -107,6 +158,44 @@ class TaskStatusResponse:
         return result
 
 
+@dataclass
+class TaskStatusPage:
+    """One page of a task status query."""
+    items: List[TaskStatusResponse] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the page to a dictionary.
+        
+        Returns:
+            Dictionary with the page's task statuses and the cursor of the next page
+        """
+        return {
+            "items": [dict(item.to_dict(), task_id=item.task_id) for item in self.items],
+            "next_cursor": self.next_cursor
+        }
+
+
+@dataclass
+class TaskWatchResult:
+    """Changes returned by a watch call."""
+    version: int
+    changes: List[TaskStatusResponse] = field(default_factory=list)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the watch result to a dictionary.
+        
+        Returns:
+            Dictionary with the version to resume from and changed task statuses
+        """
+        return {
+            "version": self.version,
+            "changes": [dict(change.to_dict(), task_id=change.task_id) for change in self.changes]
+        }
+
+
 class TaskStatusManager:
     """
     Manager for task status operations with formatted responses.
@@ -117,6 +206,7 @@ class TaskStatusManager:
     - History tracking with progress indicators
     - Bulk status operations
     - Filtering and pagination support
+    - Push-style watch API woken by state change events
     """
     
     def __init__(self, 
@@ -139,8 +229,55 @@ class TaskStatusManager:
         }
         self._lock = threading.RLock()
         
+        # Watch support: a monotonic version bumped on every state change.
+        # task_id -> version of its latest change, ordered by version. Entries
+        # beyond WATCH_HISTORY_SIZE are forgotten oldest first; a forgotten
+        # task counts as changed at _forgotten_version.
+        self._version = 0
+        self._forgotten_version = 0
+        self._task_versions: "OrderedDict[str, int]" = OrderedDict()
+        self._version_condition = threading.Condition()
+        self._async_waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+        
+        # Duration sketches, updated as tasks finish and platform operations
+        # return: terminal status -> task durations, and (platform, operation,
+        # status) -> platform call durations
+        self._latency_lock = threading.Lock()
+        self._status_latency: Dict[str, LatencySketch] = {}
+        self._platform_latency: Dict[Tuple[str, str, str], LatencySketch] = {}
+        
+        self._state_listener: Optional[Callable[[str, StateTransition], None]] = None
+        self.listen()
+        
         logger.debug("TaskStatusManager initialized")
     
+    def listen(self) -> None:
+        """
+        Start listening for state changes again after close().
+        
+        Called by __init__; safe to call while already listening.
+        """
+        if self._state_listener is not None:
+            return
+        # Keep the bound method so close() unregisters the same listener
+        self._state_listener = self._on_state_change
+        for state in TaskState:
+            self.state_manager.register_state_listener(state, self._state_listener)
+    
+    def close(self) -> None:
+        """
+        Stop listening for state changes.
+        
+        The state manager may outlive this status manager; without close()
+        it keeps the manager alive and keeps notifying it. Safe to call twice.
+        """
+        listener, self._state_listener = self._state_listener, None
+        if listener is None:
+            return
+        for state in TaskState:
+            self.state_manager.unregister_state_listener(state, listener)
+        logger.debug("TaskStatusManager closed")
+    
     def get_task_status(self, 
                        task_id: Optional[str],
                        include_history: bool = False,
@@ -190,6 +327,50 @@ class TaskStatusManager:
             
             return response
     
+    def get_task_statuses(self,
+                          task_ids: Iterable[str],
+                          include_history: bool = False,
+                          include_progress: bool = False) -> Dict[str, Optional[TaskStatusResponse]]:
+        """
+        Get statuses for a batch of tasks in one pass.
+        
+        Tasks are snapshotted from the store under a single lock acquisition
+        and, if requested, histories from the state manager under another.
+        
+        Args:
+            task_ids: Task IDs to query
+            include_history: Whether to include state history
+            include_progress: Whether to include progress information
+            
+        Returns:
+            Dictionary mapping every requested ID, in request order, to its
+            TaskStatusResponse or None if the task was not found
+        """
+        tasks = self.task_store.get_tasks(task_ids)
+        histories: Dict[str, List[StateTransition]] = {}
+        if include_history:
+            histories = self.state_manager.get_task_transitions(
+                task_id for task_id, task in tasks.items() if task is not None
+            )
+        
+        responses: Dict[str, Optional[TaskStatusResponse]] = {}
+        for task_id, task in tasks.items():
+            if task is None:
+                responses[task_id] = None
+                continue
+            
+            response = self._format_status_response(task)
+            transitions = histories.get(task_id)
+            if transitions:
+                response.history = [transition.to_dict() for transition in transitions]
+            if include_progress and task.results:
+                progress_data = task.results.get("progress")
+                if progress_data:
+                    response.progress = progress_data
+            responses[task_id] = response
+        
+        return responses
+    
     def get_multiple_task_statuses(self, 
                                   task_ids: List[str],
                                   skip_missing: bool = True,
@@ -210,28 +391,15 @@ class TaskStatusManager:
         Raises:
             TaskStatusError: If task not found and skip_missing=False
         """
-        responses = []
-        missing_tasks = []
-        
-        for task_id in task_ids:
-            try:
-                response = self.get_task_status(
-                    task_id, 
-                    include_history=include_history,
-                    include_progress=include_progress
-                )
-                responses.append(response)
-            except TaskStatusError as e:
-                if skip_missing:
-                    missing_tasks.append(task_id)
-                    continue
-                else:
-                    raise
+        statuses = self.get_task_statuses(task_ids, include_history, include_progress)
+        missing_tasks = [task_id for task_id, response in statuses.items() if response is None]
         
         if missing_tasks:
+            if not skip_missing:
+                raise TaskStatusError("Task not found", task_id=missing_tasks[0])
             logger.debug(f"Skipped missing tasks: {missing_tasks}")
         
-        return responses
+        return [statuses[task_id] for task_id in task_ids if statuses.get(task_id) is not None]
     
     def query_task_statuses(self, 
                            query: TaskStatusQuery,
@@ -248,31 +416,40 @@ class TaskStatusManager:
         Returns:
             List of TaskStatusResponse objects matching query
         """
-        with self._lock:
-            # Get all tasks from store
-            all_tasks = self.task_store.get_all_tasks()
-            
-            # Apply status filter
-            if query.status_filter:
-                all_tasks = [t for t in all_tasks if t.status in query.status_filter]
-            
-            # Apply time range filters
-            if query.created_after:
-                all_tasks = [t for t in all_tasks if t.created_at >= query.created_after]
-            
-            if query.created_before:
-                all_tasks = [t for t in all_tasks if t.created_at <= query.created_before]
-            
-            # Sort by creation time (newest first)
-            all_tasks.sort(key=lambda t: t.created_at, reverse=True)
+        return self.query_task_statuses_page(query, include_history, include_progress).items
+    
+    def query_task_statuses_page(self,
+                                 query: TaskStatusQuery,
+                                 include_history: bool = False,
+                                 include_progress: bool = False) -> TaskStatusPage:
+        """
+        Query one page of task statuses, newest first.
+        
+        Pages are keyed on (created_at, task_id): pass the returned
+        next_cursor as query.cursor to fetch the following page. Unlike
+        offsets, a cursor does not skip or repeat tasks when tasks are
+        created or removed between requests.
+        
+        Args:
+            query: TaskStatusQuery with filter parameters
+            include_history: Whether to include state history
+            include_progress: Whether to include progress information
             
-            # Apply pagination
-            start_idx = query.offset
-            if query.limit is not None:
-                end_idx = start_idx + query.limit
-                all_tasks = all_tasks[start_idx:end_idx]
-            else:
-                all_tasks = all_tasks[start_idx:]
+        Returns:
+            TaskStatusPage with the matching statuses and the cursor of the
+            next page, which is None once the results are exhausted
+        """
+        with self._lock:
+            # Walk the store's created_at index newest first; no full scan or sort
+            all_tasks = self.task_store.get_tasks_by_created_range(
+                created_after=query.created_after,
+                created_before=query.created_before,
+                status_filter=query.status_filter,
+                offset=query.offset,
+                limit=query.limit,
+                newest_first=True,
+                cursor=decode_cursor(query.cursor) if query.cursor is not None else None
+            )
             
             # Convert to responses
             responses = []
@@ -298,7 +475,12 @@ class TaskStatusManager:
                 
                 responses.append(response)
             
-            return responses
+            next_cursor = None
+            if all_tasks and query.limit is not None and len(all_tasks) == query.limit:
+                last = all_tasks[-1]
+                next_cursor = encode_cursor(last.created_at_us, last.task_id)
+            
+            return TaskStatusPage(items=responses, next_cursor=next_cursor)
     
     def get_task_performance_metrics(self, task_id: str) -> Dict[str, Any]:
         """
@@ -359,6 +541,7 @@ class TaskStatusManager:
                     "total_tasks": 0,
                     "average_duration": 0,
                     "status_breakdown": {},
+                    "latency_percentiles": self.get_latency_percentiles(),
                     "generated_at": datetime.now(timezone.utc).isoformat()
                 }
             
@@ -395,15 +578,200 @@ class TaskStatusManager:
                 "average_duration": average_duration,
                 "status_breakdown": status_breakdown,
                 "average_duration_by_status": avg_duration_by_status,
+                "latency_percentiles": self.get_latency_percentiles(),
                 "generated_at": datetime.now(timezone.utc).isoformat()
             }
     
+    def record_platform_duration(self,
+                                 platform: str,
+                                 operation: str,
+                                 duration_seconds: float,
+                                 status: TaskStatus = TaskStatus.COMPLETED) -> None:
+        """
+        Record how long a platform operation took.
+        
+        Args:
+            platform: Platform name
+            operation: Operation kind, e.g. "upload" or "publish"
+            duration_seconds: Duration of the operation
+            status: Outcome of the operation
+        """
+        key = (platform, operation, status.value)
+        with self._latency_lock:
+            sketch = self._platform_latency.get(key)
+            if sketch is None:
+                sketch = self._platform_latency[key] = LatencySketch()
+            sketch.record(max(duration_seconds, 0.0))
+    
+    def get_latency_percentiles(self) -> Dict[str, Any]:
+        """
+        Get duration percentiles without scanning the task store.
+        
+        Returns:
+            Dictionary with "by_status" (terminal status -> task duration
+            summary) and "by_platform" (platform -> operation -> status ->
+            operation duration summary); each summary has count, mean, max,
+            p50, p95 and p99 in seconds
+        """
+        with self._latency_lock:
+            by_platform: Dict[str, Dict[str, Dict[str, Any]]] = {}
+            for (platform, operation, status), sketch in self._platform_latency.items():
+                by_platform.setdefault(platform, {}).setdefault(operation, {})[status] = \
+                    sketch.summary()
+            return {
+                "by_status": {
+                    status: sketch.summary() for status, sketch in self._status_latency.items()
+                },
+                "by_platform": by_platform
+            }
+    
     def clear_performance_metrics(self) -> None:
         """Clear stored performance metrics."""
         with self._lock:
             self.performance_metrics.clear()
+            with self._latency_lock:
+                self._status_latency.clear()
+                self._platform_latency.clear()
             logger.debug("Performance metrics cleared")
     
+    @property
+    def current_version(self) -> int:
+        """Latest watch version; pass it as since_version to see only later changes."""
+        with self._version_condition:
+            return self._version
+    
+    def _on_state_change(self, task_id: str, transition: StateTransition) -> None:
+        """Record a state change, update duration sketches and wake watchers."""
+        if transition.to_state in TERMINAL_STATES:
+            self._record_task_duration(task_id, transition)
+        
+        with self._version_condition:
+            self._version += 1
+            self._task_versions[task_id] = self._version
+            self._task_versions.move_to_end(task_id)
+            while len(self._task_versions) > WATCH_HISTORY_SIZE:
+                _, self._forgotten_version = self._task_versions.popitem(last=False)
+            self._version_condition.notify_all()
+            waiters = list(self._async_waiters)
+        
+        for loop, event in waiters:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(event.set)
+    
+    def _record_task_duration(self, task_id: str, transition: StateTransition) -> None:
+        """Record the time from task creation to a terminal transition."""
+        task = self.task_store.get_task(task_id)
+        if task is None:
+            return
+        
+        duration = max(transition.timestamp_us - task.created_at_us, 0) / 1_000_000
+        with self._latency_lock:
+            sketch = self._status_latency.get(transition.to_state.value)
+            if sketch is None:
+                sketch = self._status_latency[transition.to_state.value] = LatencySketch()
+            sketch.record(duration)
+    
+    def _changed_since(self,
+                       task_ids: Optional[List[str]],
+                       since_version: int) -> Tuple[int, List[str]]:
+        """Get the current version and IDs changed after since_version. Caller must hold _version_condition."""
+        if task_ids is None:
+            # Versions increase towards the end, so stop at the first old entry
+            changed = []
+            for task_id in reversed(self._task_versions):
+                if self._task_versions[task_id] <= since_version:
+                    break
+                changed.append(task_id)
+            changed.reverse()
+        else:
+            changed = [task_id for task_id in task_ids
+                       if self._task_versions.get(task_id, self._forgotten_version) > since_version]
+        return self._version, changed
+    
+    def _build_watch_result(self, version: int, task_ids: List[str]) -> TaskWatchResult:
+        """Format the current status of changed tasks, skipping deleted ones."""
+        changes = []
+        for task_id in task_ids:
+            task_result = self.task_store.get_task(task_id)
+            if task_result is not None:
+                changes.append(self._format_status_response(task_result))
+        return TaskWatchResult(version=version, changes=changes)
+    
+    def watch(self,
+              task_ids: Optional[Iterable[str]] = None,
+              since_version: int = 0,
+              timeout: Optional[float] = None) -> TaskWatchResult:
+        """
+        Block until watched tasks change state, then return their statuses.
+        
+        Returns immediately if any watched task changed after since_version.
+        Otherwise waits for the next state change event instead of polling.
+        
+        Args:
+            task_ids: Task IDs to watch (None watches all tasks)
+            since_version: Version returned by the previous watch call (0 for all changes)
+            timeout: Maximum seconds to wait (None waits indefinitely)
+            
+        Returns:
+            TaskWatchResult with the version to resume from and the changed
+            task statuses (empty if the timeout expired)
+        """
+        watched = list(task_ids) if task_ids is not None else None
+        deadline = None if timeout is None else time.monotonic() + timeout
+        
+        with self._version_condition:
+            while True:
+                version, changed = self._changed_since(watched, since_version)
+                if changed:
+                    break
+                
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._version_condition.wait(remaining)
+        
+        return self._build_watch_result(version, changed)
+    
+    async def watch_async(self,
+                          task_ids: Optional[Iterable[str]] = None,
+                          since_version: int = 0) -> AsyncIterator[TaskWatchResult]:
+        """
+        Asynchronously iterate over state changes of watched tasks.
+        
+        Each iteration yields the statuses of tasks that changed after the
+        previously yielded version, waiting on state change events in between.
+        
+        Args:
+            task_ids: Task IDs to watch (None watches all tasks)
+            since_version: Version to start from (0 for all changes)
+            
+        Yields:
+            TaskWatchResult for each batch of changes
+        """
+        watched = list(task_ids) if task_ids is not None else None
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        waiter = (loop, event)
+        
+        with self._version_condition:
+            self._async_waiters.add(waiter)
+        try:
+            while True:
+                # Clear before checking so a change between the two wakes us
+                event.clear()
+                with self._version_condition:
+                    version, changed = self._changed_since(watched, since_version)
+                
+                if not changed:
+                    await event.wait()
+                    continue
+                
+                since_version = version
+                yield self._build_watch_result(version, changed)
+        finally:
+            with self._version_condition:
+                self._async_waiters.discard(waiter)
+    
     def _format_status_response(self, task_result: TaskResult) -> TaskStatusResponse:
         """
         Format TaskResult into spec-compliant TaskStatusResponse.
@@ -10,15 +10,19 @@ This module provides comprehensive task storage functionality including:
 - Support for concurrent access scenarios
 """
 
+import bisect
 import logging
 import threading
 import time
+import weakref
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Union, Callable, Any
+from typing import Dict, List, Optional, Union, Callable, Any, Tuple, Iterable
 from collections import defaultdict
 
-from ..models import TaskResult, TaskStatus
+from ..models import TaskResult, TaskStatus, datetime_to_epoch_us
 from ..exceptions import MedusaError
+from .journal import TaskJournal
+from .expiry import ExpiryJob, get_expiry_scheduler
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -36,14 +40,18 @@ class TaskStore:
     Provides comprehensive task storage functionality with:
     - Thread-safe CRUD operations
     - Task querying and filtering
+    - Per-status index for O(1) counts and O(matches) status listings
+    - created_at-ordered index for O(log n + k) range queries and expiry
     - Automatic cleanup of old tasks
+    - Optional append-only journal for durability across restarts
     - Concurrent access support
     """
     
     def __init__(self, 
                  cleanup_enabled: bool = True, 
                  max_task_age_hours: int = 24,
-                 cleanup_interval_minutes: int = 60):
+                 cleanup_interval_minutes: int = 60,
+                 journal: Optional[TaskJournal] = None):
         """
         Initialize TaskStore with optional cleanup configuration.
         
@@ -51,17 +59,38 @@ class TaskStore:
             cleanup_enabled: Whether to enable automatic cleanup
             max_task_age_hours: Maximum age of tasks before cleanup (hours)
             cleanup_interval_minutes: Interval between cleanup runs (minutes)
+            journal: Optional TaskJournal that records every change and
+                supplies the tasks restored at startup
         """
         self._tasks: Dict[str, TaskResult] = {}
         self._lock = threading.RLock()  # Re-entrant lock for nested operations
         
+        # Secondary index: status -> {task_id: task}. The status each task is
+        # indexed under is tracked separately, because callers may mutate a
+        # TaskResult in place before passing it to update_task.
+        self._status_index: Dict[TaskStatus, Dict[str, TaskResult]] = defaultdict(dict)
+        self._indexed_status: Dict[str, TaskStatus] = {}
+        
+        # Secondary index: (created_at epoch microseconds, task_id) keys kept
+        # sorted, so range queries bisect and expiry only touches the oldest
+        # entries. The key is unique and doubles as a pagination cursor.
+        self._created_index: List[Tuple[int, str]] = []
+        self._created_keys: Dict[str, Tuple[int, str]] = {}
+        
+        # Restore journaled tasks before recording new changes
+        self._journal = journal
+        if self._journal is not None:
+            for task in self._journal.get_tasks():
+                self._tasks[task.task_id] = task
+                self._index_task(task)
+        
         # Cleanup configuration
         self.cleanup_enabled = cleanup_enabled
         self.max_task_age_hours = max_task_age_hours
         self.cleanup_interval_minutes = cleanup_interval_minutes
         
-        # Automatic cleanup timer
-        self._cleanup_timer: Optional[threading.Timer] = None
+        # Automatic cleanup job on the shared expiry scheduler
+        self._cleanup_job: Optional[ExpiryJob] = None
         if self.cleanup_enabled:
             self._schedule_cleanup()
         
@@ -93,6 +122,9 @@ class TaskStore:
             
             # Store the task
             self._tasks[task.task_id] = task
+            self._index_task(task)
+            if self._journal is not None:
+                self._journal.record_task(task)
             
             logger.debug(f"Stored task {task.task_id} with status {task.status}")
             return True
@@ -113,6 +145,21 @@ class TaskStore:
         with self._lock:
             return self._tasks.get(task_id)
     
+    def get_tasks(self, task_ids: Iterable[str]) -> Dict[str, Optional[TaskResult]]:
+        """
+        Retrieve several tasks under a single lock acquisition.
+        
+        Args:
+            task_ids: Task IDs to retrieve
+            
+        Returns:
+            Dictionary mapping every requested ID, in request order, to its
+            TaskResult or None if not found
+        """
+        with self._lock:
+            tasks = self._tasks
+            return {task_id: tasks.get(task_id) if task_id else None for task_id in task_ids}
+    
     def update_task(self, task: TaskResult) -> bool:
         """
         Update an existing task.
@@ -138,6 +185,9 @@ class TaskStore:
             
             # Update the task
             self._tasks[task.task_id] = task
+            self._index_task(task)
+            if self._journal is not None:
+                self._journal.record_task(task)
             
             logger.debug(f"Updated task {task.task_id} with status {task.status}")
             return True
@@ -158,6 +208,9 @@ class TaskStore:
         with self._lock:
             if task_id in self._tasks:
                 del self._tasks[task_id]
+                self._unindex_task(task_id)
+                if self._journal is not None:
+                    self._journal.record_task_deleted(task_id)
                 logger.debug(f"Deleted task {task_id}")
                 return True
             return False
@@ -188,7 +241,13 @@ class TaskStore:
             status_list = status
         
         with self._lock:
-            return [task for task in self._tasks.values() if task.status in status_list]
+            if len(status_list) == 1:
+                return list(self._status_index.get(status_list[0], {}).values())
+            
+            tasks = []
+            for task_status in dict.fromkeys(status_list):
+                tasks.extend(self._status_index.get(task_status, {}).values())
+            return tasks
     
     def get_tasks_created_after(self, cutoff_time: datetime) -> List[TaskResult]:
         """
@@ -201,7 +260,98 @@ class TaskStore:
             List of TaskResult objects created after cutoff_time
         """
         with self._lock:
-            return [task for task in self._tasks.values() if task.created_at > cutoff_time]
+            start = bisect.bisect_left(self._created_index, (datetime_to_epoch_us(cutoff_time) + 1,))
+            return [self._tasks[key[1]] for key in self._created_index[start:]]
+    
+    def get_tasks_by_created_range(self,
+                                   created_after: Optional[datetime] = None,
+                                   created_before: Optional[datetime] = None,
+                                   status_filter: Optional[List[TaskStatus]] = None,
+                                   offset: int = 0,
+                                   limit: Optional[int] = None,
+                                   newest_first: bool = True,
+                                   cursor: Optional[Tuple[int, str]] = None) -> List[TaskResult]:
+        """
+        Get a page of tasks ordered by creation time.
+        
+        Walks the created_at index from one end of the requested range, so a
+        page costs O(log n + offset + limit) when no status filter is given.
+        Passing the cursor_for() key of the last task of a page as cursor
+        seeks straight to the next page; unlike offsets, cursors are not
+        shifted by tasks inserted or removed in between.
+        
+        Args:
+            created_after: Optional inclusive lower bound on created_at
+            created_before: Optional inclusive upper bound on created_at
+            status_filter: Optional list of statuses to include
+            offset: Number of matching tasks to skip
+            limit: Maximum number of tasks to return (None for all)
+            newest_first: Whether to return newest tasks first
+            cursor: Optional (created_at epoch microseconds, task_id) key; only
+                tasks after it in the requested order are returned
+            
+        Returns:
+            List of TaskResult objects in creation order
+        """
+        with self._lock:
+            count = None if limit is None else offset + limit
+            matches = self._created_range(created_after, created_before, status_filter,
+                                          count, newest_first, cursor)
+            return [task for _, task in matches[offset:]]
+    
+    @staticmethod
+    def cursor_for(task: TaskResult) -> Tuple[int, str]:
+        """
+        Get the pagination cursor of a task.
+        
+        Args:
+            task: Task returned by get_tasks_by_created_range
+            
+        Returns:
+            (created_at epoch microseconds, task_id) key
+        """
+        return (task.created_at_us, task.task_id)
+    
+    def _created_range(self,
+                       created_after: Optional[datetime],
+                       created_before: Optional[datetime],
+                       status_filter: Optional[List[TaskStatus]],
+                       count: Optional[int],
+                       newest_first: bool,
+                       cursor: Optional[Tuple[int, str]] = None
+                       ) -> List[Tuple[Tuple[int, str], TaskResult]]:
+        """
+        Collect up to count matching (index key, task) pairs from one end of a
+        created_at range, continuing after cursor. Caller must hold the lock.
+        """
+        start = 0
+        end = len(self._created_index)
+        if created_after is not None:
+            start = bisect.bisect_left(self._created_index, (datetime_to_epoch_us(created_after),))
+        if created_before is not None:
+            end = bisect.bisect_left(self._created_index, (datetime_to_epoch_us(created_before) + 1,))
+        if cursor is not None:
+            cursor = tuple(cursor)
+            if newest_first:
+                end = min(end, bisect.bisect_left(self._created_index, cursor))
+            else:
+                start = max(start, bisect.bisect_right(self._created_index, cursor))
+        
+        positions = range(end - 1, start - 1, -1) if newest_first else range(start, end)
+        matches = []
+        
+        for position in positions:
+            if count is not None and len(matches) >= count:
+                break
+            
+            key = self._created_index[position]
+            task = self._tasks[key[1]]
+            if status_filter and task.status not in status_filter:
+                continue
+            
+            matches.append((key, task))
+        
+        return matches
     
     def get_task_count(self, status: Optional[TaskStatus] = None) -> int:
         """
@@ -217,7 +367,7 @@ class TaskStore:
             if status is None:
                 return len(self._tasks)
             else:
-                return sum(1 for task in self._tasks.values() if task.status == status)
+                return len(self._status_index.get(status, ()))
     
     def task_exists(self, task_id: str) -> bool:
         """
@@ -243,11 +393,22 @@ class TaskStore:
             Number of tasks that were cleared
         """
         with self._lock:
-            count = len(self._tasks)
-            self._tasks.clear()
+            count = self._clear_tasks()
+            if self._journal is not None:
+                self._journal.record_tasks_cleared()
             logger.debug(f"Cleared all {count} tasks from store")
             return count
     
+    def _clear_tasks(self) -> int:
+        """Drop every task and index entry without journaling. Caller must hold _lock."""
+        count = len(self._tasks)
+        self._tasks.clear()
+        self._status_index.clear()
+        self._indexed_status.clear()
+        self._created_index.clear()
+        self._created_keys.clear()
+        return count
+    
     def cleanup_old_tasks(self, 
                          max_age_hours: Optional[int] = None, 
                          status_filter: Optional[List[TaskStatus]] = None) -> int:
@@ -265,28 +426,48 @@ class TaskStore:
             max_age_hours = self.max_task_age_hours
         
         cutoff_time = datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
-        cleaned_count = 0
         
         with self._lock:
-            tasks_to_remove = []
-            
-            for task_id, task in self._tasks.items():
-                # Check age
-                if task.created_at <= cutoff_time:
-                    # Check status filter if provided
-                    if status_filter is None or task.status in status_filter:
-                        tasks_to_remove.append(task_id)
-            
-            # Remove old tasks
-            for task_id in tasks_to_remove:
-                del self._tasks[task_id]
-                cleaned_count += 1
+            cleaned_count = len(self._remove_expired_tasks(cutoff_time, status_filter))
         
         if cleaned_count > 0:
             logger.info(f"Cleaned up {cleaned_count} old tasks (older than {max_age_hours}h)")
         
         return cleaned_count
     
+    def _remove_expired_tasks(self,
+                              cutoff_time: datetime,
+                              status_filter: Optional[List[TaskStatus]] = None) -> List[str]:
+        """
+        Remove tasks created at or before cutoff_time. Caller must hold the lock.
+        
+        Args:
+            cutoff_time: Tasks created at or before this time are removed
+            status_filter: Optional list of statuses to remove
+            
+        Returns:
+            IDs of the removed tasks
+        """
+        # Expired tasks are a prefix of the created_at index
+        end = bisect.bisect_left(self._created_index, (datetime_to_epoch_us(cutoff_time) + 1,))
+        removed = []
+        kept = []
+        
+        for key in self._created_index[:end]:
+            task_id = key[1]
+            if status_filter is None or self._tasks[task_id].status in status_filter:
+                del self._tasks[task_id]
+                del self._created_keys[task_id]
+                self._unindex_status(task_id)
+                if self._journal is not None:
+                    self._journal.record_task_deleted(task_id)
+                removed.append(task_id)
+            else:
+                kept.append(key)
+        
+        self._created_index[:end] = kept
+        return removed
+    
     def get_storage_stats(self) -> Dict[str, Any]:
         """
         Get storage statistics.
@@ -298,9 +479,11 @@ class TaskStore:
             total_tasks = len(self._tasks)
             
             # Count by status
-            status_counts = defaultdict(int)
-            for task in self._tasks.values():
-                status_counts[task.status.value] += 1
+            status_counts = {
+                task_status.value: len(tasks)
+                for task_status, tasks in self._status_index.items()
+                if tasks
+            }
             
             # Calculate age statistics
             now = datetime.now(timezone.utc)
@@ -308,7 +491,7 @@ class TaskStore:
             
             return {
                 "total_tasks": total_tasks,
-                "status_counts": dict(status_counts),
+                "status_counts": status_counts,
                 "oldest_task_hours": max(ages) if ages else 0,
                 "newest_task_hours": min(ages) if ages else 0,
                 "average_age_hours": sum(ages) / len(ages) if ages else 0,
@@ -316,35 +499,72 @@ class TaskStore:
                 "max_task_age_hours": self.max_task_age_hours
             }
     
+    def _index_task(self, task: TaskResult) -> None:
+        """Add or move a task in the secondary indexes. Caller must hold the lock."""
+        previous_status = self._indexed_status.get(task.task_id)
+        if previous_status is not None and previous_status != task.status:
+            self._status_index[previous_status].pop(task.task_id, None)
+        
+        self._status_index[task.status][task.task_id] = task
+        self._indexed_status[task.task_id] = task.status
+        
+        previous_key = self._created_keys.get(task.task_id)
+        if previous_key is None or previous_key[0] != task.created_at_us:
+            if previous_key is not None:
+                self._remove_created_key(previous_key)
+            key = (task.created_at_us, task.task_id)
+            bisect.insort(self._created_index, key)
+            self._created_keys[task.task_id] = key
+    
+    def _unindex_task(self, task_id: str) -> None:
+        """Remove a task from the secondary indexes. Caller must hold the lock."""
+        self._unindex_status(task_id)
+        
+        key = self._created_keys.pop(task_id, None)
+        if key is not None:
+            self._remove_created_key(key)
+    
+    def _unindex_status(self, task_id: str) -> None:
+        """Remove a task from the status index. Caller must hold the lock."""
+        previous_status = self._indexed_status.pop(task_id, None)
+        if previous_status is not None:
+            self._status_index[previous_status].pop(task_id, None)
+    
+    def _remove_created_key(self, key: Tuple[int, str]) -> None:
+        """Remove a key from the created_at index. Caller must hold the lock."""
+        position = bisect.bisect_left(self._created_index, key)
+        if position < len(self._created_index) and self._created_index[position] == key:
+            del self._created_index[position]
+    
     def _schedule_cleanup(self) -> None:
-        """Schedule automatic cleanup task."""
+        """Schedule automatic cleanup on the shared expiry scheduler."""
         if not self.cleanup_enabled:
             return
         
+        # Cleanup only walks the expired prefix of the created_at index, so
+        # all stores can share one scheduler thread. The job holds the store
+        # weakly so an abandoned store is still garbage collected.
+        cleanup = weakref.WeakMethod(self.cleanup_old_tasks)
+        
         def cleanup_task():
-            try:
-                self.cleanup_old_tasks()
-            except Exception as e:
-                logger.error(f"Error during automatic cleanup: {e}")
-            finally:
-                # Schedule next cleanup
-                if self.cleanup_enabled:
-                    self._schedule_cleanup()
-        
-        self._cleanup_timer = threading.Timer(
-            self.cleanup_interval_minutes * 60, 
-            cleanup_task
+            method = cleanup()
+            if method is None:
+                return False
+            method()
+        
+        self._cleanup_job = get_expiry_scheduler().schedule(
+            self.cleanup_interval_minutes * 60,
+            cleanup_task,
+            name=f"{type(self).__name__}.cleanup_old_tasks"
         )
-        self._cleanup_timer.daemon = True  # Don't prevent program exit
-        self._cleanup_timer.start()
         
-        logger.debug(f"Scheduled automatic cleanup in {self.cleanup_interval_minutes} minutes")
+        logger.debug(f"Scheduled automatic cleanup every {self.cleanup_interval_minutes} minutes")
     
     def stop_cleanup(self) -> None:
         """Stop automatic cleanup if running."""
-        if self._cleanup_timer:
-            self._cleanup_timer.cancel()
-            self._cleanup_timer = None
+        if self._cleanup_job:
+            get_expiry_scheduler().cancel(self._cleanup_job)
+            self._cleanup_job = None
             logger.debug("Stopped automatic cleanup")
     
     def __del__(self):
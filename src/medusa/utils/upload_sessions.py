@@ -0,0 +1,263 @@
+"""
+Durable storage of resumable upload sessions for Medusa library.
+
+This module provides crash recovery support for resumable uploads including:
+- Cheap file fingerprinting that detects changed media files
+- UploadSession records with session URI and confirmed byte offset
+- File-based store keyed by task ID and file fingerprint
+- Atomic writes so a crash never leaves a half-written record
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Union
+
+from ..exceptions import MedusaError
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Bytes hashed from the start and the end of a file when fingerprinting
+FINGERPRINT_SAMPLE_SIZE = 64 * 1024
+
+
+class UploadSessionStoreError(MedusaError):
+    """Exception raised for upload session store operations."""
+    pass
+
+
+def compute_file_fingerprint(file_path: Union[str, Path]) -> str:
+    """
+    Compute a fingerprint identifying the content of a media file.
+
+    Hashes the file size, modification time and the first and last
+    FINGERPRINT_SAMPLE_SIZE bytes, so fingerprinting a multi-gigabyte file
+    costs two small reads instead of a full scan.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        Hex digest fingerprint
+
+    Raises:
+        UploadSessionStoreError: If the file cannot be read
+    """
+    try:
+        stat = os.stat(file_path)
+        digest = hashlib.sha256(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+
+        with open(file_path, 'rb') as f:
+            digest.update(f.read(FINGERPRINT_SAMPLE_SIZE))
+            if stat.st_size > FINGERPRINT_SAMPLE_SIZE:
+                f.seek(max(FINGERPRINT_SAMPLE_SIZE, stat.st_size - FINGERPRINT_SAMPLE_SIZE))
+                digest.update(f.read(FINGERPRINT_SAMPLE_SIZE))
+
+        return digest.hexdigest()
+
+    except OSError as e:
+        raise UploadSessionStoreError(
+            f"Failed to fingerprint file {file_path}: {e}",
+            original_error=e
+        )
+
+
+@dataclass
+class UploadSession:
+    """State of a resumable upload that can be resumed after a restart."""
+    task_id: str
+    fingerprint: str
+    file_path: str
+    session_uri: str
+    total_bytes: int
+    confirmed_bytes: int = 0
+    platform: Optional[str] = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serialize UploadSession to dictionary.
+
+        Returns:
+            Dictionary representation of the session
+        """
+        return {
+            "task_id": self.task_id,
+            "fingerprint": self.fingerprint,
+            "file_path": self.file_path,
+            "session_uri": self.session_uri,
+            "total_bytes": self.total_bytes,
+            "confirmed_bytes": self.confirmed_bytes,
+            "platform": self.platform,
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'UploadSession':
+        """
+        Deserialize UploadSession from dictionary.
+
+        Args:
+            data: Dictionary containing session data
+
+        Returns:
+            UploadSession instance
+        """
+        return cls(
+            task_id=data["task_id"],
+            fingerprint=data["fingerprint"],
+            file_path=data["file_path"],
+            session_uri=data["session_uri"],
+            total_bytes=data["total_bytes"],
+            confirmed_bytes=data.get("confirmed_bytes", 0),
+            platform=data.get("platform"),
+            created_at=datetime.fromisoformat(data["created_at"].replace('Z', '+00:00')),
+            updated_at=datetime.fromisoformat(data["updated_at"].replace('Z', '+00:00'))
+        )
+
+
+class UploadSessionStore:
+    """
+    Thread-safe file-based store of resumable upload sessions.
+
+    Each session is kept in its own JSON file named after the hash of its
+    (task ID, file fingerprint) key. Files are written to a temporary file,
+    fsynced and atomically renamed into place.
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        """
+        Initialize UploadSessionStore.
+
+        Args:
+            directory: Directory holding session files (created if missing)
+
+        Raises:
+            UploadSessionStoreError: If the directory cannot be created
+        """
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            raise UploadSessionStoreError(
+                f"Cannot create upload session directory {self.directory}: {e}",
+                original_error=e
+            )
+
+        logger.debug(f"UploadSessionStore initialized in {self.directory}")
+
+    def _session_path(self, task_id: str, fingerprint: str) -> Path:
+        """Get the file path for a session key."""
+        key = hashlib.sha256(f"{task_id}:{fingerprint}".encode()).hexdigest()
+        return self.directory / f"{key}.json"
+
+    def save_session(self, session: UploadSession) -> None:
+        """
+        Persist a session, replacing any previous record for the same key.
+
+        Args:
+            session: UploadSession to persist
+
+        Raises:
+            UploadSessionStoreError: If the session cannot be written
+        """
+        session.updated_at = datetime.now(timezone.utc)
+        path = self._session_path(session.task_id, session.fingerprint)
+
+        with self._lock:
+            try:
+                fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+                try:
+                    with os.fdopen(fd, 'w') as f:
+                        json.dump(session.to_dict(), f)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp_path, path)
+                except BaseException:
+                    if os.path.exists(tmp_path):
+                        os.unlink(tmp_path)
+                    raise
+            except OSError as e:
+                raise UploadSessionStoreError(
+                    f"Failed to save upload session for task {session.task_id}: {e}",
+                    original_error=e
+                )
+
+        logger.debug(f"Saved upload session for task {session.task_id} "
+                     f"at {session.confirmed_bytes}/{session.total_bytes} bytes")
+
+    def get_session(self, task_id: str, fingerprint: str) -> Optional[UploadSession]:
+        """
+        Load a session by task ID and file fingerprint.
+
+        Unreadable records are discarded so a corrupt file never blocks an upload.
+
+        Args:
+            task_id: Task ID the upload belongs to
+            fingerprint: Fingerprint of the media file
+
+        Returns:
+            UploadSession if found, None otherwise
+        """
+        path = self._session_path(task_id, fingerprint)
+
+        with self._lock:
+            if not path.exists():
+                return None
+
+            try:
+                with open(path, 'r') as f:
+                    return UploadSession.from_dict(json.load(f))
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Discarding unreadable upload session {path}: {e}")
+                path.unlink(missing_ok=True)
+                return None
+
+    def delete_session(self, task_id: str, fingerprint: str) -> bool:
+        """
+        Delete a session.
+
+        Args:
+            task_id: Task ID the upload belongs to
+            fingerprint: Fingerprint of the media file
+
+        Returns:
+            True if a session was deleted, False if not found
+        """
+        path = self._session_path(task_id, fingerprint)
+
+        with self._lock:
+            if not path.exists():
+                return False
+            path.unlink()
+
+        logger.debug(f"Deleted upload session for task {task_id}")
+        return True
+
+    def list_sessions(self) -> List[UploadSession]:
+        """
+        List all readable sessions in the store.
+
+        Returns:
+            List of UploadSession objects
+        """
+        sessions = []
+        with self._lock:
+            for path in self.directory.glob("*.json"):
+                try:
+                    with open(path, 'r') as f:
+                        sessions.append(UploadSession.from_dict(json.load(f)))
+                except (OSError, ValueError, KeyError) as e:
+                    logger.warning(f"Skipping unreadable upload session {path}: {e}")
+        return sessions
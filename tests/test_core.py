@@ -0,0 +1,296 @@
+"""
+Tests for MedusaCore - task orchestration and bounded async execution.
+
+This module tests the MedusaCore class including:
+- Initialization and configuration validation
+- Task creation through publish_async
+- Bounded worker pool and per-platform concurrency limits
+- Result passing from uploaders to publishers
+- Fail-fast error handling
+"""
+
+import asyncio
+import json
+import pytest
+
+from medusa import MedusaCore
+from medusa.core import MedusaCore as CoreMedusaCore
+from medusa.exceptions import ConfigError, MedusaError, TaskError
+from medusa.models import TaskStatus, PlatformConfig
+from medusa.publishers.mock import MockPublisher, MockPublishConfig
+from medusa.uploaders.mock import MockUploader, MockConfig
+from medusa.utils.registry import PlatformRegistry, PlatformInfo, PlatformCapability
+from medusa.utils.states import StateTransitionError, TaskState, TaskStateManager
+
+
+class TrackingUploader(MockUploader):
+    """Mock uploader that records the maximum number of concurrent uploads."""
+
+    active = 0
+    max_active = 0
+    fail = False
+
+    def __init__(self, platform_name: str = "youtube", config=None):
+        super().__init__(
+            platform_name,
+            config,
+            MockConfig(upload_delay=0.02, auth_delay=0, simulate_progress=False,
+                       upload_success=not TrackingUploader.fail)
+        )
+
+    async def _upload_media(self, file_path, metadata, progress_callback=None):
+        TrackingUploader.active += 1
+        TrackingUploader.max_active = max(TrackingUploader.max_active, TrackingUploader.active)
+        try:
+            return await super()._upload_media(file_path, metadata, progress_callback)
+        finally:
+            TrackingUploader.active -= 1
+
+
+class RecordingPublisher(MockPublisher):
+    """Mock publisher that records the metadata it receives."""
+
+    received = []
+
+    def __init__(self, platform_name: str = "facebook", config=None):
+        super().__init__(
+            platform_name,
+            config,
+            MockPublishConfig(publish_delay=0, auth_delay=0, simulate_progress=False)
+        )
+
+    async def _publish_post(self, content, metadata, progress_callback=None):
+        RecordingPublisher.received.append((content, dict(metadata)))
+        return await super()._publish_post(content, metadata, progress_callback)
+
+
+@pytest.fixture
+def registry():
+    """Provide a registry with mock youtube uploader and facebook publisher."""
+    TrackingUploader.active = 0
+    TrackingUploader.max_active = 0
+    TrackingUploader.fail = False
+    RecordingPublisher.received = []
+
+    registry = PlatformRegistry()
+    registry.register_platform(PlatformInfo(
+        name="youtube",
+        display_name="YouTube",
+        platform_type="uploader",
+        implementation_class=TrackingUploader,
+        capabilities=[PlatformCapability.VIDEO_UPLOAD]
+    ))
+    registry.register_platform(PlatformInfo(
+        name="facebook",
+        display_name="Facebook",
+        platform_type="publisher",
+        implementation_class=RecordingPublisher,
+        capabilities=[PlatformCapability.TEXT_PUBLISHING]
+    ))
+    return registry
+
+
+@pytest.fixture
+def youtube_metadata():
+    """Provide metadata for a youtube + facebook request."""
+    return {
+        "youtube": {"title": "Test Video", "privacy": "unlisted"},
+        "facebook": {"message": "New video: {youtube_url}"}
+    }
+
+
+class TestMedusaCoreInit:
+    """Test cases for MedusaCore initialization."""
+
+    def test_exported_from_package(self):
+        """Test that MedusaCore is exported from the package root."""
+        assert MedusaCore is CoreMedusaCore
+
+    def test_invalid_max_workers(self, registry):
+        """Test that max_workers must be positive."""
+        with pytest.raises(ConfigError, match="max_workers"):
+            MedusaCore(registry=registry, max_workers=0)
+
+    def test_invalid_platform_concurrency(self, registry):
+        """Test that per-platform limits must be positive."""
+        with pytest.raises(ConfigError, match="concurrency"):
+            MedusaCore(registry=registry, platform_concurrency={"youtube": 0})
+
+    def test_loads_platform_configs_from_file(self, temp_dir, registry):
+        """Test platform configuration loading from JSON file."""
+        config_file = temp_dir / "config.json"
+        config_file.write_text(json.dumps({
+            "facebook": {"page_id": "123", "access_token": "token"}
+        }))
+
+        core = MedusaCore(config_file=config_file, registry=registry)
+
+        assert set(core.platform_configs) == {"facebook"}
+        facebook_config = core.platform_configs["facebook"]
+        assert isinstance(facebook_config, PlatformConfig)
+        assert facebook_config.credentials == {"page_id": "123", "access_token": "token"}
+
+
+class TestMedusaCoreExecution:
+    """Test cases for task execution through the worker pool."""
+
+    def test_publish_async_creates_pending_task(self, registry, temp_media_file, youtube_metadata):
+        """Test that publish_async stores a pending task before workers start."""
+        core = MedusaCore(registry=registry)
+
+        task_id = core.publish_async(str(temp_media_file), ["youtube"], youtube_metadata)
+
+        assert core.get_task_status(task_id) == {"status": "pending"}
+        assert core.state_manager.get_current_state(task_id) == TaskState.PENDING
+        assert core.get_executor_stats()["queued_tasks"] == 1
+
+    def test_invalid_transition_leaves_task_unchanged(self, registry, temp_media_file, youtube_metadata):
+        """Test that a rejected state transition does not update the stored task."""
+        core = MedusaCore(registry=registry)
+        task_id = core.publish_async(str(temp_media_file), ["youtube"], youtube_metadata)
+
+        with pytest.raises(StateTransitionError):
+            core._update_task(task_id, TaskStatus.FAILED, "Upload failed", error="boom")
+
+        task = core.task_store.get_task(task_id)
+        assert task.status == TaskStatus.PENDING
+        assert task.error is None
+        assert core.state_manager.get_current_state(task_id) == TaskState.PENDING
+
+    def test_publish_async_rejects_unregistered_platform(self, registry, temp_media_file):
+        """Test that requests for unregistered platforms are rejected."""
+        core = MedusaCore(registry=registry)
+
+        with pytest.raises(MedusaError, match="not registered"):
+            core.publish_async(str(temp_media_file), ["vimeo"])
+
+    def test_publish_async_rejects_when_queue_full(self, registry, temp_media_file, youtube_metadata):
+        """Test that a bounded queue rejects excess requests."""
+        core = MedusaCore(registry=registry, max_queue_size=1)
+        core.publish_async(str(temp_media_file), ["youtube"], youtube_metadata)
+
+        with pytest.raises(TaskError, match="queue is full"):
+            core.publish_async(str(temp_media_file), ["youtube"], youtube_metadata)
+
+    @pytest.mark.asyncio
+    async def test_upload_then_publish_passes_results(self, registry, temp_media_file, youtube_metadata):
+        """Test that uploader results are available to publisher templates."""
+        async with MedusaCore(registry=registry) as core:
+            task_id = core.publish_async(
+                str(temp_media_file), ["facebook", "youtube"], youtube_metadata
+            )
+            await core.join()
+
+        status = core.get_task_status(task_id)
+        assert status["status"] == "completed"
+        youtube_url = status["results"]["youtube_url"]
+        assert youtube_url.startswith("https://mock-platform.com/video/")
+        assert status["results"]["facebook_post_id"].startswith("mock_post_")
+
+        content, metadata = RecordingPublisher.received[0]
+        assert content == f"New video: {youtube_url}"
+        assert metadata["youtube_url"] == youtube_url
+        assert core.state_manager.get_current_state(task_id) == TaskState.COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_platform_durations_recorded(self, registry, temp_media_file, youtube_metadata):
+        """Test that upload and publish durations feed the latency percentiles."""
+        async with MedusaCore(registry=registry) as core:
+            core.publish_async(str(temp_media_file), ["youtube", "facebook"], youtube_metadata)
+            await core.join()
+
+        latency = core.status_manager.get_latency_percentiles()
+        assert latency["by_platform"]["youtube"]["upload"]["completed"]["count"] == 1
+        assert latency["by_platform"]["youtube"]["upload"]["completed"]["p50"] >= 0.02
+        assert latency["by_platform"]["facebook"]["publish"]["completed"]["count"] == 1
+        assert latency["by_status"]["completed"]["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_fail_fast_on_platform_error(self, registry, temp_media_file, youtube_metadata):
+        """Test that a failing uploader stops the task before publishing."""
+        TrackingUploader.fail = True
+
+        async with MedusaCore(registry=registry) as core:
+            task_id = core.publish_async(
+                str(temp_media_file), ["youtube", "facebook"], youtube_metadata
+            )
+            await core.join()
+
+        status = core.get_task_status(task_id)
+        assert status["status"] == "failed"
+        assert status["failed_platform"] == "youtube"
+        assert "Mock upload failed" in status["error"]
+        assert RecordingPublisher.received == []
+        assert core.task_store.get_task(task_id).status == TaskStatus.FAILED
+
+    @pytest.mark.asyncio
+    async def test_global_worker_limit(self, registry, temp_media_file, youtube_metadata):
+        """Test that no more than max_workers tasks run at once."""
+        async with MedusaCore(registry=registry, max_workers=2) as core:
+            task_ids = [
+                core.publish_async(str(temp_media_file), ["youtube"], youtube_metadata)
+                for _ in range(6)
+            ]
+            await core.join()
+
+        assert TrackingUploader.max_active == 2
+        assert all(core.get_task_status(t)["status"] == "completed" for t in task_ids)
+
+    @pytest.mark.asyncio
+    async def test_per_platform_limit(self, registry, temp_media_file, youtube_metadata):
+        """Test that per-platform limits bound concurrent platform operations."""
+        core = MedusaCore(registry=registry, max_workers=4, platform_concurrency={"youtube": 1})
+        async with core:
+            for _ in range(4):
+                core.publish_async(str(temp_media_file), ["youtube"], youtube_metadata)
+            await core.join()
+
+        assert TrackingUploader.max_active == 1
+        assert core.get_executor_stats()["active_platform_operations"] == {"youtube": 0}
+
+    @pytest.mark.asyncio
+    async def test_stop_without_wait_keeps_queued_requests(self, registry, temp_media_file, youtube_metadata):
+        """Test that requests left in the queue survive a stop/start cycle."""
+        core = MedusaCore(registry=registry, max_workers=1)
+        await core.start()
+        await core.stop(wait=False)
+
+        task_id = core.publish_async(str(temp_media_file), ["youtube"], youtube_metadata)
+        assert not core.is_running
+
+        await core.start()
+        await core.join()
+        await core.stop()
+
+        assert core.get_task_status(task_id)["status"] == "completed"
+
+    @pytest.mark.asyncio
+    async def test_stop_detaches_status_manager(self, registry):
+        """Test that a stopped core stops listening to a shared state manager."""
+        state_manager = TaskStateManager()
+        core = MedusaCore(registry=registry, state_manager=state_manager, max_workers=1)
+        listeners = state_manager._event_system._listeners
+
+        await core.start()
+        await core.stop()
+        assert not any(listeners.values())
+
+        await core.start()
+        assert all(listeners[state] for state in TaskState)
+        await core.stop()
+
+    @pytest.mark.asyncio
+    async def test_stop_leaves_shared_http_client_open(self, registry):
+        """Test that stopping one core keeps the process-wide Facebook pool usable."""
+        from medusa.publishers.facebook_auth import FacebookAuth
+
+        core = MedusaCore(registry=registry, max_workers=1)
+        await core.start()
+        shared = FacebookAuth._get_shared_http_client()
+        shared._get_session()
+
+        await core.stop()
+
+        assert FacebookAuth._shared_http_client is shared
+        assert shared.get_pool_stats()["open_sessions"] == 1
+        await FacebookAuth.close_shared_http_client()
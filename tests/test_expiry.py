@@ -0,0 +1,91 @@
+"""
+Tests for ExpiryScheduler - shared heap-based expiry scheduler.
+
+This module tests:
+- Repeating jobs running on the shared thread
+- Cancellation, including from the callback itself
+- Error isolation between jobs
+"""
+
+import threading
+import pytest
+
+from medusa.utils.expiry import ExpiryScheduler, get_expiry_scheduler
+
+
+class TestExpiryScheduler:
+    """Test ExpiryScheduler."""
+
+    def test_invalid_interval(self):
+        """Test that a non-positive interval is rejected."""
+        with pytest.raises(ValueError):
+            ExpiryScheduler().schedule(0, lambda: None)
+
+    def test_jobs_repeat_on_one_thread(self):
+        """Test that several jobs repeat on the same scheduler thread."""
+        scheduler = ExpiryScheduler()
+        threads = set()
+        runs = {"a": 0, "b": 0}
+        done = threading.Event()
+
+        def make_job(key):
+            def job():
+                threads.add(threading.current_thread().name)
+                runs[key] += 1
+                if min(runs.values()) >= 3:
+                    done.set()
+            return job
+
+        job_a = scheduler.schedule(0.01, make_job("a"))
+        job_b = scheduler.schedule(0.015, make_job("b"))
+        try:
+            assert done.wait(5)
+        finally:
+            scheduler.cancel(job_a)
+            scheduler.cancel(job_b)
+
+        assert threads == {scheduler.name}
+        assert scheduler.pending_jobs() == 0
+
+    def test_callback_returning_false_cancels(self):
+        """Test that a job is dropped once its callback returns False."""
+        scheduler = ExpiryScheduler()
+        calls = []
+
+        def job():
+            calls.append(threading.current_thread())
+            if len(calls) == 2:
+                return False
+
+        scheduler.schedule(0.01, job)
+        # With no jobs left the scheduler thread exits
+        for _ in range(500):
+            if calls:
+                break
+            threading.Event().wait(0.01)
+        calls[0].join(5)
+
+        assert len(calls) == 2
+        assert scheduler.pending_jobs() == 0
+
+    def test_failing_job_keeps_running(self):
+        """Test that an exception does not unschedule the job."""
+        scheduler = ExpiryScheduler()
+        calls = []
+        done = threading.Event()
+
+        def job():
+            calls.append(1)
+            if len(calls) >= 2:
+                done.set()
+            raise RuntimeError("boom")
+
+        handle = scheduler.schedule(0.01, job)
+        try:
+            assert done.wait(5)
+        finally:
+            scheduler.cancel(handle)
+
+    def test_default_scheduler_is_shared(self):
+        """Test that the process-wide scheduler is a singleton."""
+        assert get_expiry_scheduler() is get_expiry_scheduler()
@@ -0,0 +1,153 @@
+"""
+Tests for PooledHTTPClient - keep-alive async HTTP transport.
+
+This module tests:
+- JSON requests against a local aiohttp server
+- Keep-alive connection reuse
+- Per-host connection limits
+- Session lifecycle per event loop
+"""
+
+import asyncio
+import threading
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from medusa.utils.http_client import PooledHTTPClient
+
+
+@pytest_asyncio.fixture
+async def server():
+    """Start a local server that records the client port of each request."""
+    peers = []
+    active = {"now": 0, "max": 0}
+
+    async def echo(request):
+        peers.append(request.transport.get_extra_info("peername")[1])
+        return web.json_response({"method": request.method, "body": await request.json()
+                                  if request.can_read_body else None})
+
+    async def slow(request):
+        active["now"] += 1
+        active["max"] = max(active["max"], active["now"])
+        await asyncio.sleep(0.05)
+        active["now"] -= 1
+        return web.json_response({"ok": True})
+
+    async def text(request):
+        return web.Response(text="not json")
+
+    app = web.Application()
+    app.router.add_route("*", "/echo", echo)
+    app.router.add_get("/slow", slow)
+    app.router.add_get("/text", text)
+
+    test_server = TestServer(app)
+    await test_server.start_server()
+    test_server.peers = peers
+    test_server.active = active
+    yield test_server
+    await test_server.close()
+
+
+class TestPooledHTTPClient:
+    """Test cases for PooledHTTPClient."""
+
+    def test_invalid_limits(self):
+        """Test that limits and timeouts must be positive."""
+        with pytest.raises(ValueError, match="limits"):
+            PooledHTTPClient(limit_per_host=0)
+        with pytest.raises(ValueError, match="Timeouts"):
+            PooledHTTPClient(timeout=0)
+
+    @pytest.mark.asyncio
+    async def test_request_json(self, server):
+        """Test JSON request and response decoding."""
+        client = PooledHTTPClient()
+        try:
+            status, data = await client.request_json(
+                "POST", str(server.make_url("/echo")), json_data={"message": "hi"}
+            )
+        finally:
+            await client.close()
+
+        assert status == 200
+        assert data == {"method": "POST", "body": {"message": "hi"}}
+
+    @pytest.mark.asyncio
+    async def test_connections_are_reused(self, server):
+        """Test that sequential requests reuse one keep-alive connection."""
+        client = PooledHTTPClient()
+        try:
+            for _ in range(5):
+                await client.request_json("GET", str(server.make_url("/echo")))
+        finally:
+            await client.close()
+
+        assert len(server.peers) == 5
+        assert len(set(server.peers)) == 1
+
+    @pytest.mark.asyncio
+    async def test_per_host_limit(self, server):
+        """Test that concurrent requests to one host respect limit_per_host."""
+        client = PooledHTTPClient(limit_per_host=2)
+        try:
+            await asyncio.gather(*[
+                client.request_json("GET", str(server.make_url("/slow")))
+                for _ in range(6)
+            ])
+        finally:
+            await client.close()
+
+        assert server.active["max"] == 2
+
+    @pytest.mark.asyncio
+    async def test_invalid_json_raises_value_error(self, server):
+        """Test that a non-JSON body raises ValueError."""
+        client = PooledHTTPClient()
+        try:
+            with pytest.raises(ValueError):
+                await client.request_json("GET", str(server.make_url("/text")))
+        finally:
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_close_releases_session(self, server):
+        """Test that close drops the session and a new one is created on demand."""
+        client = PooledHTTPClient()
+        await client.request_json("GET", str(server.make_url("/echo")))
+        assert client.get_pool_stats()["open_sessions"] == 1
+
+        await client.close()
+        assert client.get_pool_stats()["open_sessions"] == 0
+
+        status, _ = await client.request_json("GET", str(server.make_url("/echo")))
+        await client.close()
+        assert status == 200
+
+    @pytest.mark.asyncio
+    async def test_close_all_closes_sessions_of_other_loops(self, server):
+        """Test that close_all closes sessions bound to loops in other threads."""
+        client = PooledHTTPClient()
+        await client.request_json("GET", str(server.make_url("/echo")))
+
+        other_loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=other_loop.run_forever)
+        thread.start()
+        try:
+            async def open_session():
+                return client._get_session()
+
+            other_session = asyncio.run_coroutine_threadsafe(open_session(), other_loop).result(5)
+            assert client.get_pool_stats()["open_sessions"] == 2
+
+            await client.close_all()
+
+            assert other_session.closed
+            assert client.get_pool_stats()["open_sessions"] == 0
+        finally:
+            other_loop.call_soon_threadsafe(other_loop.stop)
+            thread.join()
+            other_loop.close()
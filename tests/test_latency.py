@@ -0,0 +1,90 @@
+"""
+Tests for LatencySketch - streaming duration percentiles.
+
+This module tests:
+- Percentile accuracy against exact percentiles
+- Edge cases: empty sketches, zero values and invalid input
+- Merging sketches
+"""
+
+import random
+import pytest
+
+from medusa.utils.latency import LatencySketch
+
+
+def exact_quantile(values, q):
+    """Get the exact quantile using the same rank convention as the sketch."""
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+class TestLatencySketch:
+    """Test recording and percentile queries."""
+
+    def test_percentiles_within_relative_accuracy(self):
+        """Test that percentiles stay within the configured relative error."""
+        rng = random.Random(42)
+        values = [rng.lognormvariate(1, 1.5) for _ in range(20000)]
+        sketch = LatencySketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.record(value)
+
+        for q in (0.0, 0.5, 0.95, 0.99, 1.0):
+            expected = exact_quantile(values, q)
+            assert sketch.quantile(q) == pytest.approx(expected, rel=0.0101), q
+
+        assert sketch.count == 20000
+        assert sketch.mean == pytest.approx(sum(values) / len(values))
+        assert sketch.max == max(values)
+
+    def test_memory_bounded_by_value_range(self):
+        """Test that repeated values share buckets."""
+        sketch = LatencySketch()
+        for _ in range(10000):
+            sketch.record(2.5)
+            sketch.record(30.0)
+
+        assert len(sketch._buckets) == 2
+        assert sketch.percentile(50) == 2.5
+        assert sketch.percentile(99) == 30.0
+
+    def test_empty_and_zero_values(self):
+        """Test that empty sketches report zeros and tiny values count as zero."""
+        sketch = LatencySketch()
+        assert sketch.percentile(99) == 0.0
+        assert sketch.summary() == {"count": 0, "mean": 0.0, "max": 0.0,
+                                    "p50": 0.0, "p95": 0.0, "p99": 0.0}
+
+        sketch.record(0)
+        sketch.record(0)
+        sketch.record(4.0)
+        assert sketch.percentile(50) == 0.0
+        assert sketch.percentile(100) == 4.0
+
+    def test_invalid_input(self):
+        """Test that invalid parameters and values are rejected."""
+        with pytest.raises(ValueError):
+            LatencySketch(relative_accuracy=0)
+        with pytest.raises(ValueError):
+            LatencySketch(min_value=0)
+
+        sketch = LatencySketch()
+        with pytest.raises(ValueError):
+            sketch.record(-1)
+        with pytest.raises(ValueError):
+            sketch.quantile(1.5)
+
+    def test_merge(self):
+        """Test that merging matches recording everything into one sketch."""
+        combined = LatencySketch()
+        parts = [LatencySketch(), LatencySketch()]
+        for i in range(1, 1001):
+            combined.record(i / 10)
+            parts[i % 2].record(i / 10)
+
+        parts[0].merge(parts[1])
+        assert parts[0].summary() == pytest.approx(combined.summary())
+
+        with pytest.raises(ValueError):
+            parts[0].merge(LatencySketch(relative_accuracy=0.05))
@@ -9,7 +9,7 @@ import json
 import pytest
 import tempfile
 import os
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, List, Optional
 
 from medusa.models import (
@@ -238,6 +238,39 @@ class TestTaskResult:
         assert result.created_at == original_created  # Should not change
         assert result.updated_at > original_updated  # Should be updated
     
+    def test_task_result_compact_representation(self):
+        """Test that TaskResult is slotted and stores epoch-microsecond timestamps."""
+        created = datetime(2024, 1, 1, 12, 0, 0, 123456, tzinfo=timezone.utc)
+        result = TaskResult(task_id="compact_test", status=TaskStatus.PENDING, created_at=created)
+        
+        assert not hasattr(result, "__dict__")
+        assert result.created_at_us == 1704110400123456
+        assert result.created_at == created
+        assert result.created_at.tzinfo is not None
+        
+        result.updated_at = created + timedelta(seconds=1)
+        assert result.updated_at_us == result.created_at_us + 1_000_000
+    
+    def test_task_result_equality_and_repr(self):
+        """Test value equality and dataclass-style repr."""
+        created = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        first = TaskResult(task_id="eq_test", status=TaskStatus.PENDING,
+                           created_at=created, updated_at=created)
+        second = TaskResult(task_id="eq_test", status=TaskStatus.PENDING,
+                            created_at=created, updated_at=created)
+        
+        assert first == second
+        second.message = "changed"
+        assert first != second
+        assert repr(first).startswith("TaskResult(task_id='eq_test', status=<TaskStatus.PENDING")
+    
+    def test_task_result_naive_datetime_treated_as_utc(self):
+        """Test that naive datetimes are interpreted as UTC."""
+        result = TaskResult(task_id="naive_test", status=TaskStatus.PENDING,
+                            created_at=datetime(2024, 1, 1, 12, 0, 0))
+        
+        assert result.created_at == datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    
     def test_task_result_update_status_invalid_transition(self):
         """Test TaskResult status update with invalid transition."""
         result = TaskResult(
@@ -594,6 +627,30 @@ class TestPlatformConfig:
         assert config.timeout == 30
 
 
+    def test_platform_config_chunk_size_validation(self):
+        """Test PlatformConfig validation fails for non-positive chunk size."""
+        config = PlatformConfig(platform_name="youtube", chunk_size=0)
+        
+        with pytest.raises(MedusaError) as exc_info:
+            config.validate()
+        
+        assert "Chunk size must be positive" in str(exc_info.value)
+    
+    def test_platform_config_chunk_settings_round_trip(self):
+        """Test chunk settings survive serialization."""
+        config = PlatformConfig(
+            platform_name="youtube",
+            chunk_size=4 * 1024 * 1024,
+            adaptive_chunk_size=True
+        )
+        
+        restored = PlatformConfig.from_dict(config.to_dict())
+        
+        assert restored.chunk_size == 4 * 1024 * 1024
+        assert restored.adaptive_chunk_size is True
+        assert PlatformConfig.from_dict({"platform_name": "youtube"}).chunk_size is None
+
+
 class TestPublishRequest:
     """Test the PublishRequest dataclass."""
     
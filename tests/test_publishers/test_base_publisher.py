@@ -210,6 +210,37 @@ class TestTemplateSubstitution:
         expected = {"title", "youtube_url"}
         assert set(variables) == expected
     
+    def test_compiled_template_is_cached(self):
+        """Test that compiling the same template text returns the cached instance."""
+        template = "New video: {youtube_url}{?duration: ({duration} mins)}"
+        
+        first = TemplateSubstitution.compile(template)
+        second = TemplateSubstitution.compile(template)
+        
+        assert first is second
+        assert first.render({"youtube_url": "url", "duration": 5}) == "New video: url (5 mins)"
+        assert first.render({"youtube_url": "url"}) == "New video: url"
+    
+    def test_compiled_template_instructions(self):
+        """Test that templates compile into a flat instruction list."""
+        compiled = TemplateSubstitution.compile("Hi {name}, {a|b}{?c: see {c}}!")
+        
+        assert [instruction[0] for instruction in compiled.instructions] == [0, 1, 0, 2, 3, 0]
+        assert compiled.render({"name": "Ann", "b": "B", "c": "C"}) == "Hi Ann, B see C!"
+    
+    def test_compile_invalid_template(self):
+        """Test that compiling an unbalanced template raises TemplateError."""
+        with pytest.raises(TemplateError, match="Invalid template syntax"):
+            TemplateSubstitution.compile("Hello {name")
+    
+    def test_template_nested_and_literal_braces(self):
+        """Test nested conditionals and non-variable brace groups."""
+        template = "{?a: A{?b: and B}} {not a var} {x y {a}}"
+        
+        result = TemplateSubstitution.substitute(template, {"a": "1", "b": "2"})
+        
+        assert result == "A and B {not a var} {x y 1}"
+    
     def test_template_edge_cases(self):
         """Test template substitution edge cases."""
         # Empty template
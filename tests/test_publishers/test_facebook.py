@@ -7,11 +7,12 @@ functionality, including text posts, link posts, validation, and error handling.
 
 import pytest
 import asyncio
+import json
 from unittest.mock import Mock, patch, AsyncMock, MagicMock
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional
 
-from medusa.publishers.facebook import FacebookPublisher
+from medusa.publishers.facebook import FacebookPublisher, FacebookBatchPost
 from medusa.publishers.base import PublishResult, PublishProgress
 from medusa.models import PlatformConfig
 from medusa.exceptions import (
@@ -56,6 +57,7 @@ class TestFacebookPublisher:
             mock_instance.test_connection.return_value = True
             mock_instance.check_permissions.return_value = True
             mock_instance.verify_page_access.return_value = True
+            mock_instance.close = AsyncMock()
             mock_auth.return_value = mock_instance
             yield mock_instance
 
@@ -256,7 +258,7 @@ class TestFacebookPublisher:
             "post_id": "987654321"
         }
         
-        with patch.object(publisher._auth, '_make_api_request', return_value=mock_response):
+        with patch.object(publisher._auth, '_make_api_request_async', new_callable=AsyncMock, return_value=mock_response):
             result = await publisher._publish_post(content, metadata)
         
         # Verify result
@@ -287,7 +289,7 @@ class TestFacebookPublisher:
             "post_id": "987654321"
         }
         
-        with patch.object(publisher._auth, '_make_api_request', return_value=mock_response):
+        with patch.object(publisher._auth, '_make_api_request_async', new_callable=AsyncMock, return_value=mock_response):
             result = await publisher._publish_post(content, metadata)
         
         # Verify result
@@ -316,7 +318,7 @@ class TestFacebookPublisher:
             "post_id": "987654321"
         }
         
-        with patch.object(publisher._auth, '_make_api_request', return_value=mock_response):
+        with patch.object(publisher._auth, '_make_api_request_async', new_callable=AsyncMock, return_value=mock_response):
             result = await publisher._publish_post(content, metadata)
         
         # Verify result
@@ -342,7 +344,7 @@ class TestFacebookPublisher:
             "post_id": "987654321"
         }
         
-        with patch.object(publisher._auth, '_make_api_request', return_value=mock_response):
+        with patch.object(publisher._auth, '_make_api_request_async', new_callable=AsyncMock, return_value=mock_response):
             await publisher._publish_post(content, metadata, progress_callback)
         
         # Verify progress callbacks
@@ -363,7 +365,7 @@ class TestFacebookPublisher:
         # Mock API error
         api_error = NetworkError("API rate limit exceeded", platform="facebook")
         
-        with patch.object(publisher._auth, '_make_api_request', side_effect=api_error):
+        with patch.object(publisher._auth, '_make_api_request_async', new_callable=AsyncMock, side_effect=api_error):
             with pytest.raises(PublishError) as exc_info:
                 await publisher._publish_post(content, metadata)
         
@@ -399,7 +401,7 @@ class TestFacebookPublisher:
             "post_id": "987654321"
         }
         
-        with patch.object(publisher._auth, '_make_api_request', return_value=mock_response) as mock_api:
+        with patch.object(publisher._auth, '_make_api_request_async', new_callable=AsyncMock, return_value=mock_response) as mock_api:
             await publisher._publish_post(content, metadata)
         
         # Verify that the API was called with substituted content
@@ -560,6 +562,142 @@ class TestFacebookPublisher:
         assert "facebook" in repr_str
 
 
+class TestFacebookPublisherBatch:
+    """Test suite for Graph API batch publishing."""
+    
+    @pytest.fixture
+    def publisher(self) -> FacebookPublisher:
+        """Create FacebookPublisher instance for testing."""
+        return FacebookPublisher(config=PlatformConfig(
+            platform_name="facebook",
+            credentials={
+                "page_id": "123456789",
+                "access_token": "valid_access_token",
+                "app_id": "app_123456",
+                "app_secret": "app_secret_123"
+            }
+        ))
+    
+    @pytest.fixture
+    def batch_api(self, publisher: FacebookPublisher):
+        """Fake Graph API batch endpoint recording each batch request."""
+        requests = []
+        
+        async def make_request(method, endpoint, params=None, data=None):
+            operations = json.loads(data["batch"])
+            requests.append(operations)
+            responses = []
+            for operation in operations:
+                if "fail" in operation["body"]:
+                    responses.append({"code": 400, "body": json.dumps(
+                        {"error": {"message": "Duplicate status", "type": "OAuthException"}}
+                    )})
+                else:
+                    page_id = operation["relative_url"].split("/")[0]
+                    responses.append({"code": 200, "body": json.dumps(
+                        {"id": f"{page_id}_{len(responses)}"}
+                    )})
+            return responses
+        
+        publisher._auth = Mock()
+        publisher._auth._make_api_request_async = AsyncMock(side_effect=make_request)
+        return requests
+    
+    @pytest.mark.asyncio
+    async def test_batch_splits_into_requests_of_max_size(self, publisher, batch_api):
+        """Test that 120 posts are sent in three batch requests."""
+        posts = [FacebookBatchPost(content=f"Post {i}", task_id=f"task_{i}") for i in range(120)]
+        
+        results = await publisher.publish_batch(posts)
+        
+        assert [len(request) for request in batch_api] == [50, 50, 20]
+        assert all(result.success for result in results)
+        assert [result.metadata["task_id"] for result in results] == [f"task_{i}" for i in range(120)]
+        assert publisher._auth._make_api_request_async.call_args.kwargs["endpoint"] == "/"
+    
+    @pytest.mark.asyncio
+    async def test_batch_targets_multiple_pages(self, publisher, batch_api):
+        """Test that posts for other pages use their own page ID and token."""
+        posts = [
+            FacebookBatchPost(content="Default page"),
+            FacebookBatchPost(content="Other page", page_id="555", access_token="page_token")
+        ]
+        
+        results = await publisher.publish_batch(posts)
+        
+        operations = batch_api[0]
+        assert operations[0]["relative_url"] == "123456789/feed"
+        assert "access_token" not in operations[0]["body"]
+        assert operations[1]["relative_url"] == "555/feed"
+        assert "access_token=page_token" in operations[1]["body"]
+        assert results[1].post_url == "https://facebook.com/555/posts/1"
+    
+    @pytest.mark.asyncio
+    async def test_batch_maps_errors_to_each_post(self, publisher, batch_api):
+        """Test that per-operation and local errors only fail their own post."""
+        posts = [
+            FacebookBatchPost(content="Works", task_id="ok"),
+            FacebookBatchPost(content="Please fail", task_id="api_error"),
+            FacebookBatchPost(content="Missing {variable}", task_id="template_error"),
+            FacebookBatchPost(content="Works too", task_id="ok_2")
+        ]
+        
+        results = await publisher.publish_batch(posts)
+        
+        assert [result.success for result in results] == [True, False, False, True]
+        assert "Duplicate status" in results[1].error
+        assert results[1].metadata["task_id"] == "api_error"
+        assert "variable" in results[2].error
+        assert len(batch_api[0]) == 3
+    
+    @pytest.mark.asyncio
+    async def test_batch_request_failure_fails_only_its_chunk(self, publisher):
+        """Test that a failed batch request marks every post in it as failed."""
+        publisher._auth = Mock()
+        publisher._auth._make_api_request_async = AsyncMock(
+            side_effect=NetworkError("Rate limit exceeded", platform="facebook")
+        )
+        
+        results = await publisher.publish_batch([FacebookBatchPost(content="Post")])
+        
+        assert results[0].success is False
+        assert "Rate limit exceeded" in results[0].error
+    
+    @pytest.mark.asyncio
+    async def test_batch_missing_operation_response(self, publisher):
+        """Test that a null entry in the batch response fails that post."""
+        publisher._auth = Mock()
+        publisher._auth._make_api_request_async = AsyncMock(return_value=[
+            None, {"code": 200, "body": json.dumps({"id": "123456789_42"})}
+        ])
+        
+        results = await publisher.publish_batch([
+            FacebookBatchPost(content="Timed out"),
+            FacebookBatchPost(content="Published")
+        ])
+        
+        assert results[0].success is False
+        assert "did not complete" in results[0].error
+        assert results[1].post_id == "42"
+    
+    @pytest.mark.asyncio
+    async def test_batch_progress_callback(self, publisher, batch_api):
+        """Test that progress is reported once per batch request."""
+        progress_calls = []
+        posts = [FacebookBatchPost(content=f"Post {i}") for i in range(60)]
+        
+        await publisher.publish_batch(posts, progress_callback=progress_calls.append)
+        
+        assert [p.current_step for p in progress_calls] == [1, 2]
+        assert progress_calls[-1].status == "completed"
+    
+    @pytest.mark.asyncio
+    async def test_batch_not_authenticated(self, publisher):
+        """Test batch publishing without authentication."""
+        with pytest.raises(AuthenticationError, match="Not authenticated"):
+            await publisher.publish_batch([FacebookBatchPost(content="Post")])
+
+
 class TestFacebookPublisherIntegration:
     """Integration tests for FacebookPublisher with realistic scenarios."""
     
@@ -590,7 +728,8 @@ class TestFacebookPublisherIntegration:
             mock_auth.test_connection.return_value = True
             mock_auth.check_permissions.return_value = True
             mock_auth.verify_page_access.return_value = True
-            mock_auth._make_api_request.return_value = {
+            mock_auth._make_api_request_async = AsyncMock()
+            mock_auth._make_api_request_async.return_value = {
                 "id": "123456789_987654321",
                 "post_id": "987654321"
             }
@@ -618,7 +757,8 @@ class TestFacebookPublisherIntegration:
             mock_auth.test_connection.return_value = True
             mock_auth.check_permissions.return_value = True
             mock_auth.verify_page_access.return_value = True
-            mock_auth._make_api_request.return_value = {
+            mock_auth._make_api_request_async = AsyncMock()
+            mock_auth._make_api_request_async.return_value = {
                 "id": "123456789_987654321",
                 "post_id": "987654321"
             }
@@ -640,7 +780,7 @@ class TestFacebookPublisherIntegration:
             assert result.metadata["link"] == "https://youtube.com/watch?v=dQw4w9WgXcQ"
             
             # Verify API was called with substituted content
-            api_calls = mock_auth._make_api_request.call_args_list
+            api_calls = mock_auth._make_api_request_async.call_args_list
             assert len(api_calls) == 1
             call_data = api_calls[0][1]["data"]  # Get the data parameter
             assert "https://youtube.com/watch?v=dQw4w9WgXcQ" in call_data["message"] 
\ No newline at end of file
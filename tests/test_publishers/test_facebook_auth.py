@@ -6,6 +6,7 @@ covering token management, validation, and permission verification.
 """
 
 import pytest
+import pytest_asyncio
 from unittest.mock import Mock, patch, MagicMock
 import requests
 from datetime import datetime, timedelta
@@ -449,4 +450,133 @@ class TestFacebookAuth:
         assert "page_id=123456789" in repr_str
         # Should not expose sensitive information
         assert "access_token" not in repr_str
-        assert "app_secret" not in repr_str 
\ No newline at end of file
+        assert "app_secret" not in repr_str 
+
+class TestFacebookAuthAsyncRequests:
+    """Test suite for pooled async Graph API requests."""
+    
+    @pytest.fixture
+    def valid_config(self):
+        """Valid Facebook configuration for testing."""
+        return {
+            "page_id": "123456789",
+            "access_token": "valid_token_12345",
+            "app_id": "app_123",
+            "app_secret": "secret_456",
+            "max_connections_per_host": 4
+        }
+    
+    @pytest_asyncio.fixture
+    async def graph_server(self):
+        """Start a local server imitating Graph API responses."""
+        from aiohttp import web
+        from aiohttp.test_utils import TestServer
+        
+        received = []
+        
+        async def feed(request):
+            received.append((request.query.get("access_token"), await request.json()))
+            return web.json_response({"id": "123456789_987654321"})
+        
+        async def limited(request):
+            return web.json_response(
+                {"error": {"message": "Too many calls", "type": "OAuthException"}},
+                status=429
+            )
+        
+        async def missing(request):
+            return web.json_response(
+                {"error": {"message": "Unknown path", "type": "GraphMethodException"}},
+                status=404
+            )
+        
+        app = web.Application()
+        app.router.add_post("/123456789/feed", feed)
+        app.router.add_get("/limited", limited)
+        app.router.add_get("/missing", missing)
+        
+        server = TestServer(app)
+        await server.start_server()
+        server.received = received
+        yield server
+        await server.close()
+    
+    @pytest_asyncio.fixture
+    async def facebook_auth(self, valid_config, graph_server):
+        """FacebookAuth pointed at the local server."""
+        auth = FacebookAuth(valid_config)
+        auth.base_url = str(graph_server.make_url("")).rstrip("/")
+        yield auth
+        await auth.close()
+    
+    def test_invalid_max_connections_per_host(self, valid_config):
+        """Test validation of the connection pool size."""
+        valid_config["max_connections_per_host"] = 0
+        with pytest.raises(ValidationError, match="max_connections_per_host"):
+            FacebookAuth(valid_config)
+    
+    def test_shared_client_by_default(self, valid_config):
+        """Test that instances without a custom pool size share one client."""
+        del valid_config["max_connections_per_host"]
+        first = FacebookAuth(valid_config)
+        second = FacebookAuth(valid_config)
+        
+        assert first.http_client is second.http_client
+        assert first.http_client.limit_per_host == FacebookAuth.MAX_CONNECTIONS_PER_HOST
+    
+    @pytest.mark.asyncio
+    async def test_close_shared_http_client(self, valid_config):
+        """Test that the shared client is closed and replaced on next use."""
+        del valid_config["max_connections_per_host"]
+        auth = FacebookAuth(valid_config)
+        shared = auth.http_client
+        shared._get_session()
+        
+        await FacebookAuth.close_shared_http_client()
+        
+        assert shared.get_pool_stats()["open_sessions"] == 0
+        assert auth.http_client is not shared
+        await FacebookAuth.close_shared_http_client()
+    
+    @pytest.mark.asyncio
+    async def test_async_post_request(self, facebook_auth, graph_server):
+        """Test POST through the pooled client."""
+        response = await facebook_auth._make_api_request_async(
+            "POST", "/123456789/feed", data={"message": "Hello"}
+        )
+        
+        assert response == {"id": "123456789_987654321"}
+        assert graph_server.received == [("valid_token_12345", {"message": "Hello"})]
+        assert facebook_auth.http_client.limit_per_host == 4
+    
+    @pytest.mark.asyncio
+    async def test_async_rate_limit(self, facebook_auth):
+        """Test rate limit responses raise NetworkError with status 429."""
+        with pytest.raises(NetworkError) as exc_info:
+            await facebook_auth._make_api_request_async("GET", "/limited")
+        
+        assert "Rate limit exceeded: Too many calls" in str(exc_info.value)
+        assert exc_info.value.status_code == 429
+    
+    @pytest.mark.asyncio
+    async def test_async_api_error(self, facebook_auth):
+        """Test API error responses raise NetworkError."""
+        with pytest.raises(NetworkError) as exc_info:
+            await facebook_auth._make_api_request_async("GET", "/missing")
+        
+        assert "API error during GET /missing: Unknown path" in str(exc_info.value)
+        assert exc_info.value.status_code == 404
+    
+    @pytest.mark.asyncio
+    async def test_async_network_error(self, facebook_auth):
+        """Test connection failures raise NetworkError."""
+        facebook_auth.base_url = "http://127.0.0.1:1"
+        
+        with pytest.raises(NetworkError, match="Network error during API request"):
+            await facebook_auth._make_api_request_async("GET", "/me")
+    
+    @pytest.mark.asyncio
+    async def test_async_unsupported_method(self, facebook_auth):
+        """Test unsupported HTTP methods are rejected."""
+        with pytest.raises(NetworkError, match="Unsupported HTTP method"):
+            await facebook_auth._make_api_request_async("DELETE", "/me")
@@ -0,0 +1,256 @@
+"""
+Tests for QuotaLedger - daily API quota accounting.
+
+This module tests:
+- Quota days and resets in US Pacific time across DST changes
+- Reservation, charging and release accounting
+- Persistence across ledger instances and daily roll-over
+- Deferred admission of operations when the budget is short
+"""
+
+import asyncio
+import json
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from medusa.exceptions import RateLimitError
+from medusa.utils.quota import (
+    QuotaLedger,
+    QuotaLedgerError,
+    get_quota_ledger,
+    next_quota_reset,
+    quota_day,
+)
+
+
+class FakeClock:
+    """Controllable clock for ledger tests."""
+
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+class TestQuotaDay:
+    """Test quota day boundaries in US Pacific time."""
+
+    def test_quota_day_uses_pacific_standard_time(self):
+        """Test that the day changes at 08:00 UTC in winter."""
+        assert quota_day(utc(2024, 1, 16, 7, 59)) == date(2024, 1, 15)
+        assert quota_day(utc(2024, 1, 16, 8, 0)) == date(2024, 1, 16)
+
+    def test_quota_day_uses_pacific_daylight_time(self):
+        """Test that the day changes at 07:00 UTC in summer."""
+        assert quota_day(utc(2024, 7, 1, 6, 59)) == date(2024, 6, 30)
+        assert quota_day(utc(2024, 7, 1, 7, 0)) == date(2024, 7, 1)
+
+    def test_naive_datetimes_are_utc(self):
+        """Test that naive datetimes are treated as UTC."""
+        assert quota_day(datetime(2024, 1, 16, 7, 59)) == date(2024, 1, 15)
+
+    @pytest.mark.parametrize("moment,expected", [
+        (utc(2024, 1, 15, 12), utc(2024, 1, 16, 8)),
+        (utc(2024, 7, 1, 12), utc(2024, 7, 2, 7)),
+        # Days on which daylight time starts and ends
+        (utc(2024, 3, 10, 9), utc(2024, 3, 11, 7)),
+        (utc(2024, 11, 2, 12), utc(2024, 11, 3, 7)),
+        (utc(2024, 11, 3, 12), utc(2024, 11, 4, 8)),
+    ])
+    def test_next_quota_reset(self, moment, expected):
+        """Test that the reset is the next Pacific midnight."""
+        assert next_quota_reset(moment) == expected
+
+
+class TestQuotaLedger:
+    """Test reservation and charging."""
+
+    def test_invalid_daily_limit(self):
+        """Test that a non-positive daily limit is rejected."""
+        with pytest.raises(QuotaLedgerError):
+            QuotaLedger(daily_limit=0)
+
+    def test_cost_of(self):
+        """Test YouTube method costs and the default cost."""
+        ledger = QuotaLedger()
+
+        assert ledger.cost_of("videos.insert") == 1600
+        assert ledger.cost_of("thumbnails.set") == 50
+        assert ledger.cost_of("playlists.list") == 1
+
+    def test_reserve_record_release(self):
+        """Test that reserved units count against the budget until charged or released."""
+        ledger = QuotaLedger(daily_limit=2000)
+
+        reservation = ledger.try_reserve(1650)
+        assert ledger.remaining == 350
+        assert ledger.try_reserve(1600) is None
+
+        assert ledger.record("videos.insert", reservation) == 1600
+        assert ledger.used == 1600
+        assert ledger.remaining == 350
+
+        ledger.release(reservation)
+        ledger.release(reservation)
+        assert ledger.remaining == 400
+
+        status = ledger.get_status()
+        assert status["reserved"] == 0
+        assert status["calls"] == {"videos.insert": {"count": 1, "units": 1600}}
+
+    def test_try_reserve_invalid_units(self):
+        """Test that impossible reservations are rejected."""
+        ledger = QuotaLedger(daily_limit=100)
+
+        with pytest.raises(QuotaLedgerError):
+            ledger.try_reserve(-1)
+        with pytest.raises(QuotaLedgerError):
+            ledger.try_reserve(101)
+
+    def test_mark_exhausted_keeps_reservations(self):
+        """Test that an API quota error uses up everything not already reserved."""
+        ledger = QuotaLedger(daily_limit=1000)
+        reservation = ledger.try_reserve(100)
+
+        ledger.mark_exhausted()
+
+        assert ledger.remaining == 0
+        ledger.release(reservation)
+        assert ledger.remaining == 100
+
+    def test_roll_over_resets_usage(self):
+        """Test that a new Pacific day starts with the full budget."""
+        clock = FakeClock(utc(2024, 1, 15, 12))
+        ledger = QuotaLedger(daily_limit=2000, clock=clock)
+        ledger.record("videos.insert")
+        assert ledger.try_reserve(1600) is None
+
+        clock.now = utc(2024, 1, 16, 8)
+
+        assert ledger.used == 0
+        assert ledger.try_reserve(1600) is not None
+        assert ledger.get_status()["quota_day"] == "2024-01-16"
+
+    def test_seconds_until_reset(self):
+        """Test the time left in the quota day."""
+        ledger = QuotaLedger(clock=FakeClock(utc(2024, 1, 16, 6)))
+
+        assert ledger.seconds_until_reset() == 2 * 3600
+
+
+class TestQuotaLedgerPersistence:
+    """Test the JSON ledger file."""
+
+    def test_usage_survives_restart(self, temp_dir):
+        """Test that a new ledger on the same file continues the quota day."""
+        path = temp_dir / "quota.json"
+        clock = FakeClock(utc(2024, 1, 15, 12))
+        QuotaLedger(path, clock=clock).record("videos.insert")
+
+        restored = QuotaLedger(path, clock=clock)
+
+        assert restored.used == 1600
+        assert restored.get_status()["calls"]["videos.insert"]["count"] == 1
+        assert not list(temp_dir.glob("*.tmp"))
+
+    def test_previous_day_is_ignored(self, temp_dir):
+        """Test that a ledger file from an earlier quota day is not loaded."""
+        path = temp_dir / "quota.json"
+        QuotaLedger(path, clock=FakeClock(utc(2024, 1, 15, 12))).record("videos.insert")
+
+        restored = QuotaLedger(path, clock=FakeClock(utc(2024, 1, 16, 12)))
+
+        assert restored.used == 0
+
+    def test_corrupt_file(self, temp_dir):
+        """Test that an unreadable ledger file raises QuotaLedgerError."""
+        path = temp_dir / "quota.json"
+        path.write_text("{not json")
+
+        with pytest.raises(QuotaLedgerError):
+            QuotaLedger(path)
+
+    def test_file_contents(self, temp_dir):
+        """Test the persisted format."""
+        path = temp_dir / "quota.json"
+        ledger = QuotaLedger(path, clock=FakeClock(utc(2024, 1, 15, 12)))
+        ledger.record("thumbnails.set")
+
+        data = json.loads(path.read_text())
+
+        assert data == {
+            "quota_day": "2024-01-15",
+            "used": 50,
+            "calls": {"thumbnails.set": {"count": 1, "units": 50}}
+        }
+
+    def test_get_quota_ledger_is_shared(self, temp_dir):
+        """Test that one ledger is shared per file."""
+        path = temp_dir / "shared.json"
+
+        assert get_quota_ledger(path) is get_quota_ledger(str(path))
+        assert get_quota_ledger(path) is not get_quota_ledger(temp_dir / "other.json")
+
+    def test_file_written_outside_ledger_lock(self, temp_dir, monkeypatch):
+        """Test that the ledger stays usable while its file is being written."""
+        ledger = QuotaLedger(temp_dir / "quota.json")
+        lock_free = []
+
+        def write(data):
+            acquired = ledger._lock.acquire(blocking=False)
+            if acquired:
+                ledger._lock.release()
+            lock_free.append(acquired)
+
+        monkeypatch.setattr(ledger, "_write", write)
+        ledger.record("videos.insert")
+
+        assert lock_free == [True]
+
+
+class TestQuotaLedgerAdmission:
+    """Test deferred admission with reserve()."""
+
+    @pytest.mark.asyncio
+    async def test_reserve_waits_for_release(self):
+        """Test that a deferred operation is admitted once units are released."""
+        ledger = QuotaLedger(daily_limit=2000)
+        first = await ledger.reserve(1600)
+
+        waiting = asyncio.ensure_future(ledger.reserve(1600))
+        await asyncio.sleep(0.01)
+        assert not waiting.done()
+
+        ledger.release(first)
+        second = await asyncio.wait_for(waiting, 1)
+
+        assert second.units == 1600
+        assert ledger.remaining == 400
+
+    @pytest.mark.asyncio
+    async def test_reserve_timeout(self):
+        """Test that a short budget fails with a quota RateLimitError."""
+        ledger = QuotaLedger(daily_limit=2000, clock=FakeClock(utc(2024, 1, 16, 7)))
+        ledger.record("videos.insert")
+
+        with pytest.raises(RateLimitError) as exc_info:
+            await ledger.reserve(1600, timeout=0)
+
+        assert exc_info.value.quota_exceeded is True
+        assert exc_info.value.retry_after == 3601
+        assert exc_info.value.platform == "youtube"
+
+    @pytest.mark.asyncio
+    async def test_reserve_times_out_after_waiting(self):
+        """Test that waiting stops at the timeout."""
+        ledger = QuotaLedger(daily_limit=2000)
+        await ledger.reserve(1600)
+
+        with pytest.raises(RateLimitError):
+            await ledger.reserve(1600, timeout=0.02)
@@ -0,0 +1,235 @@
+"""
+Tests for ShardedTaskStore - lock-striped task storage.
+
+This module tests:
+- Parity of queries with the single-lock TaskStore
+- Cross-shard ordering, paging and cleanup
+- Concurrent writers on different shards
+- Journal restore into shards
+"""
+
+import threading
+import pytest
+from datetime import datetime, timezone, timedelta
+
+from medusa.utils.sharded_task_store import ShardedTaskStore
+from medusa.utils.task_store import TaskStore, TaskStoreError
+from medusa.utils.journal import TaskJournal
+from medusa.models import TaskResult, TaskStatus
+
+
+def create_task(task_id: str, status: TaskStatus = TaskStatus.PENDING, age_hours: float = 0) -> TaskResult:
+    """Create a test task created age_hours ago."""
+    task = TaskResult(task_id=task_id, status=status, message=f"Task {task_id}")
+    if age_hours:
+        task.created_at = datetime.now(timezone.utc) - timedelta(hours=age_hours)
+    return task
+
+
+@pytest.fixture
+def sharded_store():
+    """Provide a sharded store without automatic cleanup."""
+    store = ShardedTaskStore(shard_count=4, cleanup_enabled=False)
+    yield store
+    store.stop_cleanup()
+
+
+def populate(store, count=20):
+    """Store tasks with mixed statuses and ages, some sharing created_at."""
+    same_time = datetime.now(timezone.utc) - timedelta(hours=5)
+    statuses = [TaskStatus.PENDING, TaskStatus.IN_PROGRESS, TaskStatus.COMPLETED]
+    for i in range(count):
+        task = create_task(f"task-{i}", statuses[i % 3], age_hours=count - i)
+        if i % 5 == 0:
+            task.created_at = same_time
+        store.store_task(task)
+
+
+class TestShardedTaskStoreBasics:
+    """Test single-task operations."""
+
+    def test_invalid_shard_count(self):
+        """Test that a non-positive shard count is rejected."""
+        with pytest.raises(TaskStoreError):
+            ShardedTaskStore(shard_count=0)
+
+    def test_crud(self, sharded_store):
+        """Test storing, reading, updating and deleting tasks."""
+        task = create_task("t1")
+        assert sharded_store.store_task(task)
+        assert sharded_store.get_task("t1") is task
+        assert sharded_store.task_exists("t1")
+
+        with pytest.raises(TaskStoreError):
+            sharded_store.store_task(create_task("t1"))
+
+        updated = create_task("t1", TaskStatus.COMPLETED)
+        sharded_store.update_task(updated)
+        assert sharded_store.get_task("t1") is updated
+
+        assert sharded_store.delete_task("t1")
+        assert sharded_store.get_task("t1") is None
+        assert not sharded_store.task_exists("t1")
+        assert not sharded_store.delete_task("t1")
+
+    def test_update_missing_task_raises(self, sharded_store):
+        """Test that updating an unknown task raises."""
+        with pytest.raises(TaskStoreError):
+            sharded_store.update_task(create_task("missing"))
+
+    def test_tasks_spread_over_shards(self, sharded_store):
+        """Test that tasks are distributed across shards."""
+        populate(sharded_store, 40)
+
+        stats = sharded_store.get_storage_stats()
+        assert stats["shard_count"] == 4
+        assert sum(stats["shard_sizes"]) == stats["total_tasks"] == 40
+        assert sum(1 for size in stats["shard_sizes"] if size) > 1
+
+
+class TestShardedTaskStoreParity:
+    """Test that aggregated queries match a single TaskStore."""
+
+    @pytest.fixture
+    def stores(self, sharded_store):
+        """Provide a sharded and a plain store with the same tasks."""
+        plain = TaskStore(cleanup_enabled=False)
+        populate(plain)
+        populate(sharded_store)
+        yield plain, sharded_store
+        plain.stop_cleanup()
+
+    @staticmethod
+    def ids(tasks):
+        return [task.task_id for task in tasks]
+
+    def test_created_range_matches(self, stores):
+        """Test that paged created_at queries return the same tasks in order."""
+        plain, sharded = stores
+        now = datetime.now(timezone.utc)
+        queries = [
+            {},
+            {"newest_first": False},
+            {"offset": 3, "limit": 4},
+            {"offset": 2, "limit": 5, "newest_first": False},
+            {"created_after": now - timedelta(hours=12), "created_before": now - timedelta(hours=3)},
+            {"status_filter": [TaskStatus.COMPLETED], "limit": 3},
+        ]
+        for query in queries:
+            assert self.ids(sharded.get_tasks_by_created_range(**query)) == \
+                self.ids(plain.get_tasks_by_created_range(**query)), query
+
+    def test_cursor_pages_match(self, stores):
+        """Test that cursor pages walk the same tasks in the same order."""
+        def walk(store, newest_first):
+            pages = []
+            cursor = None
+            while True:
+                page = store.get_tasks_by_created_range(limit=3, newest_first=newest_first,
+                                                        cursor=cursor)
+                if not page:
+                    return pages
+                pages.append(self.ids(page))
+                cursor = TaskStore.cursor_for(page[-1])
+
+        plain, sharded = stores
+        for newest_first in (True, False):
+            assert walk(sharded, newest_first) == walk(plain, newest_first)
+
+    def test_batch_lookup_matches(self, stores):
+        """Test that batch lookups return the same tasks."""
+        plain, sharded = stores
+        task_ids = ["task-7", "missing", "task-0", "task-19"]
+        assert {k: v and v.task_id for k, v in sharded.get_tasks(task_ids).items()} == \
+            {k: v and v.task_id for k, v in plain.get_tasks(task_ids).items()}
+
+    def test_created_after_matches(self, stores):
+        """Test that created_after returns the same tasks in order."""
+        plain, sharded = stores
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=5)
+        assert self.ids(sharded.get_tasks_created_after(cutoff)) == \
+            self.ids(plain.get_tasks_created_after(cutoff))
+
+    def test_counts_and_status_queries_match(self, stores):
+        """Test counts, status listings and storage stats."""
+        plain, sharded = stores
+        assert sharded.get_task_count() == plain.get_task_count()
+        for status in TaskStatus:
+            assert sharded.get_task_count(status) == plain.get_task_count(status)
+            assert sorted(self.ids(sharded.get_tasks_by_status(status))) == \
+                sorted(self.ids(plain.get_tasks_by_status(status)))
+        assert sharded.get_storage_stats()["status_counts"] == plain.get_storage_stats()["status_counts"]
+        assert sorted(self.ids(sharded.get_all_tasks())) == sorted(self.ids(plain.get_all_tasks()))
+
+    def test_cleanup_matches(self, stores):
+        """Test that cleanup removes the same tasks."""
+        plain, sharded = stores
+        assert sharded.cleanup_old_tasks(max_age_hours=10, status_filter=[TaskStatus.PENDING]) == \
+            plain.cleanup_old_tasks(max_age_hours=10, status_filter=[TaskStatus.PENDING])
+        assert sorted(self.ids(sharded.get_all_tasks())) == sorted(self.ids(plain.get_all_tasks()))
+
+        assert sharded.clear_all_tasks() == plain.clear_all_tasks()
+        assert sharded.get_task_count() == 0
+
+
+class TestShardedTaskStoreConcurrency:
+    """Test concurrent access."""
+
+    def test_concurrent_writers(self, sharded_store):
+        """Test that concurrent writers and readers keep the store consistent."""
+        errors = []
+
+        def writer(worker: int):
+            try:
+                for i in range(100):
+                    task = create_task(f"w{worker}-{i}")
+                    sharded_store.store_task(task)
+                    task.status = TaskStatus.COMPLETED
+                    sharded_store.update_task(task)
+                    assert sharded_store.get_task(task.task_id) is task
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=writer, args=(w,)) for w in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert sharded_store.get_task_count() == 800
+        assert sharded_store.get_task_count(TaskStatus.COMPLETED) == 800
+
+
+class TestShardedTaskStoreJournal:
+    """Test journal integration."""
+
+    def test_restored_from_journal(self, temp_dir):
+        """Test that journaled tasks are restored into the right shards."""
+        with TaskJournal(temp_dir, sync_interval=0) as journal:
+            store = ShardedTaskStore(shard_count=4, cleanup_enabled=False, journal=journal)
+            populate(store, 10)
+            store.delete_task("task-3")
+
+        with TaskJournal(temp_dir, sync_interval=0) as journal:
+            store = ShardedTaskStore(shard_count=4, cleanup_enabled=False, journal=journal)
+
+            assert store.get_task_count() == 9
+            assert store.get_task("task-4") is not None
+            assert store.get_task("task-3") is None
+
+    def test_clear_all_tasks_journals_one_clear(self, temp_dir):
+        """Test that clearing every shard writes a single journal record."""
+        with TaskJournal(temp_dir, sync_interval=0) as journal:
+            store = ShardedTaskStore(shard_count=4, cleanup_enabled=False, journal=journal)
+            populate(store, 10)
+            before = journal.get_journal_stats()["records_since_snapshot"]
+
+            assert store.clear_all_tasks() == 10
+            assert journal.get_journal_stats()["records_since_snapshot"] == before + 1
+            store.store_task(create_task("after"))
+
+        with TaskJournal(temp_dir, sync_interval=0) as journal:
+            store = ShardedTaskStore(shard_count=4, cleanup_enabled=False, journal=journal)
+
+            assert [task.task_id for task in store.get_all_tasks()] == ["after"]
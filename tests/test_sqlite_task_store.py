@@ -0,0 +1,163 @@
+"""
+Tests for SQLiteTaskStore - persistent task storage.
+
+This module tests:
+- Persistence of tasks across store instances
+- Batched, coalesced writes and explicit flushing
+- Index-backed queries after reload
+- Deletes, cleanup and clearing reaching the database
+"""
+
+import sqlite3
+import pytest
+from datetime import datetime, timezone, timedelta
+
+from medusa.utils.sqlite_task_store import SQLiteTaskStore
+from medusa.utils.task_store import TaskStore, TaskStoreError
+from medusa.models import TaskResult, TaskStatus
+
+
+@pytest.fixture
+def db_path(temp_dir):
+    """Provide a database path in a temporary directory."""
+    return temp_dir / "tasks.db"
+
+
+def open_store(db_path, **kwargs) -> SQLiteTaskStore:
+    """Open a store without background timers unless requested."""
+    kwargs.setdefault("cleanup_enabled", False)
+    kwargs.setdefault("flush_interval", 0)
+    return SQLiteTaskStore(db_path, **kwargs)
+
+
+def count_rows(db_path) -> int:
+    """Count rows in the tasks table with an independent connection."""
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+    finally:
+        conn.close()
+
+
+class TestSQLiteTaskStore:
+    """Test cases for SQLiteTaskStore."""
+
+    def test_is_drop_in_task_store(self, db_path):
+        """Test that the store is a TaskStore using WAL mode."""
+        with open_store(db_path) as store:
+            assert isinstance(store, TaskStore)
+            mode = store._conn.execute("PRAGMA journal_mode").fetchone()[0]
+            assert mode == "wal"
+
+    def test_invalid_batch_size(self, db_path):
+        """Test parameter validation."""
+        with pytest.raises(TaskStoreError, match="batch_size"):
+            SQLiteTaskStore(db_path, batch_size=0)
+
+    def test_tasks_survive_restart(self, db_path):
+        """Test that tasks written by one instance are loaded by the next."""
+        created_at = datetime.now(timezone.utc) - timedelta(hours=1)
+        with open_store(db_path) as store:
+            task = TaskResult(task_id="task_1", status=TaskStatus.PENDING,
+                              created_at=created_at, results={"youtube_url": "url"})
+            store.store_task(task)
+            task.update_status(TaskStatus.IN_PROGRESS, "Uploading")
+            store.update_task(task)
+
+        with open_store(db_path) as store:
+            restored = store.get_task("task_1")
+            assert restored.status == TaskStatus.IN_PROGRESS
+            assert restored.message == "Uploading"
+            assert restored.results == {"youtube_url": "url"}
+            assert restored.created_at == created_at
+            assert store.get_task_count(TaskStatus.IN_PROGRESS) == 1
+
+    def test_writes_are_batched_and_coalesced(self, db_path):
+        """Test that writes are buffered until the batch fills."""
+        store = open_store(db_path, batch_size=3)
+        try:
+            task = TaskResult(task_id="task_1", status=TaskStatus.PENDING)
+            store.store_task(task)
+            task.update_status(TaskStatus.IN_PROGRESS)
+            store.update_task(task)
+
+            # Two changes to one task are a single pending row
+            assert store.get_storage_stats()["pending_writes"] == 1
+            assert count_rows(db_path) == 0
+
+            store.store_task(TaskResult(task_id="task_2", status=TaskStatus.PENDING))
+            store.store_task(TaskResult(task_id="task_3", status=TaskStatus.PENDING))
+
+            assert count_rows(db_path) == 3
+            assert store.get_storage_stats()["pending_writes"] == 0
+        finally:
+            store.close()
+
+    def test_flush_writes_pending_changes(self, db_path):
+        """Test explicit flush."""
+        with open_store(db_path) as store:
+            store.store_task(TaskResult(task_id="task_1", status=TaskStatus.PENDING))
+
+            assert store.flush() == 1
+            assert count_rows(db_path) == 1
+            assert store.flush() == 0
+
+    def test_deletes_reach_database(self, db_path):
+        """Test that delete, cleanup and clear remove rows."""
+        old = datetime.now(timezone.utc) - timedelta(hours=48)
+        with open_store(db_path) as store:
+            for i in range(4):
+                store.store_task(TaskResult(
+                    task_id=f"task_{i}",
+                    status=TaskStatus.COMPLETED,
+                    created_at=old if i < 2 else datetime.now(timezone.utc)
+                ))
+            store.flush()
+
+            store.delete_task("task_3")
+            assert store.cleanup_old_tasks(max_age_hours=24) == 2
+            store.flush()
+            assert count_rows(db_path) == 1
+
+        with open_store(db_path) as store:
+            assert [t.task_id for t in store.get_all_tasks()] == ["task_2"]
+            assert store.clear_all_tasks() == 1
+            assert count_rows(db_path) == 0
+
+    def test_range_queries_after_reload(self, db_path):
+        """Test that the created_at index is rebuilt on load."""
+        now = datetime.now(timezone.utc)
+        with open_store(db_path) as store:
+            for i in range(5):
+                store.store_task(TaskResult(
+                    task_id=f"task_{i}",
+                    status=TaskStatus.PENDING,
+                    created_at=now - timedelta(minutes=5 - i)
+                ))
+
+        with open_store(db_path) as store:
+            newest = store.get_tasks_by_created_range(limit=2)
+            assert [t.task_id for t in newest] == ["task_4", "task_3"]
+
+    def test_background_flush(self, db_path):
+        """Test that the flush timer writes buffered changes."""
+        import time
+
+        store = open_store(db_path, flush_interval=0.05)
+        try:
+            store.store_task(TaskResult(task_id="task_1", status=TaskStatus.PENDING))
+            deadline = time.monotonic() + 2
+            while count_rows(db_path) == 0 and time.monotonic() < deadline:
+                time.sleep(0.02)
+
+            assert count_rows(db_path) == 1
+        finally:
+            store.close()
+
+    def test_closed_store_rejects_writes(self, db_path):
+        """Test that writes after close raise TaskStoreError."""
+        store = open_store(db_path)
+        store.close()
+
+        with pytest.raises(TaskStoreError, match="closed"):
+            store.store_task(TaskResult(task_id="task_1", status=TaskStatus.PENDING))
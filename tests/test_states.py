@@ -8,8 +8,10 @@ This module tests all aspects of task state management including:
 - Error handling for invalid transitions
 """
 
+import asyncio
+import threading
 import pytest
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
 from unittest.mock import Mock, patch
 from typing import List, Callable
 
@@ -20,7 +22,8 @@ from medusa.utils.states import (
     StateEventSystem, 
     TaskStateManager,
     StateTransitionError,
-    InvalidStateError
+    InvalidStateError,
+    OverflowPolicy
 )
 
 
@@ -77,6 +80,19 @@ class TestStateTransition:
         
         assert transition.timestamp == custom_time
     
+    def test_transition_compact_representation(self):
+        """Test that transitions are slotted and compare by value."""
+        custom_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        transition = StateTransition(TaskState.PENDING, TaskState.IN_PROGRESS, timestamp=custom_time)
+        
+        assert not hasattr(transition, "__dict__")
+        assert transition.timestamp_us == 1704067200000000
+        assert transition == StateTransition(TaskState.PENDING, TaskState.IN_PROGRESS,
+                                             timestamp=custom_time)
+        assert transition != StateTransition(TaskState.PENDING, TaskState.IN_PROGRESS,
+                                             timestamp=custom_time, message="other")
+        assert StateTransition.from_dict(transition.to_dict()) == transition
+    
     def test_transition_validation_valid(self):
         """Test validation of valid state transitions."""
         valid_transitions = [
@@ -232,6 +248,68 @@ class TestStateHistory:
         
         with pytest.raises(InvalidStateError):
             history.rollback_to_state(TaskState.COMPLETED, "Invalid rollback")
+    
+    def test_bounded_history_keeps_latest_transitions(self):
+        """Test that a bounded history evicts the oldest transitions."""
+        history = StateHistory("task_123", max_transitions=3)
+        
+        history.add_transition(StateTransition(None, TaskState.PENDING))
+        history.add_transition(StateTransition(TaskState.PENDING, TaskState.IN_PROGRESS))
+        for _ in range(5):
+            history.add_transition(StateTransition(TaskState.IN_PROGRESS, TaskState.FAILED))
+            history.rollback_to_state(TaskState.IN_PROGRESS)
+        
+        assert len(history.transitions) == 3
+        assert history.current_state == TaskState.IN_PROGRESS
+        assert history.transitions[-1].is_rollback
+        
+        # States only present in evicted transitions can still be rolled back to
+        history.rollback_to_state(TaskState.PENDING)
+        assert history.current_state == TaskState.PENDING
+    
+    def test_bounded_history_durations_include_evicted_transitions(self):
+        """Test that durations are accumulated across evicted transitions."""
+        base = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+        history = StateHistory("task_123", max_transitions=2)
+        
+        history.add_transition(StateTransition(None, TaskState.PENDING, timestamp=base))
+        history.add_transition(StateTransition(TaskState.PENDING, TaskState.IN_PROGRESS,
+                                               timestamp=base + timedelta(minutes=1)))
+        history.add_transition(StateTransition(TaskState.IN_PROGRESS, TaskState.FAILED,
+                                               timestamp=base + timedelta(minutes=3)))
+        history.add_transition(StateTransition(TaskState.FAILED, TaskState.IN_PROGRESS,
+                                               timestamp=base + timedelta(minutes=4), is_rollback=True))
+        
+        with patch('medusa.utils.states.datetime') as mock_datetime:
+            mock_datetime.now.return_value = base + timedelta(minutes=10)
+            durations = history.get_state_durations()
+        
+        assert durations[TaskState.PENDING] == timedelta(minutes=1)
+        assert durations[TaskState.IN_PROGRESS] == timedelta(minutes=8)
+        assert durations[TaskState.FAILED] == timedelta(minutes=1)
+    
+    def test_history_built_from_transitions(self):
+        """Test that initial transitions feed the incremental statistics."""
+        base = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+        transitions = [
+            StateTransition(None, TaskState.PENDING, timestamp=base),
+            StateTransition(TaskState.PENDING, TaskState.IN_PROGRESS, timestamp=base + timedelta(minutes=2)),
+            StateTransition(TaskState.IN_PROGRESS, TaskState.COMPLETED, timestamp=base + timedelta(minutes=5)),
+        ]
+        history = StateHistory("task_123", transitions, max_transitions=2)
+        
+        assert [t.to_state for t in history.transitions] == [TaskState.IN_PROGRESS, TaskState.COMPLETED]
+        with patch('medusa.utils.states.datetime') as mock_datetime:
+            mock_datetime.now.return_value = base + timedelta(minutes=5)
+            durations = history.get_state_durations()
+        assert durations[TaskState.PENDING] == timedelta(minutes=2)
+        assert durations[TaskState.IN_PROGRESS] == timedelta(minutes=3)
+        assert durations[TaskState.COMPLETED] == timedelta(0)
+    
+    def test_invalid_max_transitions(self):
+        """Test that a non-positive bound is rejected."""
+        with pytest.raises(InvalidStateError):
+            StateHistory("task_123", max_transitions=0)
 
 
 class TestStateEventSystem:
@@ -308,6 +386,192 @@ class TestStateEventSystem:
         event_system.emit_state_change("task_123", transition)
 
 
+class TestStateEventSystemAsyncDispatch:
+    """Test queued, non-blocking listener dispatch."""
+    
+    @pytest.mark.asyncio
+    async def test_coroutine_listener(self):
+        """Test that coroutine listeners are awaited on the loop."""
+        event_system = StateEventSystem()
+        received = []
+        
+        async def listener(task_id, transition):
+            received.append((task_id, transition.to_state))
+        
+        event_system.register_listener(TaskState.COMPLETED, listener, async_dispatch=True)
+        event_system.emit_state_change("task_1", StateTransition(TaskState.IN_PROGRESS, TaskState.COMPLETED))
+        
+        assert received == []
+        await event_system.drain()
+        assert received == [("task_1", TaskState.COMPLETED)]
+        event_system.close()
+    
+    @pytest.mark.asyncio
+    async def test_slow_callable_does_not_block_emit(self):
+        """Test that plain callables run in an executor, off the emitting thread."""
+        event_system = StateEventSystem()
+        release = threading.Event()
+        threads = []
+        
+        def slow_listener(task_id, transition):
+            threads.append(threading.current_thread())
+            release.wait(5)
+        
+        event_system.register_listener(TaskState.FAILED, slow_listener, async_dispatch=True)
+        event_system.emit_state_change("task_1", StateTransition(TaskState.IN_PROGRESS, TaskState.FAILED))
+        
+        # emit returned while the listener is still blocked
+        release.set()
+        await event_system.drain()
+        assert threads and threads[0] is not threading.current_thread()
+        event_system.close()
+    
+    @pytest.mark.asyncio
+    async def test_progress_events_coalesced(self):
+        """Test that queued IN_PROGRESS events for the same task collapse to the newest."""
+        event_system = StateEventSystem()
+        started = asyncio.Event()
+        gate = asyncio.Event()
+        received = []
+        
+        async def listener(task_id, transition):
+            started.set()
+            await gate.wait()
+            received.append((task_id, transition.message))
+        
+        event_system.register_listener(TaskState.IN_PROGRESS, listener, async_dispatch=True)
+        
+        event_system.emit_state_change(
+            "task_1", StateTransition(TaskState.PENDING, TaskState.IN_PROGRESS, message="step 0")
+        )
+        await started.wait()  # step 0 is now in flight
+        for i in range(1, 5):
+            event_system.emit_state_change(
+                "task_1", StateTransition(TaskState.PENDING, TaskState.IN_PROGRESS, message=f"step {i}")
+            )
+        event_system.emit_state_change(
+            "task_2", StateTransition(TaskState.PENDING, TaskState.IN_PROGRESS, message="other")
+        )
+        
+        gate.set()
+        await event_system.drain()
+        
+        assert received == [("task_1", "step 0"), ("task_1", "step 4"), ("task_2", "other")]
+        stats = event_system.get_listener_stats()["in_progress"][0]
+        assert stats["coalesced"] == 3
+        event_system.close()
+    
+    @pytest.mark.asyncio
+    async def test_drop_oldest_policy(self):
+        """Test that a full queue drops its oldest events."""
+        event_system = StateEventSystem()
+        started = asyncio.Event()
+        gate = asyncio.Event()
+        received = []
+        
+        async def listener(task_id, transition):
+            started.set()
+            await gate.wait()
+            received.append(task_id)
+        
+        event_system.register_listener(TaskState.COMPLETED, listener, async_dispatch=True,
+                                       max_queue_size=2)
+        
+        event_system.emit_state_change("task_0", StateTransition(TaskState.IN_PROGRESS, TaskState.COMPLETED))
+        await started.wait()  # task_0 is now in flight
+        for i in range(1, 5):
+            event_system.emit_state_change(f"task_{i}", StateTransition(TaskState.IN_PROGRESS, TaskState.COMPLETED))
+        
+        gate.set()
+        await event_system.drain()
+        
+        assert received == ["task_0", "task_3", "task_4"]
+        assert event_system.get_listener_stats()["completed"][0]["dropped"] == 2
+        event_system.close()
+    
+    @pytest.mark.asyncio
+    async def test_block_policy_applies_backpressure(self):
+        """Test that emitters on other threads wait for queue space."""
+        event_system = StateEventSystem()
+        received = []
+        
+        async def listener(task_id, transition):
+            await asyncio.sleep(0.01)
+            received.append(task_id)
+        
+        event_system.register_listener(TaskState.COMPLETED, listener, async_dispatch=True,
+                                       max_queue_size=1, overflow_policy=OverflowPolicy.BLOCK)
+        
+        def emit_all():
+            for i in range(5):
+                event_system.emit_state_change(
+                    f"task_{i}", StateTransition(TaskState.IN_PROGRESS, TaskState.COMPLETED)
+                )
+        
+        await asyncio.get_running_loop().run_in_executor(None, emit_all)
+        await event_system.drain()
+        
+        assert received == [f"task_{i}" for i in range(5)]
+        assert event_system.get_listener_stats()["completed"][0]["dropped"] == 0
+        event_system.close()
+    
+    @pytest.mark.asyncio
+    async def test_failed_deliveries_counted_separately(self):
+        """Test that listener errors count as failures, not deliveries."""
+        event_system = StateEventSystem()
+        
+        async def listener(task_id, transition):
+            if task_id == "task_1":
+                raise RuntimeError("listener failed")
+        
+        event_system.register_listener(TaskState.COMPLETED, listener, async_dispatch=True)
+        for i in range(3):
+            event_system.emit_state_change(f"task_{i}", StateTransition(TaskState.IN_PROGRESS, TaskState.COMPLETED))
+        await event_system.drain()
+        
+        stats = event_system.get_listener_stats()["completed"][0]
+        assert stats["delivered"] == 2
+        assert stats["failed"] == 1
+        event_system.close()
+    
+    @pytest.mark.asyncio
+    async def test_unregister_async_listener(self):
+        """Test that unregistering stops delivery."""
+        event_system = StateEventSystem()
+        listener = Mock()
+        
+        event_system.register_listener(TaskState.COMPLETED, listener, async_dispatch=True)
+        event_system.unregister_listener(TaskState.COMPLETED, listener)
+        event_system.emit_state_change("task_1", StateTransition(TaskState.IN_PROGRESS, TaskState.COMPLETED))
+        await event_system.drain()
+        
+        listener.assert_not_called()
+        assert event_system.get_listener_stats() == {}
+    
+    def test_async_dispatch_requires_loop(self):
+        """Test that async dispatch outside a running loop needs an explicit loop."""
+        event_system = StateEventSystem()
+        
+        with pytest.raises(InvalidStateError):
+            event_system.register_listener(TaskState.COMPLETED, Mock(), async_dispatch=True)
+    
+    @pytest.mark.asyncio
+    async def test_state_manager_async_listener(self):
+        """Test async listeners registered through TaskStateManager."""
+        manager = TaskStateManager()
+        received = []
+        
+        async def listener(task_id, transition):
+            received.append(transition.to_state)
+        
+        manager.register_state_listener(TaskState.COMPLETED, listener, async_dispatch=True)
+        manager.initialize_task("task_1", TaskState.PENDING)
+        manager.transition_state("task_1", TaskState.COMPLETED)
+        
+        await manager.drain_state_events()
+        assert received == [TaskState.COMPLETED]
+
+
 class TestTaskStateManager:
     """Test TaskStateManager class functionality."""
     
@@ -379,6 +643,23 @@ class TestTaskStateManager:
         assert len(history.transitions) == 3
         assert history.current_state == TaskState.COMPLETED
     
+    def test_get_task_transitions_batch(self):
+        """Test snapshotting the transitions of several tasks at once."""
+        manager = TaskStateManager()
+        
+        manager.initialize_task("task_1", TaskState.PENDING)
+        manager.initialize_task("task_2", TaskState.PENDING)
+        manager.transition_state("task_2", TaskState.IN_PROGRESS)
+        
+        transitions = manager.get_task_transitions(["task_2", "missing", "task_1"])
+        
+        assert list(transitions) == ["task_2", "task_1"]
+        assert [t.to_state for t in transitions["task_2"]] == [TaskState.PENDING, TaskState.IN_PROGRESS]
+        
+        # The snapshot is a copy, unaffected by later transitions
+        manager.transition_state("task_1", TaskState.IN_PROGRESS)
+        assert len(transitions["task_1"]) == 1
+    
     def test_rollback_task_state(self):
         """Test rolling back task to previous state."""
         manager = TaskStateManager()
@@ -414,6 +695,54 @@ class TestTaskStateManager:
         assert "old_task" not in manager._task_histories
         assert "new_task" in manager._task_histories
     
+    def test_cleanup_rechecks_tasks_that_transitioned(self):
+        """Test that a task created long ago but recently updated is kept."""
+        manager = TaskStateManager()
+        
+        with patch('medusa.utils.states.datetime') as mock_datetime:
+            mock_datetime.now.return_value = datetime(2024, 1, 1, tzinfo=timezone.utc)
+            manager.initialize_task("active_task", TaskState.PENDING)
+            manager.initialize_task("old_task", TaskState.PENDING)
+        
+        manager.transition_state("active_task", TaskState.IN_PROGRESS)
+        
+        assert manager.cleanup_old_tasks(max_age_hours=1) == 1
+        assert "active_task" in manager._task_histories
+        assert "old_task" not in manager._task_histories
+        
+        # The re-queued entry keeps the task until it really expires
+        assert manager.cleanup_old_tasks(max_age_hours=1) == 0
+        assert manager.cleanup_old_tasks(max_age_hours=0) == 1
+    
+    def test_automatic_cleanup_scheduling(self):
+        """Test that automatic cleanup registers on the shared scheduler."""
+        with patch('medusa.utils.states.get_expiry_scheduler') as mock_get_scheduler:
+            mock_scheduler = mock_get_scheduler.return_value
+            manager = TaskStateManager(cleanup_interval_minutes=10, max_history_age_hours=0)
+            
+            mock_scheduler.schedule.assert_called_once()
+            interval, job = mock_scheduler.schedule.call_args[0][:2]
+            assert interval == 10 * 60
+            
+            manager.initialize_task("task", TaskState.PENDING)
+            job()
+            assert "task" not in manager._task_histories
+            
+            manager.stop_cleanup()
+            mock_scheduler.cancel.assert_called_once_with(mock_scheduler.schedule.return_value)
+    
+    def test_bounded_histories(self):
+        """Test that the manager caps transitions kept per task."""
+        manager = TaskStateManager(max_transitions_per_task=2)
+        manager.initialize_task("task", TaskState.PENDING)
+        manager.transition_state("task", TaskState.IN_PROGRESS)
+        manager.transition_state("task", TaskState.FAILED)
+        manager.rollback_task("task", TaskState.PENDING)
+        
+        history = manager.get_task_history("task")
+        assert len(history.transitions) == 2
+        assert manager.get_current_state("task") == TaskState.PENDING
+    
     def test_get_state_statistics(self):
         """Test getting statistics about task states."""
         manager = TaskStateManager()
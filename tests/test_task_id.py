@@ -11,10 +11,12 @@ This module tests the task ID generation system including:
 import pytest
 import uuid
 import re
-from datetime import datetime
+from datetime import datetime, timezone
 from unittest.mock import patch, MagicMock
 
-from medusa.utils.task_id import TaskIDGenerator, InvalidTaskIDError
+from medusa.utils.task_id import (
+    TaskIDGenerator, InvalidTaskIDError, encode_ulid, decode_ulid_timestamp
+)
 from medusa.exceptions import ValidationError
 
 
@@ -435,6 +437,170 @@ class TestTaskIDGenerator:
         assert "uuid_short" in summary
 
 
+class TestTaskIDGeneratorSortable:
+    """Test suite for time-sortable ULID-based task IDs."""
+    
+    def test_sortable_id_format(self):
+        """Test that sortable IDs are compact prefix_[type_]ULID strings."""
+        generator = TaskIDGenerator(sortable=True)
+        
+        task_id = generator.generate_task_id()
+        typed_id = generator.generate_task_id("upload")
+        
+        assert re.match(r'^medusa_task_[0-9A-HJKMNP-TV-Z]{26}$', task_id)
+        assert re.match(r'^medusa_task_upload_[0-9A-HJKMNP-TV-Z]{26}$', typed_id)
+        assert len(task_id) == 38
+        assert generator.validate_task_id(task_id)
+        assert generator.extract_task_type(typed_id) == "upload"
+    
+    def test_sortable_ids_strictly_increasing(self):
+        """Test that IDs sort in generation order, even within one millisecond."""
+        generator = TaskIDGenerator(sortable=True)
+        
+        with patch('medusa.utils.task_id.time.time_ns', return_value=1_700_000_000_000_000_000):
+            same_ms = [generator.generate_task_id() for _ in range(100)]
+        later = generator.generate_task_id()
+        
+        ids = same_ms + [later]
+        assert ids == sorted(ids)
+        assert len(set(ids)) == len(ids)
+    
+    def test_sortable_ids_monotonic_when_clock_steps_back(self):
+        """Test that a clock stepping backwards does not break ordering."""
+        generator = TaskIDGenerator(sortable=True)
+        
+        with patch('medusa.utils.task_id.time.time_ns', return_value=1_700_000_000_000_000_000):
+            first = generator.generate_task_id()
+        with patch('medusa.utils.task_id.time.time_ns', return_value=1_600_000_000_000_000_000):
+            second = generator.generate_task_id()
+        
+        assert second > first
+    
+    def test_parse_sortable_id_timestamp(self):
+        """Test that the creation time is decoded from the ID."""
+        generator = TaskIDGenerator(sortable=True)
+        
+        with patch('medusa.utils.task_id.time.time_ns', return_value=1_700_000_000_123_000_000):
+            task_id = generator.generate_task_id("publish")
+        
+        parsed = generator.parse_task_id(task_id)
+        assert parsed["timestamp"] == datetime(2023, 11, 14, 22, 13, 20, 123000, tzinfo=timezone.utc)
+        assert parsed["task_type"] == "publish"
+        assert isinstance(parsed["uuid"], uuid.UUID)
+        assert decode_ulid_timestamp(task_id[-26:]) == 1_700_000_000_123
+    
+    def test_parse_sortable_id_invalid(self):
+        """Test that malformed sortable IDs are rejected."""
+        generator = TaskIDGenerator(sortable=True)
+        ulid = encode_ulid(1_700_000_000_000, 12345)
+        
+        assert generator.validate_task_id(f"medusa_task_{ulid}")
+        for invalid_id in [
+            ulid,
+            f"other_task_{ulid}",
+            f"medusa_task_{ulid.lower()}",
+            f"medusa_task_{ulid[:-1]}U",
+            f"medusa_task_1bad_{ulid}",
+            f"medusa_task{ulid}",
+            TaskIDGenerator().generate_task_id(),
+        ]:
+            assert not generator.validate_task_id(invalid_id), invalid_id
+        
+        # Legacy generators keep rejecting sortable IDs
+        assert not TaskIDGenerator().validate_task_id(f"medusa_task_{ulid}")
+    
+    def test_quick_generate_sortable(self):
+        """Test the class-level helpers in sortable mode."""
+        task_id = TaskIDGenerator.quick_generate(sortable=True)
+        
+        assert TaskIDGenerator.quick_validate(task_id, sortable=True)
+        assert not TaskIDGenerator.quick_validate(task_id)
+
+
+class TestTaskIDGeneratorParsingCache:
+    """Test suite for cached, single-pass and bulk parsing."""
+    
+    def test_parse_uses_cache(self):
+        """Test that repeated parses of an ID are served from the cache."""
+        generator = TaskIDGenerator()
+        task_id = generator.generate_task_id("upload")
+        
+        first = generator.parse_task_id(task_id)
+        with patch('medusa.utils.task_id.datetime') as mock_datetime:
+            mock_datetime.strptime.side_effect = AssertionError("re-parsed")
+            assert generator.parse_task_id(task_id) == first
+            assert generator.extract_task_type(task_id) == "upload"
+            assert generator.validate_task_id(task_id)
+    
+    def test_cached_result_not_shared(self):
+        """Test that callers mutating a parsed result do not corrupt the cache."""
+        generator = TaskIDGenerator()
+        task_id = generator.generate_task_id()
+        
+        generator.parse_task_id(task_id)["task_type"] = "tampered"
+        
+        assert generator.parse_task_id(task_id)["task_type"] is None
+    
+    def test_cache_is_bounded_lru(self):
+        """Test that the least recently used IDs are evicted first."""
+        generator = TaskIDGenerator(parse_cache_size=2)
+        ids = [generator.generate_task_id() for _ in range(3)]
+        
+        generator.parse_task_id(ids[0])
+        generator.parse_task_id(ids[1])
+        generator.parse_task_id(ids[0])
+        generator.parse_task_id(ids[2])
+        
+        assert list(generator._parse_cache) == [ids[0], ids[2]]
+    
+    def test_cache_can_be_disabled(self):
+        """Test that a zero cache size disables caching and negative sizes are rejected."""
+        generator = TaskIDGenerator(parse_cache_size=0)
+        generator.parse_task_id(generator.generate_task_id())
+        
+        assert len(generator._parse_cache) == 0
+        with pytest.raises(ValidationError):
+            TaskIDGenerator(parse_cache_size=-1)
+    
+    def test_invalid_ids_not_cached(self):
+        """Test that invalid IDs keep raising descriptive errors."""
+        generator = TaskIDGenerator()
+        invalid_id = "medusa_task_invalid-type_20240101120000_" + str(uuid.uuid4())
+        
+        for _ in range(2):
+            with pytest.raises(InvalidTaskIDError, match="Invalid task type in task ID"):
+                generator.parse_task_id(invalid_id)
+        assert len(generator._parse_cache) == 0
+    
+    def test_prefix_is_matched_literally(self):
+        """Test that the full-ID matcher does not treat the prefix as a pattern."""
+        generator = TaskIDGenerator(prefix="job")
+        task_id = generator.generate_task_id()
+        
+        assert not generator.validate_task_id("jobs" + task_id[3:])
+        assert not generator.validate_task_id(task_id + "\n")
+    
+    def test_validate_many_and_parse_many(self):
+        """Test bulk validation and parsing in input order."""
+        generator = TaskIDGenerator()
+        valid_ids = [generator.generate_task_id() for _ in range(3)]
+        task_ids = [valid_ids[0], "invalid", None, valid_ids[1], valid_ids[2]]
+        
+        assert generator.validate_many(task_ids) == [True, False, False, True, True]
+        
+        parsed = generator.parse_many(task_ids)
+        assert parsed[1] is None and parsed[2] is None
+        assert [p["uuid"] for p in parsed if p] == [generator.extract_uuid(t) for t in valid_ids]
+    
+    def test_bulk_api_in_sortable_mode(self):
+        """Test bulk validation of sortable IDs."""
+        generator = TaskIDGenerator(sortable=True)
+        task_ids = [generator.generate_task_id("upload"), TaskIDGenerator().generate_task_id()]
+        
+        assert generator.validate_many(task_ids) == [True, False]
+        assert generator.parse_many(task_ids)[0]["task_type"] == "upload"
+
+
 class TestInvalidTaskIDError:
     """Test suite for InvalidTaskIDError exception."""
     
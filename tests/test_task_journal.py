@@ -0,0 +1,375 @@
+"""
+Tests for TaskJournal - append-only task journal with snapshot compaction.
+
+This module tests:
+- Replay of task changes and state transitions across journal instances
+- Field-level patch records for task updates
+- Snapshot compaction and journal truncation
+- Recovery from torn records and interrupted compaction
+- Integration with TaskStore and TaskStateManager
+"""
+
+import json
+import pytest
+from datetime import datetime, timezone, timedelta
+
+from medusa.utils.journal import TaskJournal, TaskJournalError, JOURNAL_FILE, SNAPSHOT_FILE
+from medusa.utils.task_store import TaskStore
+from medusa.utils.states import TaskStateManager, TaskState, StateTransition
+from medusa.models import TaskResult, TaskStatus
+
+
+def open_journal(directory, **kwargs) -> TaskJournal:
+    """Open a journal that syncs every record unless requested otherwise."""
+    kwargs.setdefault("sync_interval", 0)
+    return TaskJournal(directory, **kwargs)
+
+
+def read_records(directory):
+    """Read the journal file as a list of records."""
+    with open(directory / JOURNAL_FILE, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def create_task(task_id: str, status: TaskStatus = TaskStatus.PENDING) -> TaskResult:
+    """Create a test task."""
+    return TaskResult(task_id=task_id, status=status, message=f"Task {task_id}")
+
+
+class TestTaskJournalReplay:
+    """Test recording and replaying journal records."""
+
+    def test_tasks_replayed_after_reopen(self, temp_dir):
+        """Test that stored, updated and deleted tasks replay correctly."""
+        with open_journal(temp_dir) as journal:
+            task = create_task("t1")
+            journal.record_task(task)
+            journal.record_task(create_task("t2"))
+            task.status = TaskStatus.COMPLETED
+            task.results = {"youtube": {"url": "https://youtu.be/x"}}
+            journal.record_task(task)
+            journal.record_task_deleted("t2")
+
+        with open_journal(temp_dir) as journal:
+            tasks = journal.get_tasks()
+
+        assert [t.task_id for t in tasks] == ["t1"]
+        assert tasks[0].status == TaskStatus.COMPLETED
+        assert tasks[0].results == {"youtube": {"url": "https://youtu.be/x"}}
+
+    def test_update_writes_only_changed_fields(self, temp_dir):
+        """Test that updates append patch records with changed fields only."""
+        with open_journal(temp_dir) as journal:
+            task = create_task("t1")
+            journal.record_task(task)
+            task.message = "Uploading"
+            journal.record_task(task)
+            journal.record_task(task)  # Unchanged, nothing recorded
+
+        records = read_records(temp_dir)
+        assert [r["op"] for r in records] == ["put", "patch"]
+        assert records[1]["fields"] == {"message": "Uploading"}
+
+    def test_in_place_result_changes_detected(self, temp_dir):
+        """Test that mutating nested task data is seen as a change."""
+        with open_journal(temp_dir) as journal:
+            task = create_task("t1")
+            journal.record_task(task)
+            task.results["facebook"] = {"post_id": "123"}
+            journal.record_task(task)
+
+        assert read_records(temp_dir)[-1]["fields"] == {"results": {"facebook": {"post_id": "123"}}}
+
+    def test_transitions_replayed_after_reopen(self, temp_dir):
+        """Test that state transitions and history removal replay correctly."""
+        with open_journal(temp_dir) as journal:
+            journal.record_transition("t1", StateTransition(None, TaskState.PENDING))
+            journal.record_transition("t1", StateTransition(TaskState.PENDING, TaskState.IN_PROGRESS))
+            journal.record_transition("t2", StateTransition(None, TaskState.PENDING))
+            journal.record_history_removed("t2")
+
+        with open_journal(temp_dir) as journal:
+            histories = journal.get_histories()
+
+        assert list(histories) == ["t1"]
+        assert [t["to_state"] for t in histories["t1"]] == ["pending", "in_progress"]
+
+    def test_clear_replayed(self, temp_dir):
+        """Test that clearing tasks replays correctly."""
+        with open_journal(temp_dir) as journal:
+            journal.record_task(create_task("t1"))
+            journal.record_tasks_cleared()
+            journal.record_task(create_task("t2"))
+
+        with open_journal(temp_dir) as journal:
+            assert [t.task_id for t in journal.get_tasks()] == ["t2"]
+
+    def test_torn_record_discarded(self, temp_dir):
+        """Test that a partially written final record is ignored and truncated."""
+        with open_journal(temp_dir) as journal:
+            journal.record_task(create_task("t1"))
+            journal.record_task(create_task("t2"))
+
+        with open(temp_dir / JOURNAL_FILE, 'a', encoding='utf-8') as f:
+            f.write('{"op":"put","id":"t3","ta')
+
+        with open_journal(temp_dir) as journal:
+            assert [t.task_id for t in journal.get_tasks()] == ["t1", "t2"]
+            journal.record_task(create_task("t4"))
+
+        with open_journal(temp_dir) as journal:
+            assert [t.task_id for t in journal.get_tasks()] == ["t1", "t2", "t4"]
+
+    def test_invalid_parameters(self, temp_dir):
+        """Test that invalid parameters are rejected."""
+        with pytest.raises(TaskJournalError):
+            TaskJournal(temp_dir, sync_interval=-1)
+        with pytest.raises(TaskJournalError):
+            TaskJournal(temp_dir, compact_threshold=0)
+
+    def test_record_after_close_raises(self, temp_dir):
+        """Test that recording into a closed journal raises."""
+        journal = open_journal(temp_dir)
+        journal.close()
+
+        with pytest.raises(TaskJournalError):
+            journal.record_task(create_task("t1"))
+
+
+class TestTaskJournalGroupCommit:
+    """Test buffered, batched syncing."""
+
+    def test_records_buffered_until_sync(self, temp_dir):
+        """Test that records are buffered and written together on sync."""
+        journal = TaskJournal(temp_dir, sync_interval=3600)
+        try:
+            journal.record_task(create_task("t1"))
+            journal.record_task(create_task("t2"))
+
+            assert journal.get_journal_stats()["pending_records"] == 2
+            assert read_records(temp_dir) == []
+
+            assert journal.sync() == 2
+            assert len(read_records(temp_dir)) == 2
+        finally:
+            journal.close()
+
+    def test_close_syncs_pending_records(self, temp_dir):
+        """Test that close writes buffered records."""
+        journal = TaskJournal(temp_dir, sync_interval=3600)
+        journal.record_task(create_task("t1"))
+        journal.close()
+
+        assert [r["id"] for r in read_records(temp_dir)] == ["t1"]
+
+
+class TestTaskJournalCompaction:
+    """Test snapshot compaction."""
+
+    def test_compact_writes_snapshot_and_truncates(self, temp_dir):
+        """Test that compaction folds the journal into the snapshot."""
+        with open_journal(temp_dir) as journal:
+            journal.record_task(create_task("t1"))
+            journal.record_transition("t1", StateTransition(None, TaskState.PENDING))
+            journal.compact()
+
+            assert read_records(temp_dir) == []
+            assert (temp_dir / SNAPSHOT_FILE).exists()
+            journal.record_task(create_task("t2"))
+
+        with open_journal(temp_dir) as journal:
+            assert [t.task_id for t in journal.get_tasks()] == ["t1", "t2"]
+            assert list(journal.get_histories()) == ["t1"]
+
+    def test_compaction_triggered_by_threshold(self, temp_dir):
+        """Test that reaching compact_threshold compacts automatically."""
+        with open_journal(temp_dir, compact_threshold=3) as journal:
+            for i in range(4):
+                journal.record_task(create_task(f"t{i}"))
+
+            stats = journal.get_journal_stats()
+            assert stats["records_since_snapshot"] < 3
+            assert len(read_records(temp_dir)) < 3
+
+        with open_journal(temp_dir) as journal:
+            assert len(journal.get_tasks()) == 4
+
+    def test_records_in_snapshot_not_replayed_twice(self, temp_dir):
+        """Test recovery when a crash happens between snapshot and truncation."""
+        with open_journal(temp_dir) as journal:
+            journal.record_transition("t1", StateTransition(None, TaskState.PENDING))
+            journal.record_transition("t1", StateTransition(TaskState.PENDING, TaskState.IN_PROGRESS))
+
+        journal_bytes = (temp_dir / JOURNAL_FILE).read_bytes()
+        with open_journal(temp_dir) as journal:
+            journal.compact()
+
+        # Simulate the truncation never reaching disk
+        (temp_dir / JOURNAL_FILE).write_bytes(journal_bytes)
+
+        with open_journal(temp_dir) as journal:
+            assert len(journal.get_histories()["t1"]) == 2
+
+    def test_snapshot_serialized_outside_view_lock(self, temp_dir, monkeypatch):
+        """Test that recording threads are not blocked while a snapshot is serialized."""
+        import medusa.utils.journal as journal_module
+
+        dumps = json.dumps
+        lock_free = []
+
+        with open_journal(temp_dir) as journal:
+            journal.record_task(create_task("t1"))
+
+            def tracking_dumps(obj, *args, **kwargs):
+                if "version" in obj:
+                    acquired = journal._lock.acquire(blocking=False)
+                    if acquired:
+                        journal._lock.release()
+                    lock_free.append(acquired)
+                return dumps(obj, *args, **kwargs)
+
+            monkeypatch.setattr(journal_module.json, "dumps", tracking_dumps)
+            journal.compact()
+
+        assert lock_free == [True]
+
+    def test_history_limit_trims_view_and_snapshot(self, temp_dir):
+        """Test that only the most recent transitions are kept and compacted."""
+        states = [TaskState.PENDING, TaskState.IN_PROGRESS, TaskState.FAILED, TaskState.IN_PROGRESS]
+        with open_journal(temp_dir) as journal:
+            previous = None
+            for state in states:
+                journal.record_transition("t1", StateTransition(previous, state))
+                previous = state
+
+        with open_journal(temp_dir, max_transitions_per_task=2) as journal:
+            history = journal.get_histories()["t1"]
+            assert [t["to_state"] for t in history] == ["failed", "in_progress"]
+            journal.compact()
+
+        snapshot = json.loads((temp_dir / SNAPSHOT_FILE).read_text())
+        assert len(snapshot["histories"]["t1"]) == 2
+
+    def test_evicted_statistics_survive_compaction(self, temp_dir):
+        """Test that durations and states of evicted transitions are snapshotted."""
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        states = [TaskState.PENDING, TaskState.IN_PROGRESS, TaskState.FAILED, TaskState.IN_PROGRESS]
+        with open_journal(temp_dir, max_transitions_per_task=2) as journal:
+            previous = None
+            for minutes, state in enumerate(states):
+                journal.record_transition(
+                    "t1", StateTransition(previous, state, start + timedelta(minutes=minutes))
+                )
+                previous = state
+            journal.compact()
+
+        with open_journal(temp_dir, max_transitions_per_task=2) as journal:
+            evicted = journal.get_evicted_statistics()["t1"]
+
+        assert evicted["durations_us"] == {"pending": 60_000_000, "in_progress": 60_000_000}
+        assert evicted["reached"] == ["pending", "in_progress"]
+
+    def test_invalid_history_limit(self, temp_dir):
+        """Test that a non-positive history limit is rejected."""
+        with pytest.raises(TaskJournalError):
+            open_journal(temp_dir, max_transitions_per_task=0)
+
+
+class TestTaskJournalIntegration:
+    """Test TaskStore and TaskStateManager with a journal."""
+
+    def test_task_store_restored_from_journal(self, temp_dir):
+        """Test that a journaled TaskStore is restored with its indexes."""
+        with open_journal(temp_dir) as journal:
+            store = TaskStore(cleanup_enabled=False, journal=journal)
+            task = create_task("t1")
+            store.store_task(task)
+            store.store_task(create_task("t2"))
+            store.store_task(create_task("t3"))
+            task.status = TaskStatus.COMPLETED
+            store.update_task(task)
+            store.delete_task("t3")
+
+        with open_journal(temp_dir) as journal:
+            store = TaskStore(cleanup_enabled=False, journal=journal)
+
+            assert store.get_task_count() == 2
+            assert store.get_task("t1").status == TaskStatus.COMPLETED
+            assert [t.task_id for t in store.get_tasks_by_status(TaskStatus.PENDING)] == ["t2"]
+
+    def test_task_store_cleanup_journaled(self, temp_dir):
+        """Test that expired tasks removed by cleanup stay removed after replay."""
+        with open_journal(temp_dir) as journal:
+            store = TaskStore(cleanup_enabled=False, journal=journal)
+            old_task = create_task("old")
+            old_task.created_at = datetime.now(timezone.utc) - timedelta(hours=48)
+            store.store_task(old_task)
+            store.store_task(create_task("new"))
+
+            assert store.cleanup_old_tasks(max_age_hours=24) == 1
+
+        with open_journal(temp_dir) as journal:
+            assert [t.task_id for t in journal.get_tasks()] == ["new"]
+
+    def test_state_manager_restored_from_journal(self, temp_dir):
+        """Test that a journaled TaskStateManager is restored with full histories."""
+        with open_journal(temp_dir) as journal:
+            manager = TaskStateManager(journal=journal)
+            manager.initialize_task("t1", TaskState.PENDING)
+            manager.transition_state("t1", TaskState.IN_PROGRESS, "Uploading")
+            manager.transition_state("t1", TaskState.FAILED, "Network error")
+            manager.rollback_task("t1", TaskState.IN_PROGRESS, "Retrying")
+
+        with open_journal(temp_dir) as journal:
+            manager = TaskStateManager(journal=journal)
+
+            history = manager.get_task_history("t1")
+            assert manager.get_current_state("t1") == TaskState.IN_PROGRESS
+            assert len(history.transitions) == 4
+            assert history.transitions[-1].is_rollback
+
+            manager.transition_state("t1", TaskState.COMPLETED)
+            assert manager.get_current_state("t1") == TaskState.COMPLETED
+
+    def test_state_manager_caps_journaled_history(self, temp_dir):
+        """Test that the manager's history cap also bounds the journal."""
+        with open_journal(temp_dir) as journal:
+            manager = TaskStateManager(journal=journal, max_transitions_per_task=2)
+            manager.initialize_task("t1", TaskState.PENDING)
+            manager.transition_state("t1", TaskState.IN_PROGRESS)
+            manager.transition_state("t1", TaskState.COMPLETED)
+
+            assert len(journal.get_histories()["t1"]) == 2
+            assert journal.get_journal_stats()["max_transitions_per_task"] == 2
+
+    def test_capped_history_statistics_restored_from_journal(self, temp_dir):
+        """Test that a restored capped history still accounts for evicted transitions."""
+        with open_journal(temp_dir) as journal:
+            manager = TaskStateManager(journal=journal, max_transitions_per_task=2)
+            manager.initialize_task("t1", TaskState.PENDING)
+            manager.transition_state("t1", TaskState.IN_PROGRESS)
+            manager.transition_state("t1", TaskState.FAILED)
+            expected = manager.get_task_history("t1").get_state_durations()
+
+        with open_journal(temp_dir) as journal:
+            manager = TaskStateManager(journal=journal, max_transitions_per_task=2)
+            durations = manager.get_task_history("t1").get_state_durations()
+
+            assert durations[TaskState.PENDING] == expected[TaskState.PENDING]
+            assert durations[TaskState.IN_PROGRESS] == expected[TaskState.IN_PROGRESS]
+
+            manager.rollback_task("t1", TaskState.PENDING, "Starting over")
+            assert manager.get_current_state("t1") == TaskState.PENDING
+
+    def test_record_task_detects_in_place_result_changes(self, temp_dir):
+        """Test that mutating a recorded task's results produces a patch."""
+        with open_journal(temp_dir) as journal:
+            task = create_task("t1")
+            journal.record_task(task)
+            task.results["youtube"] = {"video_id": "abc"}
+            journal.record_task(task)
+            journal.record_task(task)
+
+        records = read_records(temp_dir)
+        assert [r["op"] for r in records] == ["put", "patch"]
+        assert records[1]["fields"] == {"results": {"youtube": {"video_id": "abc"}}}
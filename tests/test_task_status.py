@@ -5,13 +5,18 @@ This module contains comprehensive tests for the TaskStatusManager class,
 including status querying, formatting, history tracking, and performance metrics.
 """
 
+import asyncio
+import threading
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Any, Optional
 
 from medusa.models import TaskResult, TaskStatus
-from medusa.utils.task_status import TaskStatusManager, TaskStatusError, TaskStatusQuery, TaskStatusResponse
+from medusa.utils.task_status import (
+    TaskStatusManager, TaskStatusError, TaskStatusQuery, TaskStatusResponse, TaskWatchResult,
+    TaskStatusPage, encode_cursor, decode_cursor
+)
 from medusa.utils.task_store import TaskStore
 from medusa.utils.states import TaskStateManager, TaskState, StateTransition
 from medusa.exceptions import MedusaError
@@ -262,6 +267,42 @@ class TestTaskStatusManager:
         
         assert "missing_task" in str(exc_info.value)
     
+    def test_get_task_statuses_batch(self):
+        """Test that a batch lookup maps every requested ID, including missing ones."""
+        manager = TaskStatusManager()
+        for i in range(3):
+            manager.task_store.store_task(TaskResult(
+                task_id=f"task_{i}", status=TaskStatus.IN_PROGRESS, message="Uploading",
+                results={"progress": {"percent": i * 10}}
+            ))
+            manager.state_manager.initialize_task(f"task_{i}", TaskState.PENDING)
+            manager.state_manager.transition_state(f"task_{i}", TaskState.IN_PROGRESS)
+        
+        # One snapshot from the store and one from the state manager, no per-ID calls
+        manager.task_store.get_task = Mock(side_effect=AssertionError("per-task lookup"))
+        manager.state_manager.get_task_history = Mock(side_effect=AssertionError("per-task lookup"))
+        
+        statuses = manager.get_task_statuses(
+            ["task_2", "missing", "task_0", ""], include_history=True, include_progress=True
+        )
+        
+        assert list(statuses) == ["task_2", "missing", "task_0", ""]
+        assert statuses["missing"] is None and statuses[""] is None
+        assert statuses["task_2"].message == "Uploading"
+        assert statuses["task_2"].progress == {"percent": 20}
+        assert [h["to_state"] for h in statuses["task_0"].history] == ["pending", "in_progress"]
+    
+    def test_get_task_statuses_without_history(self):
+        """Test that histories are not read unless requested."""
+        manager = TaskStatusManager()
+        manager.task_store.store_task(TaskResult(task_id="task_1", status=TaskStatus.PENDING))
+        manager.state_manager.get_task_transitions = Mock()
+        
+        statuses = manager.get_task_statuses(["task_1"])
+        
+        assert statuses["task_1"].history is None
+        manager.state_manager.get_task_transitions.assert_not_called()
+    
     def test_query_tasks_by_status(self):
         """Test querying tasks by status."""
         # Setup
@@ -333,6 +374,32 @@ class TestTaskStatusManager:
         # Verify
         assert len(results) == 5
     
+    def test_query_tasks_with_cursor(self):
+        """Test paging through tasks with cursors while new tasks are created."""
+        now = datetime.now(timezone.utc)
+        manager = TaskStatusManager()
+        for i in range(10):
+            manager.task_store.store_task(TaskResult(
+                task_id=f"task_{i}",
+                status=TaskStatus.COMPLETED,
+                created_at=now - timedelta(minutes=10 - i)
+            ))
+        
+        page = manager.query_task_statuses_page(TaskStatusQuery(limit=4))
+        assert isinstance(page, TaskStatusPage)
+        assert [r.task_id for r in page.items] == ["task_9", "task_8", "task_7", "task_6"]
+        
+        # Tasks created between requests don't shift later pages
+        manager.task_store.store_task(TaskResult(task_id="late", status=TaskStatus.PENDING))
+        
+        page = manager.query_task_statuses_page(TaskStatusQuery(limit=4, cursor=page.next_cursor))
+        assert [r.task_id for r in page.items] == ["task_5", "task_4", "task_3", "task_2"]
+        
+        page = manager.query_task_statuses_page(TaskStatusQuery(limit=4, cursor=page.next_cursor))
+        assert [r.task_id for r in page.items] == ["task_1", "task_0"]
+        assert page.next_cursor is None
+        assert page.to_dict()["items"][0] == {"status": "completed", "task_id": "task_1"}
+    
     def test_get_task_performance_metrics(self):
         """Test getting performance metrics for tasks."""
         # Setup
@@ -391,6 +458,54 @@ class TestTaskStatusManager:
         assert "status_breakdown" in metrics
         assert metrics["status_breakdown"]["completed"] == 5
     
+    def test_latency_percentiles_updated_on_terminal_transitions(self):
+        """Test that task durations are sketched per terminal status as tasks finish."""
+        manager = TaskStatusManager()
+        now = datetime.now(timezone.utc)
+        for i in range(10):
+            task_id = f"task_{i}"
+            manager.task_store.store_task(TaskResult(
+                task_id=task_id, status=TaskStatus.PENDING,
+                created_at=now - timedelta(seconds=10 * (i + 1))
+            ))
+            manager.state_manager.initialize_task(task_id, TaskState.PENDING)
+            manager.state_manager.transition_state(task_id, TaskState.IN_PROGRESS)
+            final = TaskState.FAILED if i == 9 else TaskState.COMPLETED
+            manager.state_manager.transition_state(task_id, final)
+        
+        # Sketches are read without touching the store
+        manager.task_store.get_all_tasks = Mock(side_effect=AssertionError("store scanned"))
+        by_status = manager.get_latency_percentiles()["by_status"]
+        
+        assert set(by_status) == {"completed", "failed"}
+        completed = by_status["completed"]
+        assert completed["count"] == 9
+        assert completed["p50"] == pytest.approx(50, rel=0.02)
+        assert completed["p95"] == pytest.approx(80, rel=0.02)
+        assert completed["max"] == pytest.approx(90, rel=0.01)
+        assert by_status["failed"]["p95"] == pytest.approx(100, rel=0.02)
+    
+    def test_platform_latency_percentiles(self):
+        """Test per-platform operation duration sketches."""
+        manager = TaskStatusManager()
+        for i in range(1, 101):
+            manager.record_platform_duration("youtube", "upload", float(i))
+        manager.record_platform_duration("youtube", "upload", 3.0, TaskStatus.FAILED)
+        manager.record_platform_duration("facebook", "publish", 0.5)
+        
+        metrics = manager.get_aggregated_performance_metrics()
+        by_platform = metrics["latency_percentiles"]["by_platform"]
+        
+        youtube = by_platform["youtube"]["upload"]
+        assert youtube["completed"]["count"] == 100
+        assert youtube["completed"]["p50"] == pytest.approx(50, rel=0.02)
+        assert youtube["completed"]["p95"] == pytest.approx(95, rel=0.02)
+        assert youtube["failed"]["count"] == 1
+        assert by_platform["facebook"]["publish"]["completed"]["p99"] == pytest.approx(0.5, rel=0.02)
+        
+        manager.clear_performance_metrics()
+        assert manager.get_latency_percentiles() == {"by_status": {}, "by_platform": {}}
+    
     def test_format_status_response_completed(self):
         """Test formatting completed status response."""
         # Setup
@@ -519,6 +634,129 @@ class TestTaskStatusManager:
         assert all(result.status == "in_progress" for result in results)
 
 
+class TestTaskStatusManagerWatch:
+    """Test the push-style watch API."""
+    
+    def setup_method(self):
+        self.task_store = TaskStore(cleanup_enabled=False)
+        self.state_manager = TaskStateManager()
+        self.manager = TaskStatusManager(self.task_store, self.state_manager)
+    
+    def create_task(self, task_id: str) -> None:
+        self.task_store.store_task(TaskResult(task_id=task_id, status=TaskStatus.PENDING))
+        self.state_manager.initialize_task(task_id, TaskState.PENDING)
+    
+    def complete_task(self, task_id: str) -> None:
+        task = self.task_store.get_task(task_id)
+        task.status = TaskStatus.COMPLETED
+        task.results = {"url": f"https://example.com/{task_id}"}
+        self.task_store.update_task(task)
+        self.state_manager.transition_state(task_id, TaskState.COMPLETED)
+    
+    def test_watch_returns_existing_changes(self):
+        """Test that changes after since_version are returned without waiting."""
+        self.create_task("task_1")
+        self.create_task("task_2")
+        
+        result = self.manager.watch(["task_1", "task_2", "missing"], since_version=0, timeout=0)
+        
+        assert isinstance(result, TaskWatchResult)
+        assert result.version == self.manager.current_version == 2
+        assert [change.task_id for change in result.changes] == ["task_1", "task_2"]
+    
+    def test_watch_filters_by_version(self):
+        """Test that only tasks changed after since_version are returned."""
+        self.create_task("task_1")
+        self.create_task("task_2")
+        version = self.manager.current_version
+        
+        self.complete_task("task_2")
+        result = self.manager.watch(since_version=version, timeout=0)
+        
+        assert [change.task_id for change in result.changes] == ["task_2"]
+        assert result.changes[0].status == "completed"
+        assert result.to_dict()["changes"][0]["results"] == {"url": "https://example.com/task_2"}
+    
+    def test_watch_times_out_without_changes(self):
+        """Test that watch returns an empty result after the timeout."""
+        self.create_task("task_1")
+        version = self.manager.current_version
+        
+        result = self.manager.watch(["task_1"], since_version=version, timeout=0.01)
+        
+        assert result.changes == []
+        assert result.version == version
+    
+    def test_watch_woken_by_state_change(self):
+        """Test that a blocked watch is woken by a transition on another thread."""
+        self.create_task("task_1")
+        version = self.manager.current_version
+        
+        timer = threading.Timer(0.05, self.complete_task, args=("task_1",))
+        timer.start()
+        try:
+            result = self.manager.watch(["task_1"], since_version=version, timeout=5)
+        finally:
+            timer.join()
+        
+        assert [change.status for change in result.changes] == ["completed"]
+        assert result.version > version
+    
+    def test_watch_ignores_other_tasks(self):
+        """Test that changes of unwatched tasks do not satisfy the watch."""
+        self.create_task("task_1")
+        version = self.manager.current_version
+        self.create_task("task_2")
+        
+        result = self.manager.watch(["task_1"], since_version=version, timeout=0.01)
+        
+        assert result.changes == []
+    
+    @pytest.mark.asyncio
+    async def test_watch_async_yields_changes(self):
+        """Test the async iterator form of watch."""
+        self.create_task("task_1")
+        batches = []
+        
+        async def consume():
+            async for result in self.manager.watch_async(["task_1"]):
+                batches.append([change.status for change in result.changes])
+                if len(batches) == 2:
+                    break
+        
+        consumer = asyncio.create_task(consume())
+        await asyncio.sleep(0.01)
+        self.complete_task("task_1")
+        await asyncio.wait_for(consumer, 5)
+        
+        assert batches == [["pending"], ["completed"]]
+    
+    def test_forgotten_versions_reported_as_changed(self):
+        """Test that tasks whose versions were forgotten are reported conservatively."""
+        with patch('medusa.utils.task_status.WATCH_HISTORY_SIZE', 1):
+            self.create_task("task_1")
+            self.create_task("task_2")
+        
+        result = self.manager.watch(["task_1"], since_version=0, timeout=0)
+        assert [change.task_id for change in result.changes] == ["task_1"]
+        
+        result = self.manager.watch(["task_1"], since_version=result.version, timeout=0)
+        assert result.changes == []
+
+
+    def test_close_unregisters_state_listener(self):
+        """Test that a closed manager no longer receives state changes."""
+        self.create_task("task_1")
+        version = self.manager.current_version
+        
+        self.manager.close()
+        self.manager.close()
+        self.complete_task("task_1")
+        
+        assert self.manager.current_version == version
+        assert not any(self.state_manager._event_system._listeners.values())
+
+
 class TestTaskStatusQuery:
     """Test cases for TaskStatusQuery class."""
     
@@ -568,6 +806,16 @@ class TestTaskStatusQuery:
                 created_before=now - timedelta(hours=1)
             )
 
+    
+    def test_query_cursor(self):
+        """Test cursor encoding and validation."""
+        assert decode_cursor(encode_cursor(1700000000000000, "task:1")) == \
+            (1700000000000000, "task:1")
+        assert TaskStatusQuery(cursor="1:task").cursor == "1:task"
+        
+        for cursor in ["", "task", "abc:task", "123:"]:
+            with pytest.raises(ValueError):
+                TaskStatusQuery(cursor=cursor)
 
 class TestTaskStatusResponse:
     """Test cases for TaskStatusResponse class."""
@@ -10,6 +10,7 @@ This module tests the TaskStore class with comprehensive coverage including:
 - Concurrent access scenarios
 """
 
+import gc
 import pytest
 import threading
 import time
@@ -233,6 +234,188 @@ class TestTaskStoreQuerying:
         assert self.task_store.task_exists(fake_task_id) is False
 
 
+class TestTaskStoreStatusIndex:
+    """Test the per-status secondary index."""
+    
+    def setup_method(self):
+        self.task_store = TaskStore(cleanup_enabled=False)
+        self.task_id_generator = TaskIDGenerator()
+    
+    def create_task(self, status: TaskStatus = TaskStatus.PENDING, age_hours: float = 0) -> TaskResult:
+        """Create and store a TaskResult."""
+        task = TaskResult(
+            task_id=self.task_id_generator.generate_task_id(),
+            status=status,
+            created_at=datetime.now(timezone.utc) - timedelta(hours=age_hours)
+        )
+        self.task_store.store_task(task)
+        return task
+    
+    def test_index_follows_in_place_status_update(self):
+        """Test that a task mutated in place moves between status buckets on update."""
+        task = self.create_task()
+        
+        task.update_status(TaskStatus.IN_PROGRESS)
+        self.task_store.update_task(task)
+        
+        assert self.task_store.get_task_count(TaskStatus.PENDING) == 0
+        assert self.task_store.get_task_count(TaskStatus.IN_PROGRESS) == 1
+        assert self.task_store.get_tasks_by_status(TaskStatus.IN_PROGRESS) == [task]
+    
+    def test_index_follows_replaced_task(self):
+        """Test that updating with a new object indexes the new object."""
+        task = self.create_task()
+        replacement = TaskResult(task_id=task.task_id, status=TaskStatus.COMPLETED)
+        
+        self.task_store.update_task(replacement)
+        
+        assert self.task_store.get_tasks_by_status(TaskStatus.COMPLETED)[0] is replacement
+        assert self.task_store.get_tasks_by_status(TaskStatus.PENDING) == []
+    
+    def test_index_updated_on_delete_cleanup_and_clear(self):
+        """Test that removals keep counts consistent."""
+        deleted = self.create_task(TaskStatus.FAILED)
+        self.create_task(TaskStatus.COMPLETED, age_hours=48)
+        self.create_task(TaskStatus.COMPLETED)
+        
+        self.task_store.delete_task(deleted.task_id)
+        self.task_store.cleanup_old_tasks(max_age_hours=24)
+        
+        assert self.task_store.get_task_count(TaskStatus.FAILED) == 0
+        assert self.task_store.get_task_count(TaskStatus.COMPLETED) == 1
+        assert self.task_store.get_storage_stats()["status_counts"] == {"completed": 1}
+        
+        self.task_store.clear_all_tasks()
+        assert self.task_store.get_task_count(TaskStatus.COMPLETED) == 0
+        assert self.task_store.get_storage_stats()["status_counts"] == {}
+    
+    def test_multiple_statuses_without_duplicates(self):
+        """Test that repeated statuses in a filter do not duplicate results."""
+        self.create_task(TaskStatus.PENDING)
+        self.create_task(TaskStatus.FAILED)
+        
+        tasks = self.task_store.get_tasks_by_status(
+            [TaskStatus.PENDING, TaskStatus.FAILED, TaskStatus.PENDING]
+        )
+        
+        assert len(tasks) == 2
+
+
+class TestTaskStoreCreatedIndex:
+    """Test the created_at-ordered index."""
+    
+    def setup_method(self):
+        self.task_store = TaskStore(cleanup_enabled=False)
+        self.now = datetime.now(timezone.utc)
+        
+        # task_0 is the oldest, task_9 the newest; odd tasks are completed
+        for i in range(10):
+            self.task_store.store_task(TaskResult(
+                task_id=f"task_{i}",
+                status=TaskStatus.COMPLETED if i % 2 else TaskStatus.PENDING,
+                created_at=self.now - timedelta(hours=10 - i)
+            ))
+    
+    def test_range_newest_first(self):
+        """Test inclusive range bounds and newest-first order."""
+        tasks = self.task_store.get_tasks_by_created_range(
+            created_after=self.now - timedelta(hours=5),
+            created_before=self.now - timedelta(hours=2)
+        )
+        
+        assert [t.task_id for t in tasks] == ["task_8", "task_7", "task_6", "task_5"]
+    
+    def test_range_pagination_with_status_filter(self):
+        """Test offset and limit apply after the status filter."""
+        tasks = self.task_store.get_tasks_by_created_range(
+            status_filter=[TaskStatus.COMPLETED], offset=1, limit=2
+        )
+        
+        assert [t.task_id for t in tasks] == ["task_7", "task_5"]
+    
+    def test_range_oldest_first(self):
+        """Test ascending order."""
+        tasks = self.task_store.get_tasks_by_created_range(limit=3, newest_first=False)
+        
+        assert [t.task_id for t in tasks] == ["task_0", "task_1", "task_2"]
+    
+    def test_created_after_is_exclusive(self):
+        """Test that get_tasks_created_after excludes the cutoff itself."""
+        tasks = self.task_store.get_tasks_created_after(self.now - timedelta(hours=2))
+        
+        assert [t.task_id for t in tasks] == ["task_9"]
+    
+    def test_update_with_new_created_at_reindexes(self):
+        """Test that update_task moves a task whose created_at changed."""
+        task = self.task_store.get_task("task_0")
+        task.created_at = self.now
+        self.task_store.update_task(task)
+        
+        newest = self.task_store.get_tasks_by_created_range(limit=1)
+        assert newest[0].task_id == "task_0"
+        assert len(self.task_store.get_tasks_by_created_range()) == 10
+    
+    def test_get_tasks_batch(self):
+        """Test that a batch lookup maps every requested ID in request order."""
+        tasks = self.task_store.get_tasks(["task_3", "missing", "task_1", ""])
+        
+        assert list(tasks) == ["task_3", "missing", "task_1", ""]
+        assert tasks["task_3"].task_id == "task_3"
+        assert tasks["missing"] is None and tasks[""] is None
+    
+    def test_cursor_continues_after_key(self):
+        """Test that a cursor resumes the walk after the given task in either order."""
+        first = self.task_store.get_tasks_by_created_range(limit=3)
+        cursor = TaskStore.cursor_for(first[-1])
+        
+        newer = self.task_store.get_tasks_by_created_range(limit=3, cursor=cursor)
+        assert [t.task_id for t in newer] == ["task_6", "task_5", "task_4"]
+        
+        older = self.task_store.get_tasks_by_created_range(limit=2, newest_first=False,
+                                                           cursor=cursor)
+        assert [t.task_id for t in older] == ["task_8", "task_9"]
+    
+    def test_cursor_pages_stable_under_inserts(self):
+        """Test that cursor pages neither skip nor repeat tasks when new tasks arrive."""
+        same_time = self.now - timedelta(hours=2.5)
+        for suffix in "ab":
+            self.task_store.store_task(TaskResult(task_id=f"tie_{suffix}",
+                                                  status=TaskStatus.PENDING,
+                                                  created_at=same_time))
+        
+        seen = []
+        cursor = None
+        while True:
+            page = self.task_store.get_tasks_by_created_range(limit=4, cursor=cursor)
+            if not page:
+                break
+            seen.extend(t.task_id for t in page)
+            cursor = TaskStore.cursor_for(page[-1])
+            # A newer task must not shift the following pages
+            self.task_store.store_task(TaskResult(task_id=f"new_{len(seen)}",
+                                                  status=TaskStatus.PENDING))
+        
+        assert len(seen) == len(set(seen)) == 12
+        assert seen[:5] == ["task_9", "task_8", "tie_b", "tie_a", "task_7"]
+    
+    def test_cleanup_pops_from_old_end(self):
+        """Test that cleanup removes expired tasks and keeps the index consistent."""
+        cleaned = self.task_store.cleanup_old_tasks(
+            max_age_hours=7, status_filter=[TaskStatus.PENDING]
+        )
+        
+        assert cleaned == 2  # task_0 and task_2
+        remaining = self.task_store.get_tasks_by_created_range(newest_first=False)
+        assert [t.task_id for t in remaining][:3] == ["task_1", "task_3", "task_4"]
+        
+        assert self.task_store.cleanup_old_tasks(max_age_hours=7) == 2
+        assert self.task_store.get_task_count() == 6
+        assert len(self.task_store.get_tasks_by_created_range()) == 6
+        
+        self.task_store.delete_task("task_9")
+        assert self.task_store.get_tasks_by_created_range(limit=1)[0].task_id == "task_8"
+
+
 class TestTaskStoreThreadSafety:
     """Test thread safety and concurrent access."""
     
@@ -431,19 +614,42 @@ class TestTaskStoreCleanup:
         assert len(remaining_tasks) == 1
         assert remaining_tasks[0].status == TaskStatus.PENDING
     
-    @patch('medusa.utils.task_store.threading.Timer')
-    def test_automatic_cleanup_scheduling(self, mock_timer):
+    def test_automatic_cleanup_scheduling(self):
         """Test automatic cleanup scheduling."""
-        # Create store with auto cleanup
-        store = TaskStore(cleanup_enabled=True, cleanup_interval_minutes=30)
-        
-        # Verify timer was created
-        mock_timer.assert_called_once()
-        call_args = mock_timer.call_args
-        assert call_args[0][0] == 30 * 60  # 30 minutes in seconds
-        
-        # Verify timer was started
-        mock_timer.return_value.start.assert_called_once()
+        # Stores left in reference cycles by earlier tests would cancel their
+        # jobs on the patched scheduler if collected during this test
+        gc.collect()
+        
+        with patch('medusa.utils.task_store.get_expiry_scheduler') as mock_get_scheduler:
+            mock_scheduler = mock_get_scheduler.return_value
+            
+            # Create store with auto cleanup
+            store = TaskStore(cleanup_enabled=True, cleanup_interval_minutes=30)
+            
+            # Verify a job was registered on the shared scheduler
+            mock_scheduler.schedule.assert_called_once()
+            call_args = mock_scheduler.schedule.call_args
+            assert call_args[0][0] == 30 * 60  # 30 minutes in seconds
+            
+            # Verify stopping cancels the job
+            store.stop_cleanup()
+            mock_scheduler.cancel.assert_called_once_with(mock_scheduler.schedule.return_value)
+    
+    def test_automatic_cleanup_job_runs_cleanup(self):
+        """Test that the scheduled job cleans up and stops once the store is gone."""
+        with patch('medusa.utils.task_store.get_expiry_scheduler') as mock_get_scheduler:
+            store = TaskStore(cleanup_enabled=True, max_task_age_hours=1)
+            job = mock_get_scheduler.return_value.schedule.call_args[0][1]
+        
+        old_task = self.create_sample_task_result()
+        old_task.created_at = datetime.now(timezone.utc) - timedelta(hours=2)
+        store.store_task(old_task)
+        
+        assert job() is None
+        assert store.get_task_count() == 0
+        
+        del store
+        assert job() is False
     
     def create_sample_task_result(self, task_id: str = None, status: TaskStatus = TaskStatus.PENDING) -> TaskResult:
         """Create a sample TaskResult for testing."""
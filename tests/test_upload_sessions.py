@@ -0,0 +1,132 @@
+"""
+Tests for UploadSessionStore - durable resumable upload sessions.
+
+This module tests:
+- File fingerprinting
+- Session persistence keyed by task ID and fingerprint
+- Atomic writes and recovery from corrupt records
+"""
+
+import os
+import pytest
+
+from medusa.utils.upload_sessions import (
+    UploadSession,
+    UploadSessionStore,
+    UploadSessionStoreError,
+    compute_file_fingerprint,
+    FINGERPRINT_SAMPLE_SIZE
+)
+
+
+def create_session(task_id: str = "task_1", fingerprint: str = "abc") -> UploadSession:
+    """Create a sample UploadSession for testing."""
+    return UploadSession(
+        task_id=task_id,
+        fingerprint=fingerprint,
+        file_path="/videos/video.mp4",
+        session_uri="https://upload.example.com/session/1",
+        total_bytes=10_000,
+        confirmed_bytes=2_048,
+        platform="youtube"
+    )
+
+
+class TestFileFingerprint:
+    """Test cases for compute_file_fingerprint."""
+
+    def test_fingerprint_is_stable(self, temp_media_file):
+        """Test that an unchanged file keeps its fingerprint."""
+        assert compute_file_fingerprint(temp_media_file) == compute_file_fingerprint(temp_media_file)
+
+    def test_fingerprint_changes_with_content(self, temp_dir):
+        """Test that changing the tail of a large file changes the fingerprint."""
+        media_file = temp_dir / "large.bin"
+        media_file.write_bytes(b"a" * (FINGERPRINT_SAMPLE_SIZE * 3))
+        original = compute_file_fingerprint(media_file)
+        stat = os.stat(media_file)
+
+        with open(media_file, 'r+b') as f:
+            f.seek(-1, os.SEEK_END)
+            f.write(b"b")
+        os.utime(media_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        assert compute_file_fingerprint(media_file) != original
+
+    def test_fingerprint_missing_file(self, temp_dir):
+        """Test that fingerprinting a missing file raises a store error."""
+        with pytest.raises(UploadSessionStoreError, match="Failed to fingerprint"):
+            compute_file_fingerprint(temp_dir / "missing.mp4")
+
+
+class TestUploadSessionStore:
+    """Test cases for UploadSessionStore."""
+
+    def test_save_and_get_session(self, temp_dir):
+        """Test that a saved session can be read back."""
+        store = UploadSessionStore(temp_dir / "sessions")
+        store.save_session(create_session())
+
+        session = store.get_session("task_1", "abc")
+
+        assert session is not None
+        assert session.session_uri == "https://upload.example.com/session/1"
+        assert session.confirmed_bytes == 2_048
+        assert session.platform == "youtube"
+
+    def test_session_survives_new_store_instance(self, temp_dir):
+        """Test that sessions persist across store instances (process restarts)."""
+        UploadSessionStore(temp_dir).save_session(create_session())
+
+        restored = UploadSessionStore(temp_dir).get_session("task_1", "abc")
+
+        assert restored is not None
+        assert restored.total_bytes == 10_000
+
+    def test_sessions_are_keyed_by_task_and_fingerprint(self, temp_dir):
+        """Test that different fingerprints or tasks do not match."""
+        store = UploadSessionStore(temp_dir)
+        store.save_session(create_session())
+
+        assert store.get_session("task_1", "other") is None
+        assert store.get_session("task_2", "abc") is None
+
+    def test_save_overwrites_existing_session(self, temp_dir):
+        """Test that checkpointing replaces the previous record."""
+        store = UploadSessionStore(temp_dir)
+        session = create_session()
+        store.save_session(session)
+
+        session.confirmed_bytes = 8_192
+        store.save_session(session)
+
+        assert store.get_session("task_1", "abc").confirmed_bytes == 8_192
+        assert len(store.list_sessions()) == 1
+        assert not list(temp_dir.glob("*.tmp"))
+
+    def test_delete_session(self, temp_dir):
+        """Test session deletion."""
+        store = UploadSessionStore(temp_dir)
+        store.save_session(create_session())
+
+        assert store.delete_session("task_1", "abc") is True
+        assert store.delete_session("task_1", "abc") is False
+        assert store.get_session("task_1", "abc") is None
+
+    def test_corrupt_session_is_discarded(self, temp_dir):
+        """Test that an unreadable record is removed instead of raising."""
+        store = UploadSessionStore(temp_dir)
+        store.save_session(create_session())
+        path = store._session_path("task_1", "abc")
+        path.write_text("{not json")
+
+        assert store.get_session("task_1", "abc") is None
+        assert not path.exists()
+
+    def test_session_round_trip(self):
+        """Test UploadSession serialization."""
+        session = create_session()
+
+        restored = UploadSession.from_dict(session.to_dict())
+
+        assert restored == session
@@ -9,10 +9,10 @@ import json
 import tempfile
 import os
 from unittest.mock import Mock, patch, AsyncMock, MagicMock
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
-from medusa.uploaders.youtube_auth import YouTubeAuth
+from medusa.uploaders.youtube_auth import TokenRefresher, YouTubeAuth, get_token_refresher
 from medusa.exceptions import (
     AuthenticationError,
     ConfigError,
@@ -853,4 +853,158 @@ class TestYouTubeAuthIntegration:
             
             # Test status reporting
             status = auth.get_auth_status()
-            assert status["has_credentials"] is True 
\ No newline at end of file
+            assert status["has_credentials"] is True
+
+
+class InlineExecutor:
+    """Executor running submitted calls immediately."""
+    
+    def __init__(self):
+        self.calls = []
+    
+    def submit(self, func, *args):
+        self.calls.append(args)
+        return func(*args)
+
+
+class TestTokenRefresher:
+    """Test shared credentials and background token refresh."""
+    
+    @staticmethod
+    def _credentials(expires_in, refresh_token="refresh"):
+        credentials = MagicMock()
+        credentials.valid = True
+        credentials.refresh_token = refresh_token
+        credentials.expiry = datetime.now(timezone.utc).replace(tzinfo=None) + expires_in
+        return credentials
+    
+    @staticmethod
+    def _auth(refresher, credentials_file=None, credentials=None):
+        config = PlatformConfig(
+            platform_name="youtube",
+            credentials={"credentials_file": credentials_file} if credentials_file else {}
+        )
+        auth = YouTubeAuth(config, token_refresher=refresher)
+        auth.credentials = credentials
+        return auth
+    
+    def test_invalid_settings(self):
+        """Test that invalid margin and interval are rejected."""
+        with pytest.raises(ValidationError):
+            TokenRefresher(margin_seconds=-1)
+        with pytest.raises(ValidationError):
+            TokenRefresher(interval_seconds=0)
+    
+    def test_default_refresher_is_shared(self):
+        """Test that instances use the process-wide refresher by default."""
+        assert YouTubeAuth().token_refresher is get_token_refresher()
+        assert get_token_refresher() is get_token_refresher()
+    
+    @pytest.mark.asyncio
+    async def test_authenticate_reuses_shared_credentials(self, temp_dir):
+        """Test that a second instance adopts credentials without loading or validating."""
+        refresher = TokenRefresher()
+        credentials_file = str(temp_dir / "credentials.json")
+        credentials = self._credentials(timedelta(hours=1))
+        first = self._auth(refresher, credentials_file, credentials)
+        refresher.register(first)
+        
+        second = self._auth(refresher, credentials_file)
+        with patch.object(YouTubeAuth, 'load_existing_credentials') as mock_load, \
+             patch.object(YouTubeAuth, 'validate_credentials') as mock_validate:
+            assert await second.authenticate() is True
+        
+        assert second.credentials is credentials
+        assert second.is_authenticated is True
+        mock_load.assert_not_called()
+        mock_validate.assert_not_called()
+    
+    def test_expired_shared_credentials_are_not_reused(self, temp_dir):
+        """Test that invalid shared credentials fall back to the normal flow."""
+        refresher = TokenRefresher()
+        credentials_file = str(temp_dir / "credentials.json")
+        credentials = self._credentials(timedelta(hours=1))
+        credentials.valid = False
+        auth = self._auth(refresher, credentials_file, credentials)
+        refresher.register(auth)
+        
+        assert refresher.get_credentials(credentials_file) is None
+        assert refresher.get_credentials(None) is None
+    
+    def test_new_credentials_replace_shared_ones(self, temp_dir):
+        """Test that newer credentials are handed to every registered instance."""
+        refresher = TokenRefresher()
+        credentials_file = str(temp_dir / "credentials.json")
+        first = self._auth(refresher, credentials_file, self._credentials(timedelta(hours=1)))
+        second = self._auth(refresher, credentials_file, self._credentials(timedelta(hours=1)))
+        
+        refresher.register(first)
+        refresher.register(second)
+        
+        assert first.credentials is second.credentials
+        assert refresher.get_credentials(credentials_file) is second.credentials
+    
+    def test_refresh_due_refreshes_tokens_within_margin(self, temp_dir):
+        """Test that only tokens close to expiry are refreshed and saved."""
+        executor = InlineExecutor()
+        refresher = TokenRefresher(margin_seconds=300, executor=executor)
+        due = self._auth(refresher, str(temp_dir / "due.json"), self._credentials(timedelta(minutes=2)))
+        fresh = self._auth(refresher, str(temp_dir / "fresh.json"), self._credentials(timedelta(minutes=30)))
+        refresher.register(due)
+        refresher.register(fresh)
+        
+        with patch.object(due, 'refresh_token', return_value=True) as mock_refresh, \
+             patch.object(due, 'save_credentials') as mock_save, \
+             patch.object(fresh, 'refresh_token') as mock_fresh_refresh:
+            assert refresher.refresh_due() is None
+        
+        mock_refresh.assert_called_once()
+        mock_save.assert_called_once()
+        mock_fresh_refresh.assert_not_called()
+        assert len(executor.calls) == 1
+    
+    def test_refresh_in_progress_is_not_resubmitted(self):
+        """Test that credentials already being refreshed are skipped."""
+        executor = InlineExecutor()
+        refresher = TokenRefresher(executor=executor)
+        auth = self._auth(refresher, credentials=self._credentials(timedelta(seconds=-1)))
+        refresher.register(auth)
+        next(iter(refresher._entries.values())).refreshing = True
+        
+        refresher.refresh_due()
+        
+        assert executor.calls == []
+    
+    def test_refresh_failure_is_logged(self):
+        """Test that a failed refresh does not propagate to the scheduler."""
+        refresher = TokenRefresher(executor=InlineExecutor())
+        auth = self._auth(refresher, credentials=self._credentials(timedelta(seconds=-1)))
+        refresher.register(auth)
+        
+        with patch.object(auth, 'refresh_token',
+                          side_effect=AuthenticationError("revoked", platform="youtube")):
+            refresher.refresh_due()
+        
+        assert next(iter(refresher._entries.values())).refreshing is False
+    
+    def test_job_stops_when_nothing_is_registered(self):
+        """Test that unregistered credentials are dropped and the job ends."""
+        refresher = TokenRefresher()
+        auth = self._auth(refresher, credentials=self._credentials(timedelta(hours=1)))
+        refresher.register(auth)
+        assert refresher._job is not None
+        
+        refresher.unregister(auth)
+        
+        assert refresher.refresh_due() is False
+        assert refresher._entries == {}
+        assert refresher._job is None
+    
+    def test_is_due(self):
+        """Test which credentials count as due for refresh."""
+        refresher = TokenRefresher(margin_seconds=300)
+        
+        assert refresher.is_due(self._credentials(timedelta(minutes=4))) is True
+        assert refresher.is_due(self._credentials(timedelta(minutes=6))) is False
+        assert refresher.is_due(self._credentials(timedelta(minutes=1), refresh_token=None)) is False
+        assert refresher.is_due(None) is False
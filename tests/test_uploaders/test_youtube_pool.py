@@ -0,0 +1,290 @@
+"""
+Tests for the multi-account YouTube credential pool.
+Tests account configuration and routing by load and quota.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from medusa.uploaders.base import UploadResult
+from medusa.uploaders.youtube_auth import TokenRefresher, get_token_refresher
+from medusa.uploaders.youtube_pool import YouTubeCredentialPool
+from medusa.models import MediaMetadata, PlatformConfig
+from medusa.utils.quota import QuotaLedger
+from medusa.exceptions import AuthenticationError, ConfigError, RateLimitError
+
+
+def pool_config(*accounts, **shared):
+    credentials = {"client_secrets_file": "client_secrets.json", "accounts": list(accounts)}
+    credentials.update(shared)
+    return PlatformConfig(platform_name="youtube", credentials=credentials)
+
+
+def make_pool(count=2, **kwargs):
+    accounts = [{"name": f"channel{i}", "credentials_file": f"creds{i}.json"} for i in range(count)]
+    pool = YouTubeCredentialPool(config=pool_config(*accounts), **kwargs)
+    for account in pool.accounts:
+        account.uploader.is_authenticated = True
+    pool.is_authenticated = True
+    return pool
+
+
+class TestYouTubeCredentialPoolConfiguration:
+    """Test building accounts from configuration."""
+    
+    def test_accounts_from_credentials(self):
+        """Test that account entries override the shared credentials."""
+        pool = YouTubeCredentialPool(config=pool_config(
+            {"name": "main", "credentials_file": "main.json"},
+            {"credentials_file": "second.json"}
+        ))
+        
+        assert [account.name for account in pool.accounts] == ["main", "account2"]
+        auth = pool.accounts[1].uploader.auth_manager
+        assert auth.credentials_file == "second.json"
+        assert auth.client_secrets_file == "client_secrets.json"
+        assert pool.accounts[0].uploader.quota_wait_timeout == 0
+    
+    def test_accounts_share_token_refresher(self):
+        """Test that account tokens are kept fresh by the pool's refresher."""
+        refresher = TokenRefresher()
+        
+        pool = YouTubeCredentialPool(config=pool_config({"name": "a"}, {"name": "b"}),
+                                     token_refresher=refresher)
+        
+        assert all(account.uploader.auth_manager.token_refresher is refresher
+                   for account in pool.accounts)
+        assert YouTubeCredentialPool(config=pool_config({"name": "a"})).token_refresher is get_token_refresher()
+    
+    def test_accounts_of_one_project_share_quota(self):
+        """Test that quota ledgers are shared per client secrets file."""
+        pool = YouTubeCredentialPool(config=pool_config(
+            {"credentials_file": "a.json"},
+            {"credentials_file": "b.json"},
+            {"credentials_file": "c.json", "client_secrets_file": "other_project.json"}
+        ))
+        
+        ledgers = [account.quota_ledger for account in pool.accounts]
+        assert ledgers[0] is ledgers[1]
+        assert ledgers[0] is not ledgers[2]
+    
+    def test_quota_ledger_file_per_account(self, temp_dir):
+        """Test that an account with its own ledger file uses the shared file ledger."""
+        pool = YouTubeCredentialPool(config=pool_config(
+            {"credentials_file": "a.json", "quota_ledger_file": str(temp_dir / "quota.json")}
+        ))
+        
+        assert pool.accounts[0].quota_ledger.path == (temp_dir / "quota.json").resolve()
+    
+    def test_shared_ledger_file_split_per_project(self, temp_dir):
+        """Test that one configured ledger file is split into per-project files."""
+        pool = YouTubeCredentialPool(config=pool_config(
+            {"credentials_file": "a.json"},
+            {"credentials_file": "b.json"},
+            {"credentials_file": "c.json", "client_secrets_file": "other_project.json"},
+            quota_ledger_file=str(temp_dir / "quota.json")
+        ))
+        
+        ledgers = [account.quota_ledger for account in pool.accounts]
+        assert ledgers[0] is ledgers[1]
+        assert ledgers[0].path != ledgers[2].path
+        assert {ledger.path.parent for ledger in ledgers} == {temp_dir.resolve()}
+        
+        ledgers[0].record("videos.insert")
+        assert len(list(temp_dir.glob("quota.*.json"))) == 1
+    
+    def test_ledger_persisted_in_upload_sessions_dir(self, temp_dir):
+        """Test that project ledgers are persisted next to the upload sessions."""
+        config = pool_config({"credentials_file": "a.json"}, upload_sessions_dir=str(temp_dir))
+        ledger = YouTubeCredentialPool(config=config).accounts[0].quota_ledger
+        ledger.record("videos.insert")
+        
+        assert ledger.path.parent == temp_dir.resolve()
+        assert QuotaLedger(ledger.path).used == 1600
+        assert YouTubeCredentialPool(config=config).accounts[0].quota_ledger is ledger
+    
+    def test_no_accounts(self):
+        """Test that a pool without accounts is rejected."""
+        with pytest.raises(ConfigError):
+            YouTubeCredentialPool(config=pool_config())
+    
+    def test_explicit_accounts(self):
+        """Test passing account configurations directly."""
+        accounts = [PlatformConfig(platform_name="youtube", credentials={"name": "solo"})]
+        
+        pool = YouTubeCredentialPool(accounts=accounts)
+        
+        assert pool.get_account("solo") is pool.accounts[0]
+        assert pool.get_account("missing") is None
+
+
+class TestYouTubeCredentialPoolAuthentication:
+    """Test authenticating the accounts of a pool."""
+    
+    @pytest.mark.asyncio
+    async def test_partial_authentication(self):
+        """Test that failed accounts are left out while the rest authenticate."""
+        pool = YouTubeCredentialPool(config=pool_config({"name": "ok"}, {"name": "broken"}))
+        ok, broken = pool.accounts
+        
+        async def authenticate_ok():
+            ok.uploader.is_authenticated = True
+            return True
+        
+        ok.uploader.authenticate = authenticate_ok
+        broken.uploader.authenticate = AsyncMock(side_effect=AuthenticationError("denied", platform="youtube"))
+        
+        try:
+            assert await pool.authenticate() is True
+            assert pool.is_authenticated is True
+            assert pool.get_pool_status()["authenticated_accounts"] == 1
+        finally:
+            await pool.cleanup()
+    
+    @pytest.mark.asyncio
+    async def test_all_accounts_fail(self):
+        """Test that authentication errors are raised when no account succeeds."""
+        pool = YouTubeCredentialPool(config=pool_config({"name": "a"}, {"name": "b"}))
+        for account in pool.accounts:
+            account.uploader.authenticate = AsyncMock(side_effect=AuthenticationError("denied", platform="youtube"))
+        
+        with pytest.raises(AuthenticationError):
+            await pool.authenticate()
+        
+        assert pool.is_authenticated is False
+
+
+class TestYouTubeCredentialPoolRouting:
+    """Test routing uploads to accounts."""
+    
+    def test_least_loaded_account(self):
+        """Test that the account with the fewest uploads in flight is picked."""
+        pool = make_pool(3)
+        pool.accounts[0].active_uploads = 2
+        pool.accounts[1].active_uploads = 1
+        pool.accounts[2].active_uploads = 1
+        
+        account = pool._acquire_account(["videos.insert"])
+        
+        assert account is pool.accounts[1]
+        assert account.active_uploads == 2
+    
+    def test_accounts_without_quota_are_skipped(self):
+        """Test that an account whose project quota is spent is not picked."""
+        pool = make_pool(2)
+        pool.accounts[0].uploader.quota_ledger = MagicMock(remaining=1000, cost_of=lambda method: 1600)
+        
+        assert pool._acquire_account(["videos.insert"]) is pool.accounts[1]
+    
+    def test_unauthenticated_accounts_are_skipped(self):
+        """Test that accounts that failed to authenticate are not picked."""
+        pool = make_pool(2)
+        pool.accounts[0].uploader.is_authenticated = False
+        
+        assert pool._acquire_account(["videos.insert"]) is pool.accounts[1]
+    
+    def test_no_quota_left(self):
+        """Test that a quota RateLimitError is raised when every project is spent."""
+        pool = make_pool(2)
+        pool.accounts[0].quota_ledger.mark_exhausted()
+        
+        with pytest.raises(RateLimitError) as exc_info:
+            pool._acquire_account(["videos.insert"])
+        
+        assert exc_info.value.quota_exceeded is True
+        assert exc_info.value.retry_after > 0
+    
+    @pytest.mark.asyncio
+    async def test_upload_routed_and_released(self):
+        """Test that an upload runs on the chosen account and reports it."""
+        pool = make_pool(2)
+        pool.current_task_id = "task_1"
+        account = pool.accounts[0]
+        seen = {}
+        
+        async def upload(uploader, file_path, metadata, progress_callback=None):
+            seen["task_id"] = uploader.current_task_id
+            seen["uploader"] = uploader
+            return UploadResult(platform="youtube", upload_id="vid1", success=True, metadata={})
+        
+        with patch("medusa.uploaders.youtube.YouTubeUploader._upload_media", upload):
+            result = await pool._upload_media("/path/to/video.mp4", MediaMetadata(title="Test"))
+        
+        assert result.metadata["account"] == "channel0"
+        assert seen["task_id"] == "task_1"
+        assert seen["uploader"] is not account.uploader
+        assert seen["uploader"].auth_manager is account.uploader.auth_manager
+        assert account.active_uploads == 0
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_uploads_use_different_accounts(self):
+        """Test that parallel uploads are spread across accounts."""
+        pool = make_pool(2)
+        release = asyncio.Event()
+        accounts_in_flight = []
+        
+        async def upload(uploader, file_path, metadata, progress_callback=None):
+            accounts_in_flight.append(uploader.auth_manager.credentials_file)
+            await release.wait()
+            return UploadResult(platform="youtube", upload_id="vid", success=True, metadata={})
+        
+        with patch("medusa.uploaders.youtube.YouTubeUploader._upload_media", upload):
+            uploads = [
+                asyncio.ensure_future(pool._upload_media(f"/path/{i}.mp4", MediaMetadata(title="Test")))
+                for i in range(2)
+            ]
+            await asyncio.sleep(0.01)
+            assert sorted(accounts_in_flight) == ["creds0.json", "creds1.json"]
+            release.set()
+            results = await asyncio.gather(*uploads)
+        
+        assert {result.metadata["account"] for result in results} == {"channel0", "channel1"}
+    
+    @pytest.mark.asyncio
+    async def test_upload_rerouted_when_account_out_of_quota(self):
+        """Test that a 403 quota error from the API moves the upload to the next account."""
+        from googleapiclient.errors import HttpError
+        
+        pool = YouTubeCredentialPool(
+            config=pool_config(
+                {"name": "first", "credentials_file": "a.json", "client_secrets_file": "project_a.json"},
+                {"name": "second", "credentials_file": "b.json", "client_secrets_file": "project_b.json"}
+            ),
+            run_in_thread=False
+        )
+        quota_response = MagicMock(status=403, reason="Forbidden")
+        quota_error = HttpError(quota_response, b'{"error": {"message": "You have exceeded your quota"}}')
+        for account, outcome in zip(pool.accounts, [quota_error, (None, {"id": "vid"})]):
+            account.uploader.is_authenticated = True
+            account.uploader.service = MagicMock()
+            insert_request = MagicMock()
+            if isinstance(outcome, Exception):
+                insert_request.next_chunk.side_effect = outcome
+            else:
+                insert_request.next_chunk.return_value = outcome
+            account.uploader.service.videos().insert.return_value = insert_request
+        
+        with patch("medusa.uploaders.youtube.YouTubeUploader._validate_file"), \
+             patch("medusa.uploaders.youtube.MediaFileUpload"), \
+             patch("os.path.getsize", return_value=1024):
+            result = await pool._upload_media("/path/to/video.mp4", MediaMetadata(title="Test"))
+        
+        assert result.upload_id == "vid"
+        assert result.metadata["account"] == "second"
+        assert pool.accounts[0].quota_ledger.remaining == 0
+        assert all(account.active_uploads == 0 for account in pool.accounts)
+    
+    @pytest.mark.asyncio
+    async def test_other_rate_limits_are_not_rerouted(self):
+        """Test that non-quota rate limits propagate to the retry logic."""
+        pool = make_pool(2)
+        
+        async def upload(uploader, file_path, metadata, progress_callback=None):
+            raise RateLimitError("Slow down", platform="youtube")
+        
+        with patch("medusa.uploaders.youtube.YouTubeUploader._upload_media", upload):
+            with pytest.raises(RateLimitError):
+                await pool._upload_media("/path/to/video.mp4", MediaMetadata(title="Test"))
+        
+        assert all(account.active_uploads == 0 for account in pool.accounts)
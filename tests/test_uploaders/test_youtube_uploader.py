@@ -4,6 +4,7 @@ Tests basic video upload functionality with progress tracking and error handling
 """
 
 import asyncio
+import os
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch, mock_open
 from pathlib import Path
@@ -443,7 +444,7 @@ class TestYouTubeUploaderMetadataEnhancement:
             result = await uploader.upload_media("/path/to/video.mp4", metadata)
             
             # Verify thumbnail upload was called
-            mock_thumb_upload.assert_called_once_with("video123", "/path/to/thumb.jpg")
+            mock_thumb_upload.assert_called_once_with("video123", "/path/to/thumb.jpg", reservation=None)
             
             # Verify result includes thumbnail status
             assert result.metadata.get('thumbnail_uploaded') == mock_thumb_success
@@ -641,6 +642,8 @@ class TestYouTubeUploaderUpload:
                 await uploader._upload_media("/path/to/video.mp4", metadata)
             
             assert "quota" in str(exc_info.value).lower()
+            assert exc_info.value.quota_exceeded is True
+            assert exc_info.value.retry_after > 0
     
     @pytest.mark.asyncio
     async def test_upload_network_error(self):
@@ -783,6 +786,594 @@ class TestYouTubeUploaderResumableUpload:
         assert result == mock_response
 
 
+class TestYouTubeUploaderExecutionMode:
+    """Test off-loop execution of blocking chunk transfers."""
+    
+    @pytest.mark.asyncio
+    async def test_chunks_run_in_worker_thread(self):
+        """Test that next_chunk runs outside the event loop thread."""
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+        
+        executor = ThreadPoolExecutor(max_workers=1)
+        uploader = YouTubeUploader(executor=executor)
+        loop_thread = threading.get_ident()
+        chunk_threads = []
+        
+        def mock_next_chunk():
+            chunk_threads.append(threading.get_ident())
+            return (None, {'id': 'test_video_id_123'})
+        
+        mock_insert_request = MagicMock()
+        mock_insert_request.next_chunk = mock_next_chunk
+        
+        try:
+            result = await uploader._perform_resumable_upload(mock_insert_request, None, 1000)
+        finally:
+            executor.shutdown()
+        
+        assert result == {'id': 'test_video_id_123'}
+        assert chunk_threads and loop_thread not in chunk_threads
+    
+    @pytest.mark.asyncio
+    async def test_event_loop_not_blocked_during_chunk(self):
+        """Test that other coroutines run while a chunk is being transferred."""
+        import threading
+        
+        uploader = YouTubeUploader()
+        chunk_started = threading.Event()
+        release_chunk = threading.Event()
+        
+        def mock_next_chunk():
+            chunk_started.set()
+            release_chunk.wait(timeout=5)
+            return (None, {'id': 'test_video_id_123'})
+        
+        mock_insert_request = MagicMock()
+        mock_insert_request.next_chunk = mock_next_chunk
+        
+        upload = asyncio.create_task(
+            uploader._perform_resumable_upload(mock_insert_request, None, 1000)
+        )
+        
+        # The loop keeps running while the chunk thread is blocked
+        while not chunk_started.is_set():
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.01)
+        assert not upload.done()
+        
+        release_chunk.set()
+        assert await upload == {'id': 'test_video_id_123'}
+    
+    @pytest.mark.asyncio
+    async def test_inline_mode_runs_on_loop_thread(self):
+        """Test that run_in_thread=False keeps the legacy inline behavior."""
+        import threading
+        
+        uploader = YouTubeUploader(run_in_thread=False)
+        loop_thread = threading.get_ident()
+        chunk_threads = []
+        
+        def mock_next_chunk():
+            chunk_threads.append(threading.get_ident())
+            return (None, {'id': 'test_video_id_123'})
+        
+        mock_insert_request = MagicMock()
+        mock_insert_request.next_chunk = mock_next_chunk
+        
+        await uploader._perform_resumable_upload(mock_insert_request, None, 1000)
+        
+        assert chunk_threads == [loop_thread]
+    
+    def test_shared_executor_is_reused(self):
+        """Test that uploaders share one bounded thread pool by default."""
+        first = YouTubeUploader()._get_shared_executor()
+        second = YouTubeUploader()._get_shared_executor()
+        
+        assert first is second
+        assert first._max_workers == YouTubeUploader.CHUNK_THREAD_POOL_SIZE
+    
+    def test_build_upload_http_without_credentials(self):
+        """Test that no dedicated connection is built without credentials."""
+        uploader = YouTubeUploader()
+        uploader.auth_manager.credentials = None
+        
+        assert uploader._build_upload_http() is None
+    
+    @pytest.mark.asyncio
+    async def test_upload_http_closed_after_upload(self):
+        """Test that the dedicated upload connection is closed when the upload ends."""
+        uploader = YouTubeUploader()
+        uploader.is_authenticated = True
+        uploader.service = MagicMock()
+        insert_request = MagicMock()
+        insert_request.next_chunk.return_value = (None, {'id': 'video123'})
+        uploader.service.videos().insert.return_value = insert_request
+        upload_http = MagicMock()
+        
+        with patch.object(uploader, '_validate_file'), \
+             patch.object(uploader, '_build_upload_http', return_value=upload_http), \
+             patch('medusa.uploaders.youtube.MediaFileUpload'), \
+             patch('os.path.getsize', return_value=1024):
+            await uploader._upload_media("/path/to/video.mp4", MediaMetadata(title="Test"))
+        
+        assert insert_request.http is upload_http
+        upload_http.close.assert_called_once()
+
+
+class TestYouTubeUploaderChunking:
+    """Test chunk sizing and byte-accurate progress."""
+    
+    def test_default_chunk_size(self):
+        """Test that uploads are chunked by default."""
+        uploader = YouTubeUploader()
+        
+        assert uploader.chunk_size == YouTubeUploader.DEFAULT_CHUNK_SIZE
+        assert uploader.adaptive_chunk_size is False
+    
+    def test_chunk_size_from_config_is_normalized(self):
+        """Test that configured chunk sizes are rounded to 256KB multiples."""
+        config = PlatformConfig(platform_name="youtube", chunk_size=1024 * 1024 + 1000)
+        uploader = YouTubeUploader(config=config)
+        
+        assert uploader.chunk_size == 1024 * 1024
+        assert uploader._normalize_chunk_size(1) == YouTubeUploader.MIN_CHUNK_SIZE
+        assert uploader._normalize_chunk_size(10 ** 12) == YouTubeUploader.MAX_CHUNK_SIZE
+    
+    def test_adapt_chunk_size_follows_throughput(self):
+        """Test adaptive sizing grows on fast links and shrinks on slow ones, bounded per step."""
+        uploader = YouTubeUploader()
+        current = 8 * 1024 * 1024
+        
+        # 8MB in 1s -> 80MB target, capped at doubling
+        assert uploader._adapt_chunk_size(current, current, 1.0) == 2 * current
+        # 8MB in 40s -> 2MB target, capped at halving
+        assert uploader._adapt_chunk_size(current, current, 40.0) == current // 2
+        # 8MB in 10s -> on target
+        assert uploader._adapt_chunk_size(current, current, 10.0) == current
+        # No data -> unchanged
+        assert uploader._adapt_chunk_size(current, 0, 1.0) == current
+    
+    @pytest.mark.asyncio
+    async def test_upload_media_uses_configured_chunk_size(self):
+        """Test that MediaFileUpload is created with the configured chunk size."""
+        config = PlatformConfig(platform_name="youtube", chunk_size=2 * 1024 * 1024)
+        uploader = YouTubeUploader(config=config)
+        uploader.is_authenticated = True
+        uploader.service = MagicMock()
+        
+        mock_insert_request = MagicMock()
+        mock_insert_request.next_chunk.return_value = (None, {'id': 'test_video_id_123'})
+        uploader.service.videos().insert.return_value = mock_insert_request
+        
+        with patch.object(uploader, '_validate_file'), \
+             patch('medusa.uploaders.youtube.MediaFileUpload') as mock_media_upload, \
+             patch('os.path.getsize', return_value=1024):
+            await uploader._upload_media("/path/to/video.mp4", MediaMetadata(title="Test"))
+        
+        assert mock_media_upload.call_args.kwargs["chunksize"] == 2 * 1024 * 1024
+        assert mock_media_upload.call_args.kwargs["resumable"] is True
+    
+    @pytest.mark.asyncio
+    async def test_progress_reports_confirmed_bytes_per_chunk(self):
+        """Test that each chunk reports the byte offset confirmed by YouTube."""
+        uploader = YouTubeUploader(run_in_thread=False)
+        offsets = iter([256 * 1024, 512 * 1024, 768 * 1024])
+        
+        def mock_next_chunk():
+            offset = next(offsets, None)
+            if offset is None:
+                return (None, {'id': 'test_video_id_123'})
+            status = MagicMock()
+            status.resumable_progress = offset
+            return (status, None)
+        
+        mock_insert_request = MagicMock()
+        mock_insert_request.next_chunk = mock_next_chunk
+        progress_updates = []
+        
+        await uploader._perform_resumable_upload(
+            mock_insert_request, progress_updates.append, 1024 * 1024
+        )
+        
+        assert [p.bytes_uploaded for p in progress_updates] == [
+            256 * 1024, 512 * 1024, 768 * 1024, 1024 * 1024
+        ]
+        assert progress_updates[-1].status == "completed"
+    
+    @pytest.mark.asyncio
+    async def test_adaptive_mode_resizes_media_chunks(self):
+        """Test that adaptive mode updates the media chunk size between chunks."""
+        config = PlatformConfig(platform_name="youtube", adaptive_chunk_size=True)
+        uploader = YouTubeUploader(config=config, run_in_thread=False)
+        media = MagicMock()
+        media._chunksize = uploader.chunk_size
+        calls = []
+        
+        def mock_next_chunk():
+            calls.append(media._chunksize)
+            if len(calls) == 1:
+                status = MagicMock()
+                status.resumable_progress = uploader.chunk_size
+                return (status, None)
+            return (None, {'id': 'test_video_id_123'})
+        
+        mock_insert_request = MagicMock()
+        mock_insert_request.next_chunk = mock_next_chunk
+        
+        with patch.object(uploader, '_adapt_chunk_size', return_value=512 * 1024) as mock_adapt:
+            await uploader._perform_resumable_upload(
+                mock_insert_request, None, 100 * 1024 * 1024, media=media
+            )
+        
+        assert mock_adapt.call_args.args[:2] == (uploader.chunk_size, uploader.chunk_size)
+        assert calls == [uploader.chunk_size, 512 * 1024]
+
+
+class TestYouTubeUploaderSessionRecovery:
+    """Test persisted resumable sessions for crash recovery."""
+    
+    @staticmethod
+    def _status(offset):
+        status = MagicMock()
+        status.resumable_progress = offset
+        return status
+    
+    def test_session_store_from_credentials(self, temp_dir):
+        """Test that upload_sessions_dir enables session persistence."""
+        config = PlatformConfig(
+            platform_name="youtube",
+            credentials={"upload_sessions_dir": str(temp_dir / "sessions")}
+        )
+        
+        uploader = YouTubeUploader(config=config)
+        
+        assert uploader.session_store is not None
+        assert uploader.session_store.directory == temp_dir / "sessions"
+        assert YouTubeUploader().session_store is None
+    
+    @pytest.mark.asyncio
+    async def test_session_checkpointed_per_chunk_and_removed_on_success(self, temp_dir, temp_media_file):
+        """Test that the session URI and offset are saved after each chunk."""
+        from medusa.utils.upload_sessions import UploadSessionStore, compute_file_fingerprint
+        
+        store = UploadSessionStore(temp_dir / "sessions")
+        uploader = YouTubeUploader(run_in_thread=False, session_store=store)
+        uploader.current_task_id = "task_1"
+        file_size = os.path.getsize(temp_media_file)
+        fingerprint = compute_file_fingerprint(temp_media_file)
+        insert_request = MagicMock()
+        saved_offsets = []
+        
+        def mock_next_chunk():
+            insert_request.resumable_uri = "https://upload.example.com/session/1"
+            saved = store.get_session("task_1", fingerprint)
+            saved_offsets.append(saved.confirmed_bytes if saved else None)
+            if len(saved_offsets) == 1:
+                return (self._status(file_size // 2), None)
+            return (None, {'id': 'test_video_id_123'})
+        
+        insert_request.next_chunk = mock_next_chunk
+        session = await uploader._prepare_upload_session(insert_request, str(temp_media_file), file_size)
+        
+        await uploader._perform_resumable_upload(insert_request, None, file_size, session=session)
+        
+        assert saved_offsets == [None, file_size // 2]
+        assert store.get_session("task_1", fingerprint) is None
+    
+    @pytest.mark.asyncio
+    async def test_prepare_resumes_persisted_session(self, temp_dir, temp_media_file):
+        """Test that a persisted session points the request at the saved URI."""
+        from medusa.utils.upload_sessions import (
+            UploadSession, UploadSessionStore, compute_file_fingerprint
+        )
+        
+        store = UploadSessionStore(temp_dir / "sessions")
+        file_size = os.path.getsize(temp_media_file)
+        store.save_session(UploadSession(
+            task_id="task_1",
+            fingerprint=compute_file_fingerprint(temp_media_file),
+            file_path=str(temp_media_file),
+            session_uri="https://upload.example.com/session/1",
+            total_bytes=file_size,
+            confirmed_bytes=1024
+        ))
+        uploader = YouTubeUploader(session_store=store)
+        uploader.current_task_id = "task_1"
+        insert_request = MagicMock()
+        
+        session = await uploader._prepare_upload_session(insert_request, str(temp_media_file), file_size)
+        
+        assert session.session_uri == "https://upload.example.com/session/1"
+        assert insert_request.resumable_uri == "https://upload.example.com/session/1"
+        assert insert_request.resumable_progress == 1024
+        assert insert_request._in_error_state is True
+    
+    @pytest.mark.asyncio
+    async def test_no_session_persisted_without_task(self, temp_dir, temp_media_file):
+        """Test that uploads without a task ID are not persisted or resumed."""
+        from medusa.utils.upload_sessions import UploadSessionStore
+        
+        store = UploadSessionStore(temp_dir / "sessions")
+        uploader = YouTubeUploader(session_store=store)
+        insert_request = MagicMock()
+        
+        session = await uploader._prepare_upload_session(
+            insert_request, str(temp_media_file), os.path.getsize(temp_media_file)
+        )
+        
+        assert session is None
+        assert not list((temp_dir / "sessions").glob("*"))
+    
+    @pytest.mark.asyncio
+    async def test_resume_queries_confirmed_offset(self, temp_dir, temp_media_file):
+        """Test that a resumed request asks YouTube for the offset before sending data."""
+        import httplib2
+        from googleapiclient.http import HttpRequest, MediaFileUpload
+        from medusa.utils.upload_sessions import (
+            UploadSession, UploadSessionStore, compute_file_fingerprint
+        )
+        
+        session_uri = "https://upload.example.com/session/1"
+        file_size = os.path.getsize(temp_media_file)
+        store = UploadSessionStore(temp_dir / "sessions")
+        store.save_session(UploadSession(
+            task_id="task_1",
+            fingerprint=compute_file_fingerprint(temp_media_file),
+            file_path=str(temp_media_file),
+            session_uri=session_uri,
+            total_bytes=file_size,
+            confirmed_bytes=1024
+        ))
+        uploader = YouTubeUploader(session_store=store)
+        uploader.current_task_id = "task_1"
+        
+        http = MagicMock()
+        http.request.side_effect = [
+            (httplib2.Response({"status": 308, "range": "bytes=0-2047"}), b""),
+            (httplib2.Response({"status": 200}), b'{"id": "test_video_id_123"}')
+        ]
+        insert_request = HttpRequest(
+            http,
+            lambda resp, content: json.loads(content),
+            "https://www.googleapis.com/upload/youtube/v3/videos?uploadType=resumable",
+            method="POST",
+            body="{}",
+            headers={},
+            resumable=MediaFileUpload(str(temp_media_file), chunksize=-1, resumable=True)
+        )
+        
+        await uploader._prepare_upload_session(insert_request, str(temp_media_file), file_size)
+        status, response = insert_request.next_chunk()
+        
+        status_query, upload = http.request.call_args_list
+        assert status_query.args == (session_uri, "PUT")
+        assert status_query.kwargs["headers"]["Content-Range"] == f"bytes */{file_size}"
+        assert upload.args[0] == session_uri
+        assert upload.kwargs["headers"]["Content-Range"].startswith("bytes 2048-")
+        assert response == {"id": "test_video_id_123"}
+    
+    @pytest.mark.asyncio
+    async def test_expired_session_restarts_from_zero(self, temp_dir, temp_media_file):
+        """Test that an expired session is discarded and the upload restarts."""
+        from googleapiclient.errors import HttpError
+        from medusa.utils.upload_sessions import UploadSession, UploadSessionStore
+        
+        store = UploadSessionStore(temp_dir / "sessions")
+        session = UploadSession(
+            task_id="task_1",
+            fingerprint="abc",
+            file_path=str(temp_media_file),
+            session_uri="https://upload.example.com/expired",
+            total_bytes=1000,
+            confirmed_bytes=500
+        )
+        store.save_session(session)
+        uploader = YouTubeUploader(run_in_thread=False, session_store=store)
+        
+        expired = MagicMock()
+        expired.status = 404
+        expired.reason = "Not Found"
+        insert_request = MagicMock()
+        calls = []
+        
+        def mock_next_chunk():
+            calls.append(insert_request.resumable_uri)
+            if len(calls) == 1:
+                raise HttpError(expired, b'{"error": {"message": "Not Found"}}')
+            return (None, {'id': 'test_video_id_123'})
+        
+        insert_request.resumable_uri = session.session_uri
+        insert_request.next_chunk = mock_next_chunk
+        
+        result = await uploader._perform_resumable_upload(insert_request, None, 1000, session=session)
+        
+        assert result == {'id': 'test_video_id_123'}
+        assert calls == ["https://upload.example.com/expired", None]
+        assert insert_request.resumable_progress == 0
+        assert store.get_session("task_1", "abc") is None
+    
+    @pytest.mark.asyncio
+    async def test_session_discarded_on_permanent_failure(self, temp_dir, temp_media_file):
+        """Test that a session is removed once the upload fails for good."""
+        from googleapiclient.errors import HttpError
+        from medusa.utils.upload_sessions import UploadSession, UploadSessionStore
+        
+        store = UploadSessionStore(temp_dir / "sessions")
+        session = UploadSession(
+            task_id="task_1",
+            fingerprint="abc",
+            file_path=str(temp_media_file),
+            session_uri="https://upload.example.com/session/1",
+            total_bytes=1000,
+            confirmed_bytes=500
+        )
+        store.save_session(session)
+        uploader = YouTubeUploader(run_in_thread=False, session_store=store)
+        
+        bad_request = MagicMock()
+        bad_request.status = 400
+        bad_request.reason = "Bad Request"
+        insert_request = MagicMock()
+        insert_request.next_chunk.side_effect = HttpError(bad_request, b'{"error": {"message": "Invalid"}}')
+        
+        with pytest.raises(ValidationError):
+            await uploader._perform_resumable_upload(insert_request, None, 1000, session=session)
+        
+        assert store.get_session("task_1", "abc") is None
+
+
+class TestYouTubeUploaderQuota:
+    """Test daily API quota admission and accounting."""
+    
+    @staticmethod
+    def _uploader(ledger, **kwargs):
+        uploader = YouTubeUploader(run_in_thread=False, quota_ledger=ledger, **kwargs)
+        uploader.is_authenticated = True
+        uploader.service = MagicMock()
+        return uploader
+    
+    def test_quota_ledger_from_credentials(self, temp_dir):
+        """Test that quota_ledger_file enables a shared ledger."""
+        config = PlatformConfig(
+            platform_name="youtube",
+            credentials={
+                "quota_ledger_file": str(temp_dir / "quota.json"),
+                "daily_quota": 20000
+            }
+        )
+        
+        first = YouTubeUploader(config=config)
+        second = YouTubeUploader(config=config)
+        
+        assert first.quota_ledger is not None
+        assert first.quota_ledger is second.quota_ledger
+        assert first.quota_ledger.daily_limit == 20000
+        assert YouTubeUploader().quota_ledger is None
+    
+    @pytest.mark.asyncio
+    async def test_upload_charges_insert(self):
+        """Test that a successful upload charges videos.insert."""
+        from medusa.utils.quota import QuotaLedger
+        
+        ledger = QuotaLedger()
+        uploader = self._uploader(ledger)
+        insert_request = MagicMock()
+        insert_request.next_chunk.return_value = (None, {'id': 'test_video_id_123'})
+        uploader.service.videos().insert.return_value = insert_request
+        
+        with patch.object(uploader, '_validate_file'), \
+             patch('medusa.uploaders.youtube.MediaFileUpload'), \
+             patch('os.path.getsize', return_value=1024*1024):
+            
+            result = await uploader._upload_media("/path/to/video.mp4", MediaMetadata(title="Test Video"))
+        
+        assert result.success is True
+        status = uploader.get_quota_status()
+        assert status["enabled"] is True
+        assert status["used"] == 1600
+        assert status["reserved"] == 0
+        assert status["remaining"] == 8400
+    
+    @pytest.mark.asyncio
+    async def test_upload_with_thumbnail_charges_both_calls(self):
+        """Test that the thumbnail is charged separately from the insert."""
+        from medusa.utils.quota import QuotaLedger
+        
+        ledger = QuotaLedger()
+        uploader = self._uploader(ledger)
+        insert_request = MagicMock()
+        insert_request.next_chunk.return_value = (None, {'id': 'video123'})
+        uploader.service.videos().insert.return_value = insert_request
+        metadata = MediaMetadata(title="Test Video", thumbnail_path="/path/to/thumb.jpg")
+        
+        with patch.object(uploader, '_validate_file'), \
+             patch.object(uploader, '_validate_thumbnail_file'), \
+             patch('medusa.uploaders.youtube.MediaFileUpload'), \
+             patch('os.path.getsize', return_value=1024*1024):
+            
+            await uploader._upload_media("/path/to/video.mp4", metadata)
+        
+        calls = ledger.get_status()["calls"]
+        assert calls == {
+            "videos.insert": {"count": 1, "units": 1600},
+            "thumbnails.set": {"count": 1, "units": 50}
+        }
+        assert ledger.get_status()["reserved"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_thumbnail_uses_upload_reservation(self):
+        """Test that the thumbnail is charged to the units reserved with the upload."""
+        from medusa.utils.quota import QuotaLedger
+        
+        ledger = QuotaLedger(daily_limit=1650)
+        uploader = self._uploader(ledger, quota_wait_timeout=0)
+        insert_request = MagicMock()
+        insert_request.next_chunk.return_value = (None, {'id': 'video123'})
+        uploader.service.videos().insert.return_value = insert_request
+        metadata = MediaMetadata(title="Test Video", thumbnail_path="/path/to/thumb.jpg")
+        
+        with patch.object(uploader, '_validate_file'), \
+             patch.object(uploader, '_validate_thumbnail_file'), \
+             patch('medusa.uploaders.youtube.MediaFileUpload'), \
+             patch('os.path.getsize', return_value=1024*1024), \
+             patch.object(ledger, 'reserve', wraps=ledger.reserve) as reserve:
+            
+            result = await uploader._upload_media("/path/to/video.mp4", metadata)
+        
+        assert result.metadata["thumbnail_uploaded"] is True
+        reserve.assert_called_once_with(1650, timeout=0)
+        assert ledger.get_status()["used"] == 1650
+        assert ledger.get_status()["reserved"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_upload_deferred_when_quota_short(self):
+        """Test that an upload is not started when the budget cannot cover it."""
+        from medusa.utils.quota import QuotaLedger
+        
+        ledger = QuotaLedger(daily_limit=2000)
+        ledger.record("videos.insert")
+        uploader = self._uploader(ledger, quota_wait_timeout=0)
+        
+        with patch.object(uploader, '_validate_file'):
+            with pytest.raises(RateLimitError) as exc_info:
+                await uploader._upload_media("/path/to/video.mp4", MediaMetadata(title="Test Video"))
+        
+        assert exc_info.value.quota_exceeded is True
+        uploader.service.videos().insert.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_api_quota_error_exhausts_ledger(self):
+        """Test that a server-side quotaExceeded marks the ledger exhausted."""
+        from googleapiclient.errors import HttpError
+        from medusa.utils.quota import QuotaLedger
+        
+        ledger = QuotaLedger()
+        uploader = self._uploader(ledger)
+        mock_response = MagicMock()
+        mock_response.status = 403
+        mock_response.reason = "Forbidden"
+        insert_request = MagicMock()
+        insert_request.next_chunk.side_effect = HttpError(
+            mock_response, b'{"error": {"message": "Quota exceeded"}}'
+        )
+        uploader.service.videos().insert.return_value = insert_request
+        
+        with patch.object(uploader, '_validate_file'), \
+             patch('medusa.uploaders.youtube.MediaFileUpload'), \
+             patch('os.path.getsize', return_value=1024*1024):
+            
+            with pytest.raises(RateLimitError):
+                await uploader._upload_media("/path/to/video.mp4", MediaMetadata(title="Test Video"))
+        
+        assert ledger.remaining == 0
+        assert ledger.get_status()["reserved"] == 0
+    
+    def test_quota_status_disabled(self):
+        """Test quota status without a ledger."""
+        assert YouTubeUploader().get_quota_status() == {"platform": "youtube", "enabled": False}
+
+
 class TestYouTubeUploaderIntegration:
     """Test integration scenarios."""
     